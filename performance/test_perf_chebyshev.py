@@ -0,0 +1,177 @@
+# -*- coding: UTF-8 -*-
+#
+# Solution of the linear system of the 3D Poisson problem (plus a small mass
+# term) with:
+#
+#   * pcg with the Jacobi preconditioner
+#   * pcg with the Chebyshev-accelerated Jacobi preconditioner
+#     (psydac.linalg.preconditioners.ChebyshevPreconditioner) of various degrees
+#   * the Chebyshev iteration alone, i.e. repeated smoothing steps of high
+#     degree, with a check of the residual after every step
+#
+# Besides the time to solution and the number of iterations, we count the
+# communications: global reductions (inner products, MPI_Allreduce), updates
+# of the ghost regions (neighbour communications) and matrix-vector products.
+# The reductions of the estimation of the eigenvalues, done once, are given
+# separately. The Chebyshev preconditioner trades the global reductions of
+# pcg iterations for matrix-vector products, which only communicate with the
+# neighbours.
+#
+# Can be run in parallel, e.g. mpirun -n 4 python test_perf_chebyshev.py
+
+from sympy import pi, sin
+
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.topology import Cube
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization       import discretize
+from psydac.api.settings             import PSYDAC_BACKEND_GPYCCEL
+from psydac.linalg.stencil           import StencilVector, StencilMatrix
+from psydac.linalg.iterative_solvers import pcg
+from psydac.linalg.preconditioners   import JacobiPreconditioner, ChebyshevPreconditioner
+
+import time
+from tabulate import tabulate
+from mpi4py import MPI
+
+#==============================================================================
+def print_results(results, nprocs):
+    # ...
+    table   = []
+    headers = ['Solver', 'Processes', 'Time [s]', 'Iterations', 'Reductions (setup)', 'Reductions',
+               'Ghost updates', 'Products', 'Residual']
+
+    for kind, d in results.items():
+        line = [kind, nprocs, d['time'], d['niter'], d['setup'], d['reductions'],
+                d['ghost_updates'], d['products'], d['res_norm']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+class CommunicationCounter:
+    """
+    Count the calls to StencilVector.dot (global reductions),
+    StencilVector.update_ghost_regions (neighbour communications) and
+    StencilMatrix.dot (matrix-vector products) in a with statement.
+    """
+    methods = {'reductions'   : (StencilVector, 'dot'),
+               'ghost_updates': (StencilVector, 'update_ghost_regions'),
+               'products'     : (StencilMatrix, 'dot')}
+
+    def __enter__(self):
+        self.counts   = dict.fromkeys(self.methods, 0)
+        self.original = {}
+        for key, (cls, name) in self.methods.items():
+            f = getattr(cls, name)
+            self.original[key] = f
+            setattr(cls, name, self._counted(key, f))
+        return self
+
+    def __exit__(self, *args):
+        for key, (cls, name) in self.methods.items():
+            setattr(cls, name, self.original[key])
+
+    def _counted(self, key, f):
+        def wrapper(*args, **kwargs):
+            self.counts[key] += 1
+            return f(*args, **kwargs)
+        return wrapper
+
+#==============================================================================
+def chebyshev_iteration(A, b, S, tol, maxiter):
+
+    x = b.space.zeros()
+    r = b.copy()
+
+    for k in range(1, maxiter+1):
+        S.smooth(b, x)
+        r = A.dot(x, out=r)
+        r -= b
+        res_norm = r.dot(r) ** 0.5
+        if res_norm < tol:
+            break
+
+    return x, {'niter': k, 'success': res_norm < tol, 'res_norm': res_norm}
+
+# ...
+def run_solver(A, b, kind, degree, nsteps, tol, maxiter, comm):
+
+    d = {}
+
+    comm.Barrier()
+    tb = time.time()
+
+    with CommunicationCounter() as setup:
+        if kind == 'pcg, Jacobi':
+            P = JacobiPreconditioner(A)
+        else:
+            P = ChebyshevPreconditioner(A, degree, nsteps=nsteps)
+
+    with CommunicationCounter() as counter:
+        if kind == 'Chebyshev iteration':
+            x, info = chebyshev_iteration(A, b, P, tol, maxiter)
+        else:
+            x, info = pcg(A, b, pc=P, tol=tol, maxiter=maxiter)
+
+    comm.Barrier()
+    te = time.time()
+
+    d['time']  = comm.allreduce(te - tb, op=MPI.MAX)
+    d['niter'] = info['niter']
+    d['setup'] = setup.counts['reductions']
+    d.update(counter.counts)
+
+    r = b - A.dot(x)
+    d['res_norm'] = r.dot(r) ** 0.5
+
+    return d
+
+###############################################################################
+#            SERIAL AND PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_chebyshev_3d(ncells=[2**5,2**5,2**5], degree=[3,3,3], tol=1e-8, maxiter=5000):
+
+    comm = MPI.COMM_WORLD
+
+    domain = Cube()
+    x,y,z = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, 'u')
+    v = element_of(V, 'v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + 1e-2 * u * v))
+    l = LinearForm(v, integral(domain, sin(pi*x)*sin(pi*y)*sin(pi*z) * v))
+
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    lh = discretize(l, domain_h,      Vh , backend=PSYDAC_BACKEND_GPYCCEL)
+
+    A = ah.assemble()
+    b = lh.assemble()
+
+    results = {}
+    results['pcg, Jacobi'] = run_solver(A, b, 'pcg, Jacobi', None, None, tol, maxiter, comm)
+    for k in [2, 4, 8]:
+        results['pcg, Chebyshev ({})'.format(k)] = run_solver(A, b, 'pcg, Chebyshev', k, 10, tol, maxiter, comm)
+
+    # Alone, the Chebyshev iteration needs an accurate lower bound of the spectrum
+    results['Chebyshev iteration (64)'] = run_solver(A, b, 'Chebyshev iteration', 64, 40, tol, maxiter, comm)
+
+    if comm.rank == 0:
+        print_results(results, comm.size)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_chebyshev_3d()
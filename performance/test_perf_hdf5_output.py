@@ -0,0 +1,119 @@
+# -*- coding: UTF-8 -*-
+#
+# Size and write time of the snapshots exported by OutputManager, for
+# different layouts of the HDF5 datasets (see DatasetStorage): contiguous,
+# chunked along the domain decomposition, compressed with gzip or lzf, and
+# converted to single precision.
+#
+# Can be run in parallel, e.g. mpirun -n 4 python test_perf_hdf5_output.py
+
+import os
+import time
+
+import numpy as np
+from tabulate import tabulate
+
+from sympde.topology import Square
+from sympde.topology import ScalarFunctionSpace
+
+from psydac.fem.basic           import FemField
+from psydac.api.discretization  import discretize
+from psydac.api.postprocessing  import OutputManager
+from psydac.utilities.hdf5      import DatasetStorage
+
+try:
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+except ImportError:
+    comm = None
+
+#==============================================================================
+def print_results(results):
+    # ...
+    table   = []
+    headers = ['Storage', 'Bytes per snapshot', 'Write time per snapshot [s]']
+
+    for kind, d in results.items():
+        line = [kind, d['bytes'], d['time']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_export(Vh, field, storage, nsnapshots, comm):
+
+    filename_space  = 'perf_hdf5_output.yml'
+    filename_fields = 'perf_hdf5_output.h5'
+
+    output = OutputManager(filename_space, filename_fields, comm=comm, storage=storage)
+    output.add_spaces(Vh=Vh)
+
+    # Static part of the file (root group and attributes)
+    output.add_snapshot(t=0., ts=0)
+    output.export_fields(u=field)
+    output.fields_file.flush()
+    if comm is not None:
+        comm.Barrier()
+    size0 = os.path.getsize(filename_fields)
+
+    tb = time.time()
+    for i in range(1, nsnapshots + 1):
+        output.add_snapshot(t=float(i), ts=i)
+        output.export_fields(u=field)
+    output.fields_file.flush()
+    if comm is not None:
+        comm.Barrier()
+    te = time.time()
+
+    output.close()
+
+    d = {}
+    d['bytes'] = (os.path.getsize(filename_fields) - size0) / nsnapshots
+    d['time']  = (te - tb) / nsnapshots
+
+    if comm is None or comm.rank == 0:
+        os.remove(filename_fields)
+
+    return d
+
+###############################################################################
+#            SERIAL AND PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_hdf5_output_2d(ncells=[2**7,2**7], degree=[3,3], nsnapshots=20):
+
+    domain   = Square()
+    V        = ScalarFunctionSpace('V', domain)
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    # Smooth coefficients, for a meaningful compression ratio
+    field = FemField(Vh)
+    V     = Vh.vector_space
+    x     = [np.linspace(0, 1, n)[s:e+1] for n, s, e in zip(V.npts, V.starts, V.ends)]
+    index = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+    x1, x2 = np.meshgrid(*x, indexing='ij')
+    field.coeffs[index] = np.sin(2*np.pi*x1) * np.cos(2*np.pi*x2)
+
+    storages = {
+        'contiguous'          : DatasetStorage(),
+        'chunked, collective' : DatasetStorage(chunks='decomposition', collective=True),
+        'gzip + shuffle'      : DatasetStorage(compression='gzip', shuffle=True),
+        'lzf + shuffle'       : DatasetStorage(compression='lzf', shuffle=True),
+        'float32'             : DatasetStorage(dtype=np.float32),
+        'float32 + gzip'      : DatasetStorage(compression='gzip', shuffle=True, dtype=np.float32),
+    }
+
+    results = {}
+    for kind, storage in storages.items():
+        results[kind] = run_export(Vh, field, storage, nsnapshots, comm)
+
+    if comm is None or comm.rank == 0:
+        print_results(results)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_hdf5_output_2d()
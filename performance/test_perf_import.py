@@ -0,0 +1,76 @@
+# -*- coding: UTF-8 -*-
+#
+# Import time of psydac, measured in a fresh interpreter for each statement
+# (best of several runs), together with the heavy third-party packages which
+# are imported as a side effect. Short MPI jobs pay this cost on every rank,
+# hence the low-level modules (linalg, ddm) must not import sympy, sympde,
+# pyccel, h5py, yaml or matplotlib.
+#
+# Use 'python -X importtime -c <statement>' to break down a regression.
+
+import subprocess
+import sys
+
+from tabulate import tabulate
+
+HEAVY_PACKAGES = ['sympy', 'sympde', 'pyccel', 'scipy', 'h5py', 'yaml', 'matplotlib']
+
+#==============================================================================
+def print_results(results):
+    # ...
+    table   = []
+    headers = ['Statement', 'Import time [s]', 'Heavy packages imported']
+
+    for statement, d in results.items():
+        line = [statement, d['time'], ', '.join(d['heavy']) or '-']
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_import(statement, nruns):
+
+    code = ('import sys, time; tb = time.perf_counter(); {}; te = time.perf_counter();'
+            'print(te - tb); print(" ".join({{m.split(".")[0] for m in sys.modules}}))').format(statement)
+
+    times = []
+    for i in range(nruns):
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+        t, modules = output.splitlines()
+        times.append(float(t))
+
+    d = {}
+    d['time']  = min(times)
+    d['heavy'] = [p for p in HEAVY_PACKAGES if p in modules.split()]
+
+    return d
+
+###############################################################################
+#            SERIAL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_import(nruns=5):
+
+    statements = [
+        'import psydac',
+        'import psydac.linalg',
+        'from psydac.linalg.stencil import StencilMatrix',
+        'from psydac.linalg.iterative_solvers import pcg',
+        'from psydac.linalg.direct_solvers import SparseSolver',
+        'from psydac.ddm.cart import CartDecomposition',
+        'from psydac.fem.tensor import TensorFemSpace',
+        'from psydac.api.discretization import discretize',
+    ]
+
+    results = {}
+    for statement in statements:
+        results[statement] = run_import(statement, nruns)
+
+    print_results(results)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_import()
@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+#
+# Load balance of the assembly in parallel, with the uniform decomposition of
+# the coefficients (same number of coefficients per process) and with the
+# weighted decomposition (same estimated cost per process, see
+# TensorFemSpace(..., balance='weighted')), which accounts for the boundary
+# integrals carried by the processes at the boundary. For each decomposition
+# we report the estimated imbalance and the measured assembly times: minimum
+# and maximum over the processes, and their ratio.
+#
+# To be run in parallel, e.g. mpirun -n 8 python test_perf_load_balance.py
+
+from sympy import pi, sin
+
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.topology import Square
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization import discretize
+from psydac.api.settings       import PSYDAC_BACKEND_GPYCCEL
+
+import time
+from tabulate import tabulate
+from mpi4py import MPI
+
+#==============================================================================
+def print_results(results):
+    # ...
+    table   = []
+    headers = ['Decomposition', 'Estimated imbalance', 'Min assembly [s]', 'Max assembly [s]', 'Measured imbalance']
+
+    for kind, d in results.items():
+        line = [kind, d['estimate'], d['min'], d['max'], d['max'] / d['mean']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_assembly(domain_h, V, a, l, balance, degree, comm, nrepeat):
+
+    Vh = discretize(V, domain_h, degree=degree, balance=balance)
+
+    ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    lh = discretize(l, domain_h,      Vh , backend=PSYDAC_BACKEND_GPYCCEL)
+
+    # Warm-up (allocation of the matrix and the vector)
+    ah.assemble()
+    lh.assemble()
+
+    comm.Barrier()
+    tb = time.time()
+    for i in range(nrepeat):
+        ah.assemble()
+        lh.assemble()
+    te = time.time()
+
+    t = (te - tb) / nrepeat
+
+    d = {}
+    d['estimate'] = Vh.load_imbalance
+    d['min']      = comm.allreduce(t, op=MPI.MIN)
+    d['max']      = comm.allreduce(t, op=MPI.MAX)
+    d['mean']     = comm.allreduce(t, op=MPI.SUM) / comm.size
+
+    return d
+
+###############################################################################
+#            PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_load_balance_2d(ncells=[2**6,2**6], degree=[3,3], nrepeat=5):
+
+    comm = MPI.COMM_WORLD
+
+    domain = Square()
+    x,y = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, 'u')
+    v = element_of(V, 'v')
+
+    # Robin boundary condition: boundary integrals on the whole boundary
+    B = domain.boundary
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))) + integral(B, u * v))
+    l = LinearForm(v, integral(domain, sin(pi*x)*sin(pi*y) * v) + integral(B, v))
+
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+
+    results = {}
+    for balance in ['uniform', 'weighted']:
+        results[balance] = run_assembly(domain_h, V, a, l, balance, degree, comm, nrepeat)
+
+    if comm.rank == 0:
+        print_results(results)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_load_balance_2d()
@@ -0,0 +1,125 @@
+# -*- coding: UTF-8 -*-
+#
+# Accuracy/speed trade-off of the mass matrix options available for explicit
+# time stepping, measured on the L2 projection of a smooth function:
+#
+#   * 'consistent' : exact mass matrix (Gauss-Legendre), solved with CG
+#   * 'lobatto'    : mass matrix integrated with Gauss-Lobatto points, solved with CG
+#   * 'lumped'     : row-sum lumped mass matrix, inverted with a DiagonalSolver
+#
+# The lumped mass matrix is inverted at the cost of one element-wise product,
+# independently of the mesh size and of the degree, whereas the number of CG
+# iterations grows with the degree. The price to pay is accuracy: the lumped
+# projection is only second order accurate, whatever the spline degree, while
+# the consistent projection converges with order (degree+1).
+
+from sympy import pi, sin
+
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.topology import Square
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import Norm
+from sympde.expr     import integral
+
+from psydac.fem.basic                import FemField
+from psydac.api.discretization       import discretize
+from psydac.api.settings             import PSYDAC_BACKEND_GPYCCEL
+from psydac.linalg.iterative_solvers import cg
+from psydac.linalg.direct_solvers    import DiagonalSolver
+
+import time
+from tabulate import tabulate
+
+#==============================================================================
+def print_results(results):
+    # ...
+    table   = []
+    headers = ['Mass matrix', 'Assembly [s]', 'Solve [s]', 'CG iterations', 'L2 error']
+
+    for kind, d in results.items():
+        line = [kind, d['assembly'], d['solve'], d['niter'], d['l2_error']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_l2_projection(domain, solution, ncells, degree, kind, backend):
+
+    # ... abstract model
+    V = ScalarFunctionSpace('V', domain)
+
+    F = element_of(V, 'F')
+    u = element_of(V, 'u')
+    v = element_of(V, 'v')
+
+    a = BilinearForm((u, v), integral(domain, u * v))
+    l = LinearForm(v, integral(domain, solution * v))
+
+    error  = F - solution
+    l2norm = Norm(error, domain, kind='l2')
+    # ...
+
+    # ... discrete spaces
+    domain_h    = discretize(domain, ncells=ncells)
+    quad_family = 'lobatto' if kind == 'lobatto' else 'legendre'
+    Vh          = discretize(V, domain_h, degree=degree, quad_family=quad_family)
+    # ...
+
+    # dict to store timings, iterations and errors
+    d = {}
+
+    ah = discretize(a, domain_h, [Vh, Vh], lumped=(kind == 'lumped'), backend=backend)
+    lh = discretize(l, domain_h,      Vh , backend=backend)
+    b  = lh.assemble()
+
+    tb = time.time(); M = ah.assemble(); te = time.time()
+
+    d['assembly'] = te-tb
+
+    if kind == 'lumped':
+        tb = time.time()
+        x = DiagonalSolver(M).solve(b)
+        te = time.time()
+        d['niter'] = 0
+    else:
+        tb = time.time()
+        x, info = cg(M, b, tol=1e-12, maxiter=10000)
+        te = time.time()
+        d['niter'] = info['niter']
+
+    d['solve'] = te-tb
+
+    # ... error of the projection
+    uh = FemField(Vh, x)
+    l2norm_h = discretize(l2norm, domain_h, Vh, backend=backend)
+
+    d['l2_error'] = l2norm_h.assemble(F=uh)
+    # ...
+
+    return d
+
+###############################################################################
+#            SERIAL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_mass_lumping_2d(ncells=[2**5,2**5], degree=[3,3]):
+    domain = Square()
+    x,y = domain.coordinates
+
+    solution = sin(pi*x)*sin(pi*y)
+
+    results = {}
+    for kind in ['consistent', 'lobatto', 'lumped']:
+        results[kind] = run_l2_projection( domain, solution,
+                                           ncells=ncells, degree=degree, kind=kind,
+                                           backend=PSYDAC_BACKEND_GPYCCEL )
+
+    print_results(results)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_mass_lumping_2d()
@@ -0,0 +1,121 @@
+# -*- coding: UTF-8 -*-
+#
+# Solution of the linear system of the 3D Poisson problem (plus a small mass
+# term) with the matrix stored in double precision, and with mixed precision:
+# the matrix is also stored in single precision (StencilMatrix.astype), and
+# the system is solved by iterative refinement with inner pcg solves on the
+# single-precision matrix. We measure:
+#
+#   * the memory used by the entries of the matrix
+#   * the time of a matrix-vector product
+#   * the time to solution, the number of iterations and the final residual
+#
+# Can be run in parallel, e.g. mpirun -n 4 python test_perf_mixed_precision.py
+
+from sympy import pi, sin
+
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.topology import Cube
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization       import discretize
+from psydac.api.settings             import PSYDAC_BACKEND_GPYCCEL
+from psydac.linalg.iterative_solvers import pcg, iterative_refinement
+
+import time
+from tabulate import tabulate
+from mpi4py import MPI
+
+#==============================================================================
+def print_results(results, nprocs):
+    # ...
+    table   = []
+    headers = ['Storage', 'Processes', 'Matrix [MB]', 'Dot [s]', 'Solve [s]', 'Iterations', 'Residual']
+
+    for kind, d in results.items():
+        line = [kind, nprocs, d['memory'], d['dot'], d['solve'], d['niter'], d['res_norm']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def timed(comm, f, *args, **kwargs):
+
+    comm.Barrier()
+    tb  = time.time()
+    out = f(*args, **kwargs)
+    comm.Barrier()
+    te  = time.time()
+
+    return out, comm.allreduce(te - tb, op=MPI.MAX)
+
+# ...
+def run_solver(A, A_low, b, tol, maxiter, ndots, comm):
+
+    d = {}
+    M = A if A_low is None else A_low
+
+    d['memory'] = comm.allreduce(M._data.nbytes, op=MPI.SUM) / 2**20
+
+    x = b.copy()
+    y = M.dot(x)
+    _, t = timed(comm, lambda: [M.dot(x, out=y) for _ in range(ndots)])
+    d['dot'] = t / ndots
+
+    if A_low is None:
+        (x, info), d['solve'] = timed(comm, pcg, A, b, pc='jacobi', tol=tol, maxiter=maxiter)
+        d['niter'] = info['niter']
+    else:
+        (x, info), d['solve'] = timed(comm, iterative_refinement, A, b, A_low, pc='jacobi', tol=tol,
+                                      inner_maxiter=maxiter)
+        d['niter'] = '{} ({})'.format(info['inner_niter'], info['niter'])
+
+    r = b - A.dot(x)
+    d['res_norm'] = r.dot(r) ** 0.5
+
+    return d
+
+###############################################################################
+#            SERIAL AND PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_mixed_precision_3d(ncells=[2**5,2**5,2**5], degree=[3,3,3], tol=1e-10, maxiter=5000, ndots=20):
+
+    comm = MPI.COMM_WORLD
+
+    domain = Cube()
+    x,y,z = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, 'u')
+    v = element_of(V, 'v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + 1e-2 * u * v))
+    l = LinearForm(v, integral(domain, sin(pi*x)*sin(pi*y)*sin(pi*z) * v))
+
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    lh = discretize(l, domain_h,      Vh , backend=PSYDAC_BACKEND_GPYCCEL)
+
+    A     = ah.assemble()
+    A_low = ah.assemble(dtype='float32', reuse=True)
+    b     = lh.assemble()
+
+    results = {}
+    results['float64']           = run_solver(A, None , b, tol, maxiter, ndots, comm)
+    results['float32 + float64'] = run_solver(A, A_low, b, tol, maxiter, ndots, comm)
+
+    if comm.rank == 0:
+        print_results(results, comm.size)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_mixed_precision_3d()
@@ -0,0 +1,122 @@
+# -*- coding: UTF-8 -*-
+#
+# Solution of the linear system of the Poisson problem (plus a small mass term)
+# with the conjugate gradient of psydac (pcg) and with the PetscSolver of
+# psydac.linalg.petsc_solvers, which converts the StencilMatrix to the AIJ
+# format of PETSc with an exact preallocation. For each solver we measure:
+#
+#   * the set-up time: conversion of the matrix (and for comparison the old
+#     conversion with StencilMatrix.topetsc, which has no preallocation)
+#   * the update time of the values after a new assembly
+#   * the solve time and the number of iterations
+#
+# Can be run in parallel, e.g. mpirun -n 4 python test_perf_petsc.py
+
+from sympy import pi, sin
+
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.topology import Square
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization       import discretize
+from psydac.api.settings             import PSYDAC_BACKEND_GPYCCEL
+from psydac.linalg.iterative_solvers import pcg
+from psydac.linalg.preconditioners   import JacobiPreconditioner
+from psydac.linalg.petsc_solvers     import PetscSolver
+
+import time
+from tabulate import tabulate
+from mpi4py import MPI
+
+#==============================================================================
+def print_results(results, nprocs):
+    # ...
+    table   = []
+    headers = ['Solver', 'Processes', 'Set-up [s]', 'Update [s]', 'Solve [s]', 'Iterations']
+
+    for kind, d in results.items():
+        line = [kind, nprocs, d['setup'], d['update'], d['solve'], d['niter']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def timed(comm, f, *args, **kwargs):
+
+    comm.Barrier()
+    tb  = time.time()
+    out = f(*args, **kwargs)
+    comm.Barrier()
+    te  = time.time()
+
+    return out, comm.allreduce(te - tb, op=MPI.MAX)
+
+# ...
+def run_solver(A, b, kind, tol, maxiter, comm):
+
+    d = {}
+
+    if kind == 'pcg':
+        d['setup']  = 0.
+        d['update'] = 0.
+        (x, info), d['solve'] = timed(comm, pcg, A, b, pc=JacobiPreconditioner(A), tol=tol, maxiter=maxiter)
+        d['niter'] = info['niter']
+
+    elif kind == 'topetsc (no preallocation)':
+        _, d['setup'] = timed(comm, A.topetsc)
+        d['update'] = d['setup']
+        d['solve']  = None
+        d['niter']  = None
+
+    else:
+        ksp_type, pc_type = kind.split(' + ')
+        solver, d['setup']  = timed(comm, PetscSolver, A, ksp_type=ksp_type, pc_type=pc_type, tol=tol, maxiter=maxiter)
+        _, d['update']      = timed(comm, solver.update)
+        x, d['solve']       = timed(comm, solver.solve, b)
+        d['niter'] = solver.info['niter']
+
+    return d
+
+###############################################################################
+#            SERIAL AND PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_petsc_2d(ncells=[2**8,2**8], degree=[3,3], tol=1e-8, maxiter=5000):
+
+    comm = MPI.COMM_WORLD
+
+    domain = Square()
+    x,y = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, 'u')
+    v = element_of(V, 'v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + 1e-2 * u * v))
+    l = LinearForm(v, integral(domain, sin(pi*x)*sin(pi*y) * v))
+
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    lh = discretize(l, domain_h,      Vh , backend=PSYDAC_BACKEND_GPYCCEL)
+
+    A = ah.assemble()
+    b = lh.assemble()
+
+    results = {}
+    for kind in ['pcg', 'topetsc (no preallocation)', 'cg + jacobi', 'cg + gamg']:
+        results[kind] = run_solver(A, b, kind, tol, maxiter, comm)
+
+    if comm.rank == 0:
+        print_results(results, comm.size)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_petsc_2d()
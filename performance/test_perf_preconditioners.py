@@ -0,0 +1,99 @@
+# -*- coding: UTF-8 -*-
+#
+# Set-up and solve times of the preconditioned conjugate gradient (pcg) for the
+# stiffness matrix of the Poisson problem (plus a small mass term), with the
+# preconditioners of psydac.linalg.preconditioners and with the historical
+# 'jacobi' function, which extracts the diagonal of the matrix (and allocates
+# a new vector) at every iteration.
+
+from sympy import pi, sin
+
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.topology import Square
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization       import discretize
+from psydac.api.settings             import PSYDAC_BACKEND_GPYCCEL
+from psydac.linalg.iterative_solvers import pcg
+from psydac.linalg.preconditioners   import JacobiPreconditioner, SSORPreconditioner
+
+import time
+from tabulate import tabulate
+
+#==============================================================================
+def print_results(results):
+    # ...
+    table   = []
+    headers = ['Preconditioner', 'Set-up [s]', 'Solve [s]', 'Iterations', 'Time per iteration [s]']
+
+    for kind, d in results.items():
+        line = [kind, d['setup'], d['solve'], d['niter'], d['solve'] / d['niter']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_pcg(A, b, kind, tol, maxiter):
+
+    d = {}
+
+    tb = time.time()
+    if kind == 'none':
+        pc = None
+    elif kind == 'jacobi':
+        pc = kind
+    elif kind == 'JacobiPreconditioner':
+        pc = JacobiPreconditioner(A)
+    elif kind == 'SSORPreconditioner':
+        pc = SSORPreconditioner(A, omega=1.)
+    te = time.time()
+    d['setup'] = te - tb
+
+    tb = time.time()
+    x, info = pcg(A, b, pc=pc, tol=tol, maxiter=maxiter)
+    te = time.time()
+    d['solve'] = te - tb
+    d['niter'] = info['niter']
+
+    return d
+
+###############################################################################
+#            SERIAL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_preconditioners_2d(ncells=[2**6,2**6], degree=[3,3], tol=1e-8, maxiter=5000):
+
+    domain = Square()
+    x,y = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, 'u')
+    v = element_of(V, 'v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + 1e-2 * u * v))
+    l = LinearForm(v, integral(domain, sin(pi*x)*sin(pi*y) * v))
+
+    domain_h = discretize(domain, ncells=ncells)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    lh = discretize(l, domain_h,      Vh , backend=PSYDAC_BACKEND_GPYCCEL)
+
+    A = ah.assemble()
+    b = lh.assemble()
+
+    results = {}
+    for kind in ['none', 'jacobi', 'JacobiPreconditioner', 'SSORPreconditioner']:
+        results[kind] = run_pcg(A, b, kind, tol, maxiter)
+
+    print_results(results)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_preconditioners_2d()
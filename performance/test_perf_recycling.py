@@ -0,0 +1,128 @@
+# -*- coding: UTF-8 -*-
+#
+# Time loop of the heat equation with the implicit Euler scheme: at every
+# time step the linear system (M + dt K) u_new = M u_old + dt f(t) is solved
+# with the same matrix. We compare the total number of iterations and the
+# time of:
+#
+#   * pcg started from zero at every step
+#   * pcg started from the solution of the previous step
+#   * SolverSequence (psydac.linalg.recycling) with extrapolation or projection
+#     of the previous solutions, with and without deflation vectors recycled
+#     from the previous solves
+#
+# Can be run in parallel, e.g. mpirun -n 4 python test_perf_recycling.py
+
+from sympy import pi, sin, cos
+
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.topology import Square
+from sympde.core     import Constant
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization       import discretize
+from psydac.api.settings             import PSYDAC_BACKEND_GPYCCEL
+from psydac.linalg.iterative_solvers import pcg
+from psydac.linalg.recycling         import SolverSequence
+
+import time
+from tabulate import tabulate
+from mpi4py import MPI
+
+#==============================================================================
+def print_results(results, nprocs):
+    # ...
+    table   = []
+    headers = ['Solver', 'Processes', 'Time [s]', 'Iterations', 'First step', 'Last step']
+
+    for kind, d in results.items():
+        line = [kind, nprocs, d['time'], sum(d['niter']), d['niter'][0], d['niter'][-1]]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_time_loop(A, M, lh, dt, nsteps, kind, tol, comm):
+
+    u = A.domain.zeros()
+
+    if kind.startswith('SolverSequence'):
+        guess = 'extrapolation' if 'extrapolation' in kind else 'projection'
+        ndefl = 8 if 'deflation' in kind else 0
+        solver = SolverSequence(A, 'jacobi', tol=tol, guess=guess, nguess=3, ndefl=ndefl, recompute=False)
+
+    niter = []
+
+    comm.Barrier()
+    tb = time.time()
+
+    for n in range(1, nsteps+1):
+
+        b  = M.dot(u)
+        b += dt * lh.assemble(t=n*dt)
+
+        if kind == 'pcg':
+            u, info = pcg(A, b, pc='jacobi', tol=tol)
+        elif kind == 'pcg, previous solution':
+            u, info = pcg(A, b, pc='jacobi', x0=u, tol=tol)
+        else:
+            u    = solver.solve(b)
+            info = solver.info
+
+        niter.append(info['niter'])
+
+    comm.Barrier()
+    te = time.time()
+
+    return {'time': comm.allreduce(te - tb, op=MPI.MAX), 'niter': niter}
+
+###############################################################################
+#            SERIAL AND PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_recycling_2d(ncells=[2**6,2**6], degree=[3,3], dt=1e-3, nsteps=50, tol=1e-10):
+
+    comm = MPI.COMM_WORLD
+
+    domain = Square()
+    x,y = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, 'u')
+    v = element_of(V, 'v')
+    t = Constant('t')
+
+    m = BilinearForm((u, v), integral(domain, u * v))
+    a = BilinearForm((u, v), integral(domain, u * v + dt * dot(grad(u), grad(v))))
+    l = LinearForm(v, integral(domain, sin(pi*x)*sin(pi*y)*cos(2*pi*t) * v))
+
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    mh = discretize(m, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    lh = discretize(l, domain_h,      Vh , backend=PSYDAC_BACKEND_GPYCCEL)
+
+    M = mh.assemble()
+    A = ah.assemble()
+
+    results = {}
+    for kind in ['pcg',
+                 'pcg, previous solution',
+                 'SolverSequence, extrapolation',
+                 'SolverSequence, projection',
+                 'SolverSequence, projection + deflation']:
+        results[kind] = run_time_loop(A, M, lh, dt, nsteps, kind, tol, comm)
+
+    if comm.rank == 0:
+        print_results(results, comm.size)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_recycling_2d()
@@ -0,0 +1,138 @@
+# -*- coding: UTF-8 -*-
+#
+# Factorization of a sequence of matrices with the same sparsity pattern and
+# different values, as in time stepping with variable coefficients or in the
+# Newton iterations of a nonlinear problem. For the SparseSolver and the
+# BandedSolver of psydac.linalg.direct_solvers we compare:
+#
+#   * the construction of a new solver for every matrix
+#   * the factorization of every matrix with the 'refactor' method, which
+#     reuses the column ordering and the storage of the first factorization
+#
+# and the time to solve for many right-hand sides at once.
+
+import time
+
+import numpy as np
+from scipy.sparse import diags, identity, kron
+from tabulate import tabulate
+
+from psydac.linalg.direct_solvers import SparseSolver, BandedSolver
+
+#==============================================================================
+def print_results(results):
+    # ...
+    table   = []
+    headers = ['Solver', 'Size', 'New solver [s]', 'Refactor [s]', 'Speed-up', 'Solve, all rhs [s]']
+
+    for kind, d in results.items():
+        line = [kind, d['size'], d['new'], d['refactor'], d['new'] / d['refactor'], d['solve']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def variable_coefficients(n, p, t):
+    """ Banded matrix of size n and half-bandwidth p, with values depending on t."""
+    x = np.linspace(0, 1, n)
+    offsets = list(range(-p, p+1))
+    values  = [(2*p + 1 + np.sin(2*np.pi*(x[:n-abs(k)] - t))) if k == 0 else -np.ones(n-abs(k)) / (1 + abs(k))
+               for k in offsets]
+    return diags(values, offsets, format='csr')
+
+# ...
+def to_banded(A, p):
+    """ LAPACK banded storage of a matrix with half-bandwidth p, for dgbtrf."""
+    A    = A.tocoo()
+    bmat = np.zeros((3*p+1, A.shape[1]))
+    bmat[2*p + A.row - A.col, A.col] = A.data
+    return bmat
+
+#==============================================================================
+def run_sparse(n, p, nsteps, nrhs):
+
+    # 2D operator with a 5-point like pattern of width p
+    M = lambda t: (kron(variable_coefficients(n, p, t), identity(n)) +
+                   kron(identity(n), variable_coefficients(n, p, -t))).tocsc()
+
+    matrices = [M(t) for t in np.linspace(0, 1, nsteps)]
+    for A in matrices:
+        A.sort_indices()
+
+    tb = time.time()
+    for A in matrices:
+        solver = SparseSolver(A)
+    te = time.time()
+    t_new = (te - tb) / nsteps
+
+    solver = SparseSolver(matrices[0])
+    tb = time.time()
+    for A in matrices:
+        solver.refactor(A.data)
+    te = time.time()
+    t_refactor = (te - tb) / nsteps
+
+    rhs = np.random.random((nrhs, n*n))
+    tb = time.time()
+    solver.solve(rhs)
+    te = time.time()
+
+    d = {}
+    d['size']     = n*n
+    d['new']      = t_new
+    d['refactor'] = t_refactor
+    d['solve']    = te - tb
+
+    return d
+
+# ...
+def run_banded(n, p, nsteps, nrhs):
+
+    matrices = [to_banded(variable_coefficients(n, p, t), p) for t in np.linspace(0, 1, nsteps)]
+
+    tb = time.time()
+    for bmat in matrices:
+        solver = BandedSolver(p, p, bmat)
+    te = time.time()
+    t_new = (te - tb) / nsteps
+
+    solver = BandedSolver(p, p, matrices[0])
+    tb = time.time()
+    for bmat in matrices:
+        solver.refactor(bmat)
+    te = time.time()
+    t_refactor = (te - tb) / nsteps
+
+    rhs = np.random.random((nrhs, n))
+    tb = time.time()
+    solver.solve(rhs, out=rhs)
+    te = time.time()
+
+    d = {}
+    d['size']     = n
+    d['new']      = t_new
+    d['refactor'] = t_refactor
+    d['solve']    = te - tb
+
+    return d
+
+###############################################################################
+#            SERIAL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_refactor(nsteps=20, nrhs=64):
+
+    results = {}
+    results['SparseSolver, p=1'] = run_sparse(2**7, 1, nsteps, nrhs)
+    results['SparseSolver, p=3'] = run_sparse(2**7, 3, nsteps, nrhs)
+    results['BandedSolver, p=1'] = run_banded(2**14, 1, nsteps, nrhs)
+    results['BandedSolver, p=3'] = run_banded(2**14, 3, nsteps, nrhs)
+
+    print_results(results)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_refactor()
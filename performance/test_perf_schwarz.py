@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+#
+# Strong scaling of the conjugate gradient (pcg) for the stiffness matrix of the
+# Poisson problem (plus a small mass term), without preconditioner and with the
+# AdditiveSchwarzPreconditioner of psydac.linalg.preconditioners, whose
+# subdomains are the boxes owned by the processes. For each preconditioner we
+# measure the set-up time (local factorizations), the solve time and the number
+# of iterations, which should stay bounded as the number of processes grows if
+# the coarse space is used.
+#
+# To be run with increasing numbers of processes, e.g.
+#
+#   for n in 1 2 4 8 16; do mpirun -n $n python test_perf_schwarz.py; done
+
+from sympy import pi, sin
+
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.topology import Square
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization       import discretize
+from psydac.api.settings             import PSYDAC_BACKEND_GPYCCEL
+from psydac.linalg.iterative_solvers import pcg
+from psydac.linalg.preconditioners   import AdditiveSchwarzPreconditioner
+
+import time
+from tabulate import tabulate
+from mpi4py import MPI
+
+#==============================================================================
+def print_results(results, nprocs):
+    # ...
+    table   = []
+    headers = ['Preconditioner', 'Processes', 'Set-up [s]', 'Solve [s]', 'Iterations', 'Time per iteration [s]']
+
+    for kind, d in results.items():
+        line = [kind, nprocs, d['setup'], d['solve'], d['niter'], d['solve'] / d['niter']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_pcg(A, b, kind, tol, maxiter, comm):
+
+    d = {}
+
+    comm.Barrier()
+    tb = time.time()
+    if kind == 'none':
+        pc = None
+    elif kind == 'ASM':
+        pc = AdditiveSchwarzPreconditioner(A)
+    elif kind == 'ASM, overlap 1':
+        pc = AdditiveSchwarzPreconditioner(A, overlap=1)
+    elif kind == 'ASM, overlap 1, coarse space':
+        pc = AdditiveSchwarzPreconditioner(A, overlap=1, coarse_space=True)
+    comm.Barrier()
+    te = time.time()
+    d['setup'] = comm.allreduce(te - tb, op=MPI.MAX)
+
+    comm.Barrier()
+    tb = time.time()
+    x, info = pcg(A, b, pc=pc, tol=tol, maxiter=maxiter)
+    te = time.time()
+    d['solve'] = comm.allreduce(te - tb, op=MPI.MAX)
+    d['niter'] = info['niter']
+
+    return d
+
+###############################################################################
+#            SERIAL AND PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_schwarz_2d(ncells=[2**7,2**7], degree=[3,3], tol=1e-8, maxiter=5000):
+
+    comm = MPI.COMM_WORLD
+
+    domain = Square()
+    x,y = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, 'u')
+    v = element_of(V, 'v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + 1e-2 * u * v))
+    l = LinearForm(v, integral(domain, sin(pi*x)*sin(pi*y) * v))
+
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    lh = discretize(l, domain_h,      Vh , backend=PSYDAC_BACKEND_GPYCCEL)
+
+    A = ah.assemble()
+    b = lh.assemble()
+
+    results = {}
+    for kind in ['none', 'ASM', 'ASM, overlap 1', 'ASM, overlap 1, coarse space']:
+        results[kind] = run_pcg(A, b, kind, tol, maxiter, comm)
+
+    if comm.rank == 0:
+        print_results(results, comm.size)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_schwarz_2d()
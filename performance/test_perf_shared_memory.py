@@ -0,0 +1,86 @@
+# -*- coding: UTF-8 -*-
+#
+# Time of the update of the ghost regions of a distributed 3D array with MPI
+# messages (CartDataExchanger) and with shared memory windows between the
+# processes of the same node (SharedCartDataExchanger), for increasing sizes
+# of the local blocks, e.g.
+#
+#   mpirun -n 128 python test_perf_shared_memory.py
+#
+# The shared memory exchange is not faster in general: most MPI libraries
+# already send the messages within a node through shared memory, while
+# SharedCartDataExchanger adds two barriers of the node per direction. On a
+# single core with 4 and 8 processes, it was 1.3 to 2.6 times slower than the
+# MPI messages. Its use must hence be decided from this benchmark, on the
+# target machine.
+#
+# The shared memory exchange, and the storage of the tables of the assembly
+# grids once per node, are used by the StencilVectorSpace and TensorFemSpace
+# objects if the environment variable PSYDAC_SHARED_MEMORY is set to 1.
+
+import time
+
+import numpy as np
+from tabulate import tabulate
+from mpi4py import MPI
+
+from psydac.ddm.cart   import CartDecomposition, CartDataExchanger
+from psydac.ddm.shared import SharedCartDataExchanger, get_node_comm
+
+#==============================================================================
+def print_results(results, nprocs, nnodes):
+    # ...
+    table   = []
+    headers = ['Grid', 'Exchanger', 'Processes', 'Nodes', 'Time per update [s]']
+
+    for (npts, kind), t in results.items():
+        line = ['x'.join(str(n) for n in npts), kind, nprocs, nnodes, t]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_update(cart, exchanger, nrepeat):
+
+    comm  = cart.comm_cart
+    array = np.random.random(cart.shape)
+
+    exchanger.update_ghost_regions(array)
+
+    comm.Barrier()
+    tb = time.time()
+    for i in range(nrepeat):
+        exchanger.update_ghost_regions(array)
+    te = time.time()
+
+    return comm.allreduce((te - tb) / nrepeat, op=MPI.MAX)
+
+###############################################################################
+#            PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_shared_memory_3d(grids=[[32]*3, [64]*3, [128]*3], pads=[3,3,3], nrepeat=50):
+
+    comm = MPI.COMM_WORLD
+
+    node   = get_node_comm(comm)
+    nnodes = comm.allreduce(int(node.rank == 0))
+    node.Free()
+
+    results = {}
+    for npts in grids:
+        cart = CartDecomposition(npts, pads, [True]*3, reorder=False, comm=comm)
+        results[tuple(npts), 'MPI messages'] = run_update(cart, CartDataExchanger(cart, float), nrepeat)
+        shared = SharedCartDataExchanger(cart, float)
+        results[tuple(npts), 'shared memory'] = run_update(cart, shared, nrepeat)
+        shared.free()
+
+    if comm.rank == 0:
+        print_results(results, comm.size, nnodes)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_shared_memory_3d()
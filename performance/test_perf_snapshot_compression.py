@@ -0,0 +1,147 @@
+# -*- coding: UTF-8 -*-
+#
+# Compression of long time series exported by OutputManager with keyframes
+# and differences of consecutive snapshots, and with quantized values (see
+# DatasetStorage). For each storage we measure:
+#
+#   * the compression ratio, with respect to the contiguous float64 layout
+#   * the write time per snapshot
+#   * the read time of the last snapshot, which for keyframe storages is the
+#     worst case: the whole chain of differences back to the keyframe is read
+#
+# The fields are smooth and evolve slowly in time, as in a typical simulation.
+#
+# Can be run in parallel, e.g. mpirun -n 4 python test_perf_snapshot_compression.py
+
+import os
+import time
+
+import numpy as np
+import h5py as h5
+from tabulate import tabulate
+
+from sympde.topology import Square
+from sympde.topology import ScalarFunctionSpace
+
+from psydac.fem.basic           import FemField
+from psydac.api.discretization  import discretize
+from psydac.api.postprocessing  import OutputManager
+from psydac.utilities.hdf5      import DatasetStorage, read_dataset
+
+try:
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+except ImportError:
+    comm = None
+
+#==============================================================================
+def print_results(results):
+    # ...
+    table   = []
+    headers = ['Storage', 'Compression ratio', 'Write time per snapshot [s]',
+               'Read time of last snapshot [s]', 'Max error']
+
+    reference = results['contiguous']['bytes']
+    for kind, d in results.items():
+        line = [kind, reference / d['bytes'], d['write'], d['read'], d['error']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_export(Vh, storage, nsnapshots, comm):
+
+    filename_space  = 'perf_snapshot_compression.yml'
+    filename_fields = 'perf_snapshot_compression.h5'
+
+    V     = Vh.vector_space
+    x     = [np.linspace(0, 1, n)[s:e+1] for n, s, e in zip(V.npts, V.starts, V.ends)]
+    index = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+    x1, x2 = np.meshgrid(*x, indexing='ij')
+    field = FemField(Vh)
+
+    output = OutputManager(filename_space, filename_fields, comm=comm, storage=storage)
+    output.add_spaces(Vh=Vh)
+
+    # Root group and attributes
+    output.set_static()
+    output.export_fields(w=field)
+    output.fields_file.flush()
+    if comm is not None:
+        comm.Barrier()
+    size0 = os.path.getsize(filename_fields)
+
+    tb = time.time()
+    for i in range(nsnapshots):
+        t = 1e-2 * i
+        field.coeffs[index] = np.sin(2*np.pi*(x1 - t)) * np.cos(2*np.pi*x2) * np.exp(-t)
+        output.add_snapshot(t=t, ts=i)
+        output.export_fields(u=field)
+    output.fields_file.flush()
+    if comm is not None:
+        comm.Barrier()
+    te = time.time()
+
+    output.export_space_info()
+    output.close()
+
+    d = {}
+    d['bytes'] = os.path.getsize(filename_fields) - size0
+    d['write'] = (te - tb) / nsnapshots
+
+    if comm is not None:
+        comm.Barrier()
+
+    # Read the last snapshot
+    kwargs = {} if comm is None or comm.size == 1 else dict(driver='mpio', comm=comm)
+    with h5.File(filename_fields, mode='r', **kwargs) as f:
+        snapshot = f[f'snapshot_{nsnapshots - 1:0>4}']
+        patch    = list(snapshot.keys())[0]
+        tb = time.time()
+        values = read_dataset(snapshot[f'{patch}/Vh/u'], index)
+        te = time.time()
+
+    d['read']  = te - tb
+    d['error'] = np.max(abs(values - field.coeffs[index]))
+
+    if comm is not None:
+        comm.Barrier()
+    if comm is None or comm.rank == 0:
+        os.remove(filename_fields)
+        os.remove(filename_space)
+
+    return d
+
+###############################################################################
+#            SERIAL AND PARALLEL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_snapshot_compression_2d(ncells=[2**7,2**7], degree=[3,3], nsnapshots=50):
+
+    domain   = Square()
+    V        = ScalarFunctionSpace('V', domain)
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    storages = {
+        'contiguous'                     : DatasetStorage(),
+        'gzip + shuffle'                 : DatasetStorage(compression='gzip', shuffle=True),
+        'keyframes (10)'                 : DatasetStorage(keyframe_interval=10),
+        'tolerance 1e-8'                 : DatasetStorage(tolerance=1e-8),
+        'tolerance 1e-8, keyframes (10)' : DatasetStorage(tolerance=1e-8, keyframe_interval=10),
+        'tolerance 1e-4, keyframes (10)' : DatasetStorage(tolerance=1e-4, keyframe_interval=10),
+    }
+
+    results = {}
+    for kind, storage in storages.items():
+        results[kind] = run_export(Vh, storage, nsnapshots, comm)
+
+    if comm is None or comm.rank == 0:
+        print_results(results)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_snapshot_compression_2d()
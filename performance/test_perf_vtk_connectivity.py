@@ -0,0 +1,71 @@
+# -*- coding: UTF-8 -*-
+#
+# Time needed to build the connectivity, offsets and cell types arrays of the
+# VTK unstructured grids written by PostProcessManager.export_to_vtk, for
+# visualization grids of up to 10^7 points. The arrays are computed with
+# vectorized index arithmetic, and cached: the second call with the same
+# local domain is (almost) free.
+
+import time
+from tabulate import tabulate
+
+from psydac.api.postprocessing import PostProcessManager, _unstructured_mesh_info
+
+#==============================================================================
+def print_results(results):
+    # ...
+    table   = []
+    headers = ['Points', 'Cells', 'First call [s]', 'Cached call [s]']
+
+    for d in results:
+        line = [d['npoints'], d['ncells'], d['first'], d['cached']]
+        table.append(line)
+
+    print(tabulate(table, headers=headers, tablefmt='latex'))
+    # ...
+
+#==============================================================================
+def run_connectivity(ncells, npts_per_cell):
+
+    local_domain = ((0,) * len(ncells), tuple(n - 1 for n in ncells))
+
+    _unstructured_mesh_info.cache_clear()
+
+    tb = time.time()
+    conn, offsets, celltypes, cellshape = PostProcessManager._compute_unstructured_mesh_info(
+        local_domain, npts_per_cell=npts_per_cell)
+    te = time.time()
+
+    d = {}
+    d['first']   = te - tb
+    d['ncells']  = len(celltypes)
+    d['npoints'] = 1
+    for n, p in zip(ncells, npts_per_cell):
+        d['npoints'] *= n * p
+
+    tb = time.time()
+    PostProcessManager._compute_unstructured_mesh_info(local_domain, npts_per_cell=npts_per_cell)
+    te = time.time()
+    d['cached'] = te - tb
+
+    return d
+
+###############################################################################
+#            SERIAL TESTS
+###############################################################################
+
+#==============================================================================
+def test_perf_vtk_connectivity_2d():
+    results = [run_connectivity([n, n], (3, 3)) for n in [2**6, 2**8, 2**10]]
+    print_results(results)
+
+#==============================================================================
+def test_perf_vtk_connectivity_3d():
+    results = [run_connectivity([n, n, n], (3, 3, 3)) for n in [2**4, 2**5, 2**6, 72]]
+    print_results(results)
+
+###############################################
+if __name__ == '__main__':
+
+    test_perf_vtk_connectivity_2d()
+    test_perf_vtk_connectivity_3d()
@@ -2,14 +2,16 @@
 __all__     = ['__version__', 'api', 'cad', 'core', 'ddm', 'feec', 'fem',
                'linalg', 'mapping', 'utilities']
 
+import importlib
+
 from psydac.version import __version__
 
-from psydac import api
-from psydac import cad
-from psydac import core
-from psydac import ddm
-from psydac import feec
-from psydac import fem
-from psydac import linalg
-from psydac import mapping
-from psydac import utilities
+# The subpackages are imported on first access (PEP 562), so that importing
+# e.g. psydac.linalg does not import sympy, sympde and pyccel
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,13 +1,15 @@
 # -*- coding: UTF-8 -*-
 
-from psydac.api import ast
-from psydac.api import basic
-from psydac.api import discretization
-from psydac.api import essential_bc
-from psydac.api import fem
-from psydac.api import glt
-from psydac.api import grid
-from psydac.api import printing
-from psydac.api import settings
-from psydac.api import utilities
+__all__ = ['ast', 'basic', 'discretization', 'essential_bc', 'fem', 'glt',
+           'grid', 'printing', 'settings', 'utilities']
 
+import importlib
+
+# The modules are imported on first access (see psydac/__init__.py)
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
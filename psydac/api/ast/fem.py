@@ -611,6 +611,8 @@ def _create_ast_bilinear_form(terminal_expr, atomic_expr_field,
 
     quad_order    = kwargs.pop('quad_order', None)
     thread_span   =  dict((u,d_tests[u]['thread_span']) for u in tests)
+    geometry_cache = kwargs.pop('geometry_cache', None)
+    cached_mapping = bool(mapping_space) and mask is None and geometry_cache is not None and geometry_cache.accepts(nderiv)
     # ...........................................................................................
     g_span              = dict((u,d_tests[u]['span']) for u in tests)
     f_span              = dict((f,d_fields[f]['span']) for f in fields)
@@ -661,7 +663,7 @@ def _create_ast_bilinear_form(terminal_expr, atomic_expr_field,
         ind_dof_test  = index_dof_test.set_range(stop=Tuple(*[d+1 for d in list(d_mapping.values())[0]['degrees']]))
         # ...........................................................................................
         eval_mapping = EvalMapping(ind_quad, ind_dof_test, list(d_mapping.values())[0]['global'],
-                        mapping, geo, mapping_space, nderiv, mask, is_rational_mapping)
+                        mapping, geo, mapping_space, nderiv, mask, is_rational_mapping, cached=cached_mapping)
 
     eval_fields = []
     for f in fields:
@@ -884,6 +886,8 @@ def _create_ast_bilinear_form(terminal_expr, atomic_expr_field,
         args['mapping_degrees'] = LengthDofTest(list(d_mapping.keys())[0])
         args['mapping_basis'] = list(d_mapping.values())[0]['global']
         args['mapping_spans'] = list(d_mapping.values())[0]['span']
+        if cached_mapping:
+            args['geometry'] = eval_mapping.geometry
 
     if fields:
         args['f_span']         = f_span.values()
@@ -933,6 +937,8 @@ def _create_ast_bilinear_form(terminal_expr, atomic_expr_field,
                   *args['tests_basis'], *args['trial_basis'], *args['spans'], *args['quads'], g_mats)
         if mapping_space:
             shared = shared + (*eval_mapping.coeffs,  list(d_mapping.values())[0]['global'], list(d_mapping.values())[0]['span'])
+        if cached_mapping:
+            shared = shared + (*eval_mapping.geometry,)
         if fields:
             shared = shared + (*f_span.values(), *args['f_coeffs'], *args['field_basis'])
 
@@ -1036,6 +1042,8 @@ def _create_ast_linear_form(terminal_expr, atomic_expr_field, tests, d_tests, fi
 
     quad_order    = kwargs.pop('quad_order', None)
     thread_span   =  dict((u,d_tests[u]['thread_span']) for u in tests)
+    geometry_cache = kwargs.pop('geometry_cache', None)
+    cached_mapping = bool(mapping_space) and mask is None and geometry_cache is not None and geometry_cache.accepts(nderiv)
  
     m_tests = dict((v,d_tests[v]['multiplicity'])   for v in tests)
     l_vecs  = BlockStencilVectorLocalBasis(tests, pads, terminal_expr, tag)
@@ -1080,7 +1088,7 @@ def _create_ast_linear_form(terminal_expr, atomic_expr_field, tests, d_tests, fi
         ind_dof_test  = index_dof_test.set_range(stop=Tuple(*[d+1 for d in list(d_mapping.values())[0]['degrees']]))
         # ...........................................................................................
         eval_mapping  = EvalMapping(ind_quad, ind_dof_test, list(d_mapping.values())[0]['global'],
-                        mapping, geo, mapping_space, nderiv, mask, is_rational_mapping)
+                        mapping, geo, mapping_space, nderiv, mask, is_rational_mapping, cached=cached_mapping)
 
     eval_fields = []
     for f in fields:
@@ -1215,6 +1223,8 @@ def _create_ast_linear_form(terminal_expr, atomic_expr_field, tests, d_tests, fi
         args['mapping_degrees'] = LengthDofTest(list(d_mapping.keys())[0])
         args['mapping_basis'] = list(d_mapping.values())[0]['global']
         args['mapping_spans'] = list(d_mapping.values())[0]['span']
+        if cached_mapping:
+            args['geometry'] = eval_mapping.geometry
 
     if fields:
         args['f_span']         = f_span.values()
@@ -1255,6 +1265,8 @@ def _create_ast_linear_form(terminal_expr, atomic_expr_field, tests, d_tests, fi
                   *args['tests_basis'], *args['spans'], *args['quads'], g_vecs)
         if mapping_space:
             shared = shared + (*eval_mapping.coeffs,  list(d_mapping.values())[0]['global'], list(d_mapping.values())[0]['span'])
+        if cached_mapping:
+            shared = shared + (*eval_mapping.geometry,)
         if fields:
             shared = shared + (*f_span.values(), *args['f_coeffs'], *args['field_basis'])
         
@@ -1345,6 +1357,9 @@ def _create_ast_functional_form(terminal_expr, atomic_expr, fields, d_fields, co
     g_quad = [GlobalTensorQuadratureGrid()]
     l_quad = [LocalTensorQuadratureGrid()]
 
+    geometry_cache = kwargs.pop('geometry_cache', None)
+    cached_mapping = bool(mapping_space) and mask is None and geometry_cache is not None and geometry_cache.accepts(nderiv)
+
     #TODO move to EvalField
     coeffs   = [CoefficientBasis(i) for i in expand(fields)]
     l_coeffs = [MatrixLocalBasis(i) for i in expand(fields)]
@@ -1376,7 +1391,7 @@ def _create_ast_functional_form(terminal_expr, atomic_expr, fields, d_fields, co
         ind_dof_test  = index_dof_test.set_range(stop=Tuple(*[d+1 for d in list(d_mapping.values())[0]['degrees']]))
         # ...........................................................................................
         eval_mapping  = EvalMapping(ind_quad, ind_dof_test, list(d_mapping.values())[0]['global'],
-                        mapping, geo, mapping_space, nderiv, mask, is_rational_mapping)
+                        mapping, geo, mapping_space, nderiv, mask, is_rational_mapping, cached=cached_mapping)
 
     eval_fields = []
     for f in fields:
@@ -1420,6 +1435,8 @@ def _create_ast_functional_form(terminal_expr, atomic_expr, fields, d_fields, co
         args['mapping_degrees'] = LengthDofTest(list(d_mapping.keys())[0])
         args['mapping_basis']   = list(d_mapping.values())[0]['global']
         args['mapping_spans']   = list(d_mapping.values())[0]['span']
+        if cached_mapping:
+            args['geometry'] = eval_mapping.geometry
 
     args['f_coeffs'] = flatten(list(g_coeffs.values()))
     fields           = tuple(f.base if isinstance(f, IndexedVectorFunction) else f for f in fields)
@@ -1432,6 +1449,8 @@ def _create_ast_functional_form(terminal_expr, atomic_expr, fields, d_fields, co
         shared = (*args['tests_basis'], *args['spans'], *args['quads'], *args['f_coeffs'], g_vec)
         if mapping_space:
             shared = shared + (*eval_mapping.coeffs,  list(d_mapping.values())[0]['global'], list(d_mapping.values())[0]['span'])
+        if cached_mapping:
+            shared = shared + (*eval_mapping.geometry,)
 
         firstprivate = (*args['tests_degrees'].values(), *lengths, *args['global_pads'])
 
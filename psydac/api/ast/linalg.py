@@ -41,6 +41,8 @@ from psydac.api.utilities     import mkdir_p, touch_init_file, random_string, wr
 from psydac.api.ast.linalg_kernels import transpose_1d, interface_transpose_1d
 from psydac.api.ast.linalg_kernels import transpose_2d, interface_transpose_2d
 from psydac.api.ast.linalg_kernels import transpose_3d, interface_transpose_3d
+from psydac.api.ast.linalg_kernels import stencil_matmul_1d, stencil_matmul_2d, stencil_matmul_3d
+from psydac.api.ast.linalg_kernels import stencil_ssor_1d, stencil_ssor_2d, stencil_ssor_3d
 
 #==============================================================================
 def variable_to_sympy(x):
@@ -149,6 +151,7 @@ class LinearOperatorDot(SplBasic):
         interface_axis  = kwargs.pop('interface_axis', None)
         d_start         = toInteger(kwargs.pop('d_start', None))
         c_start         = toInteger(kwargs.pop('c_start', None))
+        dtype           = kwargs.pop('dtype', 'float64')
 
         openmp          = False if backend is None else backend["openmp"]
 
@@ -282,6 +285,10 @@ class LinearOperatorDot(SplBasic):
         if backend:
             if backend['name'] == 'pyccel':
                 a = [String(str(i)) for i in build_pyccel_types_decorator(func_args)]
+                # Matrix entries stored in reduced precision (e.g. float32): the
+                # products are still accumulated in 'v', in double precision
+                if dtype != 'float64':
+                    a[0] = String('{}[{}]'.format(dtype, ','.join(':' * 2 * ndim)))
                 decorators = {'types': Function('types')(*a)}
             elif backend['name'] == 'numba':
                 decorators = {'njit': Function('njit')(ValuedArgument(Symbol('fastmath'), backend['fastmath']))}
@@ -549,6 +556,34 @@ class InterfaceTransposeOperator(TransposeOperator):
                        2 : [repr('float[:,:,:,:]')]*2 + [repr('int64')]*21,
                        3 : [repr('float[:,:,:,:,:,:]')]*2 + [repr('int64')]*30}
 
+#==============================================================================
+class StencilMatMulOperator(TransposeOperator):
+    """ This class generates the code for the product of two StencilMatrix objects.
+    """
+
+    name_template = 'stencil_matmul_{ndim}d'
+    function_dict = {1 : stencil_matmul_1d,
+                     2 : stencil_matmul_2d,
+                     3 : stencil_matmul_3d}
+
+    args_dtype_dict = {1 : [repr('float[:,:]')]*3 + [repr('int64')]*8,
+                       2 : [repr('float[:,:,:,:]')]*3 + [repr('int64')]*16,
+                       3 : [repr('float[:,:,:,:,:,:]')]*3 + [repr('int64')]*24}
+
+#==============================================================================
+class StencilSSOROperator(TransposeOperator):
+    """ This class generates the code of the SSOR sweeps of a StencilMatrix.
+    """
+
+    name_template = 'stencil_ssor_{ndim}d'
+    function_dict = {1 : stencil_ssor_1d,
+                     2 : stencil_ssor_2d,
+                     3 : stencil_ssor_3d}
+
+    args_dtype_dict = {1 : [repr('float[:,:]')]         + [repr('float[:]')]*3     + [repr('int64')]*3 + [repr('float64')],
+                       2 : [repr('float[:,:,:,:]')]     + [repr('float[:,:]')]*3   + [repr('int64')]*6 + [repr('float64')],
+                       3 : [repr('float[:,:,:,:,:,:]')] + [repr('float[:,:,:]')]*3 + [repr('int64')]*9 + [repr('float64')]}
+
 #==============================================================================
 class VectorDot(SplBasic):
 
@@ -212,3 +212,180 @@ def interface_transpose_3d( M:'float[:,:,:,:,:,:]', Mt:'float[:,:,:,:,:,:]',
 
     #$ omp end parallel
     return
+
+#========================================================================================================
+def stencil_matmul_1d( A:'float[:,:]', B:'float[:,:]', C:'float[:,:]',
+                       n1:"int64", gp1:"int64", pa1:"int64", pb1:"int64",
+                       oa1:"int64", ob1:"int64", lb1:"int64", ub1:"int64"):
+
+    #$ omp parallel default(private) shared(A,B,C) firstprivate( n1,gp1,pa1,pb1,oa1,ob1,lb1,ub1)
+
+    #$ omp for schedule(static)
+    for x1 in range(n1):
+        i1 = gp1 + x1
+        for l1 in range(max(0, lb1-i1+pa1), min(2*pa1+1, ub1-i1+pa1)):
+            a  = A[i1, oa1+l1]
+            j1 = i1 + l1 - pa1
+            for m1 in range(2*pb1+1):
+                C[i1, l1+m1] += a * B[j1, ob1+m1]
+
+    #$ omp end parallel
+    return
+
+#========================================================================================================
+def stencil_matmul_2d( A:'float[:,:,:,:]', B:'float[:,:,:,:]', C:'float[:,:,:,:]',
+                       n1:"int64", n2:"int64", gp1:"int64", gp2:"int64",
+                       pa1:"int64", pa2:"int64", pb1:"int64", pb2:"int64",
+                       oa1:"int64", oa2:"int64", ob1:"int64", ob2:"int64",
+                       lb1:"int64", lb2:"int64", ub1:"int64", ub2:"int64"):
+
+    #$ omp parallel default(private) shared(A,B,C) firstprivate( n1,n2,gp1,gp2,pa1,pa2,pb1,pb2,&
+    #$ oa1,oa2,ob1,ob2,lb1,lb2,ub1,ub2)
+
+    #$ omp for schedule(static) collapse(2)
+    for x1 in range(n1):
+        for x2 in range(n2):
+
+            i1 = gp1 + x1
+            i2 = gp2 + x2
+
+            for l1 in range(max(0, lb1-i1+pa1), min(2*pa1+1, ub1-i1+pa1)):
+                for l2 in range(max(0, lb2-i2+pa2), min(2*pa2+1, ub2-i2+pa2)):
+
+                    a  = A[i1,i2, oa1+l1,oa2+l2]
+                    j1 = i1 + l1 - pa1
+                    j2 = i2 + l2 - pa2
+
+                    for m1 in range(2*pb1+1):
+                        for m2 in range(2*pb2+1):
+                            C[i1,i2, l1+m1,l2+m2] += a * B[j1,j2, ob1+m1,ob2+m2]
+
+    #$ omp end parallel
+    return
+
+#========================================================================================================
+def stencil_matmul_3d( A:'float[:,:,:,:,:,:]', B:'float[:,:,:,:,:,:]', C:'float[:,:,:,:,:,:]',
+                       n1:"int64", n2:"int64", n3:"int64",
+                       gp1:"int64", gp2:"int64", gp3:"int64",
+                       pa1:"int64", pa2:"int64", pa3:"int64",
+                       pb1:"int64", pb2:"int64", pb3:"int64",
+                       oa1:"int64", oa2:"int64", oa3:"int64",
+                       ob1:"int64", ob2:"int64", ob3:"int64",
+                       lb1:"int64", lb2:"int64", lb3:"int64",
+                       ub1:"int64", ub2:"int64", ub3:"int64"):
+
+    #$ omp parallel default(private) shared(A,B,C) firstprivate( n1,n2,n3,gp1,gp2,gp3,pa1,pa2,pa3,&
+    #$ pb1,pb2,pb3,oa1,oa2,oa3,ob1,ob2,ob3,lb1,lb2,lb3,ub1,ub2,ub3)
+
+    #$ omp for schedule(static) collapse(3)
+    for x1 in range(n1):
+        for x2 in range(n2):
+            for x3 in range(n3):
+
+                i1 = gp1 + x1
+                i2 = gp2 + x2
+                i3 = gp3 + x3
+
+                for l1 in range(max(0, lb1-i1+pa1), min(2*pa1+1, ub1-i1+pa1)):
+                    for l2 in range(max(0, lb2-i2+pa2), min(2*pa2+1, ub2-i2+pa2)):
+                        for l3 in range(max(0, lb3-i3+pa3), min(2*pa3+1, ub3-i3+pa3)):
+
+                            a  = A[i1,i2,i3, oa1+l1,oa2+l2,oa3+l3]
+                            j1 = i1 + l1 - pa1
+                            j2 = i2 + l2 - pa2
+                            j3 = i3 + l3 - pa3
+
+                            for m1 in range(2*pb1+1):
+                                for m2 in range(2*pb2+1):
+                                    for m3 in range(2*pb3+1):
+                                        C[i1,i2,i3, l1+m1,l2+m2,l3+m3] += a * B[j1,j2,j3, ob1+m1,ob2+m2,ob3+m3]
+
+    #$ omp end parallel
+    return
+
+#========================================================================================================
+def stencil_ssor_1d( A:'float[:,:]', r:'float[:]', w:'float[:]', x:'float[:]',
+                     n1:"int64", gp1:"int64", p1:"int64", omega:"float64" ):
+
+    # Forward sweep, w = omega * (D + omega*L)^{-1} r (w is zero beyond the current row)
+    for x1 in range(n1):
+        i1 = gp1 + x1
+        s  = 0.0
+        for k1 in range(2*p1+1):
+            s += A[i1, k1] * w[i1+k1-p1]
+        w[i1] = omega * (r[i1] - s) / A[i1, p1]
+
+    # Backward sweep, x = (2-omega) * (D + omega*U)^{-1} D w (x is zero before the current row)
+    for x1 in range(n1-1, -1, -1):
+        i1 = gp1 + x1
+        s  = 0.0
+        for k1 in range(2*p1+1):
+            s += A[i1, k1] * x[i1+k1-p1]
+        x[i1] = (2.0 - omega) * w[i1] - omega * s / A[i1, p1]
+
+    return
+
+#========================================================================================================
+def stencil_ssor_2d( A:'float[:,:,:,:]', r:'float[:,:]', w:'float[:,:]', x:'float[:,:]',
+                     n1:"int64", n2:"int64", gp1:"int64", gp2:"int64",
+                     p1:"int64", p2:"int64", omega:"float64" ):
+
+    # Forward sweep, w = omega * (D + omega*L)^{-1} r (w is zero beyond the current row)
+    for x1 in range(n1):
+        for x2 in range(n2):
+            i1 = gp1 + x1
+            i2 = gp2 + x2
+            s  = 0.0
+            for k1 in range(2*p1+1):
+                for k2 in range(2*p2+1):
+                    s += A[i1,i2, k1,k2] * w[i1+k1-p1, i2+k2-p2]
+            w[i1,i2] = omega * (r[i1,i2] - s) / A[i1,i2, p1,p2]
+
+    # Backward sweep, x = (2-omega) * (D + omega*U)^{-1} D w (x is zero before the current row)
+    for x1 in range(n1-1, -1, -1):
+        for x2 in range(n2-1, -1, -1):
+            i1 = gp1 + x1
+            i2 = gp2 + x2
+            s  = 0.0
+            for k1 in range(2*p1+1):
+                for k2 in range(2*p2+1):
+                    s += A[i1,i2, k1,k2] * x[i1+k1-p1, i2+k2-p2]
+            x[i1,i2] = (2.0 - omega) * w[i1,i2] - omega * s / A[i1,i2, p1,p2]
+
+    return
+
+#========================================================================================================
+def stencil_ssor_3d( A:'float[:,:,:,:,:,:]', r:'float[:,:,:]', w:'float[:,:,:]', x:'float[:,:,:]',
+                     n1:"int64", n2:"int64", n3:"int64",
+                     gp1:"int64", gp2:"int64", gp3:"int64",
+                     p1:"int64", p2:"int64", p3:"int64", omega:"float64" ):
+
+    # Forward sweep, w = omega * (D + omega*L)^{-1} r (w is zero beyond the current row)
+    for x1 in range(n1):
+        for x2 in range(n2):
+            for x3 in range(n3):
+                i1 = gp1 + x1
+                i2 = gp2 + x2
+                i3 = gp3 + x3
+                s  = 0.0
+                for k1 in range(2*p1+1):
+                    for k2 in range(2*p2+1):
+                        for k3 in range(2*p3+1):
+                            s += A[i1,i2,i3, k1,k2,k3] * w[i1+k1-p1, i2+k2-p2, i3+k3-p3]
+                w[i1,i2,i3] = omega * (r[i1,i2,i3] - s) / A[i1,i2,i3, p1,p2,p3]
+
+    # Backward sweep, x = (2-omega) * (D + omega*U)^{-1} D w (x is zero before the current row)
+    for x1 in range(n1-1, -1, -1):
+        for x2 in range(n2-1, -1, -1):
+            for x3 in range(n3-1, -1, -1):
+                i1 = gp1 + x1
+                i2 = gp2 + x2
+                i3 = gp3 + x3
+                s  = 0.0
+                for k1 in range(2*p1+1):
+                    for k2 in range(2*p2+1):
+                        for k3 in range(2*p3+1):
+                            s += A[i1,i2,i3, k1,k2,k3] * x[i1+k1-p1, i2+k2-p2, i3+k3-p3]
+                x[i1,i2,i3] = (2.0 - omega) * w[i1,i2,i3] - omega * s / A[i1,i2,i3, p1,p2,p3]
+
+    return
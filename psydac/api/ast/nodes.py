@@ -475,8 +475,13 @@ class EvalMapping(BaseNode):
 
         is_rational: bool,optional
             True if the mapping is rational
+
+        cached: bool,optional
+            True if the values of the mapping atoms are read from a
+            geometry cache instead of being computed from the coefficients
     """
-    def __new__(cls, quads, indices_basis, q_basis, mapping, components, mapping_space, nderiv, mask=None, is_rational=None):
+    def __new__(cls, quads, indices_basis, q_basis, mapping, components, mapping_space, nderiv, mask=None, is_rational=None,
+                cached=False):
         mapping_atoms  = components.arguments
         basis          = q_basis
         target         = basis.target
@@ -546,7 +551,13 @@ class EvalMapping(BaseNode):
         loop   = Loop((q_basis,*l_coeffs), indices_basis, stmts)
         loop   = Loop((), quads, stmts=[loop, *rationalization], mask=mask)
 
-        obj    = Basic.__new__(cls, loop, l_coeffs, g_coeffs, values, multiplicity, pads)
+        # The values are copied from the geometry cache, element by element
+        geometry = Tuple()
+        if cached:
+            values   = Tuple(*[MatrixQuadrature(a) for a in mapping_atoms])
+            geometry = Tuple(*[MatrixGeometryQuadrature(a) for a in mapping_atoms])
+
+        obj    = Basic.__new__(cls, loop, l_coeffs, g_coeffs, values, multiplicity, pads, geometry)
         return obj
 
     @property
@@ -572,6 +583,10 @@ class EvalMapping(BaseNode):
     @property
     def pads(self):
         return self._args[5]
+
+    @property
+    def geometry(self):
+        return self._args[6]
 #==============================================================================
 class IteratorBase(BaseNode):
     """
@@ -796,6 +811,21 @@ class MatrixQuadrature(MatrixNode):
     def target(self):
         return self._args[0]
 
+#==============================================================================
+class MatrixGeometryQuadrature(MatrixNode):
+    """
+    Precomputed values of a mapping atom at the quadrature points of all the
+    local elements, as stored in a geometry cache.
+    """
+    _rank = rank_dim
+
+    def __new__(cls, target):
+        return Basic.__new__(cls, target)
+
+    @property
+    def target(self):
+        return self._args[0]
+
 #==============================================================================
 class MatrixRankFromCoords(MatrixNode):
     pass
@@ -450,6 +450,7 @@ class Parser(object):
         map_degrees = args.pop('mapping_degrees', None)
         map_basis   = args.pop('mapping_basis', None)
         map_span    = args.pop('mapping_spans', None)
+        geometry    = args.pop('geometry', [])
         thread_args = args.pop('thread_args', None)
 
         if map_coeffs:
@@ -477,7 +478,7 @@ class Parser(object):
             f_args     = (*f_basis, *f_span, *f_degrees, *f_pads, *f_coeffs)
 
 
-        args = [*tests_basis, *trial_basis, *map_basis, *g_span, *map_span, *g_quad, *lengths_tests.values(), *lengths_trials.values(), *map_degrees, *lengths, *g_pads, *map_coeffs]
+        args = [*tests_basis, *trial_basis, *map_basis, *g_span, *map_span, *g_quad, *lengths_tests.values(), *lengths_trials.values(), *map_degrees, *lengths, *g_pads, *map_coeffs, *geometry]
 
         if mats:
             exprs     = [mat.expr for mat in mats]
@@ -587,6 +588,17 @@ class Parser(object):
         lhs_slices = [Slice(None,None)]*dim
         multiplicity = expr.multiplicity
         pads         = expr.pads
+
+        if expr.geometry:
+            # copy the values of the current element from the geometry cache
+            elements = self._visit_IndexElement(expr)
+            for val, geo in zip(values, expr.geometry):
+                val  = self._visit(val, **kwargs)
+                geo  = self._visit(geo, **kwargs)
+                stmt = self._visit_Assign(Assign(val[lhs_slices], geo[(*elements, *lhs_slices)]), **kwargs)
+                stmts.append(stmt)
+            return CodeBlock(stmts)
+
         for coeff, l_coeff in zip(coeffs, l_coeffs):
             spans   = flatten(self._visit_Span(Span(test))[test])
             degrees = self._visit_LengthDofTest(LengthDofTest(test))
@@ -778,6 +790,15 @@ class Parser(object):
         self.insert_variables(var)
         return var
     # ....................................................
+    def _visit_MatrixGeometryQuadrature(self, expr, **kwargs):
+        rank   = 2*self._dim
+        target = SymbolicExpr(expr.target)
+
+        name = 'geo_{}'.format(target.name)
+        var  =  IndexedVariable(name, dtype='real', rank=rank)
+        self.insert_variables(var)
+        return var
+    # ....................................................
     def _visit_GlobalTensorQuadratureBasis(self, expr, **kwargs):
         # TODO add label
         dim = self.dim
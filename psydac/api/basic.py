@@ -286,7 +286,9 @@ class BasicDiscrete(BasicCodeGen):
         mapping_space       = kwargs.pop('mapping_space', None)
         num_threads         = kwargs.pop('num_threads', 1)
         backend             = kwargs.pop('backend', None)
+        geometry_cache      = kwargs.pop('geometry_cache', None)
 
         return AST(expr, kernel_expr, discrete_space, mapping_space=mapping_space, tag=tag, quad_order=quad_order,
-                    mapping=mapping, is_rational_mapping=is_rational_mapping, backend=backend, num_threads=num_threads)
+                    mapping=mapping, is_rational_mapping=is_rational_mapping, backend=backend, num_threads=num_threads,
+                    geometry_cache=geometry_cache)
 
@@ -221,7 +221,9 @@ def discretize_space(V, domain_h, *args, **kwargs):
     basis               = kwargs.pop('basis', 'B')
     knots               = kwargs.pop('knots', None)
     quad_order          = kwargs.pop('quad_order', None)
+    quad_family         = kwargs.pop('quad_family', 'legendre')
     sequence            = kwargs.pop('sequence', 'DR')
+    balance             = kwargs.pop('balance', 'uniform')
     is_rational_mapping = False
 
     assert sequence in ['DR', 'TH', 'N', 'RT']
@@ -234,6 +236,10 @@ def discretize_space(V, domain_h, *args, **kwargs):
         if len(domain_h.mappings.values()) > 1:
             raise NotImplementedError('Multipatch not yet available')
 
+        # The decomposition is the one of the mapping spaces, read from the file
+        if balance != 'uniform':
+            raise NotImplementedError("Balance '{}' is not available for a geometry read from a file".format(balance))
+
         interiors = [domain_h.domain.interior]
         mappings  = [domain_h.mappings[inter.logical_domain.name] for inter in interiors]
         spaces    = [m.space for m in mappings]
@@ -296,12 +302,12 @@ def discretize_space(V, domain_h, *args, **kwargs):
                         nprocs = None
                         if comm is not None:
                             nprocs = g_spaces[interiors[index]].vector_space.cart.nprocs
-                        Vh = TensorFemSpace( *spaces, comm=comm, quad_order=quad_order, nprocs=nprocs, reverse_axis=e.axis)
+                        Vh = TensorFemSpace( *spaces, comm=comm, quad_order=quad_order, quad_family=quad_family, nprocs=nprocs, reverse_axis=e.axis, balance=balance)
                         break
                 else:
-                    Vh = TensorFemSpace( *spaces, comm=comm, quad_order=quad_order)
+                    Vh = TensorFemSpace( *spaces, comm=comm, quad_order=quad_order, quad_family=quad_family, balance=balance)
             else:
-                Vh = TensorFemSpace( *spaces, comm=comm, quad_order=quad_order)
+                Vh = TensorFemSpace( *spaces, comm=comm, quad_order=quad_order, quad_family=quad_family, balance=balance)
 
             if Vh is None:
                 raise ValueError('Unable to discretize the space')
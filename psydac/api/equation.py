@@ -13,6 +13,7 @@ from psydac.api.basic                import BasicDiscrete
 from psydac.api.essential_bc         import apply_essential_bc
 from psydac.fem.basic                import FemField
 from psydac.linalg.iterative_solvers import cg, pcg, bicg, minres, lsmr
+from psydac.linalg.recycling         import SolverSequence
 
 __all__ = ('DiscreteEquation',)
 
@@ -32,7 +33,9 @@ def driver_solve(L, **kwargs):
     name        = kwargs.pop('solver')
     return_info = kwargs.pop('info', False)
 
-    if name == 'cg':
+    if isinstance(name, SolverSequence):
+        x, info = name.solve(rhs, x0=kwargs.get('x0')), name.info
+    elif name == 'cg':
         x, info = cg    ( M,      rhs, **kwargs )
     elif name == 'pcg':
         x, info = pcg   ( M,      rhs, **kwargs )
@@ -172,6 +175,7 @@ class DiscreteEquation(BasicDiscrete):
         self._test_space        = test_space
         self._boundary_equation = eqn_bc_h
         self._solver_parameters = _default_solver.copy()
+        self._solver_sequence   = None
 
     @property
     def expr(self):
@@ -210,21 +214,43 @@ class DiscreteEquation(BasicDiscrete):
         return self._boundary_equation
 
     def set_solver(self, solver, **kwargs):
+        """
+        Set the solver of the linear system and its parameters, passed as
+        keyword arguments. The solver is one of 'cg', 'pcg', 'minres', 'bicg'
+        and 'lsmr' of psydac.linalg.iterative_solvers, or 'sequence' for the
+        repeated solves of a time loop: the SolverSequence of
+        psydac.linalg.recycling is then created at the first solve, and reuses
+        the previous solutions and deflation vectors in the next ones.
+        """
         self._solver_parameters.update(solver=solver, **kwargs)
+        self._solver_sequence = None
 
     def get_solver(self):
         return self._solver_parameters
 
     #--------------------------------------------------------------------------
-    def assemble(self, **kwargs):
-
+    def assemble(self, *, reuse=False, **kwargs):
+        """
+        Assemble the linear system, with the values of the free arguments given
+        as keyword arguments.
+
+        If reuse is True, the forms skip the assembly (or reuse the unchanged
+        blocks) when the free arguments are the same fields, with the same
+        versions of their coefficients, and the same constants as in the last
+        call. This relies on every modification of the coefficients being
+        recorded in their version (see StencilVector.mark_modified).
+        """
         # Decide if we should assemble
         assemble_lhs = not self.linear_system or self.lhs.free_args
         assemble_rhs = not self.linear_system or self.rhs.free_args
 
+        # The essential BCs already applied to a reused linear system are
+        # applied again, which leaves it unchanged
+        reuse = reuse and self.linear_system is not None
+
         # Matrix (left-hand side)
         if assemble_lhs:
-            A = self.lhs.assemble(reset=True, **kwargs)
+            A = self.lhs.assemble(reset=True, reuse=reuse, **kwargs)
             if self.bc:
                 apply_essential_bc(A, *self.bc)
         else:
@@ -232,7 +258,7 @@ class DiscreteEquation(BasicDiscrete):
 
         # Vector (right-hand side)
         if assemble_rhs:
-            b = self.rhs.assemble(reset=True, **kwargs)
+            b = self.rhs.assemble(reset=True, reuse=reuse, **kwargs)
             if self.bc:
                 apply_essential_bc(b, *self.bc)
         else:
@@ -278,6 +304,15 @@ class DiscreteEquation(BasicDiscrete):
             # Use inhomogeneous solution as initial guess to solver
             settings['x0'] = uh.coeffs
         #----------------------------------------------------------------------
+        # The solver sequence is kept between the calls, as long as the matrix
+        # is assembled in the same object
+        if settings['solver'] == 'sequence':
+            A = self.linear_system.lhs
+            if self._solver_sequence is None or self._solver_sequence.operator is not A:
+                params = {k: v for k, v in settings.items() if k not in ('solver', 'info', 'x0')}
+                self._solver_sequence = SolverSequence(A, **params)
+            settings = dict(settings, solver=self._solver_sequence)
+        #----------------------------------------------------------------------
         if settings.get('info', False):
             X, info = driver_solve(self.linear_system, **settings)
             uh = FemField(self.trial_space, coeffs=X)
@@ -27,6 +27,7 @@ from psydac.mapping.discrete import NurbsMapping
 from psydac.fem.vector       import ProductFemSpace
 from psydac.fem.basic        import FemField
 from psydac.core.bsplines    import find_span, basis_funs_all_ders
+from psydac.linalg.utilities import lumped_diagonal
 
 __all__ = (
     'DiscreteBilinearForm',
@@ -87,6 +88,11 @@ def get_quad_order(Vh):
         return get_quad_order(Vh.spaces[0])
     return tuple([g.weights.shape[1] for g in Vh.quad_grids])
 
+def get_quad_family(Vh):
+    if isinstance(Vh, ProductFemSpace):
+        return get_quad_family(Vh.spaces[0])
+    return Vh.quad_family
+
 #==============================================================================
 def construct_test_space_arguments(basis_values):
     space          = basis_values.space
@@ -140,6 +146,58 @@ def reset_arrays(*args):
 def do_nothing(*args):
     pass
 
+#==============================================================================
+def construct_field_arguments(cache, key, space, nderiv, grid):
+    """
+    Return the basis values, spans, degrees and pads of the space of a free
+    FemField argument. These only depend on the space, hence they are stored
+    in the dictionary 'cache' and reused as long as the same space is passed.
+    """
+    if key in cache:
+        cached_space, args = cache[key]
+        if cached_space is space:
+            return args
+
+    basis_v     = BasisValues(space, nderiv = nderiv, trial=True, grid=grid)
+    bs, d, s, p = construct_test_space_arguments(basis_v)
+    args        = (bs, s, [np.int64(a) for a in d], [np.int64(a) for a in p])
+    cache[key]  = (space, args)
+    return args
+
+#==============================================================================
+def free_args_state(free_args, kwargs):
+    """
+    Snapshot of the free arguments of a discrete form: fields are recorded with
+    the version of their coefficients, constants with their values. Returns
+    None if some coefficients do not keep track of their modifications.
+    """
+    state = []
+    for key in free_args:
+        v = kwargs[key]
+        if isinstance(v, FemField):
+            version = getattr(v.coeffs, 'version', None)
+            if version is None:
+                return None
+            state.append((v, version))
+        else:
+            state.append((v, None))
+    return tuple(state)
+
+def same_free_args_state(state1, state2):
+    """
+    Return True if two snapshots from 'free_args_state' refer to the same
+    fields, with unchanged coefficients, and to the same constant values.
+    """
+    if state1 is None or state2 is None:
+        return False
+    for (v1, version1), (v2, version2) in zip(state1, state2):
+        if isinstance(v1, FemField):
+            if v1 is not v2 or version1 != version2:
+                return False
+        elif not np.array_equal(v1, v2):
+            return False
+    return True
+
 #==============================================================================
 class DiscreteBilinearForm(BasicDiscrete):
 
@@ -165,6 +223,10 @@ class DiscreteBilinearForm(BasicDiscrete):
             kwargs['mapping_space'] = mapping.space
 
         self._is_rational_mapping = is_rational_mapping
+
+        # Values of the mapping precomputed at the quadrature points, if enabled
+        geometry_cache = domain_h.geometry_cache if mapping is not None else None
+        kwargs['geometry_cache'] = geometry_cache
         # ...
 
         self._spaces = args[1]
@@ -180,6 +242,9 @@ class DiscreteBilinearForm(BasicDiscrete):
         self._target = kernel_expr.target
         self._domain = domain_h.domain
         self._matrix = kwargs.pop('matrix', None)
+        self._lumped = kwargs.pop('lumped', False)
+        self._diagonal = None
+        self._converted_matrices = {}
 
         domain = self.domain
         target = self.target
@@ -193,6 +258,18 @@ class DiscreteBilinearForm(BasicDiscrete):
             trial_space  = self.spaces[0]
             test_space   = self.spaces[1]
 
+        if self._lumped and self.spaces[0] is not self.spaces[1]:
+            raise ValueError('Mass lumping requires the same trial and test spaces')
+
+        # The quadrature family (Gauss-Legendre or Gauss-Lobatto) is a property of the spaces
+        self._quad_family = get_quad_family(test_space)
+        if get_quad_family(trial_space) != self._quad_family:
+            raise ValueError('Trial and test spaces must use the same quadrature family')
+
+        # The geometry cache stores the mapping at the default quadrature points
+        if geometry_cache is not None and mapping.space.quad_family != self._quad_family:
+            geometry_cache = kwargs['geometry_cache'] = None
+
         # ...
         test_ext  = None
         trial_ext = None
@@ -257,6 +334,11 @@ class DiscreteBilinearForm(BasicDiscrete):
         kwargs['num_threads'] = self._num_threads
         BasicDiscrete.__init__(self, expr, kernel_expr, quad_order=quad_order, **kwargs)
 
+        # The geometry cache is only used in the interior of the domain
+        if isinstance(target, (Boundary, Interface)) or not (geometry_cache and geometry_cache.accepts(self.max_nderiv)):
+            geometry_cache = None
+        self._geometry_cache = geometry_cache
+
         #...
         self._test_basis  = BasisValues( test_space,  nderiv = self.max_nderiv , trial=False, grid=test_grid, ext=test_ext)
         self._trial_basis = BasisValues( trial_space, nderiv = self.max_nderiv , trial=True, grid=trial_grid, ext=trial_ext)
@@ -275,6 +357,11 @@ class DiscreteBilinearForm(BasicDiscrete):
 
         self._args , self._threads_args = self.construct_arguments(backend=kwargs.pop('backend', None))
 
+        # Basis values of the free fields, and state of the free arguments at
+        # the last assembly (used to skip the assembly if nothing changed)
+        self._fields_cache    = {}
+        self._assembled_state = None
+
     @property
     def domain(self):
         return self._domain
@@ -307,7 +394,56 @@ class DiscreteBilinearForm(BasicDiscrete):
     def args(self):
         return self._args
 
-    def assemble(self, *, reset=True, **kwargs):
+    @property
+    def lumped(self):
+        """
+        True if 'assemble' returns the lumped matrix, i.e. the row sums of the
+        matrix stored in a vector, which can be inverted with a DiagonalSolver.
+        """
+        return self._lumped
+
+    def assemble(self, *, reset=True, reuse=False, dtype=None, **kwargs):
+        """
+        Assemble the matrix of the bilinear form, for the given values of its
+        free arguments (fields and constants) passed as keyword arguments.
+
+        Parameters
+        ----------
+        reset : bool
+            If True, set the matrix to zero before assembly; otherwise the new
+            contributions are added to the existing entries.
+
+        reuse : bool
+            If True, and if the free arguments are the same fields (with
+            unmodified coefficients) and constants as in the last assembly,
+            return the matrix without assembling it again. Any change made
+            to the matrix since then is preserved.
+
+        dtype : type | str | numpy.dtype
+            If given, return a copy of the assembled matrix whose entries are
+            stored in this datatype (e.g. 'float32', for a low-precision
+            operator in 'iterative_refinement'). The kernels always assemble
+            in double precision; the copy is stored and updated in place at
+            every call. Not available with 'lumped=True'.
+
+        Returns
+        -------
+        StencilMatrix | BlockMatrix | StencilVector | BlockVector
+            The assembled matrix, or its row sums if the form was discretized
+            with 'lumped=True'.
+        """
+        if dtype is not None and self._lumped:
+            raise ValueError('Conversion of the datatype is not available for a lumped matrix')
+
+        # Refresh the geometry cache if the mapping was modified
+        if self._geometry_cache is not None:
+            self._geometry_cache.get(self.mapping, self.max_nderiv)
+
+        state = free_args_state(self._free_args, kwargs)
+        if reuse and same_free_args_state(state, self._assembled_state):
+            if self._lumped:
+                return self._diagonal
+            return self._matrix if dtype is None else self._convert_matrix(dtype)
 
         if self._free_args:
             basis   = []
@@ -325,12 +461,12 @@ class DiscreteBilinearForm(BasicDiscrete):
                     v = v[i]
                 if isinstance(v, FemField):
                     assert len(self.grid) == 1
-                    basis_v  = BasisValues(v.space, nderiv = self.max_nderiv, trial=True, grid=self.grid[0])
-                    bs, d, s, p = construct_test_space_arguments(basis_v)
+                    bs, s, d, p = construct_field_arguments(self._fields_cache, key, v.space,
+                                                            self.max_nderiv, self.grid[0])
                     basis   += bs
                     spans   += s
-                    degrees += [np.int64(a) for a in d]
-                    pads    += [np.int64(a) for a in p]
+                    degrees += d
+                    pads    += p
                     if v.space.is_product:
                         coeffs += (e._data for e in v.coeffs)
                     else:
@@ -349,7 +485,20 @@ class DiscreteBilinearForm(BasicDiscrete):
             reset_arrays(*self.global_matrices)
 
         self._func(*args, *self._threads_args)
-        return self._matrix
+        self._assembled_state = state
+
+        if self._lumped:
+            self._diagonal = lumped_diagonal(self._matrix, out=self._diagonal)
+            return self._diagonal
+
+        return self._matrix if dtype is None else self._convert_matrix(dtype)
+
+    def _convert_matrix(self, dtype):
+        """ Copy the assembled matrix to the stored matrix with entries of given datatype."""
+        dtype = np.dtype(dtype)
+        M = self._matrix.astype(dtype, out=self._converted_matrices.get(dtype))
+        self._converted_matrices[dtype] = M
+        return M
 
     def get_space_indices_from_target(self, domain, target):
         if domain.mapping:
@@ -389,8 +538,9 @@ class DiscreteBilinearForm(BasicDiscrete):
             mapping    = [e._coeffs._data for e in self.mapping._fields]
             space      = self.mapping._fields[0].space
             map_degree = space.degree
-            map_span   = [q.spans-s for q,s in zip(space.quad_grids, space.vector_space.starts)]
-            map_basis  = [q.basis for q in space.quad_grids]
+            map_grids  = space.get_quad_grids(self._quad_family)
+            map_span   = [q.spans-s for q,s in zip(map_grids, space.vector_space.starts)]
+            map_basis  = [q.basis for q in map_grids]
             axis       = self.grid[0].axis
             ext        = self.grid[0].ext
             points     = self.grid[0].points
@@ -408,6 +558,8 @@ class DiscreteBilinearForm(BasicDiscrete):
                     map_span[axis][0] = map_span[axis][-1]
             if self.is_rational_mapping:
                 mapping = [*mapping, self.mapping.weights_field.coeffs._data]
+            if self._geometry_cache is not None:
+                mapping = [*mapping, *self._geometry_cache.get(self.mapping, self.max_nderiv)]
         else:
             mapping    = []
             map_degree = []
@@ -574,6 +726,10 @@ class DiscreteLinearForm(BasicDiscrete):
 
         self._is_rational_mapping = is_rational_mapping
 
+        # Values of the mapping precomputed at the quadrature points, if enabled
+        geometry_cache = domain_h.geometry_cache if mapping is not None else None
+        kwargs['geometry_cache'] = geometry_cache
+
         self._space  = args[1]
 
         if isinstance(kernel_expr, (tuple, list)):
@@ -597,6 +753,13 @@ class DiscreteLinearForm(BasicDiscrete):
         else:
             test_space  = self._space
 
+        # The quadrature family (Gauss-Legendre or Gauss-Lobatto) is a property of the space
+        self._quad_family = get_quad_family(test_space)
+
+        # The geometry cache stores the mapping at the default quadrature points
+        if geometry_cache is not None and mapping.space.quad_family != self._quad_family:
+            geometry_cache = kwargs['geometry_cache'] = None
+
         kwargs['discrete_space']      = test_space
         kwargs['is_rational_mapping'] = is_rational_mapping
         kwargs['comm']                = domain_h.comm
@@ -626,6 +789,11 @@ class DiscreteLinearForm(BasicDiscrete):
 
         BasicDiscrete.__init__(self, expr, kernel_expr, quad_order=quad_order, **kwargs)
 
+        # The geometry cache is only used in the interior of the domain
+        if isinstance(target, (Boundary, Interface)) or not (geometry_cache and geometry_cache.accepts(self.max_nderiv)):
+            geometry_cache = None
+        self._geometry_cache = geometry_cache
+
         if not isinstance(target, Boundary):
             ext  = None
             axis = None
@@ -652,6 +820,11 @@ class DiscreteLinearForm(BasicDiscrete):
 
         self._args , self._threads_args = self.construct_arguments(backend=kwargs.pop('backend', None))
 
+        # Basis values of the free fields, and state of the free arguments at
+        # the last assembly (used to skip the assembly if nothing changed)
+        self._fields_cache    = {}
+        self._assembled_state = None
+
     @property
     def domain(self):
         return self._domain
@@ -680,7 +853,36 @@ class DiscreteLinearForm(BasicDiscrete):
     def args(self):
         return self._args
 
-    def assemble(self, *, reset=True, **kwargs):
+    def assemble(self, *, reset=True, reuse=False, **kwargs):
+        """
+        Assemble the vector of the linear form, for the given values of its
+        free arguments (fields and constants) passed as keyword arguments.
+
+        Parameters
+        ----------
+        reset : bool
+            If True, set the vector to zero before assembly; otherwise the new
+            contributions are added to the existing entries.
+
+        reuse : bool
+            If True, and if the free arguments are the same fields (with
+            unmodified coefficients) and constants as in the last assembly,
+            return the vector without assembling it again. Any change made
+            to the vector since then is preserved.
+
+        Returns
+        -------
+        StencilVector | BlockVector
+            The assembled vector.
+        """
+        # Refresh the geometry cache if the mapping was modified
+        if self._geometry_cache is not None:
+            self._geometry_cache.get(self.mapping, self.max_nderiv)
+
+        state = free_args_state(self._free_args, kwargs)
+        if reuse and same_free_args_state(state, self._assembled_state):
+            return self._vector
+
         if self._free_args:
             basis   = []
             spans   = []
@@ -694,12 +896,12 @@ class DiscreteLinearForm(BasicDiscrete):
                     i = get_space_indices_from_target(self.domain, self.target)
                     v = v[i]
                 if isinstance(v, FemField):
-                    basis_v  = BasisValues(v.space, nderiv = self.max_nderiv, trial=True, grid=self.grid)
-                    bs, d, s, p = construct_test_space_arguments(basis_v)
+                    bs, s, d, p = construct_field_arguments(self._fields_cache, key, v.space,
+                                                            self.max_nderiv, self.grid)
                     basis   += bs
                     spans   += s
-                    degrees += [np.int64(a) for a in d]
-                    pads    += [np.int64(a) for a in p]
+                    degrees += d
+                    pads    += p
                     if v.space.is_product:
                         coeffs += (e._data for e in v.coeffs)
                     else:
@@ -716,6 +918,7 @@ class DiscreteLinearForm(BasicDiscrete):
             reset_arrays(*self.global_matrices)
 
         self._func(*args, *self._threads_args)
+        self._assembled_state = state
         return self._vector
 
     def get_space_indices_from_target(self, domain, target):
@@ -748,8 +951,9 @@ class DiscreteLinearForm(BasicDiscrete):
             mapping    = [e._coeffs._data for e in self.mapping._fields]
             space      = self.mapping._fields[0].space
             map_degree = space.degree
-            map_span   = [q.spans-s for q,s in zip(space.quad_grids, space.vector_space.starts)]
-            map_basis  = [q.basis for q in space.quad_grids]
+            map_grids  = space.get_quad_grids(self._quad_family)
+            map_span   = [q.spans-s for q,s in zip(map_grids, space.vector_space.starts)]
+            map_basis  = [q.basis for q in map_grids]
             axis       = self.grid.axis
             ext        = self.grid.ext
             points     = self.grid.points
@@ -767,6 +971,8 @@ class DiscreteLinearForm(BasicDiscrete):
                     map_span[axis][0] = map_span[axis][-1]
             if self.is_rational_mapping:
                 mapping = [*mapping, self.mapping.weights_field.coeffs._data]
+            if self._geometry_cache is not None:
+                mapping = [*mapping, *self._geometry_cache.get(self.mapping, self.max_nderiv)]
         else:
             mapping    = []
             map_degree = []
@@ -867,6 +1073,10 @@ class DiscreteFunctional(BasicDiscrete):
 
         self._is_rational_mapping = is_rational_mapping
 
+        # Values of the mapping precomputed at the quadrature points, if enabled
+        geometry_cache = domain_h.geometry_cache if mapping is not None else None
+        kwargs['geometry_cache'] = geometry_cache
+
         self._space = args[1]
 
         if isinstance(kernel_expr, (tuple, list)):
@@ -888,6 +1098,13 @@ class DiscreteFunctional(BasicDiscrete):
         self._symbolic_space  = test_sym_space
         self._domain          = domain
 
+        # The quadrature family (Gauss-Legendre or Gauss-Lobatto) is a property of the space
+        self._quad_family = get_quad_family(self._space)
+
+        # The geometry cache stores the mapping at the default quadrature points
+        if geometry_cache is not None and mapping.space.quad_family != self._quad_family:
+            geometry_cache = kwargs['geometry_cache'] = None
+
         if isinstance(domain, Boundary):
             ext        = domain.ext
             axis       = domain.axis
@@ -919,6 +1136,11 @@ class DiscreteFunctional(BasicDiscrete):
         kwargs['num_threads'] = num_threads
         BasicDiscrete.__init__(self, expr, kernel_expr,  quad_order=quad_order, **kwargs)
 
+        # The geometry cache is only used in the interior of the domain
+        if isinstance(domain, Boundary) or not (geometry_cache and geometry_cache.accepts(self.max_nderiv)):
+            geometry_cache = None
+        self._geometry_cache = geometry_cache
+
         # ...
         grid             = QuadratureGrid( self.space,  axis=axis, ext=ext)
         self._grid       = grid
@@ -980,12 +1202,20 @@ class DiscreteFunctional(BasicDiscrete):
             mapping    = [e._coeffs._data for e in self.mapping._fields]
             space      = self.mapping._fields[0].space
             map_degree = space.degree
-            map_span   = [q.spans-s for q,s in zip(space.quad_grids, space.vector_space.starts)]
-            map_span   = [span[q.local_element_start:q.local_element_end+1] for q,span in zip(space.quad_grids, map_span)]
-            map_basis  = [q.basis[q.local_element_start:q.local_element_end+1] for q in space.quad_grids]
+            map_grids  = space.get_quad_grids(self._quad_family)
+            map_span   = [q.spans-s for q,s in zip(map_grids, space.vector_space.starts)]
+            map_span   = [span[q.local_element_start:q.local_element_end+1] for q,span in zip(map_grids, map_span)]
+            map_basis  = [q.basis[q.local_element_start:q.local_element_end+1] for q in map_grids]
 
             if self.is_rational_mapping:
                 mapping = [*mapping, self.mapping._weights_field._coeffs._data]
+            if self._geometry_cache is not None:
+                local   = tuple(slice(q.local_element_start, q.local_element_end+1) for q in space.quad_grids)
+                values  = self._geometry_cache.get(self.mapping, self.max_nderiv)
+                self._geometry_local   = local
+                self._geometry_args    = [np.ascontiguousarray(v[local]) for v in values]
+                self._geometry_version = self._geometry_cache.version(self.mapping)
+                mapping = [*mapping, *self._geometry_args]
         else:
             mapping    = []
             map_degree = []
@@ -998,6 +1228,15 @@ class DiscreteFunctional(BasicDiscrete):
         return args
 
     def assemble(self, **kwargs):
+        # The local values of the geometry cache are copied: refresh them if
+        # the mapping was modified
+        if self._geometry_cache is not None:
+            values = self._geometry_cache.get(self.mapping, self.max_nderiv)
+            if self._geometry_cache.version(self.mapping) != self._geometry_version:
+                for a, v in zip(self._geometry_args, values):
+                    a[...] = v[self._geometry_local]
+                self._geometry_version = self._geometry_cache.version(self.mapping)
+
         args = [*self._args]
         for key in self._free_args:
             v = kwargs[key]
@@ -1049,6 +1288,17 @@ class DiscreteSumForm(BasicDiscrete):
         # create a module name if not given
         tag = random_string( 8 )
 
+        # The lumping and the conversion of the datatype are applied to the sum,
+        # not to the individual forms
+        self._lumped   = kwargs.pop('lumped', False)
+        self._diagonal = None
+        self._converted_matrices = {}
+        if self._lumped:
+            if not isinstance(a, sym_BilinearForm):
+                raise TypeError('> Mass lumping is only available for a BilinearForm')
+            if args[1][0] is not args[1][1]:
+                raise ValueError('Mass lumping requires the same trial and test spaces')
+
         # ...
         forms = []
         free_args = []
@@ -1086,12 +1336,56 @@ class DiscreteSumForm(BasicDiscrete):
     def is_functional(self):
         return self._is_functional
 
-    def assemble(self, *, reset=True, **kwargs):
+    @property
+    def lumped(self):
+        return self._lumped
+
+    def assemble(self, *, reset=True, reuse=False, dtype=None, **kwargs):
+        """
+        Assemble the sum of the discrete forms. With 'reuse=True', only the
+        forms whose free arguments changed since the last assembly are
+        assembled again, together with the forms that write into the same
+        blocks: the other blocks of the matrix (or vector) are reused.
+
+        As in DiscreteBilinearForm.assemble, 'dtype' gives a copy of the
+        matrix stored in another datatype: all the forms are assembled in
+        double precision, and the complete sum is converted once.
+        """
+        if dtype is not None:
+            if not isinstance(self._expr, sym_BilinearForm):
+                raise ValueError('Conversion of the datatype is only available for a bilinear form')
+            if self._lumped:
+                raise ValueError('Conversion of the datatype is not available for a lumped matrix')
+
         if not self.is_functional:
+            if reuse:
+                assemble = [not same_free_args_state(free_args_state(form.free_args, kwargs), form._assembled_state)
+                            for form in self.forms]
+
+                # A block which is reset must receive the contributions of all forms
+                while True:
+                    dirty = {id(a) for form, flag in zip(self.forms, assemble) if flag for a in form.global_matrices}
+                    new   = [flag or any(id(a) in dirty for a in form.global_matrices)
+                             for form, flag in zip(self.forms, assemble)]
+                    if new == assemble:
+                        break
+                    assemble = new
+            else:
+                assemble = [True] * len(self.forms)
+
             if reset :
-                reset_arrays(*[i for M in self.forms for i in M.global_matrices])
-            for form in self.forms:
-                M = form.assemble(reset=False, **kwargs)
+                reset_arrays(*[i for M, flag in zip(self.forms, assemble) if flag for i in M.global_matrices])
+            for form, flag in zip(self.forms, assemble):
+                M = form.assemble(reset=False, reuse=not flag, **kwargs)
+
+            if self._lumped:
+                if any(assemble) or self._diagonal is None:
+                    self._diagonal = lumped_diagonal(M, out=self._diagonal)
+                M = self._diagonal
+            elif dtype is not None:
+                dtype = np.dtype(dtype)
+                M = M.astype(dtype, out=self._converted_matrices.get(dtype))
+                self._converted_matrices[dtype] = M
         else:
             M = [form.assemble(**kwargs) for form in self.forms]
             M = np.sum(M)
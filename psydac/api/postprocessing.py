@@ -6,23 +6,32 @@ import numpy as np
 import yaml
 import re
 import h5py as h5
+import queue
+import threading
+import warnings
+import multiprocessing
+
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 from sympde.topology.mapping import Mapping
 from sympde.topology.analytical_mapping import IdentityMapping
 from sympde.topology import Domain, VectorFunctionSpace, ScalarFunctionSpace
 from sympde.topology.datatype import H1SpaceType, HcurlSpaceType, HdivSpaceType, L2SpaceType, UndefinedSpaceType
 
-from pyevtk.hl import unstructuredGridToVTK
-from pyevtk.vtk import VtkHexahedron, VtkQuad
+from pyevtk.hl import unstructuredGridToVTK, gridToVTK, writeParallelVTKGrid
+from pyevtk.vtk import VtkHexahedron, VtkQuad, VtkGroup
 
 from psydac.api.discretization import discretize
 from psydac.cad.geometry import Geometry
 from psydac.mapping.discrete import SplineMapping
-from psydac.core.bsplines import cell_index
+from psydac.core.bsplines import cell_index, elements_spans
 from psydac.feec.pushforward import Pushforward
 from psydac.utilities.utils import refine_array_1d
 from psydac.fem.basic import FemSpace, FemField
 from psydac.utilities.vtk import writeParallelVTKUnstructuredGrid
+from psydac.utilities.hdf5 import DatasetStorage, is_encoded, read_dataset
 from psydac.core.bsplines import elevate_knots
 
 
@@ -118,6 +127,33 @@ class OutputManager:
          Name/path of the file in which to save the fields.
          The path is relative to the current working directory.
 
+    comm : mpi4py.MPI.Intracomm or None, optional
+         Communicator used to write the fields in parallel.
+
+    mode : str, optional
+         Mode in which the fields' HDF5 file is opened.
+
+    storage : psydac.utilities.hdf5.DatasetStorage or None, optional
+         Layout of the fields' datasets: chunks, compression, data type
+         and collective writes. By default the datasets are contiguous,
+         uncompressed and written with independent MPI-IO.
+
+    asynchronous : bool, optional
+         If True, ``export_fields`` copies the coefficients owned by the
+         process into staging buffers and returns immediately, while the
+         HDF5 operations are performed in order by a writer thread. In
+         parallel, the file is opened with a duplicate of ``comm`` so that
+         the writes do not interfere with the communications of the
+         simulation; if the MPI library does not provide the
+         MPI_THREAD_MULTIPLE thread level, the writes are instead deferred
+         to the next synchronization point (see ``flush``). Use ``flush``
+         before reading the file, and ``close`` at the end.
+
+    max_pending : int, optional
+         Maximum number of pending operations (snapshot creations and field
+         exports) in asynchronous mode. When it is reached, the next call
+         waits for the writer thread, or performs the deferred writes.
+
     Attributes
     ----------
     _space_info : dict
@@ -141,6 +177,12 @@ class OutputManager:
         Group where the fields will be saved in the next ``export_fields``.
     
     _static_names : list
+
+    _storage : psydac.utilities.hdf5.DatasetStorage
+
+    _references : dict
+        Last dataset written for each field and its encoded local values,
+        used as references of the next snapshot if the storage has keyframes.
     """
 
     space_types_to_str = {
@@ -151,7 +193,8 @@ class OutputManager:
         UndefinedSpaceType(): 'undefined',
     }
 
-    def __init__(self, filename_space, filename_fields, comm=None, mode='w'):
+    def __init__(self, filename_space, filename_fields, comm=None, mode='w', *, storage=None,
+                 asynchronous=False, max_pending=2):
 
         self._space_info = {}
         self._spaces = []
@@ -174,10 +217,48 @@ class OutputManager:
 
         self.comm = comm
         self.fields_file = None
-    
+
+        self._storage = DatasetStorage() if storage is None else storage
+        self._references = {}
+
+        if asynchronous:
+            if max_pending < 1:
+                raise ValueError('max_pending must be a positive integer')
+            if comm is None or comm.size == 1:
+                threaded = True
+            else:
+                from mpi4py import MPI
+                threaded = MPI.Query_thread() == MPI.THREAD_MULTIPLE
+            self._writer = _AsyncWriter(max_pending, threaded)
+        else:
+            self._writer = None
+
     def close(self):
-        if not self.fields_file is None:
-            self.fields_file.close()
+        """Write the pending data (in asynchronous mode) and close the fields' file.
+
+        """
+        try:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        finally:
+            if not self.fields_file is None:
+                self.fields_file.close()
+
+    def flush(self):
+        """Wait until all the data passed to ``export_fields`` is written to
+        the fields' file. This is a synchronization point: in parallel, it
+        must be called by all the processes.
+
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        if self.fields_file is not None:
+            self.fields_file.flush()
+
+    @property
+    def asynchronous(self):
+        return self._writer is not None
 
     @property
     def current_hdf5_group(self):
@@ -187,6 +268,10 @@ class OutputManager:
     def space_info(self):
         return self._space_info
 
+    @property
+    def storage(self):
+        return self._storage
+
     @property
     def spaces(self):
         return dict([(name, space) for name, space in zip(self._spaces[1::3], self._spaces[0::3])])
@@ -198,17 +283,32 @@ class OutputManager:
         if not self.is_static:
             
             self.is_static = True
-            if self.fields_file is None:
-                kwargs = {}
-                if self.comm is not None and self.comm.size > 1:
-                    kwargs.update(driver='mpio', comm=self.comm)
-                self.fields_file = h5.File(self.filename_fields, mode=self._mode, **kwargs)
-
-            if 'static' not in self.fields_file.keys():
-                static_group = self.fields_file.create_group('static')
-                self._current_hdf5_group = static_group
-            else:
-                self._current_hdf5_group = self.fields_file['static']
+            self._submit(self._set_static)
+
+    def _set_static(self):
+        self._open_fields_file()
+
+        if 'static' not in self.fields_file.keys():
+            static_group = self.fields_file.create_group('static')
+            self._current_hdf5_group = static_group
+        else:
+            self._current_hdf5_group = self.fields_file['static']
+
+    def _open_fields_file(self):
+        if self.fields_file is None:
+            kwargs = {}
+            if self.comm is not None and self.comm.size > 1:
+                # A dedicated communicator is used by the writer thread
+                comm = self.comm.Dup() if self._writer is not None else self.comm
+                kwargs.update(driver='mpio', comm=comm)
+            self.fields_file = h5.File(self.filename_fields, mode=self._mode, **kwargs)
+
+    def _submit(self, func, *args):
+        # Perform an HDF5 operation now, or in order in asynchronous mode
+        if self._writer is None:
+            func(*args)
+        else:
+            self._writer.submit(func, *args)
 
     def add_snapshot(self, t, ts):
         """Adds a snapshot to the fields' HDF5 file
@@ -223,12 +323,10 @@ class OutputManager:
         """
  
         self.is_static = False
+        self._submit(self._add_snapshot, t, ts)
 
-        if self.fields_file is None:
-            kwargs = {}
-            if self.comm is not None and self.comm.size > 1:
-                kwargs.update(driver='mpio', comm=self.comm)
-            self.fields_file = h5.File(self.filename_fields, mode=self._mode, **kwargs)
+    def _add_snapshot(self, t, ts):
+        self._open_fields_file()
 
         i = self._next_snapshot_number
         try:
@@ -434,82 +532,344 @@ class OutputManager:
         else:
             assert all(not field_name in self._static_names for field_name in fields.keys())
 
+        # Collect the datasets to be written: (group, parent space, dataset, parent field, vector space, coefficients)
+        datasets = []
+        for name_field, field in fields.items():
+            multipatch = hasattr(field.space.symbolic_space.domain.interior, 'as_tuple')
+            patch_fields = field.fields if multipatch else (field,)
+
+            for f in patch_fields:
+                i = self._spaces.index(f.space)
+
+                name_space = self._spaces[i+1]
+                name_patch = self._spaces[i+2]
+
+                if f.space.is_product:  # Vector field case
+                    for i, field_coeff in enumerate(f.coeffs):
+                        name_field_i = name_field + f'[{i}]'
+                        name_space_i = name_space + f'[{i}]'
+
+                        Vi = f.space.vector_space.spaces[i]
+                        datasets.append((f'{name_patch}/{name_space_i}', name_space, name_field_i, name_field, Vi, field_coeff))
+                else:
+                    V = f.space.vector_space
+                    datasets.append((f'{name_patch}/{name_space}', None, name_field, None, V, f.coeffs))
+
+        # Extract the coefficients owned by the process. In asynchronous mode
+        # they are copied to staging buffers, as the fields may change before
+        # they are written
+        local_datasets = []
+        for group_name, parent_space, dset_name, parent_field, V, coeffs in datasets:
+            index  = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+            values = coeffs[index]
+            if self._writer is not None:
+                values = self._writer.stage(values)
+            local_datasets.append((group_name, parent_space, dset_name, parent_field, V, values))
+
+        self._submit(self._export_datasets, local_datasets)
+
+    def _export_datasets(self, datasets):
         fh5 = self.fields_file
 
         if 'spaces' not in fh5.attrs.keys():
             fh5.attrs.create('spaces', self.filename_space)
 
         saving_group = self._current_hdf5_group
+        storage      = self._storage
+
+        # Between two keyframes, the snapshots are written as differences
+        # with the previous ones
+        interval = storage.keyframe_interval
+        static   = saving_group.name == '/static'
+        keyframe = static or interval is None or (self._next_snapshot_number - 1) % interval == 0
 
         # Add field coefficients as named datasets
-        for name_field, field in fields.items():
-            multipatch = hasattr(field.space.symbolic_space.domain.interior, 'as_tuple')
-            
-            if multipatch:
-                for f in field.fields:
-                    i = self._spaces.index(f.space)
+        for group_name, parent_space, dset_name, parent_field, V, values in datasets:
+            key = f'{group_name}/{dset_name}'
+            reference, previous = (None, None) if keyframe else self._references.get(key, (None, None))
 
-                    name_space = self._spaces[i+1]
-                    name_patch = self._spaces[i+2]
+            if parent_space is not None:  # Vector field case
+                space_group = saving_group.create_group(group_name)
+                space_group.attrs.create('parent_space', data=parent_space)
 
-                    if f.space.is_product:  # Vector field case
-                        for i, field_coeff in enumerate(f.coeffs):
-                            name_field_i = name_field + f'[{i}]'
-                            name_space_i = name_space + f'[{i}]'
+                dset = storage.create_dataset(space_group, dset_name, V, reference=reference)
+                dset.attrs.create('parent_field', data=parent_field)
+            else:
+                dset = storage.create_dataset(saving_group, key, V, reference=reference)
 
-                            Vi = f.space.vector_space.spaces[i]
-                            index = tuple(slice(s, e + 1) for s, e in zip(Vi.starts, Vi.ends))
+            encoded = storage.write_local(dset, V, values, previous=previous)
+            if interval is not None and not static:
+                self._references[key] = (dset, encoded)
 
-                            space_group = saving_group.create_group(f'{name_patch}/{name_space_i}')
-                            space_group.attrs.create('parent_space', data=name_space)
+        # The staging buffers can be reused
+        if self._writer is not None:
+            self._writer.release(*[values for *_, values in datasets])
 
-                            dset = space_group.create_dataset(f'{name_field_i}',
-                                                            shape=Vi.npts, dtype=Vi.dtype)
-                            dset.attrs.create('parent_field', data=name_field)
-                            dset[index] = field_coeff[index]
-                    else:
-                        V = f.space.vector_space
-                        index = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
-                        dset = saving_group.create_dataset(f'{name_patch}/{name_space}/{name_field}', shape=V.npts, dtype=V.dtype)
-                        dset[index] = f.coeffs[index]
-            else:
-                i = self._spaces.index(field.space)
+    def export_space_info(self):
+        """Export the space info to Yaml
 
-                name_space = self._spaces[i+1]
-                name_patch = self._spaces[i+2]
+        """
+        if self.comm is None or self.comm.Get_rank() == 0:
+            with open(self.filename_space, 'w') as f:
+                yaml.dump(data=self._space_info, stream=f, default_flow_style=None, sort_keys=False)
 
-                if field.space.is_product:  # Vector field case
-                    for i, field_coeff in enumerate(field.coeffs):
-                        name_field_i = name_field + f'[{i}]'
-                        name_space_i = name_space + f'[{i}]'
 
-                        Vi = field.space.vector_space.spaces[i]
-                        index = tuple(slice(s, e + 1) for s, e in zip(Vi.starts, Vi.ends))
-                        
+# ===========================================================================
+class _AsyncWriter:
+    """Perform the HDF5 operations of an OutputManager in the order in which
+    they were submitted, either in a background thread or, if the writes
+    cannot run concurrently with the MPI communications of the calling
+    thread, at the next synchronization point in the calling thread.
 
-                        space_group = saving_group.create_group(f'{name_patch}/{name_space_i}')
-                        space_group.attrs.create('parent_space', data=name_space)
+    Parameters
+    ----------
+    max_pending : int
+        Maximum number of pending operations. When it is reached, ``submit``
+        waits for the writer thread, or performs the deferred operations.
 
-                        dset = space_group.create_dataset(f'{name_field_i}',
-                                                        shape=Vi.npts, dtype=Vi.dtype)
-                        dset.attrs.create('parent_field', data=name_field)
-                        dset[index] = field_coeff[index]
-                else:
-                    V = field.space.vector_space
-                    index = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
-                    dset = saving_group.create_dataset(f'{name_patch}/{name_space}/{name_field}', shape=V.npts, dtype=V.dtype)
-                    dset[index] = field.coeffs[index]
+    threaded : bool
+        If True, use a background thread; otherwise defer the operations.
+    """
+    def __init__(self, max_pending, threaded):
 
+        self._max_pending = max_pending
+        self._threaded    = threaded
+        self._error       = None
 
-    def export_space_info(self):
-        """Export the space info to Yaml
+        # Pool of staging buffers, indexed by shape and data type
+        self._buffers = {}
+        self._lock    = threading.Lock()
 
+        if threaded:
+            self._tasks  = queue.Queue(maxsize=max_pending)
+            self._thread = threading.Thread(target=self._run, name='psydac-output-writer', daemon=True)
+            self._thread.start()
+        else:
+            self._tasks  = []
+            self._thread = None
+
+    def stage(self, values):
+        """Return a copy of an array in a staging buffer."""
+        key = (values.shape, values.dtype.str)
+        with self._lock:
+            pool   = self._buffers.get(key)
+            buffer = pool.pop() if pool else None
+        if buffer is None:
+            buffer = np.empty(values.shape, dtype=values.dtype)
+        np.copyto(buffer, values)
+        return buffer
+
+    def release(self, *buffers):
+        """Return staging buffers to the pool, once their data is written."""
+        with self._lock:
+            for buffer in buffers:
+                self._buffers.setdefault((buffer.shape, buffer.dtype.str), []).append(buffer)
+
+    def submit(self, func, *args):
+        """Schedule the call func(*args). Blocks if the maximum number of
+        pending operations is reached (back-pressure).
         """
-        if self.comm is None or self.comm.Get_rank() == 0:
-            with open(self.filename_space, 'w') as f:
-                yaml.dump(data=self._space_info, stream=f, default_flow_style=None, sort_keys=False)
+        self._raise_error()
+        if self._threaded:
+            self._tasks.put((func, args))
+        else:
+            self._tasks.append((func, args))
+            if len(self._tasks) >= self._max_pending:
+                self.flush()
+
+    def flush(self):
+        """Wait until all the submitted operations are completed."""
+        if self._threaded:
+            self._tasks.join()
+        else:
+            tasks, self._tasks = self._tasks, []
+            for func, args in tasks:
+                func(*args)
+        self._raise_error()
+
+    def close(self):
+        """Complete the submitted operations and stop the writer thread."""
+        try:
+            self.flush()
+        finally:
+            if self._threaded:
+                self._tasks.put(None)
+                self._thread.join()
+
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            try:
+                if task is None:
+                    return
+                # After an error the remaining operations are skipped
+                if self._error is None:
+                    func, args = task
+                    func(*args)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._tasks.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError('Asynchronous write to HDF5 file failed') from error
+
+# ===========================================================================
+class LazyField:
+    """Proxy of a field saved by an OutputManager, whose coefficients are only
+    read from the fields file when requested, possibly on a subdomain.
+
+    Contiguous and uncompressed datasets are read through a read-only memory
+    map of the file, other datasets through HDF5 hyperslab selections.
+
+    Parameters
+    ----------
+    space : FemSpace
+        Space of the field.
+
+    datasets : list of h5py.Dataset
+        Datasets of the coefficients, one per component of the space.
+
+    t : float, optional
+        Time of the snapshot.
+
+    ts : int, optional
+        Time step of the snapshot.
+    """
+    def __init__(self, space, datasets, t=None, ts=None):
+
+        ncomponents = len(space.spaces) if space.is_product else 1
+        if len(datasets) != ncomponents:
+            raise ValueError('Expected {} datasets, got {}'.format(ncomponents, len(datasets)))
+
+        self._space    = space
+        self._datasets = list(datasets)
+        self._arrays   = [None] * ncomponents
+        self._t        = t
+        self._ts       = ts
+
+    @property
+    def space(self):
+        return self._space
+
+    @property
+    def t(self):
+        return self._t
+
+    @property
+    def ts(self):
+        return self._ts
+
+    @property
+    def memory_mapped(self):
+        """ List of booleans: whether each component is read through a memory map."""
+        return [isinstance(self._get_array(k), np.memmap) for k in range(len(self._datasets))]
+
+    def read(self, index=None, component=0):
+        """Read a hyperslab of the coefficients of one component.
+
+        Parameters
+        ----------
+        index : tuple of slice, optional
+            Global indices of the coefficients to read. By default, the
+            coefficients owned by the process.
+
+        component : int, default=0
+            Component of a vector field.
+
+        Returns
+        -------
+        numpy.ndarray
+            Coefficients (copied from the file).
+        """
+        if index is None:
+            V = self._component_vector_space(component)
+            index = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+        return np.array(self._read(component, index))
+
+    def load(self, cells=None, out=None):
+        """Read the coefficients into a FemField.
+
+        Parameters
+        ----------
+        cells : tuple of tuple of int, optional
+            First and last cells (included) of a subdomain, in the format of
+            ``TensorFemSpace.local_domain``. If given, only the coefficients of
+            the splines which do not vanish on the subdomain are read, the other
+            ones are set to zero: the field is then only valid on the subdomain.
+
+        out : FemField, optional
+            Field of the same space in which the coefficients are stored.
+
+        Returns
+        -------
+        FemField
+            Field with the coefficients read from the file.
+        """
+        if out is None:
+            out = FemField(self._space)
+        else:
+            assert out.space is self._space
+
+        coeffs = out.coeffs.blocks if self._space.is_product else [out.coeffs]
+        for k, c in enumerate(coeffs):
+            V = c.space
+            if cells is None:
+                index = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+            else:
+                c[:] = 0
+                index = self._cells_to_index(k, cells)
+                if index is None:
+                    continue
+            c[index] = self._read(k, index)
+
+        out.coeffs.update_ghost_regions()
+        return out
+
+    # ...
+    def _component_vector_space(self, component):
+        V = self._space.vector_space
+        return V.spaces[component] if self._space.is_product else V
+
+    def _read(self, component, index):
+        dset = self._datasets[component]
+        if is_encoded(dset):
+            return read_dataset(dset, index)
+        return self._get_array(component)[index]
+
+    def _get_array(self, component):
+        array = self._arrays[component]
+        if array is None:
+            dset   = self._datasets[component]
+            array  = dset
+            offset = dset.id.get_offset() if dset.chunks is None and not is_encoded(dset) else None
+            if offset is not None and dset.file.driver in ('sec2', 'stdio', 'mpio'):
+                array = np.memmap(dset.file.filename, dtype=dset.dtype, mode='r', offset=offset, shape=dset.shape)
+            self._arrays[component] = array
+        return array
+
+    def _cells_to_index(self, component, cells):
+        """Owned coefficients of the splines which do not vanish on some cells,
+        as a box of global indices, or None if there is none.
+        """
+        space = self._space.spaces[component] if self._space.is_product else self._space
+        V     = self._component_vector_space(component)
+
+        index = []
+        for knots, p, n, s, e, a, b in zip(space.knots, space.degree, V.npts, V.starts, V.ends, *cells):
+            spans = elements_spans(knots, p)
+            needed = np.unique((np.arange(spans[a] - p, spans[b] + 1)) % n)
+            needed = needed[(needed >= s) & (needed <= e)]
+            if needed.size == 0:
+                return None
+            index.append(slice(needed[0], needed[-1] + 1))
+
+        return tuple(index)
 
 
+# ===========================================================================
 class PostProcessManager:
     """A class to read saved information of a previous simulation
     and start post-processing from there.
@@ -529,6 +889,15 @@ class PostProcessManager:
     ncells : list of ints
         Number of cells in the domain, provided alongside ``domain`` in place of ``geometry_file``.
 
+    geometry_cache_size : int, default=2
+        Maximum number of evaluation grids for which the geometric data used by
+        ``export_to_vtk`` (mesh, connectivity, Jacobians) is kept in memory.
+        The least recently used entries are discarded first. If 0, nothing is cached.
+
+    snapshot_cache_size : int, default=2
+        Maximum number of snapshots read by ``get_snapshot`` which are kept in
+        memory, e.g. for interpolation in time. If 0, nothing is cached.
+
     Attributes
     ----------
     geometry_file : str or Path-like
@@ -561,9 +930,16 @@ class PostProcessManager:
 
     _snapshot_list : list
         List of all the snapshots
+
+    _geometry_cache : OrderedDict
+        Geometric data of ``export_to_vtk``, indexed by the grid and the number of points per cell
+
+    _snapshot_cache : OrderedDict
+        Fields read by ``get_snapshot``, indexed by the snapshot, the names of the fields and the subdomain
     """
 
-    def __init__(self, geometry_file=None, domain=None, space_file=None, fields_file=None, comm=None):
+    def __init__(self, geometry_file=None, domain=None, space_file=None, fields_file=None, comm=None,
+                 *, geometry_cache_size=2, snapshot_cache_size=2):
         if geometry_file is None and domain is None:
             raise ValueError('Domain or geometry file needed')
         if geometry_file is not None and domain is not None:
@@ -582,6 +958,11 @@ class PostProcessManager:
         
         self._last_loaded_fields = None
 
+        self._multipatch = False
+        self._patch_names = []
+        self._local_patches = []
+        self._patch_owners = {}
+
         self._loaded_t = None
         self._loaded_ts = None
         self._snapshot_list = None
@@ -589,6 +970,19 @@ class PostProcessManager:
         self.comm = comm
         self.fields_file = None
 
+        if geometry_cache_size < 0:
+            raise ValueError('geometry_cache_size must be a non-negative integer')
+
+        self._geometry_cache = OrderedDict()
+        self._geometry_cache_size = geometry_cache_size
+        self._geometry_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+        if snapshot_cache_size < 0:
+            raise ValueError('snapshot_cache_size must be a non-negative integer')
+
+        self._snapshot_cache = OrderedDict()
+        self._snapshot_cache_size = snapshot_cache_size
+
         self._reconstruct_spaces()
 
     @property
@@ -605,6 +999,24 @@ class PostProcessManager:
         fields.update(self._snapshot_fields)
         fields.update(self._static_fields)
         return fields
+
+    @property
+    def local_patches(self):
+        """Names of the patches exported by this process."""
+        return self._local_patches
+
+    @property
+    def geometry_cache_info(self):
+        """Debug counters of the geometry cache used by ``export_to_vtk``:
+        number of hits, misses and evictions, number of entries and their size in bytes."""
+        info = dict(self._geometry_cache_stats)
+        info['size'] = len(self._geometry_cache)
+        info['nbytes'] = sum(self._geometry_nbytes(g) for g in self._geometry_cache.values())
+        return info
+
+    def clear_geometry_cache(self):
+        """Discard the geometric data cached by ``export_to_vtk``."""
+        self._geometry_cache.clear()
     
     def read_space_info(self):
         """Read ``self.space_filename ``.
@@ -619,12 +1031,27 @@ class PostProcessManager:
     def _reconstruct_spaces(self):
         """Reconstructs all of the spaces from reading the files.
 
+        In the multipatch case, the spaces are reconstructed without domain
+        decomposition: the patches are distributed among the processes instead
+        (see ``local_patches``). Only the spaces defined on every patch of the
+        domain are reconstructed.
         """
         space_info = self.read_space_info()
 
+        multipatch = len(space_info['patches']) > 1
+
         if self.geometry_filename  is not None:
+            if multipatch:
+                raise NotImplementedError("Multipatch geometry files are not supported yet")
             domain = Domain.from_file(self.geometry_filename)
             domain_h = discretize(domain, filename=self.geometry_filename, comm=self.comm)
+        elif multipatch:
+            domain = self._domain
+            patch_names = [interior.name for interior in domain.interior.as_tuple()]
+            assert sorted(patch_names) == sorted(patch['name'] for patch in space_info['patches'])
+            breaks = space_info['patches'][0]['breakpoints']
+            ncells = [len(b) - 1 for b in breaks]
+            domain_h = discretize(domain, ncells=ncells)
         else:
             domain = self._domain
             # Use the fact that it only works in single patch
@@ -635,6 +1062,7 @@ class PostProcessManager:
 
         self._domain = domain
         self._domain_h = domain_h
+        self._multipatch = multipatch
 
         pdim = space_info['ndim']
 
@@ -642,6 +1070,13 @@ class PostProcessManager:
         assert space_info['fields'] == self.fields_filename 
         convert_deg_dict = _augment_space_degree_dict(domain_h.ldim)
 
+        if multipatch:
+            self._reconstruct_multipatch_spaces(space_info, convert_deg_dict)
+            return
+
+        self._patch_names = [domain.name]
+        self._local_patches = [domain.name]
+
         # No Multipatch Support for now
         assert len(domain_h.mappings) == 1
         assert not hasattr(domain.interior, 'as_tuple')
@@ -665,40 +1100,12 @@ class PostProcessManager:
                 raise ValueError("Multipatch not supported yet")
             
             for v_sp in vector_spaces:
-                components = v_sp['components']
+                already_used_names.extend(sc_sp['name'] for sc_sp in v_sp['components'])
                 temp_v_sp = VectorFunctionSpace(name=v_sp['name'], domain=domain, kind=v_sp['kind'])
 
-                basis = []
-                for sc_sp in components:
-                    already_used_names.append(sc_sp['name'])
-                    basis += sc_sp['basis']
+                temp_kwargs_discretization = _vector_space_discretization_kwargs(v_sp, convert_deg_dict)
+                temp_kwargs_discretization['comm'] = self.comm
 
-                basis = list(set(basis))
-                if len(basis) != 1:
-                    basis = 'M'
-                else:
-                    basis = basis[0]
-
-                degree = [sc_sp['degree'] for sc_sp in components]
-                multiplicity = [sc_sp['multiplicity'] for sc_sp in components]
-                
-                new_degree, new_mul = convert_deg_dict[v_sp['kind']](degree, multiplicity)
-                
-                knots = [[np.asarray(sc_sp['knots'][i]) for i in range(sc_sp['ldim'])] for sc_sp in components][0]
-                periodic = components[0]['periodic']
-
-                for i in range(components[0]['ldim']):
-                    if new_degree[i] != degree[0][i]:
-                        for j in range(new_degree[i] - degree[0][i]):
-                            knots[i] = elevate_knots(knots[i], degree[0][i], periodic=periodic[i])
-
-                temp_kwargs_discretization = {
-                    'degree':[int(new_degree[i]) for i in range(components[0]['ldim'])],
-                    'knots': knots,
-                    'basis': basis,
-                    'periodic':periodic,
-                    'comm': self.comm
-                }
                 self._spaces[v_sp['name']] = discretize(temp_v_sp, domain_h, **temp_kwargs_discretization)
                 
                 for b in range(len(breaks)):
@@ -708,38 +1115,82 @@ class PostProcessManager:
                 if sc_sp['name'] not in already_used_names:
                     temp_sc_sp = ScalarFunctionSpace(sc_sp['name'], domain, kind=sc_sp['kind'])
 
-                    basis = list(set(sc_sp['basis']))
-                    if len(basis) != 1:
-                        basis = 'M'
-                    else:
-                        basis = basis[0]
-
-                    multiplicity = sc_sp['multiplicity']
-                    degree = sc_sp['degree']
-
-                    new_degree, new_mul = convert_deg_dict[sc_sp['kind']](degree, multiplicity)
-                    
-                    knots = [np.asarray(sc_sp['knots'][i]) for i in range(sc_sp['ldim'])]
-                    periodic = sc_sp['periodic']
-
-                    for i in range(sc_sp['ldim']):
-                        if new_degree[i] != degree[i]:
-                            for j in range(new_degree[i] - degree[i]):
-                                knots[i] = elevate_knots(knots[i], degree[i], periodic=periodic[i])                                    
-                    
-                    temp_kwargs_discretization = {
-                        'degree': [int(new_degree[i]) for i in range(sc_sp['ldim'])],
-                        'knots': knots,
-                        'basis': basis,
-                        'periodic': periodic,
-                        'comm': self.comm,
-                    }
+                    temp_kwargs_discretization = _scalar_space_discretization_kwargs(sc_sp, convert_deg_dict)
+                    temp_kwargs_discretization['comm'] = self.comm
 
                     self._spaces[sc_sp['name']] = discretize(temp_sc_sp, domain_h, **temp_kwargs_discretization)
 
                     for b in range(len(breaks)):
                         assert np.allclose(self._spaces[sc_sp['name']].breaks[b], breaks[b])
 
+    def _reconstruct_multipatch_spaces(self, space_info, convert_deg_dict):
+        """Reconstructs the spaces of a multipatch domain, patch by patch."""
+        domain    = self._domain
+        domain_h  = self._domain_h
+        patches   = {patch['name']: patch for patch in space_info['patches']}
+        interiors = domain.interior.as_tuple()
+
+        self._patch_names = [interior.name for interior in interiors]
+
+        # Spaces and their kind, indexed by name, in each patch
+        patch_spaces = {}
+        for name, patch in patches.items():
+            spaces = {}
+            already_used_names = []
+            for v_sp in patch.get('vector_spaces', []):
+                already_used_names.extend(sc_sp['name'] for sc_sp in v_sp['components'])
+                spaces[v_sp['name']] = (True, v_sp)
+            for sc_sp in patch.get('scalar_spaces', []):
+                if sc_sp['name'] not in already_used_names:
+                    spaces[sc_sp['name']] = (False, sc_sp)
+            patch_spaces[name] = spaces
+
+        space_names = set.intersection(*(set(spaces) for spaces in patch_spaces.values()))
+        skipped = set.union(*(set(spaces) for spaces in patch_spaces.values())) - space_names
+        if skipped:
+            warnings.warn("Spaces {} are not defined on every patch and are not reconstructed".format(sorted(skipped)))
+
+        for space_name in sorted(space_names):
+            is_vector, sp = patch_spaces[self._patch_names[0]][space_name]
+            if is_vector:
+                temp_sp = VectorFunctionSpace(name=space_name, domain=domain, kind=sp['kind'])
+                get_kwargs = _vector_space_discretization_kwargs
+            else:
+                temp_sp = ScalarFunctionSpace(space_name, domain, kind=sp['kind'])
+                get_kwargs = _scalar_space_discretization_kwargs
+
+            # The knots may differ from patch to patch
+            patch_kwargs = {name: get_kwargs(patch_spaces[name][space_name][1], convert_deg_dict)
+                            for name in self._patch_names}
+
+            temp_kwargs_discretization = dict(patch_kwargs[self._patch_names[0]])
+            temp_kwargs_discretization['knots'] = {name: kwargs['knots'] for name, kwargs in patch_kwargs.items()}
+
+            self._spaces[space_name] = discretize(temp_sp, domain_h, **temp_kwargs_discretization)
+
+        self._local_patches = self._assign_patches(patches)
+
+    def _assign_patches(self, patches):
+        """Distribute the patches among the processes, balancing the number
+        of cells (largest patches first, each one to the least loaded process).
+        Returns the names of the patches of this process.
+        """
+        size = 1 if self.comm is None else self.comm.Get_size()
+        rank = 0 if self.comm is None else self.comm.Get_rank()
+
+        ncells = {name: int(np.prod([len(b) - 1 for b in patches[name]['breakpoints']]))
+                  for name in self._patch_names}
+
+        load  = [0] * size
+        owner = {}
+        for name in sorted(self._patch_names, key=lambda name: -ncells[name]):
+            r = int(np.argmin(load))
+            owner[name] = r
+            load[r] += ncells[name]
+
+        self._patch_owners = owner
+        return [name for name in self._patch_names if owner[name] == rank]
+
     def get_snapshot_list(self):
         kwargs = {}
         if self.comm is not None and self.comm.size > 1:
@@ -769,6 +1220,12 @@ class PostProcessManager:
         fh5 = self.fields_file
 
         static_group = fh5['static']
+
+        if self._multipatch:
+            self._load_multipatch_fields(static_group, fields, self._static_fields)
+            self._last_loaded_fields = self._static_fields
+            return
+
         temp_space_to_field = {}
         for patch in static_group.keys():
             patch_group = static_group[patch]
@@ -809,7 +1266,7 @@ class PostProcessManager:
                     for field_dset_name in space_group.keys():
                         if field_dset_name in fields:
                             new_field = FemField(self._spaces[space_name])
-                            new_field.coeffs[index] = space_group[field_dset_name][index]
+                            new_field.coeffs[index] = read_dataset(space_group[field_dset_name], index)
                             new_field.coeffs.update_ghost_regions()
                             self._static_fields[field_dset_name] = new_field
  
@@ -823,7 +1280,7 @@ class PostProcessManager:
                     Vi = self._spaces[space_name].vector_space.spaces[i]
                     index = tuple(slice(s, e + 1) for s, e in zip(Vi.starts, Vi.ends))
 
-                    new_field.coeffs[i][index] = coeff[index]
+                    new_field.coeffs[i][index] = read_dataset(coeff, index)
                 new_field.coeffs.update_ghost_regions()
                 self._static_fields[field_name] = new_field
 
@@ -845,6 +1302,11 @@ class PostProcessManager:
         fh5 = self.fields_file
 
         snapshot_group = fh5[f'snapshot_{n:0>4}']
+
+        # In the multipatch case, there is no group named after the domain
+        if self._multipatch:
+            self._load_multipatch_fields(snapshot_group, fields, self._snapshot_fields)
+
         temp_space_to_field = {}
         for patch in snapshot_group.keys():
             patch_group = snapshot_group[patch]
@@ -886,12 +1348,12 @@ class PostProcessManager:
                                 if field_dset_name in fields:
                                     # Try to reuse memory
                                     try:
-                                        self._snapshot_fields[field_dset_name].coeffs[index] = space_group[field_dset_name][index]
+                                        self._snapshot_fields[field_dset_name].coeffs[index] = read_dataset(space_group[field_dset_name], index)
                                         
                                         self._snapshot_fields[field_dset_name].coeffs.update_ghost_regions()
                                     except KeyError:
                                         new_field = FemField(self._spaces[space_name])
-                                        new_field.coeffs[index] = space_group[field_dset_name][index]
+                                        new_field.coeffs[index] = read_dataset(space_group[field_dset_name], index)
                                         new_field.coeffs.update_ghost_regions()
                                         self._snapshot_fields[field_dset_name] = new_field
 
@@ -902,7 +1364,7 @@ class PostProcessManager:
                     for i, coeff in enumerate(list_coeffs):
                         Vi = self._spaces[space_name].vector_space.spaces[i]
                         index = tuple(slice(s, e + 1) for s, e in zip(Vi.starts, Vi.ends))
-                        self._snapshot_fields[field_name].coeffs[i][index] = coeff[index]
+                        self._snapshot_fields[field_name].coeffs[i][index] = read_dataset(coeff, index)
                         # Ghost regions are not in sync anymore
                         self._snapshot_fields[field_name].coeffs.update_ghost_regions()
                 except KeyError:
@@ -912,7 +1374,7 @@ class PostProcessManager:
                         Vi = self._spaces[space_name].vector_space.spaces[i]
                         index = tuple(slice(s, e + 1) for s, e in zip(Vi.starts, Vi.ends))
 
-                        new_field.coeffs[i][index] = coeff[index]
+                        new_field.coeffs[i][index] = read_dataset(coeff, index)
                     new_field.coeffs.update_ghost_regions()
                     self._snapshot_fields[field_name] = new_field
 
@@ -925,6 +1387,186 @@ class PostProcessManager:
 
         self._last_loaded_fields = self._snapshot_fields
 
+    def _load_multipatch_fields(self, group, fields, loaded):
+        """Reads the coefficients of some multipatch fields in the local patches.
+
+        Parameters
+        ----------
+        group : h5py.Group
+            Static or snapshot group of the fields file.
+
+        fields : tuple of str
+            Names of the fields to load.
+
+        loaded : dict
+            Dictionary of the loaded fields, whose memory is reused if possible.
+        """
+        updated = set()
+        for k, patch in enumerate(self._patch_names):
+            if patch not in self._local_patches or patch not in group:
+                continue
+
+            for space_key, space_group in group[patch].items():
+                if 'parent_space' in space_group.attrs.keys():  # VectorSpace/Field case
+                    space_name = space_group.attrs['parent_space']
+                    component = int(re.search(r'\[(\d+)\]$', space_key).group(1))
+                    datasets = [(dset.attrs['parent_field'], dset) for dset in space_group.values()]
+                else:  # Scalar case
+                    space_name = space_key
+                    component = None
+                    datasets = list(space_group.items())
+
+                if space_name not in self._spaces:
+                    continue
+
+                for field_name, dset in datasets:
+                    if field_name not in fields:
+                        continue
+                    if field_name not in loaded or loaded[field_name].space is not self._spaces[space_name]:
+                        loaded[field_name] = FemField(self._spaces[space_name])
+
+                    coeffs = loaded[field_name].fields[k].coeffs
+                    if component is not None:
+                        coeffs = coeffs[component]
+
+                    V = coeffs.space
+                    index = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+                    coeffs[index] = read_dataset(dset, index)
+                    updated.add(field_name)
+
+        for field_name in updated:
+            loaded[field_name].coeffs.update_ghost_regions()
+
+    def get_lazy_fields(self, snapshot, *fields):
+        """Return proxies of some fields of a snapshot, whose coefficients are
+        only read when needed (see LazyField). The proxies are valid until the
+        fields file is closed.
+
+        Parameters
+        ----------
+        snapshot : int or 'static'
+            Number of the snapshot, or 'static' for the static fields.
+
+        *fields : tuple of str
+            Names of the fields.
+
+        Returns
+        -------
+        dict
+            LazyField objects, indexed by the names of the fields.
+        """
+        if self._multipatch:
+            raise NotImplementedError("Multipatch not supported yet")
+
+        if self._snapshot_list is None:
+            self.get_snapshot_list()
+
+        if snapshot == 'static':
+            group = self.fields_file['static']
+            t = ts = None
+        else:
+            group = self.fields_file[f'snapshot_{snapshot:0>4}']
+            t  = group.attrs['t']
+            ts = group.attrs['ts']
+
+        located = {}
+        patch_group = group[self._domain.name]
+        for space_name in patch_group.keys():
+            space_group = patch_group[space_name]
+
+            if 'parent_space' in space_group.attrs.keys():  # VectorSpace/Field case
+                relevant_space_name = space_group.attrs['parent_space']
+                for field_dset in space_group.values():
+                    relevant_field_name = field_dset.attrs['parent_field']
+                    if relevant_field_name in fields:
+                        located.setdefault(relevant_field_name, (relevant_space_name, []))[1].append(field_dset)
+
+            else:  # Scalar case
+                for field_dset_name, field_dset in space_group.items():
+                    if field_dset_name in fields:
+                        located[field_dset_name] = (space_name, [field_dset])
+
+        return {name: LazyField(self._spaces[space_name], datasets, t=t, ts=ts)
+                for name, (space_name, datasets) in located.items()}
+
+    def get_snapshot(self, n, *fields, cells=None):
+        """Read some fields of a snapshot into new FemField objects. The last
+        snapshots read are kept in memory (see ``snapshot_cache_size``).
+
+        Parameters
+        ----------
+        n : int
+            Number of the snapshot.
+
+        *fields : tuple of str
+            Names of the fields to load.
+
+        cells : tuple of tuple of int, optional
+            Subdomain on which the fields are needed (see LazyField.load).
+
+        Returns
+        -------
+        dict
+            FemField objects, indexed by the names of the fields. They are
+            shared with the cache and should not be modified.
+        """
+        if cells is not None:
+            cells = tuple(tuple(c) for c in cells)
+
+        key = (n, tuple(sorted(fields)), cells)
+        snapshot = self._snapshot_cache.get(key)
+        if snapshot is not None:
+            self._snapshot_cache.move_to_end(key)
+            return snapshot
+
+        lazy_fields = self.get_lazy_fields(n, *fields)
+        snapshot = {name: f.load(cells=cells) for name, f in lazy_fields.items()}
+
+        if self._snapshot_cache_size > 0:
+            while len(self._snapshot_cache) >= self._snapshot_cache_size:
+                self._snapshot_cache.popitem(last=False)
+            self._snapshot_cache[key] = snapshot
+
+        return snapshot
+
+    def interpolate_snapshots(self, t, *fields, cells=None):
+        """Linear interpolation in time of some fields between the two
+        snapshots which surround the time t.
+
+        Parameters
+        ----------
+        t : float
+            Time, between the first and the last snapshots.
+
+        *fields : tuple of str
+            Names of the fields.
+
+        cells : tuple of tuple of int, optional
+            Subdomain on which the fields are needed (see LazyField.load).
+
+        Returns
+        -------
+        dict
+            FemField objects, indexed by the names of the fields.
+        """
+        if self._snapshot_list is None:
+            self.get_snapshot_list()
+
+        times = sorted((self.fields_file[f'snapshot_{n:0>4}'].attrs['t'], n) for n in self._snapshot_list)
+        if not times or not times[0][0] <= t <= times[-1][0]:
+            raise ValueError('Time {} is outside of the saved snapshots'.format(t))
+
+        i = int(np.searchsorted([ti for ti, _ in times], t, side='left'))
+        if i == 0:
+            f0 = self.get_snapshot(times[0][1], *fields, cells=cells)
+            return {name: f.copy() for name, f in f0.items()}
+
+        (t0, n0), (t1, n1) = times[i - 1], times[i]
+        f0 = self.get_snapshot(n0, *fields, cells=cells)
+        f1 = self.get_snapshot(n1, *fields, cells=cells)
+        w  = (t - t0) / (t1 - t0)
+        return {name: f0[name] * (1 - w) + f1[name] * w for name in f1}
+
     def export_to_vtk(self, 
                       filename_pattern, 
                       grid,
@@ -937,6 +1579,9 @@ class PostProcessManager:
                       additional_physical_functions=None,
                       additional_logical_functions=None,
                       number_by_rank=True,
+                      workers=None,
+                      precision=None,
+                      structured=False,
                       debug=False):
         """Exports some fields to vtk. 
 
@@ -946,7 +1591,8 @@ class PostProcessManager:
             file pattern of the file
 
         grid : List of ndarray
-            Grid on which to evaluate the fields
+            Grid on which to evaluate the fields. In the multipatch case, this can
+            also be a dictionary of grids indexed by the names of the patches.
 
         npts_per_cell : int or tuple of int or None, optional
             number of evaluation points in each cell.
@@ -973,6 +1619,23 @@ class PostProcessManager:
         number_by_rank : bool, default=True
             Adds a cellData attribute that represents the rank of the process that created the file. 
 
+        workers : int or None, optional
+            Number of processes used to export the snapshots, in serial runs only.
+            If larger than 1, the snapshots are exported concurrently by a pool of
+            forked processes, which share the geometry computed by the calling process
+            and open the fields file read-only; a ``filename_pattern.pvd`` time series
+            index is then written by the calling process.
+
+        precision : str or None, optional
+            Floating point precision of the coordinates and of the point data written
+            to the files: 'float32' halves the size of the files, which is usually
+            enough for visualization. By default, the data is written as computed.
+
+        structured : bool, default=False
+            If True, write structured grids (.vts files) instead of unstructured
+            grids (.vtu files), which do not need the connectivity of the cells.
+            Only available for single patch domains.
+
         debug : bool, default=False
             If true, returns ``(mesh, pointData_list)`` where ``mesh`` is ``(x_mesh, y_mesh,  z_mesh)``
             and ``pointData_list`` is the list of all the pointData dictionaries.
@@ -980,16 +1643,37 @@ class PostProcessManager:
         Notes
         -----
         This function only supports regular and irregular tensor grid.
+
+        The mesh, the connectivity and the Jacobians of the mapping only depend on
+        ``grid`` and ``npts_per_cell``: they are computed on the first call and
+        reused by the following calls with the same grid (see ``geometry_cache_size``).
+
+        Multipatch domains are exported patch by patch: each process writes the
+        patches assigned to it (see ``local_patches``) to ``filename_pattern.<patch>.*.vtu``
+        files, tied together by ``.pvtu`` files and by a ``filename_pattern.pvd`` time
+        series index. In debug mode, the meshes and the pointData are then dictionaries
+        indexed by the local patches.
         """
         # =================================================
         # Common to everything
         # =================================================
         
+        if precision not in (None, 'float32', 'float64'):
+            raise ValueError("Precision must be 'float32' or 'float64', got {}".format(precision))
+        dtype = None if precision is None else np.dtype(precision)
+
+        if self._multipatch:
+            if structured:
+                raise NotImplementedError("Structured output is not supported for multipatch domains")
+            return self._export_multipatch_to_vtk(filename_pattern, grid, npts_per_cell=npts_per_cell,
+                                                  snapshots=snapshots, lz=lz, logical_grid=logical_grid,
+                                                  fields=fields,
+                                                  additional_physical_functions=additional_physical_functions,
+                                                  additional_logical_functions=additional_logical_functions,
+                                                  number_by_rank=number_by_rank, dtype=dtype, debug=debug)
+
         # Get Mappings
         mappings = self._domain_h.mappings
-        # Do not support Multipatch domains.
-        if len(mappings.values()) != 1:
-            raise NotImplementedError("Multipatch not supported yet")
 
         ldim = self._domain_h.ldim
         # Singular mapping
@@ -1018,63 +1702,14 @@ class PostProcessManager:
 
 
 
-        # Check the grid argument
-        assert len(grid) == ldim
-        grid_test = [np.asarray(grid[i]) for i in range(ldim)]
-        assert all(grid_test[i].ndim == grid_test[i+1].ndim for i in range(len(grid) - 1))
-        
-        if grid_test[0].ndim == 1 and npts_per_cell is not None:
-            # Account for only an int being given
-            if isinstance(npts_per_cell, int):
-                npts_per_cell = (npts_per_cell,) * ldim
+        geometry = self._get_export_geometry(mapping, grid, npts_per_cell, local_domain, global_domain, space_0)
 
-            # Check that the grid is regular
-            assert all(grid_test[i].size % npts_per_cell[i] == 0 for i in range(ldim))
-
-            grid_local = []
-            for i in range(len(grid_test)):
-                grid_local.append(grid_test[i][local_domain[0][i] * npts_per_cell[i]:
-                                                (local_domain[1][i] + 1) * npts_per_cell[i]])
-                
-            cell_indexes = None
-
-        elif grid_test[0].ndim == 1 and npts_per_cell is None:
-            cell_indexes = [cell_index(space_0.breaks[i], grid_test[i]) for i in range(ldim)]
-
-            grid_local = []
-            for i in range(ldim):
-                i_start = np.searchsorted(cell_indexes[i], local_domain[0][i], side='left')
-                i_end = np.searchsorted(cell_indexes[i], local_domain[1][i], side='right')
-                grid_local.append(grid_test[i][i_start:i_end])
-
-        elif grid_test[0].ndim == ldim:
-            raise NotImplementedError("Unstructured grids are not supported yet")
-        else:
-            raise ValueError("Wrong input for the grid parameters")
-
-
-        self._pushforward = Pushforward(mapping, grid, npts_per_cell=npts_per_cell, local_domain=local_domain,
-                                        global_domain=global_domain, grid_local=grid_local)
-
-        mesh_grids = np.meshgrid(*grid_local, indexing = 'ij')
+        self._pushforward = geometry['pushforward']
+        x_mesh, y_mesh, z_mesh = geometry['mesh']
 
         cellData = None
-        cellData_info = None    
-
-        if isinstance(mapping, SplineMapping):
-            x_mesh, y_mesh, z_mesh = mapping.build_mesh(grid, npts_per_cell=npts_per_cell, overlap=0)
-        elif isinstance(mapping, Mapping):
-            call_map = mapping.get_callable_mapping()
-            if ldim == 2:
-                x_mesh, y_mesh = call_map(*mesh_grids)
-                x_mesh = x_mesh[..., None]
-                y_mesh = y_mesh[..., None]
-                z_mesh = np.zeros_like(x_mesh)
-            elif ldim == 3:
-                x_mesh, y_mesh, z_mesh = call_map(*mesh_grids)
-        conn, offsets, celltypes, cell_shape = self._compute_unstructured_mesh_info(local_domain, 
-                                                                                    npts_per_cell=npts_per_cell, 
-                                                                                    cell_indexes=cell_indexes)
+        cellData_info = None
+        piece_starts = None
 
         # Check if launched in parallel
         if self.comm is not None and self.comm.size >1:
@@ -1083,11 +1718,19 @@ class PostProcessManager:
             size = self.comm.Get_size()
 
             if number_by_rank:
-                if ldim == 2:
-                    cellData = {'MPI_RANK': np.full(tuple(cell_shape) + (1,), rank, dtype='i')}
-                elif ldim == 3:
-                    cellData = {'MPI_RANK': np.full(tuple(cell_shape), rank, dtype='i')}
+                if structured:
+                    cell_shape = tuple(max(n - 1, 1) for n in x_mesh.shape)
+                else:
+                    cell_shape = tuple(self._get_mesh_info(geometry)[3])
+                if ldim == 2 and not structured:
+                    cellData = {'MPI_RANK': np.full(cell_shape + (1,), rank, dtype='i')}
+                else:
+                    cellData = {'MPI_RANK': np.full(cell_shape, rank, dtype='i')}
                 cellData_info = {'MPI_RANK': (cellData['MPI_RANK'].dtype, 1)}
+
+            if structured:
+                piece_starts = self.comm.gather(geometry['grid_starts'], root=0)
+
             # Filenames
             filename_static = filename_pattern + f'.{rank}.' + 'static'
             filename_time_dependent = filename_pattern + f'.{rank}'
@@ -1097,7 +1740,10 @@ class PostProcessManager:
             filename_static = filename_pattern + ".static"
             filename_time_dependent = filename_pattern
 
+        output = (dtype, structured, piece_starts)
+
         if debug:
+            conn, offsets, celltypes, _ = self._get_mesh_info(geometry)
             debug_result = ((x_mesh, y_mesh, z_mesh, conn, offsets, celltypes),[])
 
         if fields is None:
@@ -1116,54 +1762,24 @@ class PostProcessManager:
             if self._static_fields == {}:
                 self.load_static(*fields.values())
             
-            if self.comm is not None and self.comm.rank == 0:
-                general_pointData_static_info = {}
-
             pointData_static = self._export_to_vtk_helper(x_mesh.shape, fields=fields)
-           
-            if logical_grid:
-                for i in range(ldim):
-                    pointData_static[f'x_{i}'] = np.reshape(mesh_grids[i], x_mesh.shape)
-            
-            for name, f in additional_logical_functions.items():
-                data = f(*mesh_grids)
-                if isinstance(data, tuple):
-                    reshaped_tuple = tuple(np.reshape(data[i], x_mesh.shape) for i in range(3))
-                    pointData_static[name] = reshaped_tuple
-                else:
-                    pointData_static[name] = np.reshape(data, x_mesh.shape) 
+            self._add_extra_point_data(pointData_static, geometry, logical_grid,
+                                       additional_logical_functions, additional_physical_functions)
 
-            if ldim == 2:
-                for name, f in additional_physical_functions.items():
-                    pointData_static[name] = f(x_mesh, y_mesh)
-            elif ldim == 3:
-                for name, f in additional_physical_functions.items():
-                    pointData_static[name] = f(x_mesh, y_mesh, z_mesh)
-            
             if debug:
                 debug_result[1].append(pointData_static)
             
             if self.comm is not None and self.comm.rank == 0:
-                for name, field in pointData_static.items():
-                    if isinstance(field, tuple):
-                        general_pointData_static_info[name] = (field[0].dtype, 3)
-                    else:
-                        general_pointData_static_info[name] = (field.dtype, 1)
+                general_pointData_static_info = _point_data_info(pointData_static, dtype)
             
             # Export static fields to VTK
-            unstructuredGridToVTK(filename_static, x_mesh, y_mesh, z_mesh,
-                                  connectivity=conn,
-                                  offsets=offsets,
-                                  cell_types=celltypes,
-                                  pointData=pointData_static,
-                                  cellData=cellData)
+            self._write_vtk_piece(filename_static, geometry, pointData_static, cellData, dtype, structured)
 
             if self.comm is not None and self.comm.Get_size() > 1 and self.comm.Get_rank() == 0:
-                writeParallelVTKUnstructuredGrid(filename_pattern + "_static", coordsdtype=x_mesh.dtype,
-                                                 sources=[filename_pattern + f".{r}"+'.static.vtu' for r in range(size)],
-                                                 ghostlevel=0,
-                                                 pointData=general_pointData_static_info,
-                                                 cellData=cellData_info)
+                self._write_vtk_index(filename_pattern + "_static", geometry,
+                                      [filename_pattern + f".{r}"+'.static' for r in range(size)],
+                                      piece_starts, general_pointData_static_info, cellData_info,
+                                      dtype, structured)
 
         # =================================================
         # Time Dependent part
@@ -1178,60 +1794,432 @@ class PostProcessManager:
         if snapshots == 'none':
             snapshots = []
         
+        args = (filename_pattern, filename_time_dependent, lz, fields, geometry, logical_grid,
+                additional_logical_functions, additional_physical_functions, cellData, cellData_info,
+                output, debug)
+
+        results = None
+        serial = self.comm is None or self.comm.Get_size() == 1
+        if workers is not None and workers > 1 and serial and len(snapshots) > 1:
+            results = self._export_snapshots_in_pool(workers, snapshots, args)
+
+        if results is None:
+            results = [self._export_snapshot_to_vtk(i, snapshot, *args) for i, snapshot in enumerate(snapshots)]
+        else:
+            # Time series index
+            group = VtkGroup(filename_pattern)
+            for i, (t, _) in enumerate(results):
+                extension = '.vts' if structured else '.vtu'
+                group.addFile(filepath=filename_time_dependent + '.{0:0{1}d}'.format(i, lz) + extension, sim_time=t)
+            group.save()
+
+        if debug:
+            debug_result[1].extend(pointData_i for _, pointData_i in results)
+            return debug_result
+
+    def _export_multipatch_to_vtk(self, filename_pattern, grid, *, npts_per_cell, snapshots, lz, logical_grid,
+                                  fields, additional_physical_functions, additional_logical_functions,
+                                  number_by_rank, dtype, debug):
+        """
+        Multipatch version of ``export_to_vtk``: each process exports its local
+        patches, one piece per patch, and the first process writes the indices.
+        """
+        ldim = self._domain_h.ldim
+        rank = 0 if self.comm is None else self.comm.Get_rank()
+        size = 1 if self.comm is None else self.comm.Get_size()
+
+        if fields is None:
+            fields = {}
+
+        if additional_physical_functions is None:
+            additional_physical_functions = {}
+
+        if additional_logical_functions is None:
+            additional_logical_functions = {}
+
+        extra_point_data = (logical_grid, additional_logical_functions, additional_physical_functions)
+
+        # Space used to locate the points of the grids in the cells
+        space_0 = self._spaces[sorted(self._spaces)[0]]
+
+        # Geometry of the local patches
+        geometries = {}
+        interiors = self._domain.interior.as_tuple()
+        for k, interior in enumerate(interiors):
+            if interior.name not in self._local_patches:
+                continue
+
+            mapping = getattr(interior, 'mapping', None)
+            if mapping is None:
+                mapping = IdentityMapping('F', ldim)
+
+            patch_space = space_0.spaces[k]
+            if patch_space.is_product:
+                patch_space = patch_space.spaces[0]
+
+            local_domain = patch_space.local_domain
+            global_domain = ((0,) * ldim, tuple(nc_i - 1 for nc_i in patch_space.ncells))
+            patch_grid = grid[interior.name] if isinstance(grid, dict) else grid
+
+            geometries[interior.name] = (k, self._get_export_geometry(mapping, patch_grid, npts_per_cell,
+                                                                      local_domain, global_domain,
+                                                                      patch_space, patch=interior.name))
+
+        cellData_info = None
+        if size > 1 and number_by_rank:
+            cellData_info = {'MPI_RANK': (np.dtype('i'), 1)}
+
+        if debug:
+            meshes = {name: (*geometry['mesh'], *self._get_mesh_info(geometry)[:3])
+                      for name, (_, geometry) in geometries.items()}
+            debug_result = (meshes, [])
+
+        def export(suffix):
+            """Export the last loaded fields, one piece per local patch."""
+            pointData_patches = {}
+            for name, (k, geometry) in geometries.items():
+                x_mesh = geometry['mesh'][0]
+                cell_shape = self._get_mesh_info(geometry)[3]
+
+                self._pushforward = geometry['pushforward']
+                loaded_fields = {f_name: f.fields[k] for f_name, f in self._last_loaded_fields.items()}
+                pointData = self._export_to_vtk_helper(x_mesh.shape, fields=fields, loaded_fields=loaded_fields)
+                self._add_extra_point_data(pointData, geometry, *extra_point_data)
+
+                cellData = None
+                if cellData_info is not None:
+                    shape = tuple(cell_shape) + (1,) if ldim == 2 else tuple(cell_shape)
+                    cellData = {'MPI_RANK': np.full(shape, rank, dtype='i')}
+
+                self._write_vtk_piece(filename_pattern + f'.{name}.' + suffix, geometry,
+                                      pointData, cellData, dtype, structured=False)
+                pointData_patches[name] = pointData
+
+            # The first process may have no patch: gather the description of the data
+            pointData_info = None
+            for pointData in pointData_patches.values():
+                pointData_info = _point_data_info(pointData, dtype)
+                break
+            if self.comm is not None:
+                infos = self.comm.gather(pointData_info, root=0)
+                if rank == 0:
+                    pointData_info = next(info for info in infos if info is not None)
+
+            if rank == 0:
+                path = filename_pattern + ('_static' if suffix == 'static' else '.' + suffix)
+                writeParallelVTKUnstructuredGrid(path, coordsdtype=np.dtype(float) if dtype is None else dtype,
+                                                 sources=[filename_pattern + f'.{name}.' + suffix + '.vtu'
+                                                          for name in self._patch_names],
+                                                 ghostlevel=0,
+                                                 pointData=pointData_info,
+                                                 cellData=cellData_info)
+            if debug:
+                debug_result[1].append(pointData_patches)
+
+        # ============================
+        # Static
+        # ============================
+        if snapshots in ['all', 'none']:
+            if self._static_fields == {}:
+                self.load_static(*fields.values())
+            self._last_loaded_fields = self._static_fields
+            export('static')
+
+        # =================================================
+        # Time Dependent part
+        # =================================================
+        if snapshots == 'all':
+            snapshots = self._snapshot_list
+        if isinstance(snapshots, int):
+            snapshots = [snapshots]
+
+        if snapshots == 'none':
+            snapshots = []
+
+        times = []
         for i, snapshot in enumerate(snapshots):
             self.load_snapshot(snapshot, *fields.values())
-            pointData_i = self._export_to_vtk_helper(x_mesh.shape, fields=fields)
+            export('{0:0{1}d}'.format(i, lz))
+            times.append(self._loaded_t)
 
-            if logical_grid:
-                for k in range(ldim):
-                    pointData_i[f'x_{k}'] = mesh_grids[k]
-            
-            for name, f in additional_logical_functions.items():
-                data = f(*mesh_grids)
-                if isinstance(data, tuple):
-                    reshaped_tuple = tuple(np.reshape(data[i], x_mesh.shape))
-                    pointData_i[name] = reshaped_tuple
-                else:
-                    pointData_i[name] = np.reshape(data, x_mesh.shape) 
-                
+        # Time series index
+        if rank == 0 and len(snapshots) > 0:
+            group = VtkGroup(filename_pattern)
+            for i, t in enumerate(times):
+                group.addFile(filepath=filename_pattern + '.{0:0{1}d}.pvtu'.format(i, lz), sim_time=t)
+            group.save()
+
+        if debug:
+            return debug_result
+
+    def _get_export_geometry(self, mapping, grid, npts_per_cell, local_domain, global_domain, space_0, patch=None):
+        """
+        Return the geometric data needed by ``export_to_vtk`` on a given grid:
+        the Pushforward object (which stores the Jacobians once they are computed),
+        the logical mesh, the physical mesh and the connectivity of the cells.
+        The data is computed once per (grid, npts_per_cell) and cached.
+
+        Parameters
+        ----------
+        mapping : sympde.topology.mapping.Mapping or SplineMapping
+            Mapping of the domain.
+
+        grid : List of ndarray
+            Grid on which to evaluate the fields.
+
+        npts_per_cell : int or tuple of int or None
+            Number of evaluation points in each cell.
+
+        local_domain : tuple of tuple of int
+            First and last cells owned by the process.
+
+        global_domain : tuple of tuple of int
+            First and last cells of the domain.
+
+        space_0 : TensorFemSpace
+            Space used to locate the points of the grid in the cells.
+
+        patch : str, optional
+            Name of the patch, in the multipatch case.
+
+        Returns
+        -------
+        geometry : dict
+            Geometric data, with keys 'pushforward', 'mesh_grids', 'mesh', 'grid_shape'
+            (global number of points), 'grid_starts' (index of the first local point)
+            and 'mesh_info' (see ``_get_mesh_info``).
+        """
+        ldim = self._domain_h.ldim
+
+        # Check the grid argument
+        assert len(grid) == ldim
+        grid_test = [np.asarray(grid[i]) for i in range(ldim)]
+        assert all(grid_test[i].ndim == grid_test[i+1].ndim for i in range(len(grid) - 1))
+
+        # Account for only an int being given
+        if isinstance(npts_per_cell, int):
+            npts_per_cell = (npts_per_cell,) * ldim
+        elif npts_per_cell is not None:
+            npts_per_cell = tuple(npts_per_cell)
+
+        key = (patch, tuple((g.dtype.str, g.shape, g.tobytes()) for g in grid_test), npts_per_cell)
+
+        geometry = self._geometry_cache.get(key)
+        if geometry is not None:
+            self._geometry_cache.move_to_end(key)
+            self._geometry_cache_stats['hits'] += 1
+            return geometry
+
+        self._geometry_cache_stats['misses'] += 1
+
+        if grid_test[0].ndim == 1 and npts_per_cell is not None:
+            # Check that the grid is regular
+            assert all(grid_test[i].size % npts_per_cell[i] == 0 for i in range(ldim))
+
+            grid_local = []
+            for i in range(len(grid_test)):
+                grid_local.append(grid_test[i][local_domain[0][i] * npts_per_cell[i]:
+                                                (local_domain[1][i] + 1) * npts_per_cell[i]])
+
+            grid_starts = tuple(local_domain[0][i] * npts_per_cell[i] for i in range(ldim))
+            cell_indexes = None
+
+        elif grid_test[0].ndim == 1 and npts_per_cell is None:
+            cell_indexes = [cell_index(space_0.breaks[i], grid_test[i]) for i in range(ldim)]
+
+            grid_local = []
+            grid_starts = []
+            for i in range(ldim):
+                i_start = np.searchsorted(cell_indexes[i], local_domain[0][i], side='left')
+                i_end = np.searchsorted(cell_indexes[i], local_domain[1][i], side='right')
+                grid_local.append(grid_test[i][i_start:i_end])
+                grid_starts.append(int(i_start))
+            grid_starts = tuple(grid_starts)
+
+        elif grid_test[0].ndim == ldim:
+            raise NotImplementedError("Unstructured grids are not supported yet")
+        else:
+            raise ValueError("Wrong input for the grid parameters")
+
+
+        pushforward = Pushforward(mapping, grid, npts_per_cell=npts_per_cell, local_domain=local_domain,
+                                  global_domain=global_domain, grid_local=grid_local)
+
+        mesh_grids = np.meshgrid(*grid_local, indexing = 'ij')
+
+        if isinstance(mapping, SplineMapping):
+            x_mesh, y_mesh, z_mesh = mapping.build_mesh(grid, npts_per_cell=npts_per_cell, overlap=0)
+        elif isinstance(mapping, Mapping):
+            call_map = mapping.get_callable_mapping()
             if ldim == 2:
-                for name, f  in additional_physical_functions.items():
-                    pointData_i[name] = f(x_mesh, y_mesh)
+                x_mesh, y_mesh = call_map(*mesh_grids)
+                x_mesh = x_mesh[..., None]
+                y_mesh = y_mesh[..., None]
+                z_mesh = np.zeros_like(x_mesh)
             elif ldim == 3:
-                for name, f  in additional_physical_functions.items():
-                    pointData_i[name] = f(x_mesh, y_mesh, z_mesh)
+                x_mesh, y_mesh, z_mesh = call_map(*mesh_grids)
 
-            if debug:
-                debug_result[1].append(pointData_i)
-            
-            if self.comm is not None and self.comm.Get_size() > 1 and self.comm.Get_rank() == 0:
-    
-                general_pointData_time_info = {}
-                for name, data in pointData_i.items():
-                    if isinstance(data, tuple):
-                        general_pointData_time_info[name] = (data[0].dtype, 3)
-                    else:
-                        general_pointData_time_info[name] = (data.dtype, 1)
-                
-                writeParallelVTKUnstructuredGrid(filename_pattern + '.{0:0{1}d}'.format(i, lz),
-                                    coordsdtype= x_mesh.dtype,
-                                    sources=[filename_pattern + f'.{r}' + '.{0:0{1}d}'.format(i, lz) + '.vtu' for r in range(size)],
-                                    ghostlevel=0,
-                                    pointData=general_pointData_time_info,
-                                    cellData=cellData_info)
-
-            unstructuredGridToVTK(filename_time_dependent + '.{0:0{1}d}'.format(i, lz),
-                                  x_mesh, y_mesh, z_mesh,
+        # The connectivity is only computed if an unstructured grid is written
+        geometry = {'pushforward'   : pushforward,
+                    'mesh_grids'    : mesh_grids,
+                    'mesh'          : (x_mesh, y_mesh, z_mesh),
+                    'grid_shape'    : tuple(g.size for g in grid_test),
+                    'grid_starts'   : grid_starts,
+                    'mesh_info'     : None,
+                    'mesh_info_args': (local_domain, npts_per_cell, cell_indexes)}
+
+        if self._geometry_cache_size > 0:
+            while len(self._geometry_cache) >= self._geometry_cache_size:
+                self._geometry_cache.popitem(last=False)
+                self._geometry_cache_stats['evictions'] += 1
+            self._geometry_cache[key] = geometry
+
+        return geometry
+
+    def _get_mesh_info(self, geometry):
+        """Connectivity, offsets, cell types and cell shape of the unstructured
+        mesh of a geometry returned by ``_get_export_geometry``, computed once."""
+        if geometry['mesh_info'] is None:
+            local_domain, npts_per_cell, cell_indexes = geometry['mesh_info_args']
+            geometry['mesh_info'] = self._compute_unstructured_mesh_info(local_domain,
+                                                                         npts_per_cell=npts_per_cell,
+                                                                         cell_indexes=cell_indexes)
+        return geometry['mesh_info']
+
+    def _write_vtk_piece(self, filename, geometry, pointData, cellData, dtype, structured):
+        """Write point data on the mesh of a geometry, to a .vts file if structured
+        and to a .vtu file otherwise. The floating point arrays are converted to dtype."""
+        x_mesh, y_mesh, z_mesh = (_cast_array(a, dtype) for a in geometry['mesh'])
+        pointData = {name: tuple(_cast_array(d, dtype) for d in data) if isinstance(data, tuple)
+                           else _cast_array(data, dtype)
+                     for name, data in pointData.items()}
+
+        if structured:
+            gridToVTK(filename, x_mesh, y_mesh, z_mesh, pointData=pointData, cellData=cellData)
+        else:
+            conn, offsets, celltypes, _ = self._get_mesh_info(geometry)
+            unstructuredGridToVTK(filename, x_mesh, y_mesh, z_mesh,
                                   connectivity=conn,
                                   offsets=offsets,
                                   cell_types=celltypes,
-                                  pointData=pointData_i,
+                                  pointData=pointData,
                                   cellData=cellData)
-    
-        if debug:
-            return debug_result
 
-    def _export_to_vtk_helper(self, shape, fields=None):
+    def _write_vtk_index(self, path, geometry, sources, piece_starts, pointData_info, cellData_info, dtype, structured):
+        """Write the parallel file (.pvts or .pvtu) which ties together the pieces written by the processes."""
+        coordsdtype = geometry['mesh'][0].dtype if dtype is None else dtype
+        if structured:
+            shape = geometry['grid_shape'] + (1,) * (3 - len(geometry['grid_shape']))
+            starts = [tuple(s) + (0,) * (3 - len(s)) for s in piece_starts]
+            writeParallelVTKGrid(path, coordsData=(shape, coordsdtype), starts=starts,
+                                 sources=[source + '.vts' for source in sources],
+                                 ghostlevel=0,
+                                 pointData=pointData_info,
+                                 cellData=cellData_info)
+        else:
+            writeParallelVTKUnstructuredGrid(path, coordsdtype=coordsdtype,
+                                             sources=[source + '.vtu' for source in sources],
+                                             ghostlevel=0,
+                                             pointData=pointData_info,
+                                             cellData=cellData_info)
+
+    @staticmethod
+    def _geometry_nbytes(geometry):
+        """Size in bytes of the arrays stored in a geometry cache entry."""
+        pushforward = geometry['pushforward']
+        arrays = [*geometry['mesh_grids'], *geometry['mesh'], *(geometry['mesh_info'] or ()),
+                  pushforward.jac_temp, pushforward.inv_jac_temp, pushforward.jac_det_temp]
+        return sum(a.nbytes for a in arrays if isinstance(a, np.ndarray))
+
+    def _add_extra_point_data(self, pointData, geometry, logical_grid,
+                              additional_logical_functions, additional_physical_functions):
+        """
+        Add the logical coordinates and the additional functions of
+        ``export_to_vtk`` to a pointData dictionary.
+        """
+        ldim = self._domain_h.ldim
+        mesh_grids = geometry['mesh_grids']
+        x_mesh, y_mesh, z_mesh = geometry['mesh']
+
+        if logical_grid:
+            for i in range(ldim):
+                pointData[f'x_{i}'] = np.reshape(mesh_grids[i], x_mesh.shape)
+
+        for name, f in additional_logical_functions.items():
+            data = f(*mesh_grids)
+            if isinstance(data, tuple):
+                reshaped_tuple = tuple(np.reshape(data[i], x_mesh.shape) for i in range(3))
+                pointData[name] = reshaped_tuple
+            else:
+                pointData[name] = np.reshape(data, x_mesh.shape)
+
+        if ldim == 2:
+            for name, f in additional_physical_functions.items():
+                pointData[name] = f(x_mesh, y_mesh)
+        elif ldim == 3:
+            for name, f in additional_physical_functions.items():
+                pointData[name] = f(x_mesh, y_mesh, z_mesh)
+
+    def _export_snapshot_to_vtk(self, i, snapshot, filename_pattern, filename_time_dependent, lz, fields,
+                                geometry, logical_grid, additional_logical_functions,
+                                additional_physical_functions, cellData, cellData_info, output, debug):
+        """
+        Export the fields of one snapshot to vtk, on the geometry computed by
+        ``export_to_vtk``. Returns the time of the snapshot and, if ``debug``
+        is true, its pointData dictionary.
+        """
+        x_mesh = geometry['mesh'][0]
+        dtype, structured, piece_starts = output
+
+        self.load_snapshot(snapshot, *fields.values())
+        pointData_i = self._export_to_vtk_helper(x_mesh.shape, fields=fields)
+        self._add_extra_point_data(pointData_i, geometry, logical_grid,
+                                   additional_logical_functions, additional_physical_functions)
+
+        if self.comm is not None and self.comm.Get_size() > 1 and self.comm.Get_rank() == 0:
+            size = self.comm.Get_size()
+
+            general_pointData_time_info = _point_data_info(pointData_i, dtype)
+
+            self._write_vtk_index(filename_pattern + '.{0:0{1}d}'.format(i, lz), geometry,
+                                  [filename_pattern + f'.{r}' + '.{0:0{1}d}'.format(i, lz) for r in range(size)],
+                                  piece_starts, general_pointData_time_info, cellData_info,
+                                  dtype, structured)
+
+        self._write_vtk_piece(filename_time_dependent + '.{0:0{1}d}'.format(i, lz), geometry,
+                              pointData_i, cellData, dtype, structured)
+
+        return self._loaded_t, (pointData_i if debug else None)
+
+    def _export_snapshots_in_pool(self, workers, snapshots, args):
+        """
+        Export the snapshots with a pool of forked processes (see ``export_to_vtk``).
+        Returns the list of the results of ``_export_snapshot_to_vtk``, or None if
+        the processes cannot be forked on this platform.
+        """
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            warnings.warn("Processes cannot be forked on this platform, snapshots are exported serially")
+            return None
+
+        # The first snapshot is exported by the calling process, which computes
+        # the Jacobians needed by the pushforward before they are inherited by the workers
+        results = [self._export_snapshot_to_vtk(0, snapshots[0], *args)]
+
+        # HDF5 files must not be shared with forked processes: each worker opens its own
+        self.close()
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('fork'),
+                                     initializer=_init_export_worker,
+                                     initargs=(self, args)) as executor:
+                indices = range(1, len(snapshots))
+                results.extend(executor.map(_export_snapshot_worker, indices, snapshots[1:]))
+        finally:
+            self.get_snapshot_list()
+
+        return results
+
+    def _export_to_vtk_helper(self, shape, fields=None, loaded_fields=None):
         """
         Helper function to make the proper function easier to read.
         The correct fields are supposed to be already loaded. 
@@ -1243,12 +2231,16 @@ class PostProcessManager:
             Shape of the mesh
         
         fields : dict, optional
-            
+
+        loaded_fields : dict, optional
+            Fields to choose from, by default the last loaded ones.
         """
+        if loaded_fields is None:
+            loaded_fields = self._last_loaded_fields
         fields_relevant = {}
         for vtk_name, f_name in fields.items():
-            if f_name in self._last_loaded_fields.keys():
-                fields_relevant[vtk_name] = self._last_loaded_fields[f_name]
+            if f_name in loaded_fields.keys():
+                fields_relevant[vtk_name] = loaded_fields[f_name]
         pointData_int = self._pushforward(fields=fields_relevant)
         pointData = {}
         if self._domain_h.ldim == 2:
@@ -1263,11 +2255,16 @@ class PostProcessManager:
 
         return pointData
 
-    def _compute_unstructured_mesh_info(self, mapping_local_domain, npts_per_cell=None, cell_indexes=None):
+    @staticmethod
+    def _compute_unstructured_mesh_info(mapping_local_domain, npts_per_cell=None, cell_indexes=None):
         """
         Computes the connection, offset and celltypes arrays for exportation
         as VTK unstructured grid.
 
+        The arrays only depend on the number of points along each direction:
+        they are computed with vectorized index arithmetic and cached (see
+        _unstructured_mesh_info). They are read-only.
+
         Parameters
         ----------
 
@@ -1292,126 +2289,179 @@ class PostProcessManager:
         ldim = len(starts)
 
         if npts_per_cell is not None:
-            n_elem = tuple(ends[i] + 1 - starts[i] for i in range(ldim))
-            cellshape = np.array(n_elem) * (np.array(npts_per_cell)) - 1
-            total_number_cells_vtk = np.prod(cellshape)
-            celltypes = np.zeros(total_number_cells_vtk, dtype='i')
-            offsets = np.arange(1, total_number_cells_vtk + 1, dtype='i') * (2 ** ldim)
-            connectivity = np.zeros(total_number_cells_vtk * 2 ** ldim, dtype='i')
-            if ldim == 2: 
-                celltypes[:] = VtkQuad.tid
-                cellID = 0
-                for i in range(n_elem[0] * npts_per_cell[0] - 1):
-                    for j  in range(n_elem[1] * npts_per_cell[1] - 1):
-                        row_top = i 
-                        col_left = j
-
-                        # VTK uses Fortran ordering
-                        topleft = col_left * npts_per_cell[0] * n_elem[0] + row_top
-                        topright = topleft + 1
-                        botleft = topleft + n_elem[0] * npts_per_cell[0] # next column
-                        botright = botleft + 1
-
-                        connectivity[4 * cellID: 4 * cellID + 4] = [topleft, topright, botright, botleft]
-
-                        cellID += 1
-    
-            elif ldim == 3:
-                celltypes[:] = VtkHexahedron.tid
-                cellID = 0
-                n_rows = n_elem[0] * npts_per_cell[0]
-                n_cols = n_elem[1] * npts_per_cell[1]
-                n_layers = n_elem[2] * npts_per_cell[2]
-                for i in range(n_rows - 1):
-                    for j in range(n_cols - 1):
-                        for k in range(n_layers - 1):
-
-                            row_top = i
-                            col_left = j 
-                            layer_front = k
-                            
-                            # VTK uses Fortran ordering
-                            top_left_front = row_top + col_left * n_rows + layer_front * n_cols * n_rows
-                            top_left_back = top_left_front + 1
-                            top_right_front = top_left_front + n_rows # next column
-                            top_right_back = top_right_front + 1
-
-                            bot_left_front = top_left_front + n_rows * n_cols # next layer
-                            bot_left_back = bot_left_front + 1
-                            bot_right_front = bot_left_front + n_rows # next column
-                            bot_right_back = bot_right_front + 1
-
-                            connectivity[8 * cellID: 8 * cellID + 8] = [
-                                top_left_front, top_right_front, bot_right_front, bot_left_front,
-                                top_left_back, top_right_back, bot_right_back, bot_left_back
-                            ]
-
-                            cellID += 1
-        
+            if isinstance(npts_per_cell, int):
+                npts_per_cell = (npts_per_cell,) * ldim
+            n_points = tuple(int((ends[i] + 1 - starts[i]) * npts_per_cell[i]) for i in range(ldim))
+
         elif cell_indexes is not None:
             i_starts = [np.searchsorted(cell_indexes[i], starts[i], side='left') for i in range(ldim)]
             i_ends = [np.searchsorted(cell_indexes[i], ends[i], side='right') for i in range(ldim)]
-            n_points = tuple(i_ends[i] - i_starts[i] for i in range(ldim))
+            n_points = tuple(int(i_ends[i] - i_starts[i]) for i in range(ldim))
 
-            cellshape = np.array([n_points[i] - 1 for i in range(ldim)])
-            total_number_cells_vtk = np.prod(cellshape)
-            celltypes = np.zeros(total_number_cells_vtk, dtype='i')
-            offsets = np.arange(1, total_number_cells_vtk + 1, dtype='i') * (2 ** ldim)
-            connectivity = np.zeros(total_number_cells_vtk * 2 ** ldim, dtype='i')
-            if ldim == 2:
-                cellID = 0
-                celltypes[:] = VtkQuad.tid
-                for i in range(i_ends[0] - 1 - i_starts[0]):
-                    for j in range(i_ends[1] - 1 - i_starts[1]):
+        else:
+            raise NotImplementedError("Not Supported Yet")
 
-                        row_top = i
-                        col_left = j
+        if ldim not in (2, 3):
+            raise NotImplementedError("Not Supported Yet")
 
-                        # VTK uses Fortran ordering
-                        topleft = row_top + col_left * n_points[0]
-                        topright = topleft + 1
-                        botleft = topleft + n_points[0]
-                        botright = botleft +1
+        connectivity, offsets, celltypes = _unstructured_mesh_info(n_points)
+        cellshape = np.array([n - 1 for n in n_points])
 
-                        connectivity[4 * cellID: 4 * cellID + 4] = [topleft, topright, botright, botleft]
-                        cellID += 1
+        return connectivity, offsets, celltypes, cellshape
 
-            elif ldim == 3:
-                cellID = 0
-                celltypes[:] = VtkHexahedron.tid
-                n_rows = n_points[0]
-                n_cols = n_points[1]
-                n_layers = n_points[2]
-                for i in range(i_ends[0] - 1 - i_starts[0]):
-                    for j in range(i_ends[1] - 1 - i_starts[1]):
-                        for k in range(i_ends[2] - 1 - i_starts[2]):
-                            row_top = i
-                            col_left = j
-                            layer_front = k
-
-                            # VTK uses Fortran ordering
-                            top_left_front = row_top + col_left * n_rows + layer_front * n_cols * n_rows
-                            top_left_back = top_left_front + 1
-                            top_right_front = top_left_front + n_rows # next column
-                            top_right_back = top_right_front + 1
-
-                            bot_left_front = top_left_front + n_rows * n_cols # next layer
-                            bot_left_back = bot_left_front + 1
-                            bot_right_front = bot_left_front + n_rows # next column
-                            bot_right_back = bot_right_front + 1
-
-
-                            connectivity[8 * cellID: 8 * cellID + 8] = [
-                                top_left_front, top_right_front, bot_right_front, bot_left_front,
-                                top_left_back, top_right_back, bot_right_back, bot_left_back
-                            ]
-
-                            cellID += 1
 
+# ===========================================================================
+# State of the worker processes of PostProcessManager.export_to_vtk
+_export_worker = None
+
+def _init_export_worker(manager, args):
+    global _export_worker
+    manager.fields_file = h5.File(manager.fields_filename, mode='r')
+    _export_worker = (manager, args)
+
+def _export_snapshot_worker(i, snapshot):
+    manager, args = _export_worker
+    return manager._export_snapshot_to_vtk(i, snapshot, *args)
+
+
+@lru_cache(maxsize=4)
+def _unstructured_mesh_info(n_points):
+    """
+    Connectivity, offsets and cell types of the VTK unstructured grid made of
+    the quadrilaterals (2D) or hexahedra (3D) of a tensor grid of points,
+    numbered in Fortran order as required by VTK. The cells are numbered in
+    C order.
+
+    Parameters
+    ----------
+    n_points : tuple of int
+        Number of points along each direction.
+
+    Returns
+    -------
+    connectivity : ndarray
+        1D array containing the connectivity between points
+    offsets : ndarray
+        1D array containing the index of the last vertex of each cell
+    celltypes : ndarray
+        1D array containing the type ID of each cell
+    """
+    ldim = len(n_points)
+    cellshape = tuple(n - 1 for n in n_points)
+    strides = np.cumprod((1,) + n_points[:-1])
+
+    # Index of the first vertex of each cell (VTK uses Fortran ordering)
+    first = np.zeros(cellshape, dtype='i')
+    for axis, index in enumerate(np.indices(cellshape, dtype='i', sparse=True)):
+        first += index * strides[axis]
+
+    # Shifts of the vertices of a cell, in the VTK order
+    if ldim == 2:
+        corners = [(0, 0), (1, 0), (1, 1), (0, 1)]
+        celltype = VtkQuad.tid
+    else:
+        corners = [(0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1),
+                   (1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)]
+        celltype = VtkHexahedron.tid
+    shifts = np.dot(np.array(corners, dtype='i'), strides).astype('i')
+
+    ncells = first.size
+    connectivity = (first.reshape(-1, 1) + shifts).ravel()
+    offsets = np.arange(1, ncells + 1, dtype='i') * len(corners)
+    celltypes = np.full(ncells, celltype, dtype='i')
+
+    for a in (connectivity, offsets, celltypes):
+        a.flags.writeable = False
+
+    return connectivity, offsets, celltypes
+
+
+def _cast_array(array, dtype):
+    """Convert a floating point array to dtype (if not None), other arrays are unchanged."""
+    if dtype is None or not np.issubdtype(array.dtype, np.floating):
+        return array
+    return np.ascontiguousarray(array, dtype=dtype)
+
+
+def _point_data_info(pointData, dtype):
+    """Data type and number of components of the arrays of a pointData dictionary, once written."""
+    info = {}
+    for name, data in pointData.items():
+        if isinstance(data, tuple):
+            info[name] = (_cast_array(data[0][:0], dtype).dtype, 3)
         else:
-            raise NotImplementedError("Not Supported Yet")
+            info[name] = (_cast_array(data[:0], dtype).dtype, 1)
+    return info
 
-        return connectivity, offsets, celltypes, cellshape
+
+def _scalar_space_discretization_kwargs(sc_sp, convert_deg_dict):
+    """
+    Arguments of ``discretize`` for a scalar space saved by an OutputManager:
+    the degree and the knots of the space from which it can be derived.
+    """
+    basis = list(set(sc_sp['basis']))
+    if len(basis) != 1:
+        basis = 'M'
+    else:
+        basis = basis[0]
+
+    multiplicity = sc_sp['multiplicity']
+    degree = sc_sp['degree']
+
+    new_degree, new_mul = convert_deg_dict[sc_sp['kind']](degree, multiplicity)
+
+    knots = [np.asarray(sc_sp['knots'][i]) for i in range(sc_sp['ldim'])]
+    periodic = sc_sp['periodic']
+
+    for i in range(sc_sp['ldim']):
+        if new_degree[i] != degree[i]:
+            for j in range(new_degree[i] - degree[i]):
+                knots[i] = elevate_knots(knots[i], degree[i], periodic=periodic[i])
+
+    return {
+        'degree': [int(new_degree[i]) for i in range(sc_sp['ldim'])],
+        'knots': knots,
+        'basis': basis,
+        'periodic': periodic,
+    }
+
+
+def _vector_space_discretization_kwargs(v_sp, convert_deg_dict):
+    """
+    Arguments of ``discretize`` for a vector space saved by an OutputManager:
+    the degree and the knots of the space from which it can be derived.
+    """
+    components = v_sp['components']
+
+    basis = []
+    for sc_sp in components:
+        basis += sc_sp['basis']
+
+    basis = list(set(basis))
+    if len(basis) != 1:
+        basis = 'M'
+    else:
+        basis = basis[0]
+
+    degree = [sc_sp['degree'] for sc_sp in components]
+    multiplicity = [sc_sp['multiplicity'] for sc_sp in components]
+
+    new_degree, new_mul = convert_deg_dict[v_sp['kind']](degree, multiplicity)
+
+    knots = [[np.asarray(sc_sp['knots'][i]) for i in range(sc_sp['ldim'])] for sc_sp in components][0]
+    periodic = components[0]['periodic']
+
+    for i in range(components[0]['ldim']):
+        if new_degree[i] != degree[0][i]:
+            for j in range(new_degree[i] - degree[0][i]):
+                knots[i] = elevate_knots(knots[i], degree[0][i], periodic=periodic[i])
+
+    return {
+        'degree': [int(new_degree[i]) for i in range(components[0]['ldim'])],
+        'knots': knots,
+        'basis': basis,
+        'periodic': periodic,
+    }
 
 
 def _augment_space_degree_dict(ldim, sequence='DR'):
@@ -1,8 +1,10 @@
 # coding: utf-8
 
 # ... Determine Pyccel version: compiler names changed with version 1.3.0
-import pyccel
-pyccel_version = tuple(map(int, pyccel.__version__.split('.')))
+# The version is read from the package metadata, which is much faster than
+# importing pyccel (only needed when the kernels are compiled)
+import importlib.metadata
+pyccel_version = tuple(map(int, importlib.metadata.version('pyccel').split('.')))
 pyccel_legacy  = pyccel_version < (1, 3, 0)
 # ...
 
@@ -16,13 +16,20 @@ def step_faraday_1d(dt, e, b, M0, M1, D0, D0_T, **kwargs):
     b -= dt * D0.dot(e)
   # e += 0
 
-def step_ampere_1d(dt, e, b, M0, M1, D0, D0_T, *, pc=None, tol=1e-7, verbose=False):
+def step_ampere_1d(dt, e, b, M0, M1, D0, D0_T, *, pc=None, tol=1e-7, verbose=False, solver=None):
     """
     Exactly integrate the semi-discrete Amperè equation over one time-step:
 
     e_new = e + ∆t (M0^{-1} D0^T M1) b
 
+    If a solver for M0 is given (e.g. a SolverSequence, which recycles the
+    previous solves of the time loop), 'pc' and 'tol' are not used.
+
     """
+    if solver is not None:
+        e += dt * solver.solve(D0_T.dot(M1.dot(b)))
+        return
+
     options = dict(tol=tol, verbose=verbose)
     if pc:
         from psydac.linalg.iterative_solvers import pcg as isolve
@@ -57,7 +64,7 @@ def update_plot(ax, t, sol_ex, sol_num):
 #==============================================================================
 def run_maxwell_1d(*, L, eps, ncells, degree, periodic, Cp, nsteps, tend,
         splitting_order, plot_interval, diagnostics_interval,
-        bc_mode, tol, verbose):
+        bc_mode, tol, verbose, recycle=False):
 
     import numpy as np
     import matplotlib.pyplot as plt
@@ -334,6 +341,11 @@ def run_maxwell_1d(*, L, eps, ncells, degree, periodic, Cp, nsteps, tend,
         kwargs['pc'] = 'jacobi'
     # ...
 
+    # Solver for the mass matrix which recycles the previous solves
+    if recycle:
+        from psydac.linalg.recycling import SolverSequence
+        kwargs['solver'] = SolverSequence(args[2], kwargs.get('pc'), tol=tol, recompute=False, verbose=verbose)
+
     # Time loop
     for i in range(nsteps):
 
@@ -457,7 +469,8 @@ def run_maxwell_1d(*, L, eps, ncells, degree, periodic, Cp, nsteps, tend,
 # UNIT TESTS
 #==============================================================================
 
-def test_maxwell_1d_periodic():
+@pytest.mark.parametrize('recycle', [False, True])
+def test_maxwell_1d_periodic(recycle):
 
     namespace = run_maxwell_1d(
         L        = 1.0,
@@ -473,7 +486,8 @@ def test_maxwell_1d_periodic():
         diagnostics_interval = 0,
         tol = 1e-6,
         bc_mode = None,
-        verbose = False
+        verbose = False,
+        recycle = recycle
     )
 
     TOL = 1e-6
@@ -484,7 +498,8 @@ def test_maxwell_1d_periodic():
     assert abs(namespace['error_B'] - ref['error_B']) / ref['error_B'] <= TOL
 
 
-def test_maxwell_1d_dirichlet_strong():
+@pytest.mark.parametrize('recycle', [False, True])
+def test_maxwell_1d_dirichlet_strong(recycle):
 
     namespace = run_maxwell_1d(
         L        = 1.0,
@@ -500,7 +515,8 @@ def test_maxwell_1d_dirichlet_strong():
         diagnostics_interval = 0,
         tol = 1e-6,
         bc_mode = 'strong',
-        verbose = False
+        verbose = False,
+        recycle = recycle
     )
 
     TOL = 1e-6
@@ -511,7 +527,8 @@ def test_maxwell_1d_dirichlet_strong():
     assert abs(namespace['error_B'] - ref['error_B']) / ref['error_B'] <= TOL
 
 
-def test_maxwell_1d_dirichlet_penalization():
+@pytest.mark.parametrize('recycle', [False, True])
+def test_maxwell_1d_dirichlet_penalization(recycle):
 
     namespace = run_maxwell_1d(
         L        = 1.0,
@@ -527,7 +544,8 @@ def test_maxwell_1d_dirichlet_penalization():
         diagnostics_interval = 0,
         tol = 1e-6,
         bc_mode = 'penalization',
-        verbose = False
+        verbose = False,
+        recycle = recycle
     )
 
     TOL = 1e-6
@@ -537,6 +555,34 @@ def test_maxwell_1d_dirichlet_penalization():
     assert abs(namespace['error_E'] - ref['error_E']) / ref['error_E'] <= TOL
     assert abs(namespace['error_B'] - ref['error_B']) / ref['error_B'] <= TOL
 
+@pytest.mark.parametrize('bc_mode', [None, 'strong', 'penalization'])
+def test_maxwell_1d_recycle(bc_mode):
+
+    # With one solve per step, the previous solutions are used from step 2 on
+    kwargs = dict(
+        L        = 1.0,
+        eps      = 0.5,
+        ncells   = 20,
+        degree   = 5,
+        periodic = bc_mode is None,
+        Cp       = 0.5,
+        nsteps   = 5,
+        tend     = None,
+        splitting_order      = 2,
+        plot_interval        = 0,
+        diagnostics_interval = 0,
+        tol = 1e-10,
+        bc_mode = bc_mode,
+        verbose = False
+    )
+
+    ref       = run_maxwell_1d(**kwargs, recycle=False)
+    namespace = run_maxwell_1d(**kwargs, recycle=True)
+
+    TOL = 1e-6
+    assert abs(namespace['error_E'] - ref['error_E']) / ref['error_E'] <= TOL
+    assert abs(namespace['error_B'] - ref['error_B']) / ref['error_B'] <= TOL
+
 @pytest.mark.parallel
 def test_maxwell_1d_periodic_par():
 
@@ -715,6 +761,11 @@ if __name__ == '__main__':
         help    = 'Print convergence information of iterative solver'
     )
 
+    parser.add_argument( '--recycle',
+        action  = 'store_true',
+        help    = 'Recycle the previous solutions and Krylov subspaces in the iterative solver'
+    )
+
     parser.add_argument( '--tol',
         type    = float,
         default = 1e-7,
@@ -16,13 +16,20 @@ def step_faraday_2d(dt, e, b, M1, M2, D1, D1_T, **kwargs):
     b -= dt * D1.dot(e)
   # e += 0
 
-def step_ampere_2d(dt, e, b, M1, M2, D1, D1_T, *, pc=None, tol=1e-7, verbose=False):
+def step_ampere_2d(dt, e, b, M1, M2, D1, D1_T, *, pc=None, tol=1e-7, verbose=False, solver=None):
     """
     Exactly integrate the semi-discrete Amperè equation over one time-step:
 
     e_new = e - ∆t (M1^{-1} D1^T M2) b
 
+    If a solver for M1 is given (e.g. a SolverSequence, which recycles the
+    previous solves of the time loop), 'pc' and 'tol' are not used.
+
     """
+    if solver is not None:
+        e += dt * solver.solve(D1_T.dot(M2.dot(b)))
+        return
+
     options = dict(tol=tol, verbose=verbose)
     if pc:
         from psydac.linalg.iterative_solvers import pcg as isolve
@@ -193,7 +200,7 @@ def update_plot(fig, t, x, y, field_h, field_ex):
 # SIMULATION
 #==============================================================================
 def run_maxwell_2d_TE(*, eps, ncells, degree, periodic, Cp, nsteps, tend,
-        splitting_order, plot_interval, diagnostics_interval, tol, verbose):
+        splitting_order, plot_interval, diagnostics_interval, tol, verbose, recycle=False):
 
     import numpy as np
     import matplotlib.pyplot as plt
@@ -463,6 +470,11 @@ def run_maxwell_2d_TE(*, eps, ncells, degree, periodic, Cp, nsteps, tend,
         kwargs['pc'] = 'jacobi'
     # ...
 
+    # Solver for the mass matrix which recycles the previous solves
+    if recycle:
+        from psydac.linalg.recycling import SolverSequence
+        kwargs['solver'] = SolverSequence(args[2], kwargs.get('pc'), tol=tol, recompute=False, verbose=verbose)
+
     # Time loop
     for ts in range(1, nsteps+1):
 
@@ -609,7 +621,8 @@ def run_maxwell_2d_TE(*, eps, ncells, degree, periodic, Cp, nsteps, tend,
 # UNIT TESTS
 #==============================================================================
 
-def test_maxwell_2d_periodic():
+@pytest.mark.parametrize('recycle', [False, True])
+def test_maxwell_2d_periodic(recycle):
 
     namespace = run_maxwell_2d_TE(
         eps      = 0.5,
@@ -623,7 +636,8 @@ def test_maxwell_2d_periodic():
         plot_interval        = 0,
         diagnostics_interval = 0,
         tol = 1e-6,
-        verbose = False
+        verbose = False,
+        recycle = recycle
     )
 
     TOL = 1e-6
@@ -636,7 +650,8 @@ def test_maxwell_2d_periodic():
     assert abs(namespace['error_Bz'] - ref['error_Bz']) / ref['error_Bz'] <= TOL
 
 
-def test_maxwell_2d_dirichlet():
+@pytest.mark.parametrize('recycle', [False, True])
+def test_maxwell_2d_dirichlet(recycle):
 
     namespace = run_maxwell_2d_TE(
         eps      = 0.5,
@@ -650,7 +665,8 @@ def test_maxwell_2d_dirichlet():
         plot_interval        = 0,
         diagnostics_interval = 0,
         tol = 1e-6,
-        verbose = False
+        verbose = False,
+        recycle = recycle
     )
 
     TOL = 1e-6
@@ -662,6 +678,33 @@ def test_maxwell_2d_dirichlet():
     assert abs(namespace['error_Ey'] - ref['error_Ey']) / ref['error_Ey'] <= TOL
     assert abs(namespace['error_Bz'] - ref['error_Bz']) / ref['error_Bz'] <= TOL
 
+@pytest.mark.parametrize('periodic', [True, False])
+def test_maxwell_2d_recycle(periodic):
+
+    # With one solve per step, the previous solutions are used from step 2 on
+    kwargs = dict(
+        eps      = 0.5,
+        ncells   = 10,
+        degree   = 3,
+        periodic = periodic,
+        Cp       = 0.5,
+        nsteps   = 5,
+        tend     = None,
+        splitting_order      = 2,
+        plot_interval        = 0,
+        diagnostics_interval = 0,
+        tol = 1e-10,
+        verbose = False
+    )
+
+    ref       = run_maxwell_2d_TE(**kwargs, recycle=False)
+    namespace = run_maxwell_2d_TE(**kwargs, recycle=True)
+
+    TOL = 1e-6
+    assert abs(namespace['error_Ex'] - ref['error_Ex']) / ref['error_Ex'] <= TOL
+    assert abs(namespace['error_Ey'] - ref['error_Ey']) / ref['error_Ey'] <= TOL
+    assert abs(namespace['error_Bz'] - ref['error_Bz']) / ref['error_Bz'] <= TOL
+
 @pytest.mark.parallel
 def test_maxwell_2d_periodic_par():
 
@@ -810,6 +853,11 @@ if __name__ == '__main__':
         help    = 'Print convergence information of iterative solver'
     )
 
+    parser.add_argument( '--recycle',
+        action  = 'store_true',
+        help    = 'Recycle the previous solutions and Krylov subspaces in the iterative solver'
+    )
+
     # Read input arguments
     args = parser.parse_args()
 
@@ -1,18 +1,35 @@
+import os
 import pytest
+import numpy as np
 from sympy import pi, sin, cos, tan, atan, atan2
 from sympy import exp, sinh, cosh, tanh, atanh
 
-from sympde.topology import Line, Square
+from sympde.calculus import grad, dot
+from sympde.topology import Line, Square, Domain
 from sympde.topology import ScalarFunctionSpace
 from sympde.topology import element_of
 from sympde.core     import Constant
 from sympde.expr     import BilinearForm
 from sympde.expr     import LinearForm
+from sympde.expr     import Norm
 from sympde.expr     import integral
 
 from psydac.api.discretization import discretize
+from psydac.api.fem            import DiscreteSumForm
 from psydac.fem.basic          import FemField
 from psydac.api.settings       import PSYDAC_BACKENDS
+from psydac.linalg.stencil     import StencilVector
+from psydac.linalg.direct_solvers import DiagonalSolver
+
+# ... get the mesh directory
+try:
+    mesh_dir = os.environ['PSYDAC_MESH_DIR']
+
+except:
+    base_dir = os.path.dirname(os.path.realpath(__file__))
+    base_dir = os.path.join(base_dir, '..', '..', '..')
+    mesh_dir = os.path.join(base_dir, 'mesh')
+# ...
 
 #==============================================================================
 @pytest.fixture(params=[None, 'numba', 'pyccel-gcc'])
@@ -102,6 +119,259 @@ def test_multiple_fields(backend):
 
     print("PASSED")
 
+#==============================================================================
+def test_reuse_assembly(backend):
+
+    # If 'backend' is specified, accelerate Python code by passing **kwargs
+    # to discretization of bilinear forms, linear forms and functionals.
+    kwargs = {'backend': PSYDAC_BACKENDS[backend]} if backend else {}
+
+    domain = Square()
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+    f = element_of(V, name='f')
+    c = Constant(name='c')
+
+    g = c * f**2
+    a = BilinearForm((u, v), integral(domain, u * v * g))
+    l = LinearForm(v, integral(domain, g * v))
+
+    ncells = (5, 5)
+    degree = (3, 3)
+    domain_h = discretize(domain, ncells=ncells)
+    Vh = discretize(V, domain_h, degree=degree)
+    ah = discretize(a, domain_h, [Vh, Vh], **kwargs)
+    lh = discretize(l, domain_h,      Vh , **kwargs)
+
+    fh = FemField(Vh)
+    fh.coeffs[:] = 1
+    x  = fh.coeffs.copy()
+
+    A = ah.assemble(c=1.0, f=fh, reuse=True)
+    b = lh.assemble(f=fh, c=1.0, reuse=True)
+
+    # Same arguments: assembly is skipped, and changes to the matrix are kept
+    A *= 3.0
+    b *= 3.0
+    assert ah.assemble(c=1.0, f=fh, reuse=True) is A
+    assert abs(A.dot(x).dot(x) - 3) < 1e-12
+    assert abs(lh.assemble(f=fh, c=1.0, reuse=True).toarray().sum() - 3) < 1e-12
+
+    # Different constant: reassembly
+    A = ah.assemble(c=2.0, f=fh, reuse=True)
+    assert abs(A.dot(x).dot(x) - 2) < 1e-12
+
+    # Modified field coefficients: reassembly
+    fh.coeffs[:] = 2
+    A = ah.assemble(c=2.0, f=fh, reuse=True)
+    b = lh.assemble(f=fh, c=2.0, reuse=True)
+    assert abs(A.dot(x).dot(x) - 8) < 1e-12
+    assert abs(b.toarray().sum() - 8) < 1e-12
+
+    # Without 'reuse' the matrix is always assembled
+    A *= 0.0
+    A = ah.assemble(c=2.0, f=fh)
+    assert abs(A.dot(x).dot(x) - 8) < 1e-12
+
+    print("PASSED")
+
+#==============================================================================
+@pytest.mark.parametrize('geometry', ['collela_2d.h5', 'quarter_annulus.h5'])
+def test_geometry_cache(geometry, backend):
+
+    # If 'backend' is specified, accelerate Python code by passing **kwargs
+    # to discretization of bilinear forms, linear forms and functionals.
+    kwargs = {'backend': PSYDAC_BACKENDS[backend]} if backend else {}
+
+    filename = os.path.join(mesh_dir, geometry)
+    domain   = Domain.from_file(filename)
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+    f = element_of(V, name='f')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u * v))
+    l = LinearForm(v, integral(domain, f * v))
+    n = Norm(f, domain, kind='l2')
+
+    domain_h = discretize(domain, filename=filename)
+    Vh = discretize(V, domain_h)
+    fh = FemField(Vh)
+    fh.coeffs[:] = 1
+
+    # Reference: the mapping is evaluated in the assembly kernels
+    A0 = discretize(a, domain_h, [Vh, Vh], **kwargs).assemble()
+    b0 = discretize(l, domain_h,      Vh , **kwargs).assemble(f=fh)
+    n0 = discretize(n, domain_h,      Vh , **kwargs).assemble(f=fh)
+
+    # All the forms share the same precomputed values of the mapping
+    cache = domain_h.enable_geometry_cache()
+    A1 = discretize(a, domain_h, [Vh, Vh], **kwargs).assemble()
+    b1 = discretize(l, domain_h,      Vh , **kwargs).assemble(f=fh)
+    nh = discretize(n, domain_h,      Vh , **kwargs)
+    n1 = nh.assemble(f=fh)
+    nbytes = cache.nbytes
+
+    assert nbytes > 0
+    assert abs(A1.toarray() - A0.toarray()).max() < 1e-12
+    assert abs(b1.toarray() - b0.toarray()).max() < 1e-12
+    assert abs(n1 - n0) < 1e-12
+
+    # Derivatives of order 1 are not cached if the limit is 0
+    domain_h.enable_geometry_cache(max_nderiv=0)
+    A2 = discretize(a, domain_h, [Vh, Vh], **kwargs).assemble()
+    assert domain_h.geometry_cache.nbytes == 0
+    assert abs(A2.toarray() - A0.toarray()).max() < 1e-12
+
+    # The cached values are refreshed if the mapping is modified
+    mapping = list(domain_h.mappings.values())[0]
+    values  = cache.get(mapping, 1)
+    x       = values[0].copy()
+    coeffs  = mapping.fields[0].coeffs
+    coeffs *= 2.0
+    assert cache.get(mapping, 1)[0] is values[0]
+    assert np.allclose(values[0], 2 * x)
+
+    # ... including the local copies of a functional (the new reference does
+    # not use the cache, which does not accept derivatives of order 1)
+    n3 = discretize(n, domain_h, Vh, **kwargs).assemble(f=fh)
+    assert abs(n3 - n1) > 1e-6
+    assert abs(nh.assemble(f=fh) - n3) < 1e-12
+
+    print("PASSED")
+
+#==============================================================================
+def test_balance_geometry_file():
+
+    filename = os.path.join(mesh_dir, 'collela_2d.h5')
+    domain   = Domain.from_file(filename)
+    V        = ScalarFunctionSpace('V', domain)
+    domain_h = discretize(domain, filename=filename)
+
+    # The spaces of the mapping have a uniform decomposition
+    Vh = discretize(V, domain_h, balance='uniform')
+    assert Vh is list(domain_h.mappings.values())[0].space
+
+    with pytest.raises(NotImplementedError):
+        discretize(V, domain_h, balance='weighted')
+
+#==============================================================================
+def test_balance_arguments():
+
+    from mpi4py import MPI
+    from psydac.ddm.cart    import CartDecomposition
+    from psydac.fem.splines import SplineSpace
+    from psydac.fem.tensor  import TensorFemSpace
+
+    domain   = Square()
+    V        = ScalarFunctionSpace('V', domain)
+    domain_h = discretize(domain, ncells=(4, 4))
+
+    # The arguments are checked as in parallel, even if they are not used
+    Vh = discretize(V, domain_h, degree=(2, 2), balance='weighted')
+    assert Vh.load_imbalance == 1.0
+
+    with pytest.raises(ValueError):
+        discretize(V, domain_h, degree=(2, 2), balance='bogus')
+
+    spaces = [SplineSpace(2, grid=np.linspace(0, 1, 5)) for _ in range(2)]
+    with pytest.raises(ValueError):
+        TensorFemSpace(*spaces, balance='weighted', element_costs=[np.ones(4)])
+    with pytest.raises(ValueError):
+        TensorFemSpace(*spaces, balance='weighted', element_costs=[np.ones(4), np.ones(3)])
+
+    cart = CartDecomposition([6, 6], [2, 2], [False, False], reorder=False, comm=MPI.COMM_WORLD)
+    with pytest.raises(ValueError):
+        TensorFemSpace(*spaces, cart=cart, balance='bogus')
+
+#==============================================================================
+def test_mass_lumping(backend):
+
+    # If 'backend' is specified, accelerate Python code by passing **kwargs
+    # to discretization of bilinear forms, linear forms and functionals.
+    kwargs = {'backend': PSYDAC_BACKENDS[backend]} if backend else {}
+
+    domain = Square()
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+
+    a = BilinearForm((u, v), integral(domain, u * v))
+    l = LinearForm(v, integral(domain, v))
+
+    ncells = (6, 6)
+    degree = (2, 2)
+    domain_h = discretize(domain, ncells=ncells)
+    Vh = discretize(V, domain_h, degree=degree)
+
+    M = discretize(a, domain_h, [Vh, Vh], **kwargs).assemble()
+    b = discretize(l, domain_h,      Vh , **kwargs).assemble()
+
+    # The lumped mass matrix is stored as a vector of row sums, which are the
+    # integrals of the basis functions (partition of unity)
+    ah = discretize(a, domain_h, [Vh, Vh], lumped=True, **kwargs)
+    D  = ah.assemble()
+    assert ah.lumped
+    assert isinstance(D, StencilVector)
+    assert abs(D.toarray() - M.toarray().sum(axis=1)).max() < 1e-12
+    assert abs(D.toarray() - b.toarray()).max() < 1e-12
+    assert ah.assemble(reuse=True) is D
+
+    # Inverting the lumped mass matrix is an element-wise division
+    x = DiagonalSolver(D).solve(b)
+    assert abs(x.toarray() - 1).max() < 1e-12
+
+    # Gauss-Lobatto quadrature with the same number of points is not exact
+    # for the mass matrix, but it is for the integrals of the basis functions
+    Vh_gl = discretize(V, domain_h, degree=degree, quad_family='lobatto')
+    assert Vh_gl.quad_family == 'lobatto'
+    assert all(g.quad_family == 'lobatto' for g in Vh_gl.quad_grids)
+
+    M_gl = discretize(a, domain_h, [Vh_gl, Vh_gl], **kwargs).assemble()
+    b_gl = discretize(l, domain_h,        Vh_gl , **kwargs).assemble()
+    assert abs(M_gl.toarray() - M.toarray()).max() > 1e-6
+    assert abs(M_gl.toarray().sum(axis=1) - b.toarray()).max() < 1e-12
+    assert abs(b_gl.toarray() - b.toarray()).max() < 1e-12
+
+    print("PASSED")
+
+#==============================================================================
+def test_sum_form_dtype(backend):
+
+    # If 'backend' is specified, accelerate Python code by passing **kwargs
+    # to discretization of bilinear forms, linear forms and functionals.
+    kwargs = {'backend': PSYDAC_BACKENDS[backend]} if backend else {}
+
+    domain = Square()
+    B = domain.boundary
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+
+    # Integrals over the domain and its boundary: sum of discrete forms
+    a = BilinearForm((u, v), integral(domain, u * v) + integral(B, u * v))
+
+    domain_h = discretize(domain, ncells=(4, 4))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+
+    ah = discretize(a, domain_h, [Vh, Vh], **kwargs)
+    assert isinstance(ah, DiscreteSumForm)
+
+    # The complete sum is converted once, into a copy stored by the sum form
+    A   = ah.assemble()
+    A32 = ah.assemble(dtype='float32')
+    assert A32 is not A
+    assert A32.data_dtype == np.float32
+    assert np.array_equal(A32._data, A._data.astype(np.float32))
+    assert ah.assemble(dtype=np.float32) is A32
+    assert all(not form._converted_matrices for form in ah.forms)
+
+    # No conversion of a lumped matrix
+    ah_lumped = discretize(a, domain_h, [Vh, Vh], lumped=True, **kwargs)
+    with pytest.raises(ValueError):
+        ah_lumped.assemble(dtype='float32')
+
 #==============================================================================
 def test_math_imports(backend):
 
@@ -142,4 +412,7 @@ def test_math_imports(backend):
 if __name__ == '__main__':
     test_field_and_constant(None)
     test_multiple_fields(None)
+    test_reuse_assembly(None)
+    test_geometry_cache('quarter_annulus.h5', None)
+    test_mass_lumping(None)
     test_math_imports(None)
@@ -10,10 +10,15 @@ from sympde.expr     import LinearForm
 from sympde.expr     import integral
 from sympde.expr     import find
 from sympde.expr     import EssentialBC
+from sympde.calculus import dot, grad
 
-from psydac.fem.basic          import FemField
-from psydac.api.discretization import discretize
-from psydac.api.settings       import PSYDAC_BACKENDS
+from psydac.fem.basic             import FemField
+from psydac.api.discretization    import discretize
+from psydac.api.settings          import PSYDAC_BACKENDS
+from psydac.linalg.kron           import KroneckerLinearSolver
+from psydac.linalg.direct_solvers import SparseSolver
+
+from scipy.sparse import identity
 
 #==============================================================================
 @pytest.fixture(params=[None, 'numba', 'pyccel-gcc'])
@@ -59,3 +64,87 @@ def test_field_and_constant(backend):
 
     # Verify that solution is equal to c_value
     assert np.allclose(xh.coeffs.toarray(), c_value, rtol=1e-10, atol=1e-16)
+
+#==============================================================================
+def test_reuse_linear_system():
+
+    # L2 projection of a discrete field
+    domain = Square()
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+    f = element_of(V, name='f')
+
+    a = BilinearForm((u, v), integral(domain, u * v))
+    l = LinearForm(v, integral(domain, f * v))
+
+    equation = find(u, forall=v, lhs=a(u, v), rhs=l(v))
+
+    domain_h = discretize(domain, ncells=(4, 4))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+    equation_h = discretize(equation, domain_h, [Vh, Vh])
+    equation_h.set_solver('cg', tol=1e-12)
+
+    fh = FemField(Vh)
+    fh.coeffs[:] = 1
+    xh = equation_h.solve(f=fh, reuse=True)
+    assert np.allclose(xh.coeffs.toarray(), 1, rtol=0, atol=1e-10)
+
+    # Unchanged field: the right-hand side is reused if requested
+    b = equation_h.linear_system.rhs
+    equation_h.solve(f=fh, reuse=True)
+    assert equation_h.linear_system.rhs is b
+
+    # Field modified as the output of a Kronecker solver, f <- 2 f: its
+    # version changes, and the right-hand side is assembled again
+    solver = KroneckerLinearSolver(Vh.vector_space, [SparseSolver(c * identity(n, format='csr'))
+                                                     for c, n in zip([0.5, 1.0], Vh.vector_space.npts)])
+    solver.solve(fh.coeffs.copy(), out=fh.coeffs)
+    xh = equation_h.solve(f=fh, reuse=True)
+    assert np.allclose(xh.coeffs.toarray(), 2, rtol=0, atol=1e-10)
+
+    # Field modified without updating its version: the system is assembled
+    # again by default
+    fh.coeffs._data[...] *= 3
+    xh = equation_h.solve(f=fh)
+    assert np.allclose(xh.coeffs.toarray(), 6, rtol=0, atol=1e-10)
+
+#==============================================================================
+def test_solver_sequence():
+
+    # Poisson problem whose source and boundary conditions depend on a constant
+    domain = Square()
+    x, y = domain.coordinates
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+    c = Constant(name='c')
+
+    g = c * x * y + (1 - c) * x**2
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+    l = LinearForm(v, integral(domain, -2 * (1 - c) * v))
+    bc = EssentialBC(u, g, domain.boundary)
+
+    equation = find(u, forall=v, lhs=a(u, v), rhs=l(v), bc=bc)
+
+    domain_h = discretize(domain, ncells=(8, 8))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+    equation_h = discretize(equation, domain_h, [Vh, Vh])
+    reference_h = discretize(equation, domain_h, [Vh, Vh])
+
+    # The solver sequence is kept between the calls to 'solve'
+    equation_h.set_solver('sequence', tol=1e-12, nguess=2, ndefl=4, info=True)
+    reference_h.set_solver('cg', tol=1e-12)
+
+    niter = []
+    for c_value in [0., 0.1, 0.2, 0.3]:
+        xh, info = equation_h.solve(c=c_value)
+        ref = reference_h.solve(c=c_value)
+        niter.append(info['niter'])
+
+        assert info['success']
+        assert np.allclose(xh.coeffs.toarray(), ref.coeffs.toarray(), rtol=0, atol=1e-10)
+
+    # The solution is linear in c, hence close to the span of the last two
+    # solutions (up to the tolerance of the L2 projection of the boundary data)
+    assert niter[-1] < niter[0] / 2
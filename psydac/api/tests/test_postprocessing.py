@@ -2,6 +2,7 @@ import pytest
 import os
 import glob
 import numpy as np
+import h5py as h5
 
 from sympde.topology import Square, Cube, ScalarFunctionSpace, VectorFunctionSpace, Domain, Derham
 from sympde.topology.analytical_mapping import IdentityMapping, AffineMapping
@@ -10,6 +11,7 @@ from psydac.api.discretization import discretize
 from psydac.fem.basic import FemField
 from psydac.api.postprocessing import OutputManager, PostProcessManager
 from psydac.utilities.utils import refine_array_1d
+from psydac.utilities.hdf5 import DatasetStorage
 
 try:
     mesh_dir = os.environ['PSYDAC_MESH_DIR']
@@ -158,6 +160,110 @@ def test_OutputManager():
     os.remove('file.yml')
 
 
+@pytest.mark.parametrize('compression', [None, 'gzip', 'lzf'])
+def test_OutputManager_storage(compression):
+
+    domain = Square('D')
+    A = ScalarFunctionSpace('A', domain, kind='H1')
+    B = VectorFunctionSpace('B', domain, kind='hcurl')
+
+    domain_h = discretize(domain, ncells=[8, 8])
+
+    Ah = discretize(A, domain_h, degree=[3, 3])
+    Bh = discretize(B, domain_h, degree=[2, 2])
+
+    uh = FemField(Ah)
+    vh = FemField(Bh)
+    uh.coeffs[:] = np.random.random(size=uh.coeffs[:].shape)
+    vh.coeffs[0][:] = np.random.random(size=vh.coeffs[0][:].shape)
+    vh.coeffs[1][:] = np.random.random(size=vh.coeffs[1][:].shape)
+
+    storage = DatasetStorage(compression=compression, shuffle=compression is not None, dtype=np.float32)
+
+    Om = OutputManager('file_storage.yml', 'file_storage.h5', storage=storage)
+    Om.add_spaces(Ah=Ah, Bh=Bh)
+    Om.add_snapshot(t=0., ts=0)
+    Om.export_fields(uh=uh, vh=vh)
+    Om.export_space_info()
+    Om.close()
+
+    # The layout of the datasets follows the storage options
+    with h5.File('file_storage.h5', mode='r') as f:
+        dset = f['snapshot_0000/D/Ah/uh']
+        assert dset.dtype == np.float32
+        assert dset.compression == compression
+        if compression is not None:
+            assert dset.chunks == Ah.vector_space.npts
+            assert dset.shuffle
+
+    # The fields are read back in double precision, up to the float32 rounding
+    Pm = PostProcessManager(domain=domain, space_file='file_storage.yml', fields_file='file_storage.h5')
+    Pm.load_snapshot(0, 'uh', 'vh')
+    u_new = Pm._snapshot_fields['uh']
+    v_new = Pm._snapshot_fields['vh']
+
+    assert np.allclose(u_new.coeffs.toarray(), uh.coeffs.toarray(), rtol=1e-6, atol=0)
+    assert np.allclose(v_new.coeffs.toarray(), vh.coeffs.toarray(), rtol=1e-6, atol=0)
+    Pm.close()
+
+    with pytest.raises(ValueError):
+        DatasetStorage(compression='szip')
+
+    os.remove('file_storage.h5')
+    os.remove('file_storage.yml')
+
+
+def test_OutputManager_asynchronous():
+
+    domain = Square('D')
+    A = ScalarFunctionSpace('A', domain, kind='H1')
+    B = VectorFunctionSpace('B', domain, kind='hdiv')
+
+    domain_h = discretize(domain, ncells=[6, 6])
+
+    Ah = discretize(A, domain_h, degree=[2, 2])
+    Bh = discretize(B, domain_h, degree=[2, 2])
+
+    uh = FemField(Ah)
+    vh = FemField(Bh)
+
+    Om = OutputManager('file_async.yml', 'file_async.h5', asynchronous=True, max_pending=2)
+    assert Om.asynchronous
+    Om.add_spaces(Ah=Ah, Bh=Bh)
+
+    u_arrays = []
+    v_arrays = []
+    for i in range(5):
+        uh.coeffs[:] = np.random.random(size=uh.coeffs[:].shape)
+        vh.coeffs[0][:] = np.random.random(size=vh.coeffs[0][:].shape)
+        vh.coeffs[1][:] = np.random.random(size=vh.coeffs[1][:].shape)
+        u_arrays.append(uh.coeffs.toarray())
+        v_arrays.append(vh.coeffs.toarray())
+
+        Om.add_snapshot(t=float(i), ts=i)
+        Om.export_fields(uh=uh, vh=vh)
+
+        # The exported values are not affected by later modifications
+        uh.coeffs[:] = 0.
+        vh.coeffs[0][:] = 0.
+        vh.coeffs[1][:] = 0.
+
+    Om.export_space_info()
+
+    # Closing the manager writes all pending snapshots
+    Om.close()
+
+    Pm = PostProcessManager(domain=domain, space_file='file_async.yml', fields_file='file_async.h5')
+    for i in range(5):
+        Pm.load_snapshot(i, 'uh', 'vh')
+        assert np.array_equal(Pm._snapshot_fields['uh'].coeffs.toarray(), u_arrays[i])
+        assert np.array_equal(Pm._snapshot_fields['vh'].coeffs.toarray(), v_arrays[i])
+    Pm.close()
+
+    os.remove('file_async.h5')
+    os.remove('file_async.yml')
+
+
 @pytest.mark.parametrize('domain', [Square(), Cube()])
 def test_reconstruct_spaces_topological_domain(domain):
     dim = domain.dim
@@ -420,6 +526,392 @@ def test_PostProcessManager(geometry):
     os.remove('fields_example.h5')
 
 
+def test_PostProcessManager_geometry_cache():
+    geometry_file = os.path.join(mesh_dir, 'bent_pipe.h5')
+    domain = Domain.from_file(geometry_file)
+
+    V = VectorFunctionSpace('V', domain, kind='hdiv')
+
+    domainh = discretize(domain, filename=geometry_file)
+    Vh = discretize(V, domainh, degree=[[2, 1], [1, 2]])
+
+    wh = FemField(Vh)
+    wh.coeffs[0][:] = np.random.random(size=wh.coeffs[0][:].shape)
+    wh.coeffs[1][:] = np.random.random(size=wh.coeffs[1][:].shape)
+
+    output = OutputManager('space_geometry_cache.yml', 'fields_geometry_cache.h5')
+    output.add_spaces(Vh=Vh)
+    output.set_static()
+    output.export_fields(w=wh)
+    output.export_space_info()
+    output.close()
+
+    post = PostProcessManager(geometry_file=geometry_file,
+                              space_file='space_geometry_cache.yml',
+                              fields_file='fields_geometry_cache.h5',
+                              geometry_cache_size=1)
+
+    grid_1 = [refine_array_1d(Vh.spaces[0].breaks[i], 1, remove_duplicates=False) for i in range(2)]
+    grid_2 = [refine_array_1d(Vh.spaces[0].breaks[i], 2, remove_duplicates=False) for i in range(2)]
+
+    # First export: the geometry is computed
+    mesh_1, fields_1 = post.export_to_vtk('example_cache', grid_1, npts_per_cell=2,
+                                          fields={'field': 'w'}, debug=True)
+    info = post.geometry_cache_info
+    assert (info['hits'], info['misses'], info['size']) == (0, 1, 1)
+    assert info['nbytes'] > 0
+
+    # Same grid (given as a copy): the geometry, including the Jacobian, is reused
+    jacobian = post._pushforward.jac_temp
+    mesh_2, fields_2 = post.export_to_vtk('example_cache', [g.copy() for g in grid_1], npts_per_cell=[2, 2],
+                                          fields={'field': 'w'}, debug=True)
+    info = post.geometry_cache_info
+    assert (info['hits'], info['misses']) == (1, 1)
+    assert all(a is b for a, b in zip(mesh_1, mesh_2))
+    assert post._pushforward.jac_temp is jacobian
+    assert all(np.array_equal(a, b) for a, b in zip(fields_1[0]['field'], fields_2[0]['field']))
+
+    # Different grid: the least recently used geometry is evicted
+    post.export_to_vtk('example_cache', grid_2, npts_per_cell=3, fields={'field': 'w'})
+    info = post.geometry_cache_info
+    assert (info['hits'], info['misses'], info['evictions'], info['size']) == (1, 2, 1, 1)
+
+    post.clear_geometry_cache()
+    assert post.geometry_cache_info['size'] == 0
+
+    # Clear files
+    for f in glob.glob("example_cache*.vtu"): #VTK files
+        os.remove(f)
+    os.remove('space_geometry_cache.yml')
+    os.remove('fields_geometry_cache.h5')
+
+
+def test_PostProcessManager_workers():
+    geometry_file = os.path.join(mesh_dir, 'identity_2d.h5')
+    domain = Domain.from_file(geometry_file)
+
+    V = ScalarFunctionSpace('V', domain, kind='l2')
+
+    domainh = discretize(domain, filename=geometry_file)
+    Vh = discretize(V, domainh, degree=[2, 2])
+
+    uh = FemField(Vh)
+
+    output = OutputManager('space_workers.yml', 'fields_workers.h5')
+    output.add_spaces(Vh=Vh)
+    output.set_static()
+    for i in range(5):
+        uh.coeffs[:] = np.random.random(size=uh.coeffs[:].shape)
+        output.add_snapshot(t=0.5 * i, ts=i)
+        output.export_fields(u=uh)
+    output.export_space_info()
+    output.close()
+
+    post = PostProcessManager(geometry_file=geometry_file,
+                              space_file='space_workers.yml',
+                              fields_file='fields_workers.h5')
+
+    grid = [refine_array_1d(Vh.breaks[i], 1, remove_duplicates=False) for i in range(2)]
+
+    _, serial_fields = post.export_to_vtk('example_serial', grid, npts_per_cell=2, snapshots='all',
+                                          fields={'field': 'u'}, debug=True)
+    _, pool_fields = post.export_to_vtk('example_workers', grid, npts_per_cell=2, snapshots='all',
+                                        fields={'field': 'u'}, workers=2, debug=True)
+
+    assert len(pool_fields) == len(serial_fields) == 6
+    for f1, f2 in zip(serial_fields[1:], pool_fields[1:]):
+        assert np.allclose(f1['field'], f2['field'])
+
+    assert len(glob.glob('example_workers.*.vtu')) == 5
+    assert os.path.exists('example_workers.pvd')
+
+    # The fields file is open again in the calling process
+    post.load_snapshot(3, 'u')
+
+    # Clear files
+    for f in glob.glob("example_serial*.vtu") + glob.glob("example_workers*.vtu"): #VTK files
+        os.remove(f)
+    os.remove('example_workers.pvd')
+    os.remove('space_workers.yml')
+    os.remove('fields_workers.h5')
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_PostProcessManager_lazy_fields(compression):
+    geometry_file = os.path.join(mesh_dir, 'identity_2d.h5')
+    domain = Domain.from_file(geometry_file)
+
+    V1 = ScalarFunctionSpace('V1', domain, kind='h1')
+    V2 = VectorFunctionSpace('V2', domain, kind='hcurl')
+
+    domainh = discretize(domain, filename=geometry_file)
+    V1h = discretize(V1, domainh, degree=[3, 2])
+    V2h = discretize(V2, domainh, degree=[[2, 3], [3, 2]])
+
+    uh = FemField(V1h)
+    vh = FemField(V2h)
+
+    output = OutputManager('space_lazy.yml', 'fields_lazy.h5', storage=DatasetStorage(compression=compression))
+    output.add_spaces(V1h=V1h, V2h=V2h)
+    for i in range(3):
+        uh.coeffs[:] = np.random.random(size=uh.coeffs[:].shape)
+        vh.coeffs[0][:] = np.random.random(size=vh.coeffs[0][:].shape)
+        vh.coeffs[1][:] = np.random.random(size=vh.coeffs[1][:].shape)
+        output.add_snapshot(t=float(i), ts=i)
+        output.export_fields(u=uh, v=vh)
+    output.export_space_info()
+    output.close()
+
+    post = PostProcessManager(geometry_file=geometry_file,
+                              space_file='space_lazy.yml',
+                              fields_file='fields_lazy.h5')
+
+    lazy = post.get_lazy_fields(2, 'u', 'v')
+    assert lazy['u'].t == 2.0 and lazy['u'].ts == 2
+    assert lazy['u'].memory_mapped == [compression is None]
+    assert lazy['v'].memory_mapped == [compression is None] * 2
+
+    # Whole fields
+    post.load_snapshot(2, 'u', 'v')
+    u = lazy['u'].load()
+    v = lazy['v'].load()
+    assert np.array_equal(u.coeffs.toarray(), post.fields['u'].coeffs.toarray())
+    assert np.array_equal(v.coeffs.toarray(), post.fields['v'].coeffs.toarray())
+    assert np.array_equal(lazy['u'].read(), uh.coeffs[:uh.coeffs.space.npts[0], :uh.coeffs.space.npts[1]])
+
+    # Subdomain: the fields are only read (and valid) on some cells
+    cells = ((1, 2), (3, 4))
+    u_sub = lazy['u'].load(cells=cells)
+    v_sub = lazy['v'].load(cells=cells)
+
+    grid  = [refine_array_1d(V1h.breaks[i], 1, remove_duplicates=False) for i in range(2)]
+    index = tuple(slice(2 * c0, 2 * (c1 + 1)) for c0, c1 in zip(*cells))
+
+    u_vals, u_sub_vals = V1h.eval_fields(grid, u, u_sub, npts_per_cell=2)
+    assert np.allclose(u_sub_vals[index], u_vals[index])
+
+    v_vals, v_sub_vals = V2h.eval_fields(grid, v, v_sub, npts_per_cell=2)
+    for k in range(2):
+        assert np.allclose(v_sub_vals[k][index], v_vals[k][index])
+
+    assert np.count_nonzero(u_sub.coeffs.toarray()) < np.count_nonzero(u.coeffs.toarray())
+
+    # Cache of snapshots and interpolation in time
+    assert post.get_snapshot(2, 'u') is post.get_snapshot(2, 'u')
+    u_mid = post.interpolate_snapshots(1.5, 'u')['u']
+    u_1 = post.get_snapshot(1, 'u')['u']
+    assert np.allclose(u_mid.coeffs.toarray(), 0.5 * (u_1.coeffs.toarray() + u.coeffs.toarray()))
+    with pytest.raises(ValueError):
+        post.interpolate_snapshots(3.5, 'u')
+
+    post.close()
+    os.remove('space_lazy.yml')
+    os.remove('fields_lazy.h5')
+
+
+@pytest.mark.parametrize('tolerance', [None, 1e-6])
+def test_PostProcessManager_keyframes(tolerance):
+    geometry_file = os.path.join(mesh_dir, 'identity_2d.h5')
+    domain = Domain.from_file(geometry_file)
+
+    V1 = ScalarFunctionSpace('V1', domain, kind='h1')
+    V2 = VectorFunctionSpace('V2', domain, kind='hdiv')
+
+    domainh = discretize(domain, filename=geometry_file)
+    V1h = discretize(V1, domainh, degree=[3, 2])
+    V2h = discretize(V2, domainh, degree=[[3, 2], [2, 3]])
+
+    uh = FemField(V1h)
+    vh = FemField(V2h)
+
+    storage = DatasetStorage(keyframe_interval=3, tolerance=tolerance)
+    assert storage.compression == 'gzip' and storage.shuffle
+
+    output = OutputManager('space_keyframes.yml', 'fields_keyframes.h5', storage=storage)
+    output.add_spaces(V1h=V1h, V2h=V2h)
+
+    output.set_static()
+    output.export_fields(w=uh)
+
+    # Slowly evolving fields
+    u_arrays = []
+    v_arrays = []
+    for i in range(7):
+        uh.coeffs[:] += 1e-3 * np.random.random(size=uh.coeffs[:].shape)
+        vh.coeffs[0][:] = np.random.random(size=vh.coeffs[0][:].shape)
+        vh.coeffs[1][:] += 1e-3
+        output.add_snapshot(t=float(i), ts=i)
+        output.export_fields(u=uh, v=vh)
+        u_arrays.append(uh.coeffs.toarray())
+        v_arrays.append(vh.coeffs.toarray())
+    output.export_space_info()
+    output.close()
+
+    with h5.File('fields_keyframes.h5', 'r') as f:
+        patch = list(f['static'].keys())[0]
+        assert 'delta_reference' not in f[f'static/{patch}/V1h/w'].attrs
+        assert 'delta_reference' not in f[f'snapshot_0003/{patch}/V1h/u'].attrs
+        assert f[f'snapshot_0005/{patch}/V1h/u'].attrs['delta_reference'] == f'/snapshot_0004/{patch}/V1h/u'
+
+    post = PostProcessManager(geometry_file=geometry_file,
+                              space_file='space_keyframes.yml',
+                              fields_file='fields_keyframes.h5')
+
+    atol = 0 if tolerance is None else tolerance
+    for i in range(7):
+        post.load_snapshot(i, 'u', 'v')
+        assert np.allclose(post.fields['u'].coeffs.toarray(), u_arrays[i], rtol=0, atol=atol)
+        assert np.allclose(post.fields['v'].coeffs.toarray(), v_arrays[i], rtol=0, atol=atol)
+
+    lazy = post.get_lazy_fields(5, 'u')
+    assert lazy['u'].memory_mapped == [False]
+    assert np.array_equal(lazy['u'].load().coeffs.toarray(), post.get_snapshot(5, 'u')['u'].coeffs.toarray())
+
+    post.close()
+    os.remove('space_keyframes.yml')
+    os.remove('fields_keyframes.h5')
+
+    with pytest.raises(ValueError):
+        DatasetStorage(keyframe_interval=0)
+    with pytest.raises(ValueError):
+        DatasetStorage(tolerance=0.)
+
+
+@pytest.mark.parametrize('structured', [False, True])
+def test_PostProcessManager_precision(structured):
+    geometry_file = os.path.join(mesh_dir, 'bent_pipe.h5')
+    domain = Domain.from_file(geometry_file)
+
+    V = ScalarFunctionSpace('V', domain, kind='h1')
+
+    domainh = discretize(domain, filename=geometry_file)
+    Vh = discretize(V, domainh, degree=[2, 2])
+
+    uh = FemField(Vh)
+    uh.coeffs[:] = np.random.random(size=uh.coeffs[:].shape)
+
+    output = OutputManager('space_precision.yml', 'fields_precision.h5')
+    output.add_spaces(Vh=Vh)
+    output.set_static()
+    output.export_fields(u=uh)
+    output.export_space_info()
+    output.close()
+
+    post = PostProcessManager(geometry_file=geometry_file,
+                              space_file='space_precision.yml',
+                              fields_file='fields_precision.h5')
+
+    grid = [refine_array_1d(Vh.breaks[i], 1, remove_duplicates=False) for i in range(2)]
+    post.export_to_vtk('example_precision', grid, npts_per_cell=2, fields={'u': 'u'},
+                       precision='float32', structured=structured)
+
+    filename = 'example_precision.static.' + ('vts' if structured else 'vtu')
+    with open(filename, 'rb') as f:
+        content = f.read()
+    assert b'Float32' in content
+    assert b'Float64' not in content
+
+    # The connectivity of the cells is not needed by structured grids
+    geometry, = post._geometry_cache.values()
+    assert (geometry['mesh_info'] is None) == structured
+
+    with pytest.raises(ValueError):
+        post.export_to_vtk('example_precision', grid, npts_per_cell=2, fields={'u': 'u'}, precision='float16')
+
+    os.remove(filename)
+    os.remove('space_precision.yml')
+    os.remove('fields_precision.h5')
+
+
+def test_multipatch_export():
+    A = Square('A', bounds1=(0.5, 1.), bounds2=(0, np.pi/2))
+    B = Square('B', bounds1=(0.5, 1.), bounds2=(np.pi/2, np.pi))
+
+    domain = A.join(B, name='domain',
+                    bnd_minus=A.get_boundary(axis=1, ext=1),
+                    bnd_plus=B.get_boundary(axis=1, ext=-1))
+
+    V = ScalarFunctionSpace('V', domain, kind='h1')
+    W = VectorFunctionSpace('W', domain, kind='hcurl')
+
+    domain_h = discretize(domain, ncells=[4, 4])
+    Vh = discretize(V, domain_h, degree=[2, 2])
+    Wh = discretize(W, domain_h, degree=[2, 2])
+
+    uh = FemField(Vh)
+    wh = FemField(Wh)
+
+    Om = OutputManager('spaces_multipatch_export.yml', 'fields_multipatch_export.h5')
+    Om.add_spaces(V=Vh, W=Wh)
+    Om.set_static()
+    Om.export_fields(w=wh)
+    for i in range(2):
+        for f in uh.fields:
+            f.coeffs[:] = np.random.random(size=f.coeffs[:].shape)
+        Om.add_snapshot(t=float(i), ts=i)
+        Om.export_fields(u=uh)
+    Om.export_space_info()
+    Om.close()
+
+    post = PostProcessManager(domain=domain,
+                              space_file='spaces_multipatch_export.yml',
+                              fields_file='fields_multipatch_export.h5')
+    assert post.local_patches == ['A', 'B']
+
+    grid = {name: [refine_array_1d(b, 1, remove_duplicates=False) for b in Vh.spaces[k].breaks]
+            for k, name in enumerate(['A', 'B'])}
+
+    meshes, pointDatas = post.export_to_vtk('example_mp', grid, npts_per_cell=2, snapshots='all',
+                                            fields={'u': 'u', 'w': 'w'}, debug=True)
+
+    assert sorted(meshes) == ['A', 'B']
+    assert len(pointDatas) == 3
+    assert all(list(pointDatas[0][name]) == ['w'] for name in ['A', 'B'])
+
+    # The last snapshot is exported with the H1 field of the last time step
+    for k, name in enumerate(['A', 'B']):
+        u_vals = Vh.spaces[k].eval_fields(grid[name], uh.fields[k], npts_per_cell=2)[0]
+        assert np.allclose(np.ravel(pointDatas[2][name]['u']), np.ravel(u_vals))
+
+    for f in ['example_mp.A.static.vtu', 'example_mp.B.0001.vtu', 'example_mp_static.pvtu',
+              'example_mp.0001.pvtu', 'example_mp.pvd']:
+        assert os.path.exists(f)
+
+    # Clear files
+    for f in glob.glob("example_mp*"):
+        os.remove(f)
+    os.remove('spaces_multipatch_export.yml')
+    os.remove('fields_multipatch_export.h5')
+
+
+@pytest.mark.parametrize('ldim', [2, 3])
+def test_unstructured_mesh_info(ldim):
+    local_domain = ((1,) * ldim, (3,) * ldim)
+    n_points = (6,) * ldim
+
+    # Reference: loop over the cells, with the points in Fortran ordering
+    index = lambda *ijk: int(np.ravel_multi_index(ijk, n_points, order='F'))
+    reference = []
+    for ijk in np.ndindex(*(n - 1 for n in n_points)):
+        if ldim == 2:
+            i, j = ijk
+            reference += [index(i, j), index(i+1, j), index(i+1, j+1), index(i, j+1)]
+        else:
+            i, j, k = ijk
+            reference += [index(i, j, k), index(i, j+1, k), index(i, j+1, k+1), index(i, j, k+1),
+                          index(i+1, j, k), index(i+1, j+1, k), index(i+1, j+1, k+1), index(i+1, j, k+1)]
+
+    # Regular grid with 2 points per cell, and irregular grid with 2 points in the local cells
+    cell_indexes = [np.array([0, 1, 1, 2, 2, 3, 3, 4])] * ldim
+    for kwargs in [{'npts_per_cell': 2}, {'cell_indexes': cell_indexes}]:
+        conn, offsets, celltypes, cellshape = PostProcessManager._compute_unstructured_mesh_info(local_domain, **kwargs)
+
+        assert np.array_equal(conn, reference)
+        assert np.array_equal(offsets, 2**ldim * np.arange(1, 5**ldim + 1))
+        assert np.all(celltypes == celltypes[0])
+        assert tuple(cellshape) == (5,) * ldim
+
+
 @pytest.mark.parallel
 def test_multipatch_parallel_export(interactive=False):
     bounds1   = (0.5, 1.)
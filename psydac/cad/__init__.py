@@ -1,8 +1,14 @@
 # coding = utf-8
 
-__all__ = ['geometry']
+__all__ = ['geometry', 'cad', 'gallery', 'utils']
 
-from psydac.cad import geometry
-from psydac.cad import cad
-from psydac.cad import gallery
-from psydac.cad import utils
+import importlib
+
+# The modules are imported on first access (see psydac/__init__.py)
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,6 +6,7 @@
 # (hdf5)
 from itertools import product
 from collections import abc
+from math import comb
 import numpy as np
 import string
 import random
@@ -31,6 +32,7 @@ class Geometry( object ):
     _pdim     = None
     _patches  = []
     _topology = None
+    _geometry_cache = None
 
     #--------------------------------------------------------------------------
     # Option [1]: from a (domain, mappings) or a file
@@ -128,9 +130,46 @@ class Geometry( object ):
     def mappings(self):
         return self._mappings
 
+    @property
+    def geometry_cache(self):
+        """Cache of the mapping values at the quadrature points, or None."""
+        return self._geometry_cache
+
     def __len__(self):
         return len(self.domain)
 
+    #--------------------------------------------------------------------------
+    def enable_geometry_cache( self, max_nderiv=None ):
+        """
+        Store the values of the mappings (and of their logical derivatives) at
+        the quadrature points of the local elements, so that all the forms
+        discretized on this geometry afterwards read them instead of
+        evaluating the mappings in their assembly kernels.
+
+        Parameters
+        ----------
+        max_nderiv : int, optional
+            Maximum order of the logical derivatives which are cached. Forms
+            which need higher derivatives evaluate the mapping on the fly.
+            Lower values save memory at the cost of speed. Default: no limit.
+
+        Returns
+        -------
+        cache : GeometryCache
+            The geometry cache attached to this geometry.
+
+        """
+        self._geometry_cache = GeometryCache( max_nderiv=max_nderiv )
+        return self._geometry_cache
+
+    def disable_geometry_cache( self ):
+        """
+        Detach the geometry cache from this geometry. Forms which were
+        discretized while the cache was enabled keep a reference to it.
+
+        """
+        self._geometry_cache = None
+
     def read( self, filename, comm=MPI.COMM_WORLD ):
         # ... check extension of the file
         basename, ext = os.path.splitext(filename)
@@ -316,6 +355,156 @@ class Geometry( object ):
         # Close HDF5 file
         h5.close()
 
+#==============================================================================
+class GeometryCache:
+    """
+    Values of discrete mappings, and of their logical derivatives, at the
+    quadrature points of the local elements.
+
+    The arrays are computed once per mapping and are shared by all the
+    discrete forms of a Geometry. They are refreshed in place when the
+    coefficients of a mapping are modified.
+
+    Parameters
+    ----------
+    max_nderiv : int, optional
+        Maximum order of the logical derivatives which may be cached.
+        Default: no limit.
+
+    """
+    def __init__( self, max_nderiv=None ):
+        self._max_nderiv = max_nderiv
+        self._data       = {}
+
+    @property
+    def max_nderiv( self ):
+        return self._max_nderiv
+
+    @property
+    def nbytes( self ):
+        """Total size of the cached arrays, in bytes."""
+        return sum(a.nbytes for _, values in self._data.values() for a in values.values())
+
+    def accepts( self, nderiv ):
+        """True if the derivatives of order up to nderiv may be cached."""
+        return self._max_nderiv is None or max(nderiv, 1) <= self._max_nderiv
+
+    def clear( self ):
+        """Free all the cached arrays."""
+        self._data.clear()
+
+    def version( self, mapping ):
+        """
+        Versions of the coefficients of a mapping when its cached values were
+        last computed (None if they are not cached): the arrays returned by
+        'get' are refreshed in place when this changes.
+        """
+        return self._data.get(mapping, (None, {}))[0]
+
+    def get( self, mapping, nderiv ):
+        """
+        Values of the components of a discrete mapping and of their logical
+        derivatives up to order nderiv, at the quadrature points of the local
+        elements of the mapping space.
+
+        Parameters
+        ----------
+        mapping : SplineMapping | NurbsMapping
+            Discrete mapping.
+
+        nderiv : int
+            Maximum order of the logical derivatives.
+
+        Returns
+        -------
+        values : list of numpy.ndarray
+            One array of shape (n1, ..., nd, k1, ..., kd) for each component
+            of the mapping and each multi-index of derivation, with n_i the
+            number of local elements and k_i the number of quadrature points
+            per element. The components form the outer loop, and for each of
+            them the multi-indices are in lexicographic order.
+
+        """
+        if not self.accepts(nderiv):
+            raise ValueError('Cannot cache derivatives of order {} > {}'.format(nderiv, self._max_nderiv))
+
+        nderiv  = max(nderiv, 1)
+        dim     = mapping.ldim
+        fields  = list(mapping.fields)
+        if isinstance(mapping, NurbsMapping):
+            fields.append(mapping.weights_field)
+
+        indices = [ijk for ijk in product(range(nderiv+1), repeat=dim) if sum(ijk) <= nderiv]
+        keys    = [(d, ijk) for d in range(dim) for ijk in indices]
+        version = tuple(f.coeffs.version for f in fields)
+
+        old_version, values = self._data.get(mapping, (None, {}))
+        if old_version != version or any(k not in values for k in keys):
+            new_values = self._evaluate(mapping, indices)
+            for k, v in new_values.items():
+                if k in values:
+                    values[k][...] = v
+                else:
+                    values[k] = v
+            self._data[mapping] = (version, values)
+
+        return [values[k] for k in keys]
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _evaluate( mapping, indices ):
+
+        space   = mapping.space
+        V       = space.vector_space
+        grids   = space.quad_grids
+        dim     = mapping.ldim
+
+        # Index of the coefficients which are non-zero over each element,
+        # with shape (n1, ..., nd, p1+1, ..., pd+1) after broadcasting
+        index = []
+        for k, (g, s, m, p, d) in enumerate(zip(grids, V.starts, V.shifts, V.pads, space.degree)):
+            idx       = m*p + (g.spans - s)[:, None] - d + np.arange(d+1)[None, :]
+            shape     = [1] * (2*dim)
+            shape[k]  = idx.shape[0]
+            shape[dim+k] = d+1
+            index.append(idx.reshape(shape))
+        index = tuple(index)
+
+        letters    = 'abcdefghi'
+        e, l, q    = letters[:dim], letters[3:3+dim], letters[6:6+dim]
+        subscripts = ','.join([e+l] + [e[k]+l[k]+q[k] for k in range(dim)]) + '->' + e+q
+
+        def contract( coeffs, ijk ):
+            basis = []
+            for g, n in zip(grids, ijk):
+                if n >= g.basis.shape[2]:
+                    return np.zeros(coeffs.shape[:dim] + tuple(g.num_quad_pts for g in grids))
+                basis.append(g.basis[:, :, n, :])
+            return np.ascontiguousarray(np.einsum(subscripts, coeffs, *basis, optimize=True))
+
+        coeffs = [f.coeffs._data[index] for f in mapping.fields[:dim]]
+        values = {}
+
+        if not isinstance(mapping, NurbsMapping):
+            for d, c in enumerate(coeffs):
+                for ijk in indices:
+                    values[d, ijk] = contract(c, ijk)
+            return values
+
+        # Rational mapping x = N / W: apply the Leibniz rule to N = x W
+        w = mapping.weights_field.coeffs._data[index]
+        W = {ijk: contract(w, ijk) for ijk in indices}
+        for d, c in enumerate(coeffs):
+            for a in indices:
+                v = contract(c * w, a)
+                for b in indices:
+                    if b != a and all(bi <= ai for ai, bi in zip(a, b)):
+                        factor = np.prod([comb(ai, bi) for ai, bi in zip(a, b)])
+                        v     -= factor * W[tuple(ai-bi for ai, bi in zip(a, b))] * values[d, b]
+                values[d, a] = v / W[(0,)*dim]
+
+        return values
+
 #==============================================================================
 def export_nurbs_to_hdf5(filename, nurbs, periodic=None, comm=None ):
 
@@ -4,7 +4,7 @@ import numpy as np
 from itertools import product
 from mpi4py    import MPI
 
-from psydac.ddm.partition import compute_dims
+from psydac.ddm.partition import compute_dims, partition_weights, load_imbalance
 
 __all__ = ['find_mpi_type', 'CartDecomposition', 'CartDataExchanger']
 
@@ -70,8 +70,15 @@ class CartDecomposition():
     reverse_axis: int
        Reverse the ownership of the processes along the specified axis.
 
+    weights: list or tuple of array_like
+       Cost estimates of the coefficients along each dimension, e.g. from the
+       number of quadrature points and the boundary integrals of the elements
+       (optional). If given, the coefficients along each dimension are split
+       into blocks of (nearly) equal costs, rather than of equal sizes (see
+       partition_weights). Only available with shifts equal to 1.
+
     """
-    def __init__( self, npts, pads, periods, reorder, comm=MPI.COMM_WORLD, shifts=None, nprocs=None, reverse_axis=None, num_threads=None ):
+    def __init__( self, npts, pads, periods, reorder, comm=MPI.COMM_WORLD, shifts=None, nprocs=None, reverse_axis=None, num_threads=None, weights=None ):
 
         # Check input arguments
         # TODO: check that arguments are identical across all processes
@@ -115,6 +122,13 @@ class CartDecomposition():
 
         assert np.product(nprocs) == self._size
 
+        if weights is not None:
+            assert len( weights ) == len( npts )
+            if any( m > 1 for m in shifts ):
+                raise NotImplementedError( 'Weighted decomposition is only available with shifts equal to 1' )
+            weights = [np.asarray( w, dtype=float ) for w in weights]
+            assert all( w.shape == (n,) for w, n in zip( weights, reduced_npts ) )
+
         self._dims = nprocs
         self._reverse_axis = reverse_axis
         # ...
@@ -142,10 +156,25 @@ class CartDecomposition():
             d = nprocs[axis]
             p = pads[axis]
             m = shifts[axis]
-            self._reduced_global_starts[axis] = np.array( [( c   *n)//d   for c in range( d )] )
-            self._reduced_global_ends  [axis] = np.array( [((c+1)*n)//d-1 for c in range( d )] )
+            if weights is None:
+                self._reduced_global_starts[axis] = np.array( [( c   *n)//d   for c in range( d )] )
+                self._reduced_global_ends  [axis] = np.array( [((c+1)*n)//d-1 for c in range( d )] )
+            else:
+                self._reduced_global_starts[axis], self._reduced_global_ends[axis] = \
+                        partition_weights( weights[axis], d, max( p, 1 ) )
             if m>1:self._reduced_global_ends  [axis][-1] += p+1
 
+        # Ratio of the maximum to the average load of the processes
+        loads = []
+        for axis in range( self._ndims ):
+            r_starts = self._reduced_global_starts[axis]
+            r_ends   = self._reduced_global_ends  [axis]
+            if weights is None:
+                loads.append( r_ends - r_starts + 1 )
+            else:
+                loads.append( [weights[axis][s:e+1].sum() for s, e in zip( r_starts, r_ends )] )
+        self._load_imbalance = load_imbalance( loads )
+
         # Store arrays with all the starts and ends along each direction
         self._global_starts = [None]*self._ndims
         self._global_ends   = [None]*self._ndims
@@ -259,6 +288,11 @@ class CartDecomposition():
     def reduced_global_ends( self ):
         return self._reduced_global_ends
 
+    @property
+    def load_imbalance( self ):
+        """ Ratio of the maximum to the average (estimated) load of the processes."""
+        return self._load_imbalance
+
     #---------------------------------------------------------------------------
     # Local properties
     #---------------------------------------------------------------------------
@@ -494,6 +528,8 @@ class CartDecomposition():
                 n = cart._npts[axis]
                 cart._reduced_global_ends[axis][-1] = n-1
 
+        cart._load_imbalance = self._load_imbalance
+
         cart._parent_starts = self.starts
         cart._parent_ends   = self.ends
         return cart
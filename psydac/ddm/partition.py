@@ -1,9 +1,7 @@
 import numpy    as np
 import numpy.ma as ma
 
-from sympy.ntheory import factorint
-
-__all__ = ['compute_dims']
+__all__ = ['compute_dims', 'partition_weights', 'load_imbalance']
 
 #==============================================================================
 def compute_dims( nnodes, gridsizes, min_blocksizes=None, mpi=None ):
@@ -74,7 +72,7 @@ def compute_dims_general( mpi_size, npts ):
     nprocs = [1]*len( npts )
     shape  = [n for n in npts]
 
-    f = factorint( mpi_size, multiple=True )
+    f = _factorint( mpi_size, multiple=True )
     f.sort( reverse=True )
 
     for a in f:
@@ -95,8 +93,8 @@ def compute_dims_uniform( mpi_size, npts ):
 
     nprocs = [1]*len( npts )
 
-    mpi_factors   = factorint( int(mpi_size) )
-    npts_factors  = [factorint( int(n) ) for n in npts]
+    mpi_factors   = _factorint( int(mpi_size) )
+    npts_factors  = [_factorint( int(n) ) for n in npts]
 
     nprocs = [1 for n in npts]
 
@@ -120,3 +118,141 @@ def compute_dims_uniform( mpi_size, npts ):
     shape = [np.prod( [key**val for key,val in f.items()] ) for f in npts_factors]
 
     return nprocs, shape
+
+#==============================================================================
+def partition_weights( weights, nparts, min_blocksize=1 ):
+    """
+    Split a 1D array of non-negative costs into contiguous blocks, so that the
+    largest total cost of a block is minimized (linear partitioning problem).
+
+    The optimal bottleneck is found by bisection. For a given bound on the
+    cost, the feasibility test is a dynamic programming over the blocks: the
+    end of block k can be reached if the end of block k-1 is reachable at
+    least min_blocksize elements before, with a cost of the block within the
+    bound.
+
+    Parameters
+    ----------
+    weights : array_like of float
+        Cost of each array element.
+
+    nparts : int
+        Number of blocks.
+
+    min_blocksize : int
+        Minimum acceptable size of a block.
+
+    Returns
+    -------
+    starts : numpy.ndarray of int
+        Index of the first element of each block.
+
+    ends : numpy.ndarray of int
+        Index of the last element of each block.
+
+    """
+    w = np.asarray( weights, dtype=float )
+    n = len( w )
+
+    assert w.ndim == 1
+    assert nparts > 0
+    assert min_blocksize > 0
+    assert n >= nparts * min_blocksize
+
+    if np.any( w < 0 ):
+        raise ValueError( 'Weights must be non-negative' )
+
+    # Without information, blocks with the same number of elements
+    if not w.sum() > 0:
+        w = np.ones( n )
+
+    m      = min_blocksize
+    cumsum = np.concatenate( ([0.], np.cumsum( w )) )
+    index  = np.arange( n+1 )
+
+    def split( bound ):
+        # For each block and each end position, latest admissible start (or -1)
+        reachable = index == 0
+        previous  = []
+        for k in range( nparts ):
+            latest = np.maximum.accumulate( np.where( reachable, index, -1 ) )
+            start  = np.full( n+1, -1 )
+            start[m:] = latest[:n+1-m]
+            reachable = (start >= 0) & (cumsum - cumsum[np.maximum( start, 0 )] <= bound)
+            start[~reachable] = -1
+            previous.append( start )
+
+        if not reachable[n]:
+            return None
+
+        starts = []
+        e = n
+        for start in reversed( previous ):
+            e = start[e]
+            starts.append( e )
+        return starts[::-1]
+
+    # Bisection between the average and the total cost
+    lo = cumsum[n] / nparts
+    hi = cumsum[n]
+    while hi - lo > 1e-12 * hi:
+        mid = 0.5 * (lo + hi)
+        if split( mid ) is None:
+            lo = mid
+        else:
+            hi = mid
+
+    starts = np.array( split( hi ), dtype=int )
+    ends   = np.append( starts[1:], n ) - 1
+
+    return starts, ends
+
+#==============================================================================
+def load_imbalance( loads ):
+    """
+    Load imbalance of a Cartesian decomposition with separable costs: the
+    load of a block is the product of the loads of its intervals along each
+    dimension, and the imbalance is the ratio of the maximum to the average
+    load (1 for a perfectly balanced decomposition).
+
+    Parameters
+    ----------
+    loads : list of array_like
+        Load of each interval along each dimension.
+
+    Returns
+    -------
+    float
+        Ratio of the maximum to the average load of the blocks.
+
+    """
+    total = np.ones( () )
+    for l in loads:
+        total = np.multiply.outer( total, np.asarray( l, dtype=float ) )
+
+    mean = total.mean()
+    return float( total.max() / mean ) if mean > 0 else 1.0
+
+#==============================================================================
+def _factorint( n, multiple=False ):
+    """
+    Prime factorization of a positive integer, with the interface of
+    sympy.ntheory.factorint: a dictionary {prime: exponent} in increasing
+    order, or the sorted list of the prime factors if multiple=True.
+
+    Trial division is enough for the numbers of processes and of grid points
+    decomposed here, and avoids importing sympy in every MPI process.
+    """
+    factors = {}
+    p = 2
+    while p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get( p, 0 ) + 1
+            n //= p
+        p += 1 if p == 2 else 2
+    if n > 1:
+        factors[n] = factors.get( n, 0 ) + 1
+
+    if multiple:
+        return [p for p, k in factors.items() for _ in range( k )]
+    return factors
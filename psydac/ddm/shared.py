@@ -0,0 +1,265 @@
+# coding: utf-8
+"""
+Node-aware communications with MPI-3 shared memory windows: the processes
+on the same node exchange the ghost regions of distributed arrays through a
+shared segment instead of MPI messages, and read-only data replicated on all
+the processes can be stored once per node.
+
+"""
+import numpy as np
+from mpi4py import MPI
+
+from psydac.ddm.cart import CartDecomposition, CartDataExchanger
+
+__all__ = ['get_node_comm', 'replicate', 'SharedCartDataExchanger']
+
+#===============================================================================
+def get_node_comm( comm ):
+    """
+    Communicator of the processes of comm which can share memory, i.e. which
+    run on the same node.
+
+    Parameters
+    ----------
+    comm : mpi4py.MPI.Comm
+        Parent communicator.
+
+    Returns
+    -------
+    mpi4py.MPI.Comm
+        Communicator of the node of the process.
+
+    """
+    return comm.Split_type( MPI.COMM_TYPE_SHARED, key=comm.rank )
+
+#===============================================================================
+def replicate( array, comm ):
+    """
+    Copy an array, identical on all the processes, to a segment of memory
+    shared by the processes of each node: the values are stored once per node
+    instead of once per process. This operation is collective.
+
+    Parameters
+    ----------
+    array : numpy.ndarray | None
+        Data to be replicated; only the array of the first process of each
+        node is used, the other processes may pass None.
+
+    comm : mpi4py.MPI.Comm
+        Communicator of the processes.
+
+    Returns
+    -------
+    shared : numpy.ndarray
+        Read-only array in shared memory.
+
+    window : mpi4py.MPI.Win
+        Shared memory window, which must be kept (and eventually freed with
+        its Free method, collectively) as long as the array is used.
+
+    """
+    node = get_node_comm( comm )
+    root = node.rank == 0
+
+    if root:
+        array = np.ascontiguousarray( array )
+    shape, dtype = node.bcast( (array.shape, array.dtype) if root else None, root=0 )
+
+    nbytes = array.nbytes if root else 0
+    window = MPI.Win.Allocate_shared( nbytes, dtype.itemsize, comm=node )
+    buf, itemsize = window.Shared_query( 0 )
+    shared = np.ndarray( buffer=buf, dtype=dtype, shape=shape )
+
+    window.Fence()
+    if root:
+        shared[...] = array
+    window.Fence()
+    node.Free()
+
+    shared.flags.writeable = False
+    return shared, window
+
+#===============================================================================
+class SharedCartDataExchanger( CartDataExchanger ):
+    """
+    Node-aware version of CartDataExchanger. The ghost regions are exchanged
+    with MPI messages between processes on different nodes only: on the same
+    node, every process copies its send buffers into a shared memory window,
+    from which its neighbours copy them directly into their ghost regions.
+
+    The window is allocated once, at construction (which is collective on the
+    Cartesian communicator), with the size of the largest pair of buffers of
+    one direction; the directions are then processed one after the other as
+    in CartDataExchanger, so that the corners are also updated.
+
+    Parameters
+    ----------
+    cart : psydac.ddm.CartDecomposition
+        Object that contains all information about the Cartesian decomposition
+        of a tensor-product grid of coefficients.
+
+    dtype : [type | str | numpy.dtype]
+        Datatype of single coefficient (if scalar) or of each of its
+        components (if vector).
+
+    coeff_shape : [tuple(int) | list(int)]
+        Shape of a single coefficient, if this is multi-dimensional
+        (optional: by default, we assume scalar coefficients).
+
+    """
+    def __init__( self, cart, dtype, *, coeff_shape=() ):
+
+        assert isinstance( cart, CartDecomposition )
+
+        super().__init__( cart, dtype, coeff_shape=coeff_shape )
+
+        dtype       = np.dtype( dtype )
+        coeff_shape = tuple( coeff_shape )
+        comm        = cart.comm_cart
+        node        = get_node_comm( comm )
+
+        # Ranks of the neighbours in the communicator of the node
+        group      = comm.Get_group()
+        node_group = node.Get_group()
+        node_ranks = {}
+        for direction in range( cart.ndim ):
+            for disp in [-1, 1]:
+                info = cart.get_shift_info( direction, disp )
+                for key in ['rank_source', 'rank_dest']:
+                    rank = info[key]
+                    if rank == MPI.PROC_NULL:
+                        node_ranks[direction, disp, key] = MPI.PROC_NULL
+                    else:
+                        node_ranks[direction, disp, key] = group.Translate_ranks( [rank], node_group )[0]
+        group.Free()
+        node_group.Free()
+
+        # Shared window: one slot per displacement, for the largest direction
+        sizes  = [int( np.prod( cart.get_shift_info( d, 1 )['buf_shape'] + coeff_shape ) ) for d in range( cart.ndim )]
+        size   = 2 * max( sizes )
+        window = MPI.Win.Allocate_shared( size * dtype.itemsize, dtype.itemsize, comm=node )
+        window.Lock_all( MPI.MODE_NOCHECK )
+
+        segments = {}
+        for rank in set( r for r in node_ranks.values() if r not in (MPI.PROC_NULL, MPI.UNDEFINED) ) | {node.rank}:
+            buf, itemsize = window.Shared_query( rank )
+            segments[rank] = np.ndarray( buffer=buf, dtype=dtype, shape=(size,) )
+
+        # Slots of the send buffers (mine) and of the receive buffers (of the sources)
+        send_slots = {}
+        recv_slots = {}
+        for direction in range( cart.ndim ):
+            for disp in [-1, 1]:
+                info  = cart.get_shift_info( direction, disp )
+                shape = info['buf_shape'] + coeff_shape
+                n     = int( np.prod( shape ) )
+                slot  = slice( 0, n ) if disp == -1 else slice( size//2, size//2 + n )
+
+                send_slots[direction, disp] = segments[node.rank][slot].reshape( shape )
+
+                source = node_ranks[direction, disp, 'rank_source']
+                if source not in (MPI.PROC_NULL, MPI.UNDEFINED):
+                    recv_slots[direction, disp] = segments[source][slot].reshape( shape )
+
+        self._node       = node
+        self._window     = window
+        self._node_ranks = node_ranks
+        self._send_slots = send_slots
+        self._recv_slots = recv_slots
+
+    #---------------------------------------------------------------------------
+    # Public interface
+    #---------------------------------------------------------------------------
+    @property
+    def node_comm( self ):
+        return self._node
+
+    # ...
+    def free( self ):
+        """
+        Free the shared memory window and the communicator of the node. This
+        operation is collective on the Cartesian communicator, and the object
+        cannot be used afterwards.
+
+        """
+        if self._window is None:
+            return
+
+        self._window.Unlock_all()
+        self._window.Free()
+        self._node.Free()
+
+        self._window     = None
+        self._send_slots = None
+        self._recv_slots = None
+
+    # ...
+    def update_ghost_regions( self, array, *, direction=None ):
+        """
+        Update ghost regions in a numpy array with dimensions compatible with
+        CartDecomposition (and coeff_shape) provided at initialization. This
+        operation is collective on the Cartesian communicator.
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+            Multidimensional array corresponding to local subdomain in
+            decomposed tensor grid, including padding.
+
+        direction : int
+            Index of dimension over which ghost regions should be updated
+            (optional: by default all ghost regions are updated).
+
+        """
+        if direction is None:
+            for d in range( self._cart.ndim ):
+                self.update_ghost_regions( array, direction=d )
+            return
+
+        assert isinstance( array, np.ndarray )
+        assert isinstance( direction, int )
+
+        # Shortcuts
+        cart   = self._cart
+        comm   = self._comm
+        node   = self._node
+        window = self._window
+
+        tag = lambda disp: 42+disp
+
+        def region( starts, shape ):
+            return tuple( slice( s, s+n ) for s, n in zip( starts, shape ) )
+
+        def on_node( key, disp ):
+            return self._node_ranks[direction, disp, key] not in (MPI.PROC_NULL, MPI.UNDEFINED)
+
+        # Messages with the processes of the other nodes
+        requests = []
+        for disp in [-1,1]:
+            info = cart.get_shift_info( direction, disp )
+            if not on_node( 'rank_source', disp ):
+                recv_buf = (array, 1, self.get_recv_type( direction, disp ))
+                requests.append( comm.Irecv( recv_buf, info['rank_source'], tag(disp) ) )
+
+        for disp in [-1,1]:
+            info = cart.get_shift_info( direction, disp )
+            if on_node( 'rank_dest', disp ):
+                self._send_slots[direction, disp][...] = array[region( info['send_starts'], info['buf_shape'] )]
+            else:
+                send_buf = (array, 1, self.get_send_type( direction, disp ))
+                requests.append( comm.Isend( send_buf, info['rank_dest'], tag(disp) ) )
+
+        # Copies from the shared window, once all the processes of the node wrote in it
+        window.Sync()
+        node.Barrier()
+        window.Sync()
+
+        for disp in [-1,1]:
+            info = cart.get_shift_info( direction, disp )
+            if on_node( 'rank_source', disp ):
+                array[region( info['recv_starts'], info['buf_shape'] )] = self._recv_slots[direction, disp]
+
+        # The window is overwritten by the next update only after all the copies
+        node.Barrier()
+
+        MPI.Request.Waitall( requests )
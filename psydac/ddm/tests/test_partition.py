@@ -1,6 +1,9 @@
 import pytest
 
-from psydac.ddm.partition import compute_dims
+import itertools
+import numpy as np
+
+from psydac.ddm.partition import compute_dims, partition_weights, load_imbalance
 
 #==============================================================================
 @pytest.mark.parametrize( 'mpi_size', [1,2,5,10] )
@@ -67,3 +70,48 @@ def test_partition_3d():
 
     assert tuple( dims ) == (5, 5, 4)
     assert tuple( blocksizes ) == (12, 25, 12)
+
+#==============================================================================
+@pytest.mark.parametrize( 'nparts', [1,3,4] )
+@pytest.mark.parametrize( 'min_blocksize', [1,2] )
+
+def test_partition_weights( nparts, min_blocksize ):
+
+    # ...
+    # Uniform weights: same blocks as the uniform decomposition
+    n = 12
+    starts, ends = partition_weights( np.ones( n ), nparts, min_blocksize )
+
+    assert np.array_equal( starts, [( c   *n)//nparts   for c in range( nparts )] )
+    assert np.array_equal( ends  , [((c+1)*n)//nparts-1 for c in range( nparts )] )
+
+    # ...
+    # Random weights (some zero): optimal partition, found by exhaustive search
+    rng = np.random.default_rng( 0 )
+    w   = rng.random( n ) * (rng.random( n ) > 0.3)
+    starts, ends = partition_weights( w, nparts, min_blocksize )
+
+    assert starts[0] == 0 and ends[-1] == n-1
+    assert np.array_equal( starts[1:], ends[:-1] + 1 )
+    assert all( ends - starts + 1 >= min_blocksize )
+
+    def bottleneck( bounds ):
+        return max( w[a:b].sum() for a, b in zip( bounds[:-1], bounds[1:] ) )
+
+    best = min( bottleneck( (0,) + c + (n,) )
+                for c in itertools.combinations( range( 1, n ), nparts-1 )
+                if all( b-a >= min_blocksize for a, b in zip( (0,) + c, c + (n,) ) ) )
+
+    assert np.isclose( bottleneck( tuple( starts ) + (n,) ), best, rtol=1e-10, atol=0 )
+
+    # ...
+    # Should fail: negative weights
+    with pytest.raises( ValueError ):
+        partition_weights( -np.ones( n ), nparts, min_blocksize )
+
+#==============================================================================
+def test_load_imbalance():
+
+    assert load_imbalance( [[2, 2], [3, 3, 3]] ) == 1.0
+    assert load_imbalance( [[1, 3], [1]] ) == 1.5
+    assert load_imbalance( [[1, 3], [1, 2]] ) == 6 / 3
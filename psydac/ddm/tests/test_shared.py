@@ -0,0 +1,105 @@
+# coding: utf-8
+
+import pytest
+
+#===============================================================================
+# TEST SharedCartDataExchanger against CartDataExchanger, and replicate
+#===============================================================================
+def run_shared_exchanger( npts, pads, periods, coeff_shape=() ):
+
+    import numpy as np
+    from mpi4py import MPI
+    from psydac.ddm.cart   import CartDecomposition, CartDataExchanger
+    from psydac.ddm.shared import SharedCartDataExchanger
+
+    comm = MPI.COMM_WORLD
+
+    cart = CartDecomposition( npts, pads, periods, reorder=False, comm=comm )
+
+    # Random owned values, and ghost regions filled with garbage
+    shape = list( cart.shape ) + list( coeff_shape )
+    u     = np.random.random( shape )
+    v     = u.copy()
+
+    shared = SharedCartDataExchanger( cart, v.dtype, coeff_shape=coeff_shape )
+
+    CartDataExchanger( cart, u.dtype, coeff_shape=coeff_shape ).update_ghost_regions( u )
+    shared.update_ghost_regions( v )
+    shared.free()
+
+    return comm.allreduce( np.array_equal( u, v ), op=MPI.LAND )
+
+#===============================================================================
+def run_replicate():
+
+    import numpy as np
+    from mpi4py import MPI
+    from psydac.ddm.shared import replicate, get_node_comm
+
+    comm = MPI.COMM_WORLD
+    node = get_node_comm( comm )
+
+    # Only the first process of each node provides the data
+    table = np.arange( 24. ).reshape( 4, 6 )
+    shared, window = replicate( table if node.rank == 0 else None, comm )
+    node.Free()
+
+    success = np.array_equal( shared, table ) and not shared.flags.writeable
+    window.Free()
+
+    return comm.allreduce( success, op=MPI.LAND )
+
+#===============================================================================
+def run_shared_assembly_grid( ncells, degree, periodic ):
+
+    import numpy as np
+    from mpi4py import MPI
+    from psydac.ddm.cart    import CartDecomposition
+    from psydac.fem.splines import SplineSpace
+    from psydac.fem.grid    import FemAssemblyGrid
+
+    comm = MPI.COMM_WORLD
+
+    grid  = np.linspace( 0., 1., ncells+1 )
+    space = SplineSpace( degree, grid=grid, periodic=periodic )
+    cart  = CartDecomposition( [space.nbasis], [degree], [periodic], reorder=False, comm=comm )
+    s, e  = cart.starts[0], cart.ends[0]
+
+    local  = FemAssemblyGrid( space, s, e, nderiv=degree )
+    shared = FemAssemblyGrid( space, s, e, nderiv=degree, comm=comm )
+
+    success = all( np.array_equal( getattr( local, name ), getattr( shared, name ) )
+                   for name in ['spans', 'basis', 'points', 'weights', 'indices'] )
+    success = success and not shared.basis.flags.writeable
+    success = success and (local.local_element_start, local.local_element_end) == \
+                          (shared.local_element_start, shared.local_element_end)
+
+    shared.free()
+    success = success and shared.basis is None
+
+    return comm.allreduce( success, op=MPI.LAND )
+
+#===============================================================================
+@pytest.mark.parallel
+@pytest.mark.parametrize( 'npts, pads, periods', [([40], [3], [True]),
+                                                  ([20, 17], [2, 3], [True, False]),
+                                                  ([9, 10, 8], [1, 2, 2], [False, True, True])] )
+def test_shared_exchanger( npts, pads, periods ):
+
+    assert run_shared_exchanger( npts, pads, periods )
+
+@pytest.mark.parallel
+def test_shared_exchanger_vector_coeffs():
+
+    assert run_shared_exchanger( [20, 17], [2, 3], [True, False], coeff_shape=[2] )
+
+@pytest.mark.parallel
+def test_replicate():
+
+    assert run_replicate()
+
+@pytest.mark.parallel
+@pytest.mark.parametrize( 'periodic', [True, False] )
+def test_shared_assembly_grid( periodic ):
+
+    assert run_shared_assembly_grid( 16, 3, periodic )
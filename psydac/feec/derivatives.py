@@ -221,6 +221,41 @@ class DirectionalDerivativeOperator(Matrix):
         mats = [M if i == self._diffdir else make_id(i) for i in range(self._domain.ndim)]
         return KroneckerStencilMatrix(self._domain, self._codomain, *mats)
     
+    def tostencil(self):
+        """
+        Converts this operator into a StencilMatrix, distributed like its codomain.
+        The matrix has pads 1 along the differentiation direction and 0 otherwise.
+
+        Returns
+        -------
+        out : StencilMatrix
+            The resulting StencilMatrix.
+        """
+        V = self._domain
+        W = self._codomain
+
+        pads = tuple(1 if i == self._diffdir else 0 for i in range(V.ndim))
+        M    = StencilMatrix(V, W, pads=pads)
+
+        # (D v)_i = v_{i+1} - v_i, hence (D^T v)_i = v_{i-1} - v_i
+        sign  = -1. if self._negative else 1.
+        shift = 0 if self._transposed else 2
+        rows  = tuple(slice(p, p+e-s+1) for p, s, e in zip(W.pads, W.starts, W.ends))
+
+        M._data[rows + pads] = -1. * sign
+        M._data[rows + tuple(shift if i == self._diffdir else 0 for i in range(V.ndim))] = 1. * sign
+
+        M.remove_spurious_entries()
+
+        return M
+
+    def matmul(self, B):
+        """
+        Computes the product of this operator with a matrix B as a StencilMatrix.
+        See StencilMatrix.matmul for details.
+        """
+        return self.tostencil().matmul(B)
+
     def transpose(self):
         """
         Transposes this operator. Creates and returns a new object.
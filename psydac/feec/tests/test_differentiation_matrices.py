@@ -6,6 +6,7 @@ from psydac.fem.basic        import FemField
 from psydac.fem.splines      import SplineSpace
 from psydac.fem.tensor       import TensorFemSpace
 from psydac.fem.vector       import ProductFemSpace
+from psydac.linalg.stencil   import StencilMatrix
 
 from psydac.feec.derivatives import DirectionalDerivativeOperator
 from psydac.feec.derivatives import Derivative_1D, Gradient_2D, Gradient_3D
@@ -251,6 +252,50 @@ def test_directional_derivative_operator_interface():
     compare_diff_operators_by_matrixassembly(-diffNT, diffT)
     compare_diff_operators_by_matrixassembly(-diffNT.T, diff)
 
+@pytest.mark.parametrize('periodic', [True, False])
+@pytest.mark.parametrize('direction', [0, 1])
+def test_directional_derivative_operator_matmul(periodic, direction):
+    # stiffness-like products D^T M D, computed as StencilMatrix objects
+
+    domain = [(0,1),(0,1)]
+    ncells = [8, 8]
+    degree = [3, 3]
+
+    breaks = [np.linspace(*lims, num=n+1) for lims, n in zip(domain, ncells)]
+
+    Ns = [SplineSpace(degree=d, grid=g, periodic=periodic, basis='B') \
+                                  for d, g in zip(degree, breaks)]
+
+    # original space
+    V0 = TensorFemSpace(*Ns)
+
+    # reduced space
+    V1 = V0.reduce_degree(axes=[direction], basis='M')
+
+    diff = DirectionalDerivativeOperator(V0.vector_space, V1.vector_space, direction)
+
+    # tridiagonal matrix on the reduced space
+    np.random.seed(2)
+    M = StencilMatrix(V1.vector_space, V1.vector_space, pads=(1, 1))
+    M._data[:] = np.random.random(M._data.shape)
+    M.remove_spurious_entries()
+
+    # compare against products of sparse matrices
+    D = diff.tosparse().tocsr()
+    assert abs(diff.tostencil().tosparse() - D).max() < 1e-14
+    assert abs(diff.T.tostencil().tosparse() - D.T).max() < 1e-14
+
+    MD = M.matmul(diff)
+    assert abs(MD.tosparse() - M.tosparse() @ D).max() < 1e-13
+
+    K = diff.T.matmul(MD)
+    assert K.domain is V0.vector_space
+    assert K.codomain is V0.vector_space
+    assert abs(K.tosparse() - D.T @ M.tosparse() @ D).max() < 1e-13
+
+    K = diff.T.tokronstencil().matmul(MD)
+    assert abs(K.tosparse() - D.T @ M.tosparse() @ D).max() < 1e-13
+
 @pytest.mark.parametrize('domain', [(0, 1), (-2, 3)])
 @pytest.mark.parametrize('ncells', [11, 37])
 @pytest.mark.parametrize('degree', [2, 3, 4, 5])
@@ -1,7 +1,14 @@
 # -*- coding: UTF-8 -*-
 
-from psydac.fem import basic
-from psydac.fem import context
-from psydac.fem import splines
-from psydac.fem import tensor
-from psydac.fem import vector
+__all__ = ['basic', 'context', 'splines', 'tensor', 'vector']
+
+import importlib
+
+# The modules are imported on first access (see psydac/__init__.py)
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -256,7 +256,17 @@ class FemField:
 
         """
         return self._coeffs
-        
+
+    # ...
+    @property
+    def version( self ):
+        """
+        Version of the coefficients, which changes whenever they are modified
+        in place. Used by the discrete forms to skip unnecessary assemblies.
+
+        """
+        return self._coeffs.version
+
     # ...
     @property
     def fields(self):
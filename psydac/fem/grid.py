@@ -8,7 +8,7 @@ from psydac.core.bsplines         import elements_spans
 from psydac.core.bsplines         import quadrature_grid
 from psydac.core.bsplines         import basis_ders_on_quad_grid
 from psydac.core.bsplines         import elevate_knots
-from psydac.utilities.quadratures import gauss_legendre
+from psydac.utilities.quadratures import gauss_legendre, gauss_lobatto
 
 __all__ = ['FemAssemblyGrid']
 
@@ -44,13 +44,29 @@ class FemAssemblyGrid:
         Number of basis functions' derivatives to be precomputed at the Gauss
         points (default: 1).
 
+    quad_family : str
+        Family of the quadrature rule, with (quad_order+1) points per element:
+        'legendre' for Gauss-Legendre (default), or 'lobatto' for Gauss-Lobatto.
+        The Gauss-Lobatto points include the element boundaries, and the rule
+        is exact for polynomials of degree 2*quad_order-1 instead of
+        2*quad_order+1.
+
     parent_start: int
         Index of first 1D parent basis local to process.
 
     parent_end: int
         Index of last 1D parent basis local to process.
+
+    comm : mpi4py.MPI.Comm
+        If given, the tables of the quadrature points and weights and of the
+        basis functions are computed by the first process of each node only,
+        and stored once per node in shared memory (see replicate). The local
+        tables are then read-only, and views of the shared ones when the local
+        elements are contiguous. The construction is collective on comm, and
+        the memory must be released with the method free.
     """
-    def __init__( self, space, start, end, *, quad_order=None, nderiv=1, parent_start=None, parent_end=None):
+    def __init__( self, space, start, end, *, quad_order=None, nderiv=1, quad_family='legendre',
+                  parent_start=None, parent_end=None, comm=None):
 
         T            = space.knots           # knots sequence
         degree       = space.degree          # spline degree
@@ -62,22 +78,51 @@ class FemAssemblyGrid:
         multiplicity = space.multiplicity    # multiplicity of the knots
 
 
-        # Gauss-legendre quadrature rule
-        u, w = gauss_legendre( k )
+        if quad_family == 'legendre':
+            # Gauss-legendre quadrature rule
+            u, w = gauss_legendre( k )
+
+            # invert order
+            u = u[::-1]
+            w = w[::-1]
 
-        # invert order
-        u = u[::-1]
-        w = w[::-1]
+        elif quad_family == 'lobatto':
+            # Gauss-Lobatto quadrature rule (needs at least 2 points)
+            if k < 1:
+                raise ValueError('Gauss-Lobatto quadrature requires quad_order >= 1')
+            u, w = gauss_lobatto( k )
+
+        else:
+            raise ValueError("Unknown quadrature family '{}'".format(quad_family))
 
         #-------------------------------------------
         # GLOBAL GRID
         #-------------------------------------------
 
-        # Lists of quadrature coordinates and weights on each element
-        glob_points, glob_weights = quadrature_grid( grid, u, w )
+        if comm is None:
+            root = True
+        else:
+            from psydac.ddm.shared import get_node_comm, replicate
+            node = get_node_comm( comm )
+            root = node.rank == 0
 
-        # List of basis function values on each element
-        glob_basis = basis_ders_on_quad_grid( T, degree, glob_points, nderiv, space.basis )
+        if root:
+            # Lists of quadrature coordinates and weights on each element
+            glob_points, glob_weights = quadrature_grid( grid, u, w )
+
+            # List of basis function values on each element
+            glob_basis = basis_ders_on_quad_grid( T, degree, glob_points, nderiv, space.basis )
+        else:
+            glob_points = glob_weights = glob_basis = None
+
+        # Global tables stored once per node
+        windows = []
+        if comm is not None:
+            glob_points , win_points  = replicate( glob_points , node )
+            glob_weights, win_weights = replicate( glob_weights, node )
+            glob_basis  , win_basis   = replicate( glob_basis  , node )
+            windows = [win_points, win_weights, win_basis]
+            node.Free()
 
         # List of spans on each element
         # (Span is global index of last non-vanishing basis function)
@@ -88,11 +133,8 @@ class FemAssemblyGrid:
         # LOCAL GRID, EXTENDED (WITH GHOST REGIONS)
         #-------------------------------------------
 
-        # Lists of local quadrature points and weights, basis functions values
+        # Lists of local spans and indices of the elements
         spans   = []
-        basis   = []
-        points  = []
-        weights = []
         indices = []
         ne      = 0
 
@@ -118,9 +160,6 @@ class FemAssemblyGrid:
                 gk = current_glob_spans[k]
                 if start <= gk-n and gk-n-pad <= end:
                     spans  .append( glob_spans[k]-n )
-                    basis  .append( glob_basis  [k] )
-                    points .append( glob_points [k] )
-                    weights.append( glob_weights[k] )
                     indices.append( k )
                     ne += 1
 
@@ -133,12 +172,22 @@ class FemAssemblyGrid:
             if current_start-m <= gk and gk-pad <= current_end:
                 if m>0 and pad-degree==1 and start>gs:continue
                 spans  .append( glob_spans  [k] )
-                basis  .append( glob_basis  [k] )
-                points .append( glob_points [k] )
-                weights.append( glob_weights[k] )
                 indices.append( k )
                 ne += 1
 
+        # Local quadrature points and weights, basis functions values: views
+        # of the shared tables if the elements are contiguous, copies otherwise
+        indices = np.array( indices, dtype=int )
+        if comm is not None and ne > 0 and np.all( np.diff( indices ) == 1 ):
+            local = slice( indices[0], indices[-1]+1 )
+        else:
+            local = indices
+
+        basis, points, weights = glob_basis[local], glob_points[local], glob_weights[local]
+        if comm is not None:
+            for table in (basis, points, weights):
+                table.flags.writeable = False
+
         #-------------------------------------------
         # DATA STORAGE IN OBJECT
         #-------------------------------------------
@@ -146,12 +195,14 @@ class FemAssemblyGrid:
         self._num_elements = ne
         self._num_quad_pts = len( u )
         self._spans        = np.array( spans   )
-        self._basis        = np.array( basis   )
-        self._points       = np.array( points  )
-        self._weights      = np.array( weights )
-        self._indices      = np.array( indices )
+        self._basis        = basis
+        self._points       = points
+        self._weights      = weights
+        self._indices      = indices
+        self._windows      = windows
         self._quad_rule_x  = u
         self._quad_rule_w  = w
+        self._quad_family  = quad_family
 
         #-------------------------------------------
         # LOCAL GRID, PROPER (WITHOUT GHOST REGIONS)
@@ -237,6 +288,13 @@ class FemAssemblyGrid:
         """
         return self._quad_rule_w
 
+    # ...
+    @property
+    def quad_family( self ):
+        """ Family of the quadrature rule: 'legendre' or 'lobatto'.
+        """
+        return self._quad_family
+
     # ...
     @property
     def local_element_start( self ):
@@ -250,3 +308,20 @@ class FemAssemblyGrid:
         """ Local index of last element owned by process.
         """
         return self._local_element_end
+
+    # ...
+    def free( self ):
+        """ Free the shared memory of the tables, if any. This operation is
+            collective on the communicator given at construction, and the
+            tables cannot be used afterwards.
+        """
+        if not self._windows:
+            return
+
+        for window in self._windows:
+            window.Free()
+
+        self._windows = []
+        self._basis   = None
+        self._points  = None
+        self._weights = None
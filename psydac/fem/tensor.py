@@ -19,6 +19,7 @@ from psydac.fem.basic      import FemSpace, FemField
 from psydac.fem.splines    import SplineSpace
 from psydac.fem.grid       import FemAssemblyGrid
 from psydac.ddm.cart       import CartDecomposition
+from psydac.utilities.hdf5 import DatasetStorage
 from psydac.core.bsplines  import (find_span,
                                    basis_funs,
                                    basis_funs_1st_der,
@@ -47,6 +48,14 @@ class TensorFemSpace( FemSpace ):
     For now we assume that this tensor-product space can ONLY be constructed
     from 1D spline spaces.
 
+    In parallel (comm given), the coefficients are split into blocks with the
+    same number of coefficients along each direction by default. With
+    balance='weighted', the blocks have instead (nearly) the same estimated
+    cost: the cost of each element along each direction is given by the list
+    of arrays element_costs, or by default is 1 plus, for the first and last
+    elements of non-periodic directions, the relative cost 1/(degree+1) of the
+    boundary integrals. The resulting imbalance is given by load_imbalance.
+
     """
 
     def __init__( self, *args, **kwargs ):
@@ -61,6 +70,22 @@ class TensorFemSpace( FemSpace ):
         periods      = [V.periodic for V in self.spaces]
         basis        = [V.basis    for V in self.spaces]
 
+        # Balance of the decomposition, checked in the serial case too so that
+        # the arguments are valid for any number of processes
+        balance = kwargs.pop('balance', 'uniform')
+        costs   = kwargs.pop('element_costs', None)
+
+        if balance == 'uniform':
+            weights = None
+        elif balance == 'weighted':
+            if costs is None:
+                costs = [None] * len(self.spaces)
+            elif len(costs) != len(self.spaces):
+                raise ValueError('Expected element costs for {} directions, got {}'.format(len(self.spaces), len(costs)))
+            weights = [_coefficient_costs(V, c) for V, c in zip(self.spaces, costs)]
+        else:
+            raise ValueError("Balance must be 'uniform' or 'weighted', got '{}'".format(balance))
+
         if 'comm' in kwargs and not( kwargs['comm'] is None ):
             # parallel case
             comm         = kwargs['comm']
@@ -68,6 +93,7 @@ class TensorFemSpace( FemSpace ):
             reverse_axis = kwargs.pop('reverse_axis', None)
             num_threads  = int(os.environ.get('OMP_NUM_THREADS',1))
             assert isinstance(comm, MPI.Comm)
+
             cart = CartDecomposition(
                 npts         = npts,
                 pads         = pads,
@@ -77,7 +103,8 @@ class TensorFemSpace( FemSpace ):
                 comm         = comm,
                 nprocs       = nprocs,
                 reverse_axis = reverse_axis,
-                num_threads  = num_threads
+                num_threads  = num_threads,
+                weights      = weights
             )
 
             self._vector_space = StencilVectorSpace(cart)
@@ -98,11 +125,11 @@ class TensorFemSpace( FemSpace ):
         if self._quad_order is None:
             self._quad_order = [sp.degree for sp in self.spaces]
 
+        self._quad_family = kwargs.pop('quad_family', 'legendre')
+
         # Compute extended 1D quadrature grids (local to process) along each direction
-        self._quad_grids = tuple( FemAssemblyGrid( V,s,e, nderiv=V.degree, quad_order=q, parent_start=ps, parent_end=pe)
-                                  for V,s,e,ps,pe,q in zip( self.spaces, v.starts, v.ends,
-                                                        v.parent_starts, v.parent_ends,
-                                                        self._quad_order ) )
+        self._quad_grids = self._create_quad_grids(self._quad_family)
+        self._quad_grids_cache = {self._quad_family: self._quad_grids}
 
         # Determine portion of logical domain local to process
         self._element_starts = tuple( g.indices[g.local_element_start] for g in self.quad_grids )
@@ -164,6 +191,12 @@ class TensorFemSpace( FemSpace ):
         """Returns the topological associated vector space."""
         return self._vector_space
 
+    @property
+    def load_imbalance(self):
+        """ Ratio of the maximum to the average estimated load of the processes (1 in serial)."""
+        v = self._vector_space
+        return v.cart.load_imbalance if v.parallel else 1.0
+
     @property
     def is_product(self):
         return False
@@ -761,6 +794,12 @@ class TensorFemSpace( FemSpace ):
     def quad_order( self ):
         return self._quad_order
 
+    @property
+    def quad_family( self ):
+        """ Family of the quadrature rule used by 'quad_grids': 'legendre' or 'lobatto'.
+        """
+        return self._quad_family
+
     @property
     def quad_grids( self ):
         """
@@ -772,6 +811,32 @@ class TensorFemSpace( FemSpace ):
         """
         return self._quad_grids
 
+    def get_quad_grids( self, quad_family ):
+        """
+        List of 'FemAssemblyGrid' objects with the same quadrature order as
+        'quad_grids', but using the given quadrature family. The grids are
+        computed once and then cached.
+
+        Parameters
+        ----------
+        quad_family : str
+            Family of the quadrature rule: 'legendre' or 'lobatto'.
+
+        """
+        if quad_family not in self._quad_grids_cache:
+            self._quad_grids_cache[quad_family] = self._create_quad_grids(quad_family)
+        return self._quad_grids_cache[quad_family]
+
+    def _create_quad_grids( self, quad_family ):
+        v = self._vector_space
+        # Tables stored once per node with shared memory (collective)
+        comm = v.cart.comm if v.shared_memory else None
+        return tuple( FemAssemblyGrid( V,s,e, nderiv=V.degree, quad_order=q, quad_family=quad_family,
+                                       parent_start=ps, parent_end=pe, comm=comm)
+                      for V,s,e,ps,pe,q in zip( self.spaces, v.starts, v.ends,
+                                            v.parent_starts, v.parent_ends,
+                                            self._quad_order ) )
+
     @property
     def local_domain( self ):
         """
@@ -921,12 +986,27 @@ class TensorFemSpace( FemSpace ):
                 global_starts[axis][0] = 0
 
         cart = v._cart.reduce_grid(global_starts, global_ends)
-        V    = TensorFemSpace(*spaces, cart=cart, quad_order=self._quad_order)
+        V    = TensorFemSpace(*spaces, cart=cart, quad_order=self._quad_order, quad_family=self._quad_family)
         return V
 
     # ...
-    def export_fields( self, filename, **fields ):
-        """ Write spline coefficients of given fields to HDF5 file.
+    def export_fields( self, filename, *, storage=None, **fields ):
+        """
+        Write spline coefficients of given fields to HDF5 file.
+
+        Parameters
+        ----------
+        filename : str
+            Name of HDF5 output file.
+
+        storage : psydac.utilities.hdf5.DatasetStorage, optional
+            Layout of the datasets (chunks, compression, data type and
+            collective writes). By default the datasets are contiguous.
+
+        fields : dict
+            Fields (elements of this space) to be written, with the names
+            of their datasets as keys.
+
         """
         assert isinstance( filename, str )
         assert all( field.space is self for field in fields.values() )
@@ -934,8 +1014,8 @@ class TensorFemSpace( FemSpace ):
         V    = self.vector_space
         comm = V.cart.comm if V.parallel else None
 
-        # Multi-dimensional index range local to process
-        index = tuple( slice( s, e+1 ) for s,e in zip( V.starts, V.ends ) )
+        if storage is None:
+            storage = DatasetStorage()
 
         # Create HDF5 file (in parallel mode if MPI communicator size > 1)
         kwargs = {}
@@ -946,8 +1026,8 @@ class TensorFemSpace( FemSpace ):
 
         # Add field coefficients as named datasets
         for name,field in fields.items():
-            dset = h5.create_dataset( name, shape=V.npts, dtype=V.dtype )
-            dset[index] = field.coeffs[index]
+            dset = storage.create_dataset( h5, name, V )
+            storage.write( dset, field.coeffs )
 
         # Close HDF5 file
         h5.close()
@@ -1039,10 +1119,12 @@ class TensorFemSpace( FemSpace ):
         n_elements = [s1.nbasis-s2.nbasis for s1,s2 in zip(self.spaces, spaces)]
         if v.cart:
             red_cart = v.cart.reduce_elements(axes, n_elements)
-            tensor_vec = TensorFemSpace(*spaces, cart=red_cart, quad_order=self._quad_order)
+            tensor_vec = TensorFemSpace(*spaces, cart=red_cart, quad_order=self._quad_order,
+                                        quad_family=self._quad_family)
         else:
             v = v.reduce_elements(axes, n_elements)
-            tensor_vec = TensorFemSpace(*spaces, quad_order=self._quad_order, vector_space=v)
+            tensor_vec = TensorFemSpace(*spaces, quad_order=self._quad_order, quad_family=self._quad_family,
+                                        vector_space=v)
         
         tensor_vec._interpolation_ready = False
         return tensor_vec
@@ -1130,3 +1212,46 @@ class TensorFemSpace( FemSpace ):
         txt += '> nbasis :: ({dims})\n'.format(dims=dims)
         return txt
 
+
+#===============================================================================
+def _coefficient_costs( space, element_costs=None ):
+    """
+    Cost estimates of the coefficients of a 1D spline space, for the weighted
+    decomposition of a TensorFemSpace: each coefficient carries the cost of
+    the element which starts at its support in the ownership convention of
+    the elements (see TensorFemSpace.__init__), and the first degree-1
+    coefficients of non-periodic spaces carry no elements.
+
+    Parameters
+    ----------
+    space : SplineSpace
+        1D spline space, with multiplicity 1.
+
+    element_costs : array_like of float, optional
+        Cost of each element. By default it is 1, plus 1/(degree+1) for the
+        boundary elements of a non-periodic space.
+
+    Returns
+    -------
+    numpy.ndarray
+        Cost of each coefficient.
+    """
+    ne = space.ncells
+    k  = max(space._pads - 1, 0)
+
+    if element_costs is None:
+        element_costs = np.ones(ne)
+        if not space.periodic:
+            element_costs[[0, -1]] += 1 / (space.degree + 1)
+    else:
+        element_costs = np.asarray(element_costs, dtype=float)
+        if element_costs.shape != (ne,):
+            raise ValueError('Expected {} element costs, got shape {}'.format(ne, element_costs.shape))
+
+    weights = np.zeros(space.nbasis)
+    if space.periodic:
+        weights[:ne] = element_costs
+    else:
+        weights[k:k+ne] = element_costs
+
+    return weights
@@ -1,10 +1,13 @@
-__all__ = ['basic', 'block', 'direct_solvers', 'iterative_solvers', 'stencil', 'kron', 'utilities']
+__all__ = ['basic', 'block', 'direct_solvers', 'iterative_solvers', 'stencil', 'kron', 'utilities', 'identity',
+           'preconditioners', 'recycling']
 
-from psydac.linalg import basic
-from psydac.linalg import block
-from psydac.linalg import direct_solvers
-from psydac.linalg import iterative_solvers
-from psydac.linalg import stencil
-from psydac.linalg import kron
-from psydac.linalg import utilities
-from psydac.linalg import identity
+import importlib
+
+# The modules are imported on first access (see psydac/__init__.py)
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,10 +2,13 @@
 #
 # Copyright 2018 Yaman Güçlü, Jalal Lakhlili
 
-from abc   import ABCMeta, abstractmethod
-from numpy import ndarray
+from abc     import ABCMeta, abstractmethod
+from numbers import Number
+from numpy   import ndarray
 
-__all__ = ['VectorSpace', 'Vector', 'LinearOperator', 'LinearSolver', 'Matrix']
+__all__ = ['VectorSpace', 'Vector', 'LinearOperator', 'LinearSolver', 'Matrix',
+           'SumLinearOperator', 'ComposedLinearOperator', 'ScaledLinearOperator',
+           'InverseLinearOperator']
 
 #===============================================================================
 class VectorSpace( metaclass=ABCMeta ):
@@ -153,6 +156,53 @@ class LinearOperator( metaclass=ABCMeta ):
     def dot( self, v, out=None ):
         pass
 
+    #-------------------------------------
+    # Methods with default implementation
+    #-------------------------------------
+    def transpose( self ):
+        raise NotImplementedError('Class does not provide a transpose() method')
+
+    # ...
+    @property
+    def T( self ):
+        return self.transpose()
+
+    # ...
+    def __add__( self, B ):
+        """ Lazy sum A + B, evaluated matrix-free. """
+        return SumLinearOperator( self, B )
+
+    # ...
+    def __sub__( self, B ):
+        """ Lazy difference A - B, evaluated matrix-free. """
+        return SumLinearOperator( self, ScaledLinearOperator( -1.0, B ) )
+
+    # ...
+    def __neg__( self ):
+        """ Lazy opposite operator -A. """
+        return ScaledLinearOperator( -1.0, self )
+
+    # ...
+    def __mul__( self, c ):
+        """ Lazy multiplication by scalar. """
+        if not isinstance( c, Number ):
+            return NotImplemented
+        return ScaledLinearOperator( c, self )
+
+    # ...
+    def __rmul__( self, c ):
+        """ Lazy multiplication by scalar. """
+        if not isinstance( c, Number ):
+            return NotImplemented
+        return ScaledLinearOperator( c, self )
+
+    # ...
+    def __matmul__( self, B ):
+        """ Lazy composition A @ B, where B is applied first. """
+        if not (isinstance( B, LinearOperator ) and hasattr( B, 'domain' ) and hasattr( B, 'codomain' )):
+            return NotImplemented
+        return ComposedLinearOperator( self, B )
+
 LinearOperator.register( ndarray )
 
 #===============================================================================
@@ -243,5 +293,309 @@ class LinearSolver( metaclass=ABCMeta ):
     def solve( self, rhs, out=None, transposed=False ):
         pass
 
+#===============================================================================
+class SumLinearOperator( LinearOperator ):
+    """
+    Lazy sum L = A_1 + A_2 + ... + A_n of linear operators with identical
+    domain and codomain. The sum is never assembled: every call to dot()
+    applies all the operators in turn and accumulates the results, using a
+    work vector which is allocated once at construction.
+
+    Parameters
+    ----------
+    *operators : psydac.linalg.basic.LinearOperator
+        The operators to be summed. Nested sums are flattened.
+
+    """
+    def __init__( self, *operators ):
+
+        assert len( operators ) > 0
+        assert all( isinstance( A, LinearOperator ) for A in operators )
+
+        # Flatten nested sums
+        addends = []
+        for A in operators:
+            if isinstance( A, SumLinearOperator ):
+                addends.extend( A.addends )
+            else:
+                addends.append( A )
+
+        domain   = addends[0].domain
+        codomain = addends[0].codomain
+        assert all( A.domain   is domain   for A in addends )
+        assert all( A.codomain is codomain for A in addends )
+
+        self._addends  = tuple( addends )
+        self._domain   = domain
+        self._codomain = codomain
+        self._work     = codomain.zeros() if len( addends ) > 1 else None
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain( self ):
+        return self._domain
+
+    # ...
+    @property
+    def codomain( self ):
+        return self._codomain
+
+    # ...
+    @property
+    def dtype( self ):
+        return self.domain.dtype
+
+    # ...
+    def dot( self, v, out=None ):
+
+        assert v.space is self.domain
+
+        if out is None:
+            out = self.codomain.zeros()
+        else:
+            assert out.space is self.codomain
+            # The input vector is needed by all addends: do not overwrite it
+            if out is v:
+                v = v.copy()
+
+        _dot_into( self._addends[0], v, out )
+        for A in self._addends[1:]:
+            out += A.dot( v, out=self._work )
+
+        return out
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def addends( self ):
+        return self._addends
+
+    # ...
+    def transpose( self ):
+        return SumLinearOperator( *[A.transpose() for A in self._addends] )
+
+#===============================================================================
+class ComposedLinearOperator( LinearOperator ):
+    """
+    Lazy product L = A_1 @ A_2 @ ... @ A_n of linear operators, where A_n is
+    applied first (like in a matrix product). The product is never assembled:
+    intermediate results are stored in work vectors which are allocated once
+    at construction, hence dot() does not allocate any memory if the output
+    vector is provided.
+
+    Parameters
+    ----------
+    *operators : psydac.linalg.basic.LinearOperator
+        The factors of the product. Nested products are flattened.
+
+    """
+    def __init__( self, *operators ):
+
+        assert len( operators ) > 0
+        assert all( isinstance( A, LinearOperator ) for A in operators )
+
+        # Flatten nested products
+        factors = []
+        for A in operators:
+            if isinstance( A, ComposedLinearOperator ):
+                factors.extend( A.factors )
+            else:
+                factors.append( A )
+
+        for A, B in zip( factors[:-1], factors[1:] ):
+            assert A.domain is B.codomain
+
+        self._factors = tuple( factors )
+
+        # Work vectors: the codomain of every factor but the first one
+        self._work = tuple( B.codomain.zeros() for B in factors[1:] )
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain( self ):
+        return self._factors[-1].domain
+
+    # ...
+    @property
+    def codomain( self ):
+        return self._factors[0].codomain
+
+    # ...
+    @property
+    def dtype( self ):
+        return self.domain.dtype
+
+    # ...
+    def dot( self, v, out=None ):
+
+        assert v.space is self.domain
+
+        if out is None:
+            out = self.codomain.zeros()
+        else:
+            assert out.space is self.codomain
+
+        # Apply the factors from right to left, going through the work vectors
+        for A, w in zip( self._factors[:0:-1], self._work[::-1] ):
+            v = A.dot( v, out=w )
+
+        _dot_into( self._factors[0], v, out )
+
+        return out
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def factors( self ):
+        return self._factors
+
+    # ...
+    def transpose( self ):
+        return ComposedLinearOperator( *[A.transpose() for A in self._factors[::-1]] )
+
+#===============================================================================
+class ScaledLinearOperator( LinearOperator ):
+    """
+    Lazy product L = c * A of a linear operator by a scalar.
+
+    Parameters
+    ----------
+    c : Number
+        Scalar factor.
+
+    A : psydac.linalg.basic.LinearOperator
+        Linear operator to be scaled. If A is itself a ScaledLinearOperator,
+        the two scalar factors are merged.
+
+    """
+    def __init__( self, c, A ):
+
+        assert isinstance( c, Number )
+        assert isinstance( A, LinearOperator )
+
+        if isinstance( A, ScaledLinearOperator ):
+            c = c * A.scalar
+            A = A.operator
+
+        self._scalar   = c
+        self._operator = A
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain( self ):
+        return self._operator.domain
+
+    # ...
+    @property
+    def codomain( self ):
+        return self._operator.codomain
+
+    # ...
+    @property
+    def dtype( self ):
+        return self.domain.dtype
+
+    # ...
+    def dot( self, v, out=None ):
+
+        if out is None:
+            out = self._operator.dot( v )
+        else:
+            _dot_into( self._operator, v, out )
+
+        out *= self._scalar
+        return out
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def scalar( self ):
+        return self._scalar
+
+    # ...
+    @property
+    def operator( self ):
+        return self._operator
+
+    # ...
+    def transpose( self ):
+        return ScaledLinearOperator( self._scalar, self._operator.transpose() )
+
+#===============================================================================
+class InverseLinearOperator( LinearOperator ):
+    """
+    Linear operator representing the inverse of a square matrix, whose
+    application is delegated to a LinearSolver object.
+
+    Parameters
+    ----------
+    solver : psydac.linalg.basic.LinearSolver
+        Solver for the linear system Ax=b, which provides the action of A^{-1}.
+
+    transposed : bool
+        If True, the operator represents A^{-T} instead of A^{-1}.
+
+    """
+    def __init__( self, solver, *, transposed=False ):
+
+        assert isinstance( solver, LinearSolver )
+
+        self._solver     = solver
+        self._transposed = transposed
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain( self ):
+        return self._solver.space
+
+    # ...
+    @property
+    def codomain( self ):
+        return self._solver.space
+
+    # ...
+    @property
+    def dtype( self ):
+        return self.domain.dtype
+
+    # ...
+    def dot( self, v, out=None ):
+        return self._solver.solve( v, out=out, transposed=self._transposed )
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def solver( self ):
+        return self._solver
+
+    # ...
+    def transpose( self ):
+        return InverseLinearOperator( self._solver, transposed=not self._transposed )
+
+#===============================================================================
+def _dot_into( A, v, out ):
+    """
+    Compute A.dot(v) and store the result in the vector 'out'. Some operators
+    ignore the 'out' argument and return a new vector, in which case the
+    result is copied.
+
+    """
+    w = A.dot( v, out=out )
+    if w is not out:
+        out *= 0.0
+        out += w
+
 #===============================================================================
 del ABCMeta, abstractmethod, ndarray
@@ -3,7 +3,6 @@
 # Copyright 2018 Jalal Lakhlili, Yaman Güçlü
 
 import numpy as np
-from scipy.sparse import bmat, lil_matrix
 
 from psydac.linalg.basic import VectorSpace, Vector, LinearOperator, LinearSolver, Matrix
 
@@ -143,6 +142,9 @@ class BlockVector( Vector ):
         # TODO: distinguish between different directions
         self._sync  = False
 
+        # Counter of block replacements (see property 'version')
+        self._version = 0
+
     #--------------------------------------
     # Abstract interface
     #--------------------------------------
@@ -238,6 +240,15 @@ class BlockVector( Vector ):
     def __setitem__( self, key, value ):
         assert value.space == self.space[key]
         self._blocks[key] = value
+        self._version += 1
+
+    # ...
+    @property
+    def version( self ):
+        """ Tuple of the versions of the blocks, preceded by the number of block
+            replacements: it changes whenever any block is modified in place.
+        """
+        return (self._version, *(b.version for b in self._blocks))
 
     # ...
     @property
@@ -541,6 +552,8 @@ class BlockMatrix( BlockLinearOperator, Matrix ):
         block_domain   = (lambda j: self.domain  [j]) if ncols > 1 else (lambda j: self.domain)
         block_codomain = (lambda i: self.codomain[i]) if nrows > 1 else (lambda i: self.codomain)
 
+        from scipy.sparse import bmat, lil_matrix
+
         # Convert all blocks to Scipy sparse format
         blocks_sparse = [[None for j in range(ncols)] for i in range(nrows)]
         for i in range(nrows):
@@ -562,11 +575,74 @@ class BlockMatrix( BlockLinearOperator, Matrix ):
 
         return M
 
+    # ...
+    def diagonal(self, *, inverse=False, out=None):
+        """
+        Diagonal entries of the matrix owned by the process, as a vector of the
+        codomain, obtained from the diagonals of the diagonal blocks.
+
+        Parameters
+        ----------
+        inverse : bool
+            If True, return the inverses of the diagonal entries.
+
+        out : BlockVector, optional
+            Vector of the codomain where the result is stored.
+
+        Returns
+        -------
+        out : BlockVector
+            Diagonal (or inverse diagonal) of the matrix.
+        """
+        if out is None:
+            out = BlockVector(self.codomain)
+        else:
+            assert isinstance(out, BlockVector)
+            assert out.space is self.codomain
+
+        for i in range(self.n_block_rows):
+            Aii = self._blocks.get((i, i))
+            if Aii is None:
+                raise ValueError('Diagonal block ({0}, {0}) is missing'.format(i))
+            Aii.diagonal(inverse=inverse, out=out[i])
+
+        return out
+
     # ...
     def copy(self):
         blocks = {ij: Bij.copy() for ij, Bij in self._blocks.items()}
         return BlockMatrix(self.domain, self.codomain, blocks=blocks)
 
+    # ...
+    def astype(self, dtype, out=None):
+        """
+        Copy of the matrix with the entries of all blocks stored in another
+        datatype (see StencilMatrix.astype).
+
+        Parameters
+        ----------
+        dtype : type | str | numpy.dtype
+            Datatype of the stored entries of the new matrix.
+
+        out : BlockMatrix
+            Matrix with the same blocks in which the entries are copied
+            (optional: a new matrix is created).
+
+        Returns
+        -------
+        out : BlockMatrix
+            Matrix with the same domain and codomain.
+        """
+        if out is None:
+            blocks = {ij: Bij.astype(dtype) for ij, Bij in self._blocks.items()}
+            return BlockMatrix(self.domain, self.codomain, blocks=blocks)
+
+        assert isinstance(out, BlockMatrix)
+        assert out._blocks.keys() == self._blocks.keys()
+        for ij, Bij in self._blocks.items():
+            Bij.astype(dtype, out=out[ij])
+        return out
+
     # ...
     def __neg__(self):
         blocks = {ij: -Bij for ij, Bij in self._blocks.items()}
@@ -2,14 +2,13 @@
 # Copyright 2018 Jalal Lakhlili, Yaman Güçlü
 
 from abc                 import abstractmethod
-from numpy               import ndarray
-from scipy.linalg.lapack import dgbtrf, dgbtrs
-from scipy.sparse        import spmatrix
-from scipy.sparse.linalg import splu
+import numpy as np
+from numpy               import ndarray, multiply
 
-from psydac.linalg.basic    import LinearSolver
+from psydac.linalg.basic     import LinearSolver
+from psydac.linalg.utilities import _stencil_blocks, _owned_region
 
-__all__ = ['DirectSolver', 'BandedSolver', 'SparseSolver']
+__all__ = ['DirectSolver', 'BandedSolver', 'SparseSolver', 'DiagonalSolver']
 
 #===============================================================================
 class DirectSolver( LinearSolver ):
@@ -46,9 +45,17 @@ class BandedSolver ( DirectSolver ):
     bmat : nd-array
         Banded matrix.
 
+    Notes
+    -----
+    A new matrix with the same bandwidths is factorized in the storage of the
+    current factors with 'refactor'.
+
     """
     def __init__( self, u, l, bmat ):
 
+        # SciPy is imported on first use, to keep 'import psydac.linalg' fast
+        from scipy.linalg.lapack import dgbtrf
+
         self._u    = u
         self._l    = l
 
@@ -63,6 +70,24 @@ class BandedSolver ( DirectSolver ):
     def finfo( self ):
         return self._finfo
 
+    #...
+    def refactor( self, bmat ):
+        """
+        Compute the LU factorization of a new banded matrix with the same
+        bandwidths, overwriting the current factors (no allocation).
+
+        Parameters
+        ----------
+        bmat : nd-array
+            Banded matrix, in the same format as in the constructor.
+        """
+        from scipy.linalg.lapack import dgbtrf
+
+        assert bmat.shape == self._bmat.shape
+
+        self._bmat[...] = bmat
+        self._bmat, self._ipiv, self._finfo = dgbtrf(self._bmat, self._l, self._u, overwrite_ab=True)
+
     @property
     def sinfo( self ):
         return self._sinfo
@@ -93,6 +118,8 @@ class BandedSolver ( DirectSolver ):
         transposed : bool
             If and only if set to true, we solve against the transposed matrix. (supported by the underlying solver)
         """
+        from scipy.linalg.lapack import dgbtrs
+
         assert rhs.T.shape[0] == self._bmat.shape[1]
 
         if out is None:
@@ -107,10 +134,13 @@ class BandedSolver ( DirectSolver ):
             if rhs is not out:
                 out[:] = rhs
 
-            # TODO: handle non-contiguous views?
-            
-            # we want FORTRAN-contiguous data (default is assumed to be C contiguous)
-            _, self._sinfo = dgbtrs(self._bmat, self._l, self._u, out.T, self._ipiv, overwrite_b=True, trans=transposed)
+            # we want FORTRAN-contiguous data (default is assumed to be C contiguous):
+            # all the right-hand sides are then solved in place, in one call
+            preout, self._sinfo = dgbtrs(self._bmat, self._l, self._u, out.T, self._ipiv, overwrite_b=True, trans=transposed)
+
+            # non-contiguous views are copied by LAPACK wrapper
+            if not np.shares_memory(preout, out):
+                out[:] = preout.T
 
         return out
 
@@ -124,13 +154,79 @@ class SparseSolver ( DirectSolver ):
     spmat : scipy.sparse.spmatrix
         Generic sparse matrix.
 
+    Notes
+    -----
+    A new matrix with the same sparsity pattern is factorized with 'refactor',
+    which reuses the fill-reducing column ordering and the CSC structure
+    computed at construction: only the numerical factorization is done again.
+
     """
     def __init__( self, spmat ):
 
+        from scipy.sparse        import spmatrix
+        from scipy.sparse.linalg import splu
+
         assert isinstance( spmat, spmatrix )
 
         self._space = ndarray
-        self._splu  = splu( spmat.tocsc() )
+        self._csc   = spmat.tocsc( copy=True )
+        self._csc.sort_indices()
+        self._splu  = splu( self._csc )
+
+        # Column ordering and permuted CSC structure (computed by first 'refactor')
+        self._perm_c  = None
+        self._index   = None
+        self._indices = None
+        self._indptr  = None
+
+    @property
+    def matrix( self ):
+        """ Factorized matrix, in CSC format with sorted indices."""
+        return self._csc
+
+    #...
+    def refactor( self, values ):
+        """
+        Compute the LU factorization of a new matrix with the same sparsity
+        pattern as the current one. The column permutation of the first
+        factorization is applied once to the CSC structure, and reused: the
+        new factorization is computed in this order, with partial pivoting.
+
+        Parameters
+        ----------
+        values : scipy.sparse.spmatrix | ndarray
+            New matrix with the same sparsity pattern, or its nonzero values
+            in the order of the array 'self.matrix.data'.
+        """
+        from scipy.sparse        import spmatrix, csc_matrix
+        from scipy.sparse.linalg import splu
+
+        A = self._csc
+
+        if isinstance( values, spmatrix ):
+            B = values.tocsc( copy=True )
+            B.sort_indices()
+            if not (np.array_equal( B.indptr, A.indptr ) and np.array_equal( B.indices, A.indices )):
+                raise ValueError( 'New matrix must have the sparsity pattern of the factorized one' )
+            values = B.data
+
+        assert values.shape == A.data.shape
+        A.data[:] = values
+
+        if self._perm_c is None:
+            # Column j of the permuted matrix A*Pc is column order[j] of A
+            perm_c = self._splu.perm_c
+            order  = np.argsort( perm_c )
+            counts = np.diff( A.indptr )[order]
+            indptr = np.concatenate( ([0], np.cumsum( counts )) )
+
+            self._index   = np.repeat( A.indptr[order] - indptr[:-1], counts ) + np.arange( A.nnz )
+            self._indices = A.indices[self._index]
+            self._indptr  = indptr
+            self._perm_c  = perm_c
+
+        B = csc_matrix( (A.data[self._index], self._indices, self._indptr), shape=A.shape )
+        self._splu = splu( B, permc_spec='NATURAL' )
 
     #--------------------------------------
     # Abstract interface
@@ -162,17 +258,98 @@ class SparseSolver ( DirectSolver ):
         assert rhs.T.shape[0] == self._splu.shape[1]
 
         if out is None:
-            out = self._splu.solve( rhs.T, trans='T' if transposed else 'N' ).T
+            out = self._solve( rhs.T, transposed ).T
 
         else:
             assert out.shape == rhs.shape
             assert out.dtype == rhs.dtype
 
             # currently no in-place solve exposed
-            out[:] = self._splu.solve( rhs.T, trans='T' if transposed else 'N' ).T
+            out[:] = self._solve( rhs.T, transposed ).T
 
         return out
 
+    #...
+    def _solve( self, b, transposed ):
+        """ Solve for the right-hand sides in the columns of b, with the current factors."""
+        trans  = 'T' if transposed else 'N'
+        perm_c = self._perm_c
+
+        # Factors of A (initial factorization)
+        if perm_c is None:
+            return self._splu.solve( b, trans=trans )
+
+        # Factors of A*Pc (after refactor), with Pc[i, perm_c[i]] = 1
+        if transposed:
+            z = np.empty_like( b )
+            z[perm_c] = b
+            return self._splu.solve( z, trans=trans )
+        else:
+            return self._splu.solve( b, trans=trans )[perm_c]
+
 #===============================================================================
+class DiagonalSolver ( DirectSolver ):
+    """
+    Solve the equation Dx = b for x, assuming D is a diagonal matrix whose
+    entries are stored in a StencilVector or BlockVector, e.g. a lumped mass
+    matrix (see psydac.linalg.utilities.lumped_diagonal).
 
+    Parameters
+    ----------
+    diag : StencilVector | BlockVector
+        Diagonal entries of D, which must all be non-zero.
+
+    """
+    def __init__( self, diag ):
+
+        self._space = diag.space
+        self._diag  = diag
+        self._inv   = diag.space.zeros()
+
+        # Only the entries owned by the process are inverted: the ghost regions
+        # of the inverse stay equal to zero
+        for d, w in zip( _stencil_blocks( diag ), _stencil_blocks( self._inv ) ):
+            index = _owned_region( d.space )
+            w._data[index] = 1.0 / d._data[index]
+
+    @property
+    def diagonal( self ):
+        return self._diag
 
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def space( self ):
+        return self._space
+
+    #...
+    def solve( self, rhs, out=None, transposed=False ):
+        """
+        Solves for the given right-hand side.
+
+        Parameters
+        ----------
+        rhs : StencilVector | BlockVector
+            The right-hand side, element of the space of the diagonal.
+
+        out : StencilVector | BlockVector | NoneType
+            Output vector. If given, it has to belong to the same space as rhs.
+            In-place operations (out is rhs) are supported.
+
+        transposed : bool
+            Ignored, as a diagonal matrix is symmetric.
+        """
+        assert rhs.space is self._space
+
+        if out is None:
+            out = self._space.zeros()
+        else:
+            assert out.space is self._space
+
+        for b, w, x in zip( _stencil_blocks( rhs ), _stencil_blocks( self._inv ), _stencil_blocks( out ) ):
+            multiply( b._data, w._data, out=x._data )
+            x.ghost_regions_in_sync = False
+            x.mark_modified()
+
+        return out
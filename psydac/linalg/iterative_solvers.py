@@ -10,7 +10,7 @@ from psydac.linalg.basic     import LinearSolver, LinearOperator
 from psydac.linalg.utilities import _sym_ortho
 
 
-__all__ = ['cg', 'pcg', 'bicg', 'lsmr', 'minres', 'jacobi', 'weighted_jacobi']
+__all__ = ['cg', 'pcg', 'iterative_refinement', 'deflated_pcg', 'bicg', 'lsmr', 'minres', 'jacobi', 'weighted_jacobi']
 
 # ...
 def cg( A, b, x0=None, tol=1e-6, maxiter=1000, verbose=False ):
@@ -136,7 +136,8 @@ def pcg(A, b, pc, x0=None, tol=1e-6, maxiter=1000, verbose=False):
         Can either be:
         * None, i.e. not pre-conditioning (this calls the standard `cg` method)
         * The strings 'jacobi' or 'weighted_jacobi'. (rather obsolete, supply a callable instead, if possible)
-        * A LinearSolver object (in which case the out parameter is used)
+        * A LinearSolver object (in which case the out parameter is used), e.g. one of the
+          preconditioners of psydac.linalg.preconditioners, which are set up once for A
         * A callable with two parameters (A, r), where A is the LinearOperator from above, and r is the residual.
 
     x0 : psydac.linalg.basic.Vector
@@ -236,6 +237,285 @@ def pcg(A, b, pc, x0=None, tol=1e-6, maxiter=1000, verbose=False):
     return x, info
 # ...
 
+# ...
+def iterative_refinement(A, b, A_low, pc=None, x0=None, tol=1e-6, inner_tol=1e-3,
+                         maxiter=50, inner_maxiter=1000, verbose=False):
+    """
+    Mixed-precision iterative refinement for the symmetric positive definite
+    system Ax = b. The corrections are computed with pcg on an approximation
+    A_low of A, typically the same matrix with entries stored in single
+    precision (see StencilMatrix.astype), whose products are cheaper; the
+    residuals are computed with A, so that the solution has the accuracy of A.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of linear system, in full precision.
+
+    b : psydac.linalg.basic.Vector
+        Right-hand-side vector of linear system.
+
+    A_low : psydac.linalg.basic.LinearOperator
+        Approximation of A (e.g. in reduced precision) used by the inner solver.
+
+    pc : NoneType | str | psydac.linalg.basic.LinearSolver | Callable
+        Preconditioner of the inner solver (see pcg).
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A*x - b.
+
+    inner_tol : float
+        Tolerance of each inner solve, relative to the L2-norm of the current
+        residual. It should not be smaller than the accuracy of A_low.
+
+    maxiter : int
+        Maximum number of refinement steps.
+
+    inner_maxiter : int
+        Maximum number of iterations of each inner solve.
+
+    verbose : bool
+        If True, L2-norm of residual r is printed at each refinement step.
+
+    Returns
+    -------
+    x : psydac.linalg.basic.Vector
+        Converged solution.
+
+    info : dict
+        Dictionary containing convergence information:
+          - 'niter'       = (int) number of refinement steps
+          - 'inner_niter' = (int) total number of iterations of the inner solver
+          - 'success'     = (boolean) whether convergence criteria have been met
+          - 'res_norm'    = (float) 2-norm of residual vector r = A*x - b.
+
+    """
+    n = A.shape[0]
+
+    assert( A.shape == (n,n) )
+    assert( A_low.shape == (n,n) )
+    assert( b.shape == (n, ) )
+
+    # First guess of solution
+    if x0 is None:
+        x  = b.copy()
+        x *= 0.0
+    else:
+        assert( x0.shape == (n,) )
+        x = x0.copy()
+
+    # First values
+    v = A.dot(x)
+    r = b - v
+    nrmr = sqrt(r.dot(r))
+
+    if verbose:
+        print( "Iterative refinement:" )
+        print( "+---------+---------------------+---------------+")
+        print( "+ Step  # | L2-norm of residual | Inner iters.  |")
+        print( "+---------+---------------------+---------------+")
+        template = "| {:7d} | {:19.2e} | {:13d} |"
+        print( template.format(0, nrmr, 0))
+
+    k           = 0
+    inner_niter = 0
+    for k in range(1, maxiter+1):
+
+        if nrmr < tol:
+            k -= 1
+            break
+
+        # Correction with the approximate matrix, and residual with the exact one
+        d, info = pcg(A_low, r, pc, tol=max(inner_tol * nrmr, tol), maxiter=inner_maxiter)
+        x += d
+        inner_niter += info['niter']
+
+        v  = A.dot(x, out=v)
+        r *= 0.0
+        r += b
+        r -= v
+        nrmr = sqrt(r.dot(r))
+
+        if verbose:
+            print( template.format(k, nrmr, info['niter']))
+
+    if verbose:
+        print( "+---------+---------------------+---------------+")
+
+    # Convergence information
+    info = {'niter': k, 'inner_niter': inner_niter, 'success': nrmr < tol, 'res_norm': nrmr }
+
+    return x, info
+# ...
+
+# ...
+def deflated_pcg(A, b, pc=None, W=(), AW=None, x0=None, tol=1e-6, maxiter=1000, verbose=False, nstore=0):
+    """
+    Deflated Preconditioned Conjugate Gradient for the symmetric positive
+    definite system Ax = b. The solution is split between the deflation
+    space spanned by the vectors W, where it is computed exactly with the
+    small matrix W^T A W, and its A-orthogonal complement, where it is
+    computed by pcg. If W approximates the eigenvectors of the smallest
+    eigenvalues, which are the slowest to converge, the number of iterations
+    is reduced: the vectors can be recycled from the previous solves of a
+    sequence of linear systems (see psydac.linalg.recycling.SolverSequence).
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of linear system.
+
+    b : psydac.linalg.basic.Vector
+        Right-hand-side vector of linear system.
+
+    pc : NoneType | str | psydac.linalg.basic.LinearSolver | Callable
+        Preconditioner for A (see pcg).
+
+    W : list of psydac.linalg.basic.Vector
+        Linearly independent vectors spanning the deflation space (optional).
+
+    AW : list of psydac.linalg.basic.Vector
+        Products A*w of the vectors of W (computed if not given).
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A*x - b.
+
+    maxiter : int
+        Maximum number of iterations.
+
+    verbose : bool
+        If True, L2-norm of residual r is printed at each iteration.
+
+    nstore : int
+        Number of search directions p of the first iterations which are stored,
+        with their products A*p, and returned in 'info'.
+
+    Returns
+    -------
+    x : psydac.linalg.basic.Vector
+        Converged solution.
+
+    info : dict
+        Dictionary containing convergence information:
+          - 'niter'      = (int) number of iterations
+          - 'success'    = (boolean) whether convergence criteria have been met
+          - 'res_norm'   = (float) 2-norm of residual vector r = A*x - b
+          - 'directions' = (list) pairs (p, A*p) of the stored search directions,
+                           which are A-orthogonal to each other and to W.
+
+    """
+    n = A.shape[0]
+
+    assert( A.shape == (n,n) )
+    assert( b.shape == (n, ) )
+
+    # First guess of solution
+    if x0 is None:
+        x  = b.copy()
+        x *= 0.0
+    else:
+        assert( x0.shape == (n,) )
+        x = x0.copy()
+
+    # Preconditioner
+    if pc is None:
+        psolve = lambda r: r
+    elif isinstance(pc, str):
+        pcfun = globals()[pc]
+        psolve = lambda r: pcfun(A, r)
+    elif isinstance(pc, LinearSolver):
+        s = b.space.zeros()
+        psolve = lambda r: pc.solve(r, out=s)
+    elif hasattr(pc, '__call__'):
+        psolve = lambda r: pc(A, r)
+
+    # Deflation space, with the Galerkin matrix E = W^T A W
+    W = list(W)
+    if W and AW is None:
+        AW = [A.dot(w) for w in W]
+
+    if W:
+        E    = np.array([[wi.dot(awj) for awj in AW] for wi in W])
+        Einv = np.linalg.pinv(0.5 * (E + E.T))
+
+        # Deflated preconditioner P^T M^{-1} r + Q r, with Q = W E^{-1} W^T and
+        # P^T = I - Q A ("A-DEF2" variant, which is robust to rounding errors)
+        def deflated_psolve(r):
+            s  = psolve(r).copy()
+            mu = Einv.dot([aw.dot(s) - w.dot(r) for w, aw in zip(W, AW)])
+            for c, w in zip(mu, W):
+                s -= c * w
+            return s
+    else:
+        deflated_psolve = psolve
+
+    # First values, with a residual orthogonal to W
+    v = A.dot(x)
+    r = b - v
+    if W:
+        mu = Einv.dot([w.dot(r) for w in W])
+        for c, w, aw in zip(mu, W, AW):
+            x += c * w
+            r -= c * aw
+
+    nrmr_sqr = r.dot(r)
+
+    s  = deflated_psolve(r)
+    am = s.dot(r)
+    p  = s.copy()
+
+    tol_sqr    = tol**2
+    directions = []
+
+    if verbose:
+        print( "Deflated pre-conditioned CG solver:" )
+        print( "+---------+---------------------+")
+        print( "+ Iter. # | L2-norm of residual |")
+        print( "+---------+---------------------+")
+        template = "| {:7d} | {:19.2e} |"
+        print( template.format(1, sqrt(nrmr_sqr)))
+
+    # Iterate to convergence
+    for k in range(2, maxiter+1):
+
+        if nrmr_sqr < tol_sqr:
+            k -= 1
+            break
+
+        v  = A.dot(p, out=v)
+        l  = am / v.dot(p)
+        x += l*p
+        r -= l*v
+
+        if len(directions) < nstore:
+            directions.append((p.copy(), v.copy()))
+
+        nrmr_sqr = r.dot(r)
+        s = deflated_psolve(r)
+
+        am1 = s.dot(r)
+        p  *= (am1/am)
+        p  += s
+        am  = am1
+
+        if verbose:
+            print( template.format(k, sqrt(nrmr_sqr)))
+
+    if verbose:
+        print( "+---------+---------------------+")
+
+    # Convergence information
+    info = {'niter': k, 'success': nrmr_sqr < tol_sqr, 'res_norm': sqrt(nrmr_sqr), 'directions': directions}
+
+    return x, info
+# ...
+
 # ...
 def jacobi(A, b):
     """
@@ -96,6 +96,8 @@ class KroneckerStencilMatrix( Matrix ):
 
             out._data[xx] = v
 
+        out.mark_modified()
+
         # IMPORTANT: flag that ghost regions are not up-to-date
         out.ghost_regions_in_sync = False
         return out
@@ -212,6 +214,13 @@ class KroneckerStencilMatrix( Matrix ):
                         M[(*ii, *kk)] = np.product(values)
             new_nrows[d] += er
 
+    def matmul(self, B):
+        """
+        Compute the product of this matrix with a matrix B as a StencilMatrix.
+        See StencilMatrix.matmul for details.
+        """
+        return self.tostencil().matmul(B)
+
     def tosparse(self):
         return reduce(kron, (m.tosparse() for m in self.mats))
 
@@ -390,7 +399,8 @@ class KroneckerLinearSolver( LinearSolver ):
 
         # call the actual kernel
         self._solve_nd(inslice, outslice, transposed)
-        
+        out.mark_modified()
+
         out.update_ghost_regions()
         return out
  
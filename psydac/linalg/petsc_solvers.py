@@ -0,0 +1,427 @@
+# coding: utf-8
+"""
+Solution of the linear systems of psydac with the Krylov solvers (KSP) and
+preconditioners (PC) of PETSc, e.g. algebraic multigrid (GAMG, or hypre if
+PETSc was configured with it). The matrix is converted once to the AIJ format
+of PETSc, with an exact preallocation given by the stencil of the matrix, and
+its values can be updated in place after reassembly.
+
+"""
+import numpy as np
+from mpi4py import MPI
+
+from psydac.linalg.basic     import LinearSolver
+from psydac.linalg.stencil   import StencilVectorSpace, StencilMatrix
+from psydac.linalg.block     import BlockVectorSpace, BlockMatrix
+from psydac.linalg.utilities import _stencil_blocks, _owned_region
+
+__all__ = ['PetscSolver']
+
+#===============================================================================
+def _petsc_layout( spaces, comm ):
+    """
+    Numbering of the coefficients of a list of StencilVectorSpace objects in
+    the global ordering of PETSc: every process owns a contiguous range of
+    indices, in which its entries of every space follow each other, each in
+    C order.
+
+    Parameters
+    ----------
+    spaces : list of StencilVectorSpace
+        Spaces of the blocks of a (block) vector, distributed on comm.
+
+    comm : mpi4py.MPI.Comm
+        Communicator of the processes.
+
+    Returns
+    -------
+    layouts : list of tuple
+        For each space, the starts and ends of the blocks of the decomposition
+        along each axis and the PETSc index of the first entry of each block.
+
+    offsets : list of int
+        PETSc index of the first entry of each space on the process.
+
+    sizes : list of int
+        Number of entries of each space on the process.
+
+    """
+    boxes = comm.allgather( [(V.starts, V.ends) for V in spaces] )
+
+    sizes   = np.array( [[np.prod( [e-s+1 for s, e in zip( *box )] ) for box in local] for local in boxes] )
+    offsets = np.concatenate( ([0], np.cumsum( sizes.ravel() )[:-1]) ).reshape( sizes.shape )
+
+    layouts = []
+    for k, V in enumerate( spaces ):
+        starts = [np.unique( [local[k][0][d] for local in boxes] ) for d in range( V.ndim )]
+        ends   = [np.unique( [local[k][1][d] for local in boxes] ) for d in range( V.ndim )]
+        base   = np.empty( [len( s ) for s in starts], dtype=int )
+        for rank, local in enumerate( boxes ):
+            coords = tuple( np.searchsorted( s, local[k][0][d] ) for d, s in enumerate( starts ) )
+            base[coords] = offsets[rank, k]
+        layouts.append( (starts, ends, base) )
+
+    return layouts, list( offsets[comm.rank] ), list( sizes[comm.rank] )
+
+#===============================================================================
+def _petsc_indices( layout, jj ):
+    """
+    PETSc indices of the entries of a StencilVectorSpace with multi-indices jj,
+    given as a list of broadcastable integer arrays (one per axis).
+
+    """
+    starts, ends, base = layout
+
+    cc    = [np.searchsorted( s, j, side='right' ) - 1 for s, j in zip( starts, jj )]
+    index = base[tuple( cc )]
+    shape = 1
+    for d in reversed( range( len( jj ) ) ):
+        index = index + (jj[d] - starts[d][cc[d]]) * shape
+        shape = shape * (ends[d][cc[d]] - starts[d][cc[d]] + 1)
+
+    return index
+
+#===============================================================================
+def _stencil_pattern( M, rlayout, clayout ):
+    """
+    Rows and columns, in the PETSc numbering, of the entries of the owned rows
+    of a StencilMatrix, and position of these entries in its data array. The
+    entries which fall outside of the domain in the non-periodic directions
+    are excluded: they are always zero.
+
+    """
+    V  = M.domain
+    W  = M.codomain
+    nd = W.ndim
+
+    diags = M._data.shape[nd:]
+    pp    = [n - (p+1) for n, p in zip( diags, M.pads )]
+
+    rows  = []
+    cols  = []
+    valid = []
+    for d in range( nd ):
+        shape_r = [1] * (2*nd)
+        shape_c = [1] * (2*nd)
+        shape_r[d] = shape_c[d] = W.ends[d] - W.starts[d] + 1
+        shape_c[nd+d] = diags[d]
+
+        ii = np.arange( W.starts[d], W.ends[d]+1 )
+        jj = (ii // W.shifts[d])[:, None] * V.shifts[d] + np.arange( diags[d] ) - pp[d]
+
+        rows .append( ii.reshape( shape_r ) )
+        valid.append( (V.periods[d] | ((0 <= jj) & (jj < V.npts[d]))).reshape( shape_c ) )
+        cols .append( (jj % V.npts[d]).reshape( shape_c ) )
+
+    shape = M._data[_owned_region( W )].shape
+    mask  = np.broadcast_to( np.logical_and.reduce( np.broadcast_arrays( *valid ) ), shape )
+    I     = np.broadcast_to( _petsc_indices( rlayout, rows ), shape )[mask]
+    J     = np.broadcast_to( _petsc_indices( clayout, cols ), shape )[mask]
+
+    index = np.arange( M._data.size ).reshape( M._data.shape )[_owned_region( W )][mask]
+
+    return I, J, index
+
+#===============================================================================
+class PetscSolver( LinearSolver ):
+    """
+    Solver for Ax=b with a Krylov method (KSP) and a preconditioner (PC) of
+    PETSc, where A is a StencilMatrix or a BlockMatrix of StencilMatrix
+    objects.
+
+    The matrix is converted at construction to the AIJ format of PETSc, with
+    the number of nonzeros of every row (in the diagonal and off-diagonal
+    parts) computed from the stencil: no memory is reallocated during the
+    insertion of the values. After a new assembly of A (with the same
+    sparsity pattern), the values are copied in place with 'update'.
+
+    The entries owned by the process are copied to and from work vectors of
+    PETSc at each solve, unless they are contiguous in the data array of a
+    StencilVector (e.g. in 1D), in which case the PETSc vectors use this
+    memory directly.
+
+    Parameters
+    ----------
+    A : StencilMatrix | BlockMatrix
+        Square matrix of the linear system.
+
+    ksp_type : str
+        Type of Krylov method, e.g. 'cg', 'gmres' or 'preonly' (default: 'cg').
+
+    pc_type : str
+        Type of preconditioner, e.g. 'gamg', 'hypre', 'jacobi' or 'lu'
+        (default: 'gamg').
+
+    tol : float
+        Relative tolerance on the residual (default: 1e-10).
+
+    maxiter : int
+        Maximum number of iterations (default: 1000).
+
+    options : dict
+        Additional PETSc options, without their prefix, e.g.
+        {'pc_hypre_type': 'boomeramg'} (optional).
+
+    prefix : str
+        Prefix of the options of the solver in the PETSc options database,
+        which are also read from the command line (default: 'psydac_').
+
+    """
+    def __init__( self, A, *, ksp_type='cg', pc_type='gamg', tol=1e-10, maxiter=1000, options=None,
+                  prefix='psydac_' ):
+
+        try:
+            from petsc4py import PETSc
+        except ImportError:
+            raise ImportError( 'petsc4py needs to be installed in order to use the class PetscSolver' )
+
+        assert isinstance( A, (StencilMatrix, BlockMatrix) )
+        assert A.domain == A.codomain
+
+        if pc_type == 'hypre' and not PETSc.Sys.hasExternalPackage( 'hypre' ):
+            raise ValueError( 'PETSc was not configured with hypre' )
+
+        V      = A.domain
+        spaces = V.spaces if isinstance( V, BlockVectorSpace ) else [V]
+        if not all( isinstance( W, StencilVectorSpace ) for W in spaces ):
+            raise NotImplementedError( 'PETSc solver requires a StencilMatrix or a BlockMatrix of StencilMatrix' )
+
+        comm = spaces[0].cart.comm if spaces[0].parallel else MPI.COMM_SELF
+
+        layouts, offsets, sizes = _petsc_layout( spaces, comm )
+
+        # Nonzero entries of the owned rows, and position of their values in the blocks of A
+        rows   = []
+        cols   = []
+        blocks = []
+        for i, j, M in self._stencil_matrices( A ):
+            I, J, index = _stencil_pattern( M, layouts[i], layouts[j] )
+            rows  .append( I )
+            cols  .append( J )
+            blocks.append( ((i, j), index) )
+
+        rows   = np.concatenate( rows )
+        cols   = np.concatenate( cols )
+        rstart = offsets[0]
+        n      = int( sum( sizes ) )
+        N      = comm.allreduce( n, op=MPI.SUM )
+
+        # CSR structure of the local rows: duplicate entries (periodic directions
+        # with few points) are summed, as in the product of the StencilMatrix
+        order = np.lexsort( (cols, rows) )
+        first = np.ones( len( order ), dtype=bool )
+        first[1:] = (np.diff( rows[order] ) != 0) | (np.diff( cols[order] ) != 0)
+
+        pos          = np.empty( len( order ), dtype=int )
+        pos[order]   = np.cumsum( first ) - 1
+        csr_rows     = rows[order][first] - rstart
+        csr_cols     = cols[order][first]
+        indptr       = np.concatenate( ([0], np.cumsum( np.bincount( csr_rows, minlength=n ) )) )
+
+        # Exact preallocation: nonzeros in the diagonal and off-diagonal parts of every row
+        diagonal = (rstart <= csr_cols) & (csr_cols < rstart + n)
+        d_nnz    = np.bincount( csr_rows[diagonal], minlength=n )
+        o_nnz    = np.bincount( csr_rows[~diagonal], minlength=n )
+
+        # Local numbering of the columns, for insertion of the values without communication
+        colmap, local_cols = np.unique( csr_cols, return_inverse=True )
+
+        IntType = PETSc.IntType
+        mat = PETSc.Mat().createAIJ( size=((n, N), (n, N)), nnz=(d_nnz.astype( IntType ), o_nnz.astype( IntType )),
+                                     comm=comm )
+        mat.setOption( PETSc.Mat.Option.NEW_NONZERO_ALLOCATION_ERR, True )
+        mat.setLGMap( PETSc.LGMap().create( np.arange( rstart, rstart + n, dtype=IntType ), comm=comm ),
+                      PETSc.LGMap().create( colmap.astype( IntType ), comm=comm ) )
+
+        ksp = PETSc.KSP().create( comm=comm )
+        ksp.setType( ksp_type )
+        ksp.getPC().setType( pc_type )
+        ksp.setTolerances( rtol=tol, max_it=maxiter )
+
+        if options:
+            opts = PETSc.Options( prefix )
+            for key, value in options.items():
+                opts[key] = value
+        ksp.setOptionsPrefix( prefix )
+
+        # Work vectors, on the owned entries of the process
+        self._b_array = np.zeros( n, dtype=PETSc.ScalarType )
+        self._x_array = np.zeros( n, dtype=PETSc.ScalarType )
+
+        self._petsc   = PETSc
+        self._A       = A
+        self._space   = V
+        self._spaces  = spaces
+        self._blocks  = blocks
+        self._order   = np.argsort( pos, kind='stable' )
+        self._bounds  = np.flatnonzero( np.concatenate( ([True], np.diff( pos[self._order] ) != 0) ) )
+        self._indptr  = indptr.astype( IntType )
+        self._indices = local_cols.astype( IntType )
+        self._offsets = [o - rstart for o in offsets]
+        self._sizes   = sizes
+        self._mat     = mat
+        self._ksp     = ksp
+        self._b       = PETSc.Vec().createWithArray( self._b_array, size=(n, N), comm=comm )
+        self._x       = PETSc.Vec().createWithArray( self._x_array, size=(n, N), comm=comm )
+        self._info    = None
+
+        # Owned entries of a StencilVector which can be used directly by PETSc
+        owned = V.zeros()._data[_owned_region( V )] if len( spaces ) == 1 else None
+        self._zero_copy = owned is not None and owned.flags.c_contiguous and owned.dtype == PETSc.ScalarType
+
+        self.update()
+        ksp.setOperators( mat )
+        ksp.setFromOptions()
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def space( self ):
+        return self._space
+
+    #...
+    def solve( self, rhs, out=None, transposed=False ):
+        """
+        Solve the linear system with the Krylov method and the preconditioner
+        of PETSc, with a zero initial guess.
+
+        Parameters
+        ----------
+        rhs : StencilVector | BlockVector
+            Right-hand side of the linear system.
+
+        out : StencilVector | BlockVector
+            Output vector. If given, it has to belong to the same space as rhs.
+            In-place operations (out is rhs) are supported.
+
+        transposed : bool
+            If True, solve the transposed system.
+
+        Returns
+        -------
+        out : StencilVector | BlockVector
+            Solution of the linear system.
+
+        """
+        assert rhs.space is self._space
+
+        if out is None:
+            out = self._space.zeros()
+        else:
+            assert out.space is self._space
+
+        ksp = self._ksp
+        b   = self._b
+        x   = self._x
+
+        zero_copy = self._zero_copy and out is not rhs
+
+        if zero_copy:
+            b.placeArray( rhs._data[_owned_region( self._space )].reshape( -1 ) )
+            x.placeArray( out._data[_owned_region( self._space )].reshape( -1 ) )
+        else:
+            self._to_array( rhs, self._b_array )
+
+        if transposed:
+            ksp.solveTranspose( b, x )
+        else:
+            ksp.solve( b, x )
+
+        if zero_copy:
+            b.resetArray()
+            x.resetArray()
+        else:
+            self._from_array( self._x_array, out )
+
+        for w in _stencil_blocks( out ):
+            w.ghost_regions_in_sync = False
+            w.mark_modified()
+
+        self._info = {'niter'   : ksp.getIterationNumber(),
+                      'success' : ksp.getConvergedReason() > 0,
+                      'res_norm': ksp.getResidualNorm()}
+
+        return out
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def mat( self ):
+        """ Matrix in the AIJ format of PETSc (petsc4py.PETSc.Mat)."""
+        return self._mat
+
+    # ...
+    @property
+    def ksp( self ):
+        """ Krylov solver of PETSc (petsc4py.PETSc.KSP), for further settings."""
+        return self._ksp
+
+    # ...
+    @property
+    def info( self ):
+        """ Number of iterations, convergence and residual norm of the last solve."""
+        return self._info
+
+    # ...
+    def update( self, A=None ):
+        """
+        Copy the values of the matrix into the PETSc matrix, after a new
+        assembly with the same sparsity pattern. The preconditioner is set up
+        again at the next solve.
+
+        Parameters
+        ----------
+        A : StencilMatrix | BlockMatrix
+            New matrix with the same structure (optional: by default, the
+            matrix given at construction, whose values have changed).
+
+        """
+        if A is None:
+            A = self._A
+        else:
+            assert A.domain is self._space and A.codomain is self._space
+            self._A = A
+
+        values = np.concatenate( [self._block( A, key )._data.ravel()[index] for key, index in self._blocks] )
+        data   = np.add.reduceat( values[self._order], self._bounds ).astype( self._petsc.ScalarType )
+
+        mat = self._mat
+        mat.setValuesLocalCSR( self._indptr, self._indices, data )
+        mat.assemble()
+
+    #--------------------------------------
+    # Private methods
+    #--------------------------------------
+    @staticmethod
+    def _stencil_matrices( A ):
+        """ List of the blocks (i, j, Aij) of a StencilMatrix or of a BlockMatrix."""
+        if isinstance( A, StencilMatrix ):
+            return [(0, 0, A)]
+
+        blocks = []
+        for (i, j), Aij in sorted( A._blocks.items() ):
+            if not isinstance( Aij, StencilMatrix ):
+                raise NotImplementedError( 'PETSc solver requires a StencilMatrix or a BlockMatrix of StencilMatrix' )
+            blocks.append( (i, j, Aij) )
+        return blocks
+
+    # ...
+    @staticmethod
+    def _block( A, key ):
+        return A if isinstance( A, StencilMatrix ) else A[key]
+
+    # ...
+    def _to_array( self, v, array ):
+        """ Copy the owned entries of a (block) vector into a work array."""
+        for w, o, n in zip( _stencil_blocks( v ), self._offsets, self._sizes ):
+            index = _owned_region( w.space )
+            array[o:o+n].reshape( w._data[index].shape )[...] = w._data[index]
+
+    # ...
+    def _from_array( self, array, v ):
+        """ Copy a work array into the owned entries of a (block) vector."""
+        for w, o, n in zip( _stencil_blocks( v ), self._offsets, self._sizes ):
+            index = _owned_region( w.space )
+            w._data[index] = array[o:o+n].reshape( w._data[index].shape )
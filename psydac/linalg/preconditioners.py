@@ -0,0 +1,840 @@
+# coding: utf-8
+"""
+Preconditioners for the iterative solvers of psydac.linalg.iterative_solvers,
+e.g. pcg. They are LinearSolver objects: all the data they need is extracted
+from the matrix once, at construction, and every application writes to a
+preallocated output vector.
+
+"""
+import numpy as np
+from mpi4py import MPI
+
+from psydac.linalg.basic          import LinearSolver
+from psydac.linalg.stencil        import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.block          import BlockVector, BlockMatrix
+from psydac.linalg.direct_solvers import DiagonalSolver, SparseSolver
+from psydac.linalg.utilities      import _stencil_blocks, _owned_region
+
+__all__ = ['JacobiPreconditioner', 'BlockJacobiPreconditioner', 'SSORPreconditioner',
+           'AdditiveSchwarzPreconditioner', 'ChebyshevPreconditioner']
+
+#===============================================================================
+class JacobiPreconditioner( DiagonalSolver ):
+    """
+    (Weighted) Jacobi preconditioner P^{-1} = omega * D^{-1}, where D is the
+    diagonal of a StencilMatrix or BlockMatrix. The diagonal is extracted and
+    inverted at construction.
+
+    Parameters
+    ----------
+    A : StencilMatrix | BlockMatrix
+        Square matrix to be preconditioned.
+
+    omega : float
+        Relaxation factor (default: 1).
+
+    """
+    def __init__( self, A, omega=1.0 ):
+
+        assert isinstance( A, (StencilMatrix, BlockMatrix) )
+        assert A.domain == A.codomain
+
+        super().__init__( A.diagonal() )
+
+        if omega != 1.0:
+            for w in _stencil_blocks( self._inv ):
+                w._data *= omega
+
+        self._omega = omega
+
+    @property
+    def omega( self ):
+        return self._omega
+
+#===============================================================================
+class BlockJacobiPreconditioner( LinearSolver ):
+    """
+    Point-block Jacobi preconditioner of a BlockMatrix whose blocks are
+    StencilMatrix objects with the same distribution, e.g. the components of a
+    vector field discretized with the same spline space: the small matrices
+    which couple the components at each point are inverted at construction.
+
+    Parameters
+    ----------
+    A : BlockMatrix
+        Square matrix to be preconditioned. Missing blocks are zero.
+
+    """
+    def __init__( self, A ):
+
+        assert isinstance( A, BlockMatrix )
+        assert A.domain == A.codomain
+
+        V      = A.codomain
+        spaces = V.spaces
+        V0     = spaces[0]
+
+        if not all( isinstance( W, StencilVectorSpace ) for W in spaces ):
+            raise NotImplementedError( 'Block-Jacobi preconditioner requires blocks of StencilVectorSpace' )
+
+        if any( (W.npts, W.starts, W.ends, W.pads, W.shifts) != (V0.npts, V0.starts, V0.ends, V0.pads, V0.shifts)
+                for W in spaces ):
+            raise ValueError( 'Block-Jacobi preconditioner requires blocks with the same distribution' )
+
+        n     = len( spaces )
+        rows  = _owned_region( V0 )
+        shape = tuple( e-s+1 for s,e in zip( V0.starts, V0.ends ) )
+
+        # Point blocks of the diagonal, and their inverses
+        D = np.zeros( shape + (n, n), dtype=V.dtype )
+        for i in range( n ):
+            for j in range( n ):
+                Aij = A[i, j]
+                if Aij is not None:
+                    D[..., i, j] = Aij.diagonal()._data[rows]
+
+        self._space = V
+        self._rows  = rows
+        self._inv   = np.linalg.inv( D )
+
+        # Work arrays: right-hand sides and solutions, one column per point
+        self._rhs = np.empty( shape + (n, 1), dtype=V.dtype )
+        self._sol = np.empty( shape + (n, 1), dtype=V.dtype )
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def space( self ):
+        return self._space
+
+    #...
+    def solve( self, rhs, out=None, transposed=False ):
+        """
+        Apply the preconditioner to a vector.
+
+        Parameters
+        ----------
+        rhs : BlockVector
+            Vector of the space of the matrix.
+
+        out : BlockVector | NoneType
+            Output vector. If given, it has to belong to the same space as rhs.
+            In-place operations (out is rhs) are supported.
+
+        transposed : bool
+            If True, apply the transpose of the preconditioner.
+        """
+        assert rhs.space is self._space
+
+        if out is None:
+            out = self._space.zeros()
+        else:
+            assert isinstance( out, BlockVector )
+            assert out.space is self._space
+
+        rows = self._rows
+        for j, b in enumerate( rhs.blocks ):
+            self._rhs[..., j, 0] = b._data[rows]
+
+        inv = self._inv.swapaxes( -1, -2 ) if transposed else self._inv
+        np.matmul( inv, self._rhs, out=self._sol )
+
+        for i, x in enumerate( out.blocks ):
+            x._data[rows] = self._sol[..., i, 0]
+            x.ghost_regions_in_sync = False
+            x.mark_modified()
+
+        return out
+
+#===============================================================================
+class SSORPreconditioner( LinearSolver ):
+    """
+    Symmetric successive over-relaxation (SSOR) preconditioner of a StencilMatrix
+    A = L + D + U:
+
+        P^{-1} = omega * (2-omega) * (D + omega*U)^{-1} D (D + omega*L)^{-1},
+
+    which is symmetric positive definite if A is, for 0 < omega < 2. The two
+    triangular sweeps only involve the rows owned by the process: in parallel
+    (and across the periodic boundaries) the couplings with the ghost regions
+    are neglected, as in a block-Jacobi method.
+
+    The sweeps run in a compiled kernel if the matrix has a backend, and in
+    Python otherwise (which is only suitable for small matrices). The kernel
+    works on the datatype of the vector space: a matrix stored in another
+    datatype (see StencilMatrix.astype) is converted once, at construction,
+    and later changes of its entries are then not seen. For a
+    BlockMatrix, SSOR preconditioners of the diagonal blocks can be combined
+    in a BlockDiagonalSolver.
+
+    Parameters
+    ----------
+    A : StencilMatrix
+        Square matrix to be preconditioned.
+
+    omega : float
+        Relaxation factor, between 0 and 2 (default: 1, symmetric Gauss-Seidel).
+
+    """
+    def __init__( self, A, omega=1.0 ):
+
+        assert isinstance( A, StencilMatrix )
+        assert A.domain is A.codomain
+
+        V = A.codomain
+
+        if any( m != 1 for m in V.shifts ):
+            raise NotImplementedError( 'SSOR preconditioner is only implemented for vector spaces with shifts equal to 1' )
+
+        if not 0 < omega < 2:
+            raise ValueError( 'Relaxation factor must be between 0 and 2, got {}'.format(omega) )
+
+        self._space = V
+        self._A     = A
+        self._omega = omega
+        self._work  = np.zeros_like( V.zeros()._data )
+
+        self._args = {}
+        self._args['nrows'] = tuple( e-s+1 for s,e in zip(V.starts, V.ends) )
+        self._args['gpads'] = tuple( V.pads )
+        self._args['pads']  = tuple( A.pads )
+
+        if A.backend is None:
+            self._kernel = None
+        else:
+            # The compiled kernel works on the datatype of the vector space
+            if A.data_dtype != V.dtype:
+                self._A = A.astype( V.dtype )
+
+            # Kernel is compiled at the first use only (instances are cached)
+            from psydac.api.ast.linalg import StencilSSOROperator
+            ssor = StencilSSOROperator( V.ndim, backend=frozenset(A.backend.items()) )
+            self._kernel      = ssor.func
+            self._kernel_args = [np.int64(a) for arg in self._args.values() for a in arg] + [np.float64(omega)]
+
+    @property
+    def omega( self ):
+        return self._omega
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def space( self ):
+        return self._space
+
+    #...
+    def solve( self, rhs, out=None, transposed=False ):
+        """
+        Apply the preconditioner to a vector.
+
+        Parameters
+        ----------
+        rhs : StencilVector
+            Vector of the space of the matrix.
+
+        out : StencilVector | NoneType
+            Output vector. If given, it has to belong to the same space as rhs.
+            In-place operations (out is rhs) are supported.
+
+        transposed : bool
+            Not supported: the preconditioner of a symmetric matrix is symmetric.
+        """
+        if transposed:
+            raise NotImplementedError( 'Transposed SSOR preconditioner is not implemented' )
+
+        assert rhs.space is self._space
+
+        if out is None:
+            out = self._space.zeros()
+        else:
+            assert isinstance( out, StencilVector )
+            assert out.space is self._space
+
+        # The sweeps require zero values beyond (resp. before) the current row
+        r = rhs._data.copy() if out is rhs else rhs._data
+        self._work[...] = 0.0
+        out._data[...]  = 0.0
+
+        if self._kernel is None:
+            self._sweeps( self._A._data, r, self._work, out._data, omega=self._omega, **self._args )
+        else:
+            self._kernel( self._A._data, r, self._work, out._data, *self._kernel_args )
+
+        out.ghost_regions_in_sync = False
+        out.mark_modified()
+
+        return out
+
+    # ...
+    @staticmethod
+    def _sweeps( A, r, w, x, nrows, gpads, pads, omega ):
+
+        # NOTE: same algorithm as the kernels 'stencil_ssor_{ndim}d' in
+        #       psydac.api.ast.linalg_kernels, vectorized over the diagonals
+
+        diag = tuple( pads )
+        rows = list( np.ndindex( *nrows ) )
+
+        # Forward sweep, w = omega * (D + omega*L)^{-1} r
+        for ii in rows:
+            i = tuple( gp+j for gp,j in zip(gpads, ii) )
+            a = A[i]
+            window = tuple( slice(k-p, k+p+1) for k,p in zip(i, pads) )
+            w[i] = omega * (r[i] - np.sum( a * w[window] )) / a[diag]
+
+        # Backward sweep, x = (2-omega) * (D + omega*U)^{-1} D w
+        for ii in reversed( rows ):
+            i = tuple( gp+j for gp,j in zip(gpads, ii) )
+            a = A[i]
+            window = tuple( slice(k-p, k+p+1) for k,p in zip(i, pads) )
+            x[i] = (2.0 - omega) * w[i] - omega * np.sum( a * x[window] ) / a[diag]
+
+#===============================================================================
+class AdditiveSchwarzPreconditioner( LinearSolver ):
+    """
+    Additive Schwarz domain decomposition preconditioner of a StencilMatrix,
+    whose subdomains are the boxes of coefficients owned by the processes
+    (see CartDecomposition), possibly extended by some layers of the ghost
+    regions:
+
+        P^{-1} = sum_i R_i^T A_i^{-1} R_i  [ + Phi A_0^{-1} Phi^T ],
+
+    where R_i is the restriction to the subdomain i and A_i = R_i A R_i^T is
+    factorized at construction. Without overlap, this is the block-Jacobi
+    method with one block per process. The contributions of the overlaps are
+    sent back to their owners, so that the preconditioner is symmetric (and
+    can be used in pcg) if A is.
+
+    The optional coarse space is the Nicolaides one: one basis function per
+    process, equal to 1 on the coefficients that it owns. The coarse matrix
+    A_0 = Phi^T A Phi has the size of the communicator; it is assembled and
+    inverted redundantly on every process.
+
+    Parameters
+    ----------
+    A : StencilMatrix
+        Square matrix to be preconditioned.
+
+    overlap : int
+        Number of layers of the ghost regions added to the subdomains, at most
+        the pads of the vector space (default: 0, block-Jacobi). The overlap is
+        only used along the directions with more than one process.
+
+    local_solver : callable, optional
+        Function which returns a LinearSolver of numpy arrays from the local
+        matrix A_i, given as a scipy.sparse matrix (default: SparseSolver).
+
+    coarse_space : bool
+        If True, add the correction of the Nicolaides coarse space.
+
+    """
+    def __init__( self, A, overlap=0, local_solver=None, coarse_space=False ):
+
+        assert isinstance( A, StencilMatrix )
+        assert A.domain is A.codomain
+
+        V = A.codomain
+
+        if any( m != 1 for m in V.shifts ):
+            raise NotImplementedError( 'Additive Schwarz preconditioner is only implemented for vector spaces with shifts equal to 1' )
+
+        if not 0 <= overlap <= min( V.pads ):
+            raise ValueError( 'Overlap must be between 0 and the pads {} of the vector space, got {}'.format(V.pads, overlap) )
+
+        if local_solver is None:
+            local_solver = SparseSolver
+
+        # Subdomain, as a box of the local data arrays (ghost regions included)
+        npts  = tuple( e-s+1 for s,e in zip(V.starts, V.ends) )
+        owned = _owned_region( V )
+        if V.parallel and overlap > 0:
+            cart   = V.cart
+            lower  = [overlap if (n > 1 and (c > 0 or P)) else 0
+                      for n, c, P in zip(cart.nprocs, cart.coords, V.periods)]
+            upper  = [overlap if (n > 1 and (c < n-1 or P)) else 0
+                      for n, c, P in zip(cart.nprocs, cart.coords, V.periods)]
+        else:
+            lower = upper = [0] * V.ndim
+
+        box = tuple( slice(p-l, p+n+u) for p, n, l, u in zip(V.pads, npts, lower, upper) )
+
+        self._space    = V
+        self._overlap  = overlap
+        self._owned    = owned
+        self._box      = box
+        self._exchange = V.parallel and overlap > 0
+        self._buffers  = {disp: np.zeros_like( V.zeros()._data ) for disp in (-1, 1)} if self._exchange else None
+
+        # Rows of the overlap are owned by the neighbours
+        if self._exchange:
+            A.update_ghost_regions()
+
+        self._local_solver = local_solver( self._local_matrix( A, box ) )
+
+        # Nicolaides coarse space
+        if coarse_space:
+            self._coarse_inv = np.linalg.inv( self._coarse_matrix( A ) )
+        else:
+            self._coarse_inv = None
+
+    @property
+    def overlap( self ):
+        return self._overlap
+
+    @property
+    def coarse_space( self ):
+        return self._coarse_inv is not None
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def space( self ):
+        return self._space
+
+    #...
+    def solve( self, rhs, out=None, transposed=False ):
+        """
+        Apply the preconditioner to a vector. This operation is collective.
+
+        Parameters
+        ----------
+        rhs : StencilVector
+            Vector of the space of the matrix.
+
+        out : StencilVector | NoneType
+            Output vector. If given, it has to belong to the same space as rhs.
+            In-place operations (out is rhs) are supported.
+
+        transposed : bool
+            If True, apply the transpose of the preconditioner.
+        """
+        assert rhs.space is self._space
+
+        if out is None:
+            out = self._space.zeros()
+        else:
+            assert isinstance( out, StencilVector )
+            assert out.space is self._space
+
+        # Values of the right-hand side in the overlap
+        if self._exchange:
+            rhs.update_ghost_regions()
+
+        box = self._box
+        rl  = rhs._data[box].ravel()
+
+        if self._coarse_inv is not None:
+            r0 = self._coarse_restriction( rhs )
+
+        # Local solves, and sum of the contributions to the overlaps
+        zl = self._local_solver.solve( rl, transposed=transposed )
+
+        out._data[...] = 0.0
+        out._data[box] = zl.reshape( out._data[box].shape )
+
+        if self._exchange:
+            self._accumulate_ghost_regions( out._data )
+
+        # Coarse correction
+        if self._coarse_inv is not None:
+            A0inv = self._coarse_inv.T if transposed else self._coarse_inv
+            out._data[self._owned] += A0inv[self._rank] @ r0
+
+        out.ghost_regions_in_sync = False
+        out.mark_modified()
+
+        return out
+
+    #--------------------------------------
+    # Private methods
+    #--------------------------------------
+    @staticmethod
+    def _local_matrix( A, box ):
+        """ Couplings of the coefficients of a box of the local data arrays, as a scipy.sparse matrix."""
+        from scipy.sparse import coo_matrix
+
+        lo    = [b.start for b in box]
+        shape = tuple( b.stop - b.start for b in box )
+        rows  = np.arange( np.prod( shape ) ).reshape( shape )
+
+        I = []
+        J = []
+        data = []
+        for kk in np.ndindex( *[2*p+1 for p in A.pads] ):
+
+            # Columns of the box coupled to its rows by the diagonal kk
+            offsets = [k-p for k, p in zip(kk, A.pads)]
+            ii = tuple( slice(max(0, -o), min(n, n-o)) for n, o in zip(shape, offsets) )
+            jj = tuple( slice(i.start+o, i.stop+o) for i, o in zip(ii, offsets) )
+
+            values = A._data[tuple( slice(l+i.start, l+i.stop) for l, i in zip(lo, ii) ) + kk]
+            mask   = values != 0
+
+            I.append( rows[ii][mask] )
+            J.append( rows[jj][mask] )
+            data.append( values[mask] )
+
+        n = rows.size
+        return coo_matrix( (np.concatenate(data), (np.concatenate(I), np.concatenate(J))), shape=(n, n) )
+
+    # ...
+    def _coarse_matrix( self, A ):
+        """ Matrix Phi^T A Phi of the Nicolaides coarse space, on every process."""
+        V = self._space
+
+        if V.parallel:
+            comm = V.cart.comm
+            rank, size = comm.rank, comm.size
+        else:
+            comm = None
+            rank, size = 0, 1
+
+        # Sums of the entries of the local rows, by column
+        owned  = self._owned
+        colsum = np.zeros_like( V.zeros()._data )
+        for kk in np.ndindex( *[2*p+1 for p in A.pads] ):
+            cols = tuple( slice(o.start+k-p, o.stop+k-p) for o, k, p in zip(owned, kk, A.pads) )
+            colsum[cols] += A._data[owned + kk]
+
+        # Owner of each column: ghost regions of a vector equal to the rank
+        owner = V.zeros()
+        owner._data[...] = -1
+        owner._data[owned] = rank
+        owner.update_ghost_regions()
+        if not V.parallel:
+            owner._data[...] = 0
+
+        valid = owner._data >= 0
+        row   = np.bincount( owner._data[valid].astype(int), weights=colsum[valid], minlength=size )
+
+        if comm is None:
+            A0 = row.reshape( 1, 1 )
+        else:
+            A0 = np.empty( (size, size), dtype=row.dtype )
+            comm.Allgather( row, A0 )
+
+        self._rank = rank
+        self._comm = comm
+
+        return A0
+
+    # ...
+    def _coarse_restriction( self, v ):
+        """ Coefficients Phi^T v of a vector in the coarse space, on every process."""
+        local = np.array( [v._data[self._owned].sum()] )
+        if self._comm is None:
+            return local
+        r0 = np.empty( self._comm.size, dtype=local.dtype )
+        self._comm.Allgather( local, r0 )
+        return r0
+
+    # ...
+    def _accumulate_ghost_regions( self, array ):
+        """
+        Add the values of the ghost regions of an array to the processes which
+        own them: this is the transpose of the update of the ghost regions, hence
+        the directions are processed in reverse order. The two displacements
+        receive into separate buffers, because the regions to which they
+        contribute overlap if the local block is shorter than twice the pads.
+        """
+        cart    = self._space.cart
+        comm    = cart.comm_cart
+        sync    = self._space._synchronizer
+        buffers = self._buffers
+        tag     = lambda disp: 42+disp
+
+        for direction in reversed( range( cart.ndim ) ):
+
+            requests = []
+            for disp in [-1, 1]:
+                info = cart.get_shift_info( direction, disp )
+                recv_buf = (buffers[disp], 1, sync.get_send_type( direction, disp ))
+                send_buf = (array        , 1, sync.get_recv_type( direction, disp ))
+                requests.append( comm.Irecv( recv_buf, info['rank_dest'  ], tag(disp) ) )
+                requests.append( comm.Isend( send_buf, info['rank_source'], tag(disp) ) )
+
+            MPI.Request.Waitall( requests )
+
+            for disp in [-1, 1]:
+                info = cart.get_shift_info( direction, disp )
+                if info['rank_dest'] != MPI.PROC_NULL:
+                    index = tuple( slice(s, s+n) for s, n in zip(info['send_starts'], info['buf_shape']) )
+                    array[index] += buffers[disp][index]
+
+#===============================================================================
+class ChebyshevPreconditioner( LinearSolver ):
+    """
+    Chebyshev polynomial preconditioner, or smoother, of a symmetric positive
+    definite StencilMatrix or BlockMatrix A:
+
+        P^{-1} = p(D^{-1} A) D^{-1},
+
+    where D is the diagonal of A (Chebyshev-accelerated Jacobi) or the identity
+    (Chebyshev iteration), and p is the polynomial of degree k-1 such that
+    1 - lambda * p(lambda) is the scaled Chebyshev polynomial of degree k for
+    the interval [lmin, lmax]. The application of P^{-1} consists of k steps of
+    the Chebyshev iteration, with k-1 matrix-vector products: unlike the steps
+    of pcg, these do not compute any inner product (global reduction), hence
+    their only communications are the updates of the ghost regions.
+
+    Unless they are given, the extreme eigenvalues of D^{-1} A are estimated at
+    construction by the Lanczos method, from the coefficients of a few steps of
+    pcg with a random right-hand side; the upper bound is multiplied by a
+    safety factor, as P is only positive definite if lmax is an upper bound of
+    the spectrum. With the interval [lmax/eig_ratio, lmax], the polynomial
+    damps the upper part of the spectrum only, as needed for the smoother of a
+    multigrid method (see the method smooth).
+
+    Parameters
+    ----------
+    A : StencilMatrix | BlockMatrix
+        Symmetric positive definite matrix.
+
+    degree : int
+        Degree k of the Chebyshev polynomial, i.e. number of steps (default: 3).
+
+    jacobi : bool
+        If True (default), Chebyshev acceleration of the Jacobi method;
+        otherwise, Chebyshev iteration for A.
+
+    eig_bounds : tuple(float, float) | NoneType
+        Bounds (lmin, lmax) of the spectrum of D^{-1} A, used as given (default:
+        estimated).
+
+    eig_ratio : float | NoneType
+        If given, lmin = lmax / eig_ratio, e.g. 30 for a smoother.
+
+    nsteps : int
+        Number of Lanczos steps for the estimation of the eigenvalues.
+
+    safety : float
+        Safety factor of the estimated upper bound (default: 1.1).
+
+    """
+    def __init__( self, A, degree=3, *, jacobi=True, eig_bounds=None, eig_ratio=None, nsteps=10, safety=1.1 ):
+
+        assert isinstance( A, (StencilMatrix, BlockMatrix) )
+        assert A.domain == A.codomain
+
+        if degree < 1:
+            raise ValueError( 'Degree of the Chebyshev polynomial must be positive, got {}'.format(degree) )
+
+        V = A.codomain
+
+        self._space  = V
+        self._A      = A
+        self._degree = degree
+        self._pc     = JacobiPreconditioner( A ) if jacobi else None
+
+        # Work vectors: residual, preconditioned residual, update, matrix-vector product
+        self._r = V.zeros()
+        self._z = V.zeros()
+        self._d = V.zeros()
+        self._v = V.zeros()
+
+        if eig_bounds is None:
+            lmin, lmax = self._estimate_eigenvalues( nsteps )
+            lmax *= safety
+        else:
+            lmin, lmax = eig_bounds
+
+        if eig_ratio is not None:
+            lmin = lmax / eig_ratio
+
+        if not 0 < lmin < lmax:
+            raise ValueError( 'Bounds of the eigenvalues must satisfy 0 < lmin < lmax, got ({}, {})'.format(lmin, lmax) )
+
+        self._eig_bounds = (lmin, lmax)
+
+    @property
+    def degree( self ):
+        return self._degree
+
+    @property
+    def eig_bounds( self ):
+        """ Interval (lmin, lmax) of the Chebyshev polynomial."""
+        return self._eig_bounds
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def space( self ):
+        return self._space
+
+    #...
+    def solve( self, rhs, out=None, transposed=False ):
+        """
+        Apply the preconditioner to a vector. This operation only communicates
+        through the updates of the ghost regions.
+
+        Parameters
+        ----------
+        rhs : StencilVector | BlockVector
+            Vector of the space of the matrix.
+
+        out : StencilVector | BlockVector | NoneType
+            Output vector. If given, it has to belong to the same space as rhs.
+            In-place operations (out is rhs) are supported.
+
+        transposed : bool
+            Apply the transpose of the preconditioner (same as the
+            preconditioner, which is symmetric).
+        """
+        assert rhs.space is self._space
+
+        if out is None:
+            out = self._space.zeros()
+        else:
+            assert out.space is self._space
+
+        self._r *= 0.0
+        self._r += rhs
+
+        out *= 0.0
+        self._iterate( out )
+
+        return out
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    def smooth( self, rhs, x ):
+        """
+        Smoothing step of the linear system A x = rhs, e.g. in a multigrid
+        method: x is replaced in place by x + P^{-1} (rhs - A x), which costs
+        k matrix-vector products.
+
+        Parameters
+        ----------
+        rhs : StencilVector | BlockVector
+            Right-hand side of the linear system.
+
+        x : StencilVector | BlockVector
+            Approximate solution, updated in place.
+
+        Returns
+        -------
+        x : StencilVector | BlockVector
+            Updated approximate solution.
+
+        """
+        assert rhs.space is self._space
+        assert x.space is self._space
+
+        self._A.dot( x, out=self._v )
+        self._r *= 0.0
+        self._r += rhs
+        self._r -= self._v
+
+        self._iterate( x )
+
+        return x
+
+    #--------------------------------------
+    # Private methods
+    #--------------------------------------
+    def _precondition( self, r, z ):
+        """ Inner preconditioner z = D^{-1} r (or z = r)."""
+        if self._pc is None:
+            z *= 0.0
+            z += r
+        else:
+            self._pc.solve( r, out=z )
+
+    # ...
+    def _iterate( self, x ):
+        """
+        Add P^{-1} r to x with k steps of the Chebyshev iteration, where r is
+        stored in the work vector self._r (overwritten).
+        """
+        A = self._A
+        r, z, d, v = self._r, self._z, self._d, self._v
+
+        lmin, lmax = self._eig_bounds
+        theta = 0.5 * (lmax + lmin)
+        delta = 0.5 * (lmax - lmin)
+        sigma = theta / delta
+        rho   = 1.0 / sigma
+
+        # First step, d = D^{-1} r / theta
+        self._precondition( r, z )
+        d *= 0.0
+        d += z
+        d *= 1.0 / theta
+        x += d
+
+        # Three-term recurrence of the Chebyshev polynomials
+        for k in range( 1, self._degree ):
+            A.dot( d, out=v )
+            r -= v
+
+            rho1 = 1.0 / (2.0 * sigma - rho)
+            self._precondition( r, z )
+            z *= 2.0 * rho1 / delta
+            d *= rho1 * rho
+            d += z
+            x += d
+            rho = rho1
+
+    # ...
+    def _estimate_eigenvalues( self, nsteps ):
+        """
+        Estimate of the extreme eigenvalues of D^{-1} A: extreme eigenvalues of
+        the Lanczos tridiagonal matrix, computed from the coefficients of pcg
+        applied to a random right-hand side. This operation is collective.
+        """
+        A = self._A
+        r, z, p, v = self._r, self._z, self._d, self._v
+
+        # Random right-hand side (same on every process, for reproducibility)
+        rng = np.random.default_rng( 0 )
+        for w in _stencil_blocks( r ):
+            owned = _owned_region( w.space )
+            w._data[...] = 0.0
+            w._data[owned] = rng.uniform( -1.0, 1.0, size=w._data[owned].shape )
+            w.ghost_regions_in_sync = False
+            w.mark_modified()
+
+        self._precondition( r, z )
+        p *= 0.0
+        p += z
+        am  = r.dot( z )
+        am0 = am
+
+        alpha = []
+        beta  = []
+        for k in range( nsteps ):
+            A.dot( p, out=v )
+            l  = am / v.dot( p )
+            v *= l
+            r -= v
+            alpha.append( l )
+
+            self._precondition( r, z )
+            am1 = r.dot( z )
+
+            # Invariant subspace: the spectrum is found exactly
+            if am1 <= np.finfo( float ).eps**2 * am0:
+                break
+
+            beta.append( am1 / am )
+            p *= am1 / am
+            p += z
+            am = am1
+
+        # Tridiagonal matrix of the Lanczos method
+        m = len( alpha )
+        T = np.zeros( (m, m) )
+        for j in range( m ):
+            T[j, j] = 1.0 / alpha[j]
+            if j > 0:
+                T[j, j] += beta[j-1] / alpha[j-1]
+                T[j, j-1] = T[j-1, j] = np.sqrt( beta[j-1] ) / alpha[j-1]
+
+        ritz = np.linalg.eigvalsh( T )
+
+        return ritz[0], ritz[-1]
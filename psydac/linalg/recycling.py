@@ -0,0 +1,271 @@
+# coding: utf-8
+"""
+Solution of a sequence of symmetric positive definite linear systems with
+a constant or slowly varying matrix, e.g. in a time loop, by recycling the
+information of the previous solves:
+
+  * the first guess of every solve is extrapolated from the last solutions,
+    or obtained by a Galerkin projection onto their span;
+  * approximate eigenvectors of the smallest eigenvalues, computed from the
+    search directions of each solve, deflate the next solves (deflated pcg).
+
+"""
+import numpy as np
+from math import comb
+
+from psydac.linalg.basic             import LinearSolver
+from psydac.linalg.iterative_solvers import deflated_pcg
+
+__all__ = ['SolverSequence']
+
+#===============================================================================
+def _combine( coeffs, vectors ):
+    """ Linear combination sum_i coeffs[i] * vectors[i] of a list of vectors."""
+    out  = vectors[0].copy()
+    out *= coeffs[0]
+    for c, v in zip( coeffs[1:], vectors[1:] ):
+        out += c * v
+    return out
+
+#===============================================================================
+class SolverSequence( LinearSolver ):
+    """
+    Solver for a sequence of linear systems Ax = b with the same symmetric
+    positive definite matrix A, whose values may change slowly between the
+    solves (for instance a matrix reassembled in place at every time step).
+
+    Each solve uses the deflated pcg of psydac.linalg.iterative_solvers:
+
+    1. The first guess is computed from the last solutions, either by
+       polynomial extrapolation or by a Galerkin projection of the new system
+       onto their span.
+    2. The deflation space is spanned by Ritz vectors of A, computed by the
+       Rayleigh-Ritz procedure in the space spanned by the previous deflation
+       vectors and the first search directions of the last solve. These
+       approximate the eigenvectors of the smallest eigenvalues of A, which
+       slow down the convergence of CG, and improve from solve to solve.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Matrix of the linear systems (a reference is kept: changes of its
+        values are seen by the next solves).
+
+    pc : NoneType | str | psydac.linalg.basic.LinearSolver | Callable
+        Preconditioner for A (see psydac.linalg.iterative_solvers.pcg).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A*x - b.
+
+    maxiter : int
+        Maximum number of iterations of each solve.
+
+    guess : str
+        Method for the first guess from the last 'nguess' solutions:
+        'extrapolation' (polynomial extrapolation of degree nguess-1, for
+        solutions which vary smoothly in time) or 'projection' (Galerkin
+        projection, which minimizes the A-norm of the error in their span).
+
+    nguess : int
+        Number of previous solutions stored (0 to start from the given x0).
+
+    ndefl : int
+        Number of deflation vectors (0 for no deflation).
+
+    nstore : int
+        Number of search directions of each solve used to update the deflation
+        vectors (default: 2 * ndefl).
+
+    recompute : bool
+        If True (default), the products of A with the stored vectors are
+        recomputed at every solve, as needed if the values of A change between
+        the solves. Set to False if A is constant, which saves nguess + ndefl
+        matrix-vector products per solve.
+
+    verbose : bool
+        If True, L2-norm of residual r is printed at each iteration.
+
+    """
+    def __init__( self, A, pc=None, *, tol=1e-6, maxiter=1000, guess='projection', nguess=4,
+                  ndefl=8, nstore=None, recompute=True, verbose=False ):
+
+        assert A.domain is A.codomain
+        assert guess in ('extrapolation', 'projection')
+        assert nguess >= 0 and ndefl >= 0
+
+        self._A         = A
+        self._pc        = pc
+        self._tol       = tol
+        self._maxiter   = maxiter
+        self._guess     = guess
+        self._nguess    = nguess
+        self._ndefl     = ndefl
+        self._nstore    = 2 * ndefl if nstore is None else nstore
+        self._recompute = recompute
+        self._verbose   = verbose
+
+        # Last solutions (corrections to the given first guess) and their
+        # products with A, most recent last
+        self._X  = []
+        self._AX = []
+
+        # Deflation vectors and their products with A
+        self._W  = []
+        self._AW = []
+
+        self._info = None
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def space( self ):
+        return self._A.domain
+
+    # ...
+    def solve( self, rhs, out=None, transposed=False, x0=None ):
+        """
+        Solve the next linear system of the sequence (A is symmetric, so
+        'transposed' has no effect).
+
+        Parameters
+        ----------
+        rhs : psydac.linalg.basic.Vector
+            Right-hand side of the linear system.
+
+        out : psydac.linalg.basic.Vector
+            Vector in which the solution is stored (optional).
+
+        transposed : bool
+            Solve the transposed system (same as the system, A is symmetric).
+
+        x0 : psydac.linalg.basic.Vector
+            First guess (optional), e.g. a lifting of the inhomogeneous
+            essential boundary conditions: the recycled information is only
+            used for the correction to x0.
+
+        Returns
+        -------
+        out : psydac.linalg.basic.Vector
+            Solution of the linear system.
+
+        """
+        A = self._A
+
+        # Products with the current values of A
+        if self._recompute:
+            if self._guess == 'projection':
+                self._AX = [A.dot( x ) for x in self._X]
+            self._AW = [A.dot( w ) for w in self._W]
+
+        # System for the correction to the first guess: A d = b - A x0
+        if x0 is None:
+            b = rhs
+        else:
+            b = rhs - A.dot( x0 )
+
+        d0 = self._first_guess( b )
+
+        d, info = deflated_pcg( A, b, self._pc, W=self._W, AW=self._AW, x0=d0, tol=self._tol,
+                                maxiter=self._maxiter, verbose=self._verbose, nstore=self._nstore )
+
+        directions = info.pop( 'directions' )
+        self._info = info
+
+        # Store the solution, and its product with A if it is not recomputed
+        if self._nguess:
+            self._X.append( d.copy() )
+            if self._guess == 'projection' and not self._recompute:
+                self._AX.append( A.dot( d ) )
+            del self._X[:-self._nguess]
+            del self._AX[:-self._nguess]
+
+        if self._ndefl:
+            self._update_deflation( directions )
+
+        if x0 is not None:
+            d += x0
+
+        if out is None:
+            return d
+
+        out *= 0.0
+        out += d
+        return out
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def operator( self ):
+        """ Matrix A of the linear systems."""
+        return self._A
+
+    @property
+    def info( self ):
+        """ Convergence information of the last solve (see deflated_pcg)."""
+        return self._info
+
+    @property
+    def deflation_vectors( self ):
+        """ Current deflation vectors (approximate eigenvectors of A)."""
+        return tuple( self._W )
+
+    # ...
+    def reset( self ):
+        """ Forget the stored solutions and deflation vectors."""
+        self._X.clear()
+        self._AX.clear()
+        self._W.clear()
+        self._AW.clear()
+
+    # ...
+    def _first_guess( self, b ):
+        """ First guess for the correction d of the linear system A d = b."""
+        X = self._X
+        if not X:
+            return None
+
+        if self._guess == 'extrapolation':
+            # Polynomial extrapolation at equally spaced steps, e.g.
+            # 2 x_n - x_{n-1} for nguess = 2
+            k = len( X )
+            coeffs = [(-1)**(j+1) * comb( k, j ) for j in range( k, 0, -1 )]
+            return _combine( coeffs, X )
+
+        # Galerkin projection: minimize the A-norm of the error in span(X)
+        AX = self._AX
+        G  = np.array( [[xi.dot( axj ) for axj in AX] for xi in X] )
+        g  = np.array( [xi.dot( b ) for xi in X] )
+        c  = np.linalg.lstsq( 0.5 * (G + G.T), g, rcond=1e-12 )[0]
+        return _combine( c, X )
+
+    # ...
+    def _update_deflation( self, directions ):
+        """
+        Rayleigh-Ritz procedure for A in the space Z spanned by the deflation
+        vectors and the stored search directions: the new deflation vectors
+        are the Ritz vectors of the ndefl smallest Ritz values.
+        """
+        Z  = self._W  + [p  for p, ap in directions]
+        AZ = self._AW + [ap for p, ap in directions]
+
+        if len( Z ) <= self._ndefl:
+            self._W, self._AW = Z, AZ
+            return
+
+        G = np.array( [[zi.dot( azj ) for azj in AZ] for zi in Z] )
+        F = np.array( [[zi.dot( zj  ) for zj  in Z ] for zi in Z ] )
+        G = 0.5 * (G + G.T)
+
+        # Orthonormal basis of span(Z), without the (numerically) dependent vectors
+        f, V = np.linalg.eigh( F )
+        keep = f > f.max() * 1e-12
+        Q    = V[:, keep] / np.sqrt( f[keep] )
+
+        # Ritz values in ascending order
+        theta, Y = np.linalg.eigh( Q.T @ G @ Q )
+        Y = Q @ Y[:, :self._ndefl]
+
+        self._W  = [_combine( y, Z  ) for y in Y.T]
+        self._AW = [_combine( y, AZ ) for y in Y.T]
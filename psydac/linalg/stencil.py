@@ -6,7 +6,6 @@ import os
 import warnings
 
 import numpy as np
-from scipy.sparse import coo_matrix
 from mpi4py import MPI
 
 from psydac.linalg.basic   import VectorSpace, Vector, Matrix
@@ -76,6 +75,14 @@ class StencilVectorSpace( VectorSpace ):
     cart : psydac.ddm.cart.CartDecomposition
         Tensor-product grid decomposition according to MPI Cartesian topology.
 
+    shared_memory : bool
+        Parallel case only: if True, the processes on the same node exchange
+        the ghost regions through a shared memory window instead of MPI
+        messages (see SharedCartDataExchanger), and the tables of the 1D
+        assembly grids of the FEM spaces built on this space are stored once
+        per node. By default, True if the environment variable
+        PSYDAC_SHARED_MEMORY is set to 1.
+
     """
     def __init__( self, *args, **kwargs ):
 
@@ -91,6 +98,7 @@ class StencilVectorSpace( VectorSpace ):
 
         assert len(npts) == len(pads) == len(periods) == len(shifts)
         self._parallel = False
+        self._shared_memory = False
 
         # Sequential attributes
         self._starts        = tuple( 0   for n in npts )
@@ -107,7 +115,7 @@ class StencilVectorSpace( VectorSpace ):
         self._npts   = tuple( npts )
 
     # ...
-    def _init_parallel( self, cart, dtype=float ):
+    def _init_parallel( self, cart, dtype=float, shared_memory=None ):
 
         assert isinstance( cart, CartDecomposition )
         self._parallel = True
@@ -129,7 +137,17 @@ class StencilVectorSpace( VectorSpace ):
         # Parallel attributes
         self._cart         = cart
         self._mpi_type     = find_mpi_type( dtype )
-        self._synchronizer = CartDataExchanger( cart, dtype )
+
+        if shared_memory is None:
+            shared_memory = os.environ.get('PSYDAC_SHARED_MEMORY') == '1'
+
+        self._shared_memory = shared_memory
+
+        if shared_memory:
+            from psydac.ddm.shared import SharedCartDataExchanger
+            self._synchronizer = SharedCartDataExchanger( cart, dtype )
+        else:
+            self._synchronizer = CartDataExchanger( cart, dtype )
 
     #--------------------------------------
     # Abstract interface
@@ -209,6 +227,11 @@ class StencilVectorSpace( VectorSpace ):
     def parallel( self ):
         return self._parallel
 
+    # ...
+    @property
+    def shared_memory( self ):
+        return self._shared_memory
+
     # ...
     @property
     def cart( self ):
@@ -286,6 +309,9 @@ class StencilVector( Vector ):
         # TODO: distinguish between different directions
         self._sync  = False
 
+        # Counter of in-place modifications (see property 'version')
+        self._version = 0
+
     #--------------------------------------
     # Abstract interface
     #--------------------------------------
@@ -367,6 +393,7 @@ class StencilVector( Vector ):
     #...
     def __imul__( self, a ):
         self._data *= a
+        self._version += 1
         return self
 
     #...
@@ -375,6 +402,7 @@ class StencilVector( Vector ):
         assert v._space is self._space
         self._data += v._data
         self._sync  = v._sync and self._sync
+        self._version += 1
         return self
 
     #...
@@ -383,6 +411,7 @@ class StencilVector( Vector ):
         assert v._space is self._space
         self._data -= v._data
         self._sync  = v._sync and self._sync
+        self._version += 1
         return self
 
     #--------------------------------------
@@ -402,6 +431,21 @@ class StencilVector( Vector ):
     def pads(self):
         return self._space.pads
 
+    # ...
+    @property
+    def version( self ):
+        """ Counter which is incremented whenever the vector is modified in place
+            through item assignment, in-place arithmetic or as the 'out' argument
+            of a matrix-vector product. Code writing directly into the private
+            '_data' array must call 'mark_modified' afterwards.
+        """
+        return self._version
+
+    # ...
+    def mark_modified( self ):
+        """ Flag the vector data as modified, by incrementing its version. """
+        self._version += 1
+
     # ...
     def __str__(self):
         txt  = '\n'
@@ -545,6 +589,7 @@ class StencilVector( Vector ):
     def __setitem__(self, key, value):
         index = self._getindex( key )
         self._data[index] = value
+        self._version += 1
 
     # ...
     @property
@@ -656,8 +701,20 @@ class StencilMatrix( Matrix ):
     W : psydac.linalg.stencil.StencilVectorSpace
         Codomain of the new linear operator.
 
+    pads : tuple of int
+        Padding of the linear operator (optional: by default the pads of V).
+
+    backend : dict
+        Backend of the compiled kernels (optional).
+
+    dtype : type | str | numpy.dtype
+        Datatype of the stored entries (optional: by default the datatype of
+        W). A reduced precision, e.g. float32, halves the memory traffic of the
+        matrix-vector product, which is memory bound; the vectors and the sums
+        of the product keep the datatype of the vector spaces.
+
     """
-    def __init__( self, V, W, pads=None , backend=None):
+    def __init__( self, V, W, pads=None , backend=None, dtype=None):
 
         assert isinstance( V, StencilVectorSpace )
         assert isinstance( W, StencilVectorSpace )
@@ -670,7 +727,7 @@ class StencilMatrix( Matrix ):
         self._pads     = pads or tuple(V.pads)
         dims           = [e-s+2*mi*p+1 for s,e,p,mi in zip(W.starts, W.ends, W.pads, W.shifts)]
         diags          = [compute_diag_len(p, md, mc) for p,md,mc in zip(self._pads, V.shifts, W.shifts)]
-        self._data     = np.zeros( dims+diags, dtype=W.dtype )
+        self._data     = np.zeros( dims+diags, dtype=dtype or W.dtype )
         self._domain   = V
         self._codomain = W
         self._ndim     = len( dims )
@@ -682,7 +739,7 @@ class StencilMatrix( Matrix ):
             # Create data exchanger for ghost regions
             self._synchronizer = CartDataExchanger(
                 cart        = W.cart,
-                dtype       = W.dtype,
+                dtype       = self._data.dtype,
                 coeff_shape = diags
             )
 
@@ -756,6 +813,7 @@ class StencilMatrix( Matrix ):
 
 
         self._func(self._data, v._data, out._data, **self._args)
+        out.mark_modified()
 
         # IMPORTANT: flag that ghost regions are not up-to-date
         out.ghost_regions_in_sync = False
@@ -816,8 +874,12 @@ class StencilMatrix( Matrix ):
         if not M.ghost_regions_in_sync:
             M.update_ghost_regions()
 
+        # The compiled kernels work on the datatype of the vector spaces
+        if self._backend is not None and self.data_dtype != self.dtype:
+            return M.astype( self.dtype ).transpose().astype( self.data_dtype )
+
         # Create new matrix where domain and codomain are swapped
-        Mt = StencilMatrix(M.codomain, M.domain, pads=self._pads, backend=self._backend)
+        Mt = StencilMatrix(M.codomain, M.domain, pads=self._pads, backend=self._backend, dtype=self.data_dtype)
 
         # Call low-level '_transpose' function (works on Numpy arrays directly)
         self._transpose_func(M._data, Mt._data, **self._transpose_args)
@@ -850,6 +912,150 @@ class StencilMatrix( Matrix ):
                    all(i<n for i,n in zip(ii, ncols)):
                     Mt[(*jj, *ll)] = M[(*ii, *kk)]
 
+    # ...
+    def matmul( self, B ):
+        """ Compute the product C = A @ B of this matrix A with a matrix B, and
+            return C as a new StencilMatrix, distributed like A.
+
+            The pads of C are the sums of the half-bandwidths of A and B, which
+            are computed from their non-zero entries: these must not exceed the
+            pads of the vector spaces.
+
+        Parameters
+        ----------
+        B : StencilMatrix | KroneckerStencilMatrix | DirectionalDerivativeOperator
+            Right factor, whose codomain must be the domain of A. Operators which
+            are not StencilMatrix objects are converted with their method tostencil().
+
+        Returns
+        -------
+        C : StencilMatrix
+            Product matrix from B.domain to A.codomain, with the backend of A.
+            Its entries are stored in the datatype of the vector spaces, even
+            if A or B use reduced-precision storage.
+
+        """
+        A = self
+
+        if not isinstance( B, StencilMatrix ):
+            B = B.tostencil()
+
+        assert B.codomain is A.domain
+
+        U = B.domain
+        V = A.domain
+        W = A.codomain
+
+        if any( m != 1 for X in (U, V, W) for m in X.shifts ):
+            raise NotImplementedError( 'Matrix product is only implemented for vector spaces with shifts equal to 1' )
+
+        # Rows of A and rows of B are traversed with the same local index
+        if V.starts != W.starts:
+            raise NotImplementedError( 'Matrix product requires A.domain and A.codomain to have the same starts' )
+
+        # The rows of A, B and C have the same ghost regions
+        if V.pads != W.pads:
+            raise NotImplementedError( 'Matrix product requires A.domain and A.codomain to have the same pads' )
+
+        gpads = V.pads
+        pa    = A._bandwidth()
+        pb    = B._bandwidth()
+        pc    = tuple( a+b for a,b in zip(pa, pb) )
+
+        if any( p > gp for p,gp in zip(pc, U.pads) ):
+            raise ValueError( 'Pads {} of matrix product exceed pads {} of vector space'.format(pc, U.pads) )
+
+        # Rows of B up to a distance pa from the local rows of A are needed
+        if not B.ghost_regions_in_sync:
+            B.update_ghost_regions()
+
+        # Range of valid rows in the local data of B (no ghost rows beyond a non-periodic boundary)
+        lb = [gp if (s == 0 and not P) else 0
+              for s,gp,P in zip(V.starts, gpads, V.periods)]
+        ub = [gp+e-s+1 if (e == n-1 and not P) else e-s+1+2*gp
+              for s,e,n,gp,P in zip(V.starts, V.ends, V.npts, gpads, V.periods)]
+
+        args = {}
+        args['nrows'] = tuple( e-s+1 for s,e in zip(W.starts, W.ends) )
+        args['gpads'] = tuple( gpads )
+        args['pa']    = pa
+        args['pb']    = pb
+        args['oa']    = tuple( p-b for p,b in zip(A._pads, pa) )
+        args['ob']    = tuple( p-b for p,b in zip(B._pads, pb) )
+        args['lb']    = tuple( lb )
+        args['ub']    = tuple( ub )
+
+        C = StencilMatrix( U, W, pads=pc, backend=A._backend )
+
+        # The product is computed in the datatype of the vector spaces
+        # (which is also the only one handled by the compiled kernel)
+        if A.data_dtype != A.dtype:
+            A = A.astype( A.dtype )
+        if B.data_dtype != B.dtype:
+            B = B.astype( B.dtype )
+
+        if A._backend is None:
+            A._matmul( A._data, B._data, C._data, **args )
+        else:
+            # Kernel is compiled at the first call only (instances are cached)
+            from psydac.api.ast.linalg import StencilMatMulOperator
+            matmul = StencilMatMulOperator( A._ndim, backend=frozenset(A._backend.items()) )
+            kernel_args = [np.int64(a) for arg in args.values() for a in arg]
+            matmul.func( A._data, B._data, C._data, *kernel_args )
+
+        C.remove_spurious_entries()
+
+        return C
+
+    @staticmethod
+    def _matmul( A, B, C, nrows, gpads, pa, pb, oa, ob, lb, ub ):
+
+        # NOTE:
+        #  . C[i, l+m] += A[i, l] * B[i+l-pa, m], with diagonal indices starting at 0
+        #  . loop over the diagonals of A, and vectorize over rows and diagonals of B
+
+        ndim    = len(nrows)
+        ndiagsB = [2*p+1 for p in pb]
+        newaxes = (Ellipsis,) + (None,)*ndim
+
+        for ll in np.ndindex( *[2*p+1 for p in pa] ):
+
+            # Local rows i such that row i+l-pa of B is valid
+            lo = [max(gp, b-l+p)    for gp,b,l,p   in zip(gpads, lb, ll, pa)]
+            hi = [min(gp+n, b-l+p)  for gp,n,b,l,p in zip(gpads, nrows, ub, ll, pa)]
+
+            if any( i >= j for i,j in zip(lo, hi) ):
+                continue
+
+            ii = tuple( slice(i, j) for i,j in zip(lo, hi) )
+            jj = tuple( slice(i+l-p, j+l-p) for i,j,l,p in zip(lo, hi, ll, pa) )
+            ka = tuple( o+l for o,l in zip(oa, ll) )
+            kb = tuple( slice(o, o+n) for o,n in zip(ob, ndiagsB) )
+            kc = tuple( slice(l, l+n) for l,n in zip(ll, ndiagsB) )
+
+            C[ii + kc] += A[ii + ka][newaxes] * B[jj + kb]
+
+    # ...
+    def _bandwidth( self ):
+        """ Half-bandwidth of the matrix along each direction, computed from
+            the non-zero entries in the local rows of all processes.
+        """
+        nd    = self._ndim
+        W     = self._codomain
+        rows  = tuple( slice(m*p, m*p+e-s+1) for s,e,p,m in zip(W.starts, W.ends, W.pads, W.shifts) )
+        local = self._data[rows] != 0
+
+        bw = np.zeros( nd, dtype=int )
+        for d in range( nd ):
+            axes = tuple( a for a in range(2*nd) if a != nd+d )
+            kk   = np.flatnonzero( local.any( axis=axes ) )
+            bw[d] = abs( kk - self._pads[d] ).max() if kk.size else 0
+
+        if W.parallel:
+            W.cart.comm.Allreduce( MPI.IN_PLACE, bw, op=MPI.MAX )
+
+        return tuple( int(b) for b in bw )
+
     # ...
     def toarray( self, **kwargs ):
         """ Convert to Numpy 2D array. """
@@ -892,6 +1098,43 @@ class StencilMatrix( Matrix ):
     def backend( self ):
         return self._backend
 
+    # ...
+    @property
+    def data_dtype( self ):
+        """ Datatype of the stored entries, which may differ from dtype."""
+        return self._data.dtype
+
+    # ...
+    def astype( self, dtype, out=None ):
+        """
+        Copy of the matrix with entries stored in another datatype, e.g.
+        float32 for a faster matrix-vector product with a reduced accuracy.
+
+        Parameters
+        ----------
+        dtype : type | str | numpy.dtype
+            Datatype of the stored entries of the new matrix.
+
+        out : StencilMatrix
+            Matrix with the same structure in which the entries are copied
+            (optional: a new matrix is created).
+
+        Returns
+        -------
+        out : StencilMatrix
+            Matrix with the same domain, codomain, pads and backend.
+        """
+        if out is None:
+            out = StencilMatrix( self._domain, self._codomain, self._pads, self._backend, dtype=dtype )
+        else:
+            assert isinstance( out, StencilMatrix )
+            assert out._domain is self._domain and out._codomain is self._codomain
+            assert out._pads == self._pads and out.data_dtype == np.dtype( dtype )
+
+        out._data[...] = self._data
+        out._sync      = self._sync
+        return out
+
     # ...
     def __getitem__(self, key):
         index = self._getindex( key )
@@ -907,9 +1150,53 @@ class StencilMatrix( Matrix ):
     def max( self ):
         return self._data.max()
 
+    #...
+    def diagonal( self, *, inverse=False, out=None ):
+        """
+        Diagonal entries of the matrix owned by the process, as a vector of the
+        codomain. The entries are copied from the data array in a single slice,
+        and the ghost regions of the result are not updated.
+
+        Parameters
+        ----------
+        inverse : bool
+            If True, return the inverses of the diagonal entries.
+
+        out : StencilVector, optional
+            Vector of the codomain where the result is stored.
+
+        Returns
+        -------
+        out : StencilVector
+            Diagonal (or inverse diagonal) of the matrix.
+
+        """
+        V = self._codomain
+        assert self._domain.npts == V.npts
+
+        if out is None:
+            out = StencilVector( V )
+        else:
+            assert isinstance( out, StencilVector )
+            assert out.space is V
+
+        # Owned rows, and diagonal index k = 0 in the last dimensions
+        rows  = tuple( slice(m*p, m*p+e-s+1) for p,m,s,e in zip(V.pads, V.shifts, V.starts, V.ends) )
+        index = rows + tuple( self._pads )
+
+        if inverse:
+            np.divide( 1.0, self._data[index], out=out._data[rows] )
+        else:
+            out._data[rows] = self._data[index]
+
+        out.ghost_regions_in_sync = False
+        out.mark_modified()
+
+        return out
+
     #...
     def copy( self ):
-        M = StencilMatrix( self.domain, self.codomain, self._pads, self._backend )
+        M = StencilMatrix( self.domain, self.codomain, self._pads, self._backend, dtype=self.data_dtype )
         M._data[:] = self._data[:]
         M._func    = self._func
         M._args    = self._args
@@ -917,7 +1204,7 @@ class StencilMatrix( Matrix ):
 
     #...
     def __mul__( self, a ):
-        w = StencilMatrix( self._domain, self._codomain, self._pads, self._backend )
+        w = StencilMatrix( self._domain, self._codomain, self._pads, self._backend, dtype=self.data_dtype )
         w._data = self._data * a
         w._func = self._func
         w._args = self._args
@@ -926,7 +1213,7 @@ class StencilMatrix( Matrix ):
 
     #...
     def __rmul__( self, a ):
-        w = StencilMatrix( self._domain, self._codomain, self._pads, self._backend )
+        w = StencilMatrix( self._domain, self._codomain, self._pads, self._backend, dtype=self.data_dtype )
         w._data = a * self._data
         w._func = self._func
         w._args = self._args
@@ -948,7 +1235,7 @@ class StencilMatrix( Matrix ):
             msg = 'Adding two matrices with different backends is ambiguous - defaulting to backend of first addend'
             warnings.warn(msg, category=RuntimeWarning)
         
-        w = StencilMatrix(self._domain, self._codomain, self._pads, self._backend)
+        w = StencilMatrix(self._domain, self._codomain, self._pads, self._backend, dtype=self.data_dtype)
         w._data = self._data  +  m._data
         w._func = self._func
         w._args = self._args
@@ -966,7 +1253,7 @@ class StencilMatrix( Matrix ):
             msg = 'Subtracting two matrices with different backends is ambiguous - defaulting to backend of the matrix we subtract from'
             warnings.warn(msg, category=RuntimeWarning)
 
-        w = StencilMatrix(self._domain, self._codomain, self._pads, self._backend)
+        w = StencilMatrix(self._domain, self._codomain, self._pads, self._backend, dtype=self.data_dtype)
         w._data = self._data  -  m._data
         w._func = self._func
         w._args = self._args
@@ -1000,7 +1287,7 @@ class StencilMatrix( Matrix ):
 
     #...
     def __abs__( self ):
-        w = StencilMatrix( self._domain, self._codomain, self._pads, self._backend )
+        w = StencilMatrix( self._domain, self._codomain, self._pads, self._backend, dtype=self.data_dtype )
         w._data = abs(self._data)
         w._func = self._func
         w._args = self._args
@@ -1188,6 +1475,7 @@ class StencilMatrix( Matrix ):
             cols.append( J )
             data.append( value )
 
+        from scipy.sparse import coo_matrix
         M = coo_matrix(
                 (data,(rows,cols)),
                 shape = [np.prod(nr),np.prod(nc)],
@@ -1239,6 +1527,7 @@ class StencilMatrix( Matrix ):
             cols.append( J )
             data.append( value )
 
+        from scipy.sparse import coo_matrix
         M = coo_matrix(
                 (data,(rows,cols)),
                 shape = [np.prod(nr),np.prod(nc)],
@@ -1325,6 +1614,7 @@ class StencilMatrix( Matrix ):
                 data.append( value )
 
         # Create Scipy COO matrix
+        from scipy.sparse import coo_matrix
         M = coo_matrix(
                 (data,(rows,cols)),
                 shape = [np.prod(nr), np.prod(nc)],
@@ -1483,7 +1773,8 @@ class StencilMatrix( Matrix ):
                                     gpads=self._args['gpads'],
                                     pads=self._args['pads'],
                                     dm = self._args['dm'],
-                                    cm = self._args['cm'])
+                                    cm = self._args['cm'],
+                                    dtype = self.data_dtype.name)
 
                     starts = self._args.pop('starts')
                     nrows  = self._args.pop('nrows')
@@ -1507,7 +1798,8 @@ class StencilMatrix( Matrix ):
                                             gpads=self._args['gpads'],
                                             pads=self._args['pads'],
                                             dm = self._args['dm'],
-                                            cm = self._args['cm'])
+                                            cm = self._args['cm'],
+                                            dtype = self.data_dtype.name)
 
                     starts      = self._args.pop('starts')
                     nrows       = self._args.pop('nrows')
@@ -1537,7 +1829,8 @@ class StencilMatrix( Matrix ):
                                         gpads=self._args['gpads'],
                                         pads=self._args['pads'],
                                         dm = self._args['dm'],
-                                        cm = self._args['cm'])
+                                        cm = self._args['cm'],
+                                        dtype = self.data_dtype.name)
                 self._args.pop('nrows')
                 self._args.pop('nrows_extra')
                 self._args.pop('gpads')
@@ -1678,6 +1971,7 @@ class StencilInterfaceMatrix(Matrix):
             out = StencilVector( self.codomain )
 
         self._func(self._data, v._data, out._data, **self._args)
+        out.mark_modified()
 
         # IMPORTANT: flag that ghost regions are not up-to-date
         out.ghost_regions_in_sync = False
@@ -2038,6 +2332,7 @@ class StencilInterfaceMatrix(Matrix):
                 cols.append( J )
                 data.append( value )
 
+        from scipy.sparse import coo_matrix
         M = coo_matrix(
                     (data,(rows,cols)),
                     shape = [np.prod(nr),np.prod(nc)],
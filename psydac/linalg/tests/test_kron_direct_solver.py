@@ -184,6 +184,53 @@ def test_direct_solvers(seed, n, p, P, nrhs, direct_solver, transposed):
     assert np.allclose( X_glob, X_glob3, rtol=1e-8, atol=1e-8 )
     assert np.allclose( X_glob, X_glob5, rtol=1e-8, atol=1e-8 )
 
+@pytest.mark.parametrize( 'seed', [0, 2] )
+@pytest.mark.parametrize( 'n', [8, 17] )
+@pytest.mark.parametrize( 'p', [1, 3] )
+@pytest.mark.parametrize( 'P', [True, False] )
+@pytest.mark.parametrize( 'transposed', [True, False] )
+def test_direct_solvers_refactor(seed, n, p, P, transposed):
+    # space (V)
+    V = StencilVectorSpace([n], [p], [P])
+
+    # initial and new matrices with the same pattern (A, B)
+    A = random_matrix(seed+1, V)
+    A.remove_spurious_entries()
+    B = A.copy()
+    B._data[...] *= 1 + np.random.default_rng(seed).random(B._data.shape)
+
+    Y_glob = np.stack([random_vectordata(seed + i, [n]) for i in range(3)], axis=0)
+    M      = B.toarray().T if transposed else B.toarray()
+    X_glob = np.linalg.solve(M, Y_glob.T).T
+
+    # sparse solver: new matrix, or new values only
+    solver = matrix_to_sparse(A)
+    solver.refactor(B.tosparse())
+    assert np.allclose( X_glob, solver.solve(Y_glob, transposed=transposed), rtol=1e-8, atol=1e-8 )
+
+    solver = matrix_to_sparse(A)
+    data   = solver.matrix.data.copy()
+    solver.refactor(csc_matrix(B.tosparse()).sorted_indices().data)
+    assert np.allclose( X_glob, solver.solve(Y_glob, transposed=transposed), rtol=1e-8, atol=1e-8 )
+
+    solver.refactor(data)
+    X_glob2 = np.linalg.solve(A.toarray().T if transposed else A.toarray(), Y_glob.T).T
+    assert np.allclose( X_glob2, solver.solve(Y_glob, transposed=transposed), rtol=1e-8, atol=1e-8 )
+
+    with pytest.raises(ValueError):
+        solver.refactor(csc_matrix(np.eye(n)))
+
+    # banded solver, with non-contiguous output
+    solver = matrix_to_bandsolver(A)
+    B_bnd, lb, ub = to_bnd(B)
+    solver.refactor(B_bnd)
+
+    X_glob3 = np.asfortranarray(Y_glob)
+    X_glob4 = solver.solve(X_glob3, out=X_glob3, transposed=transposed)
+
+    assert X_glob4 is X_glob3
+    assert np.allclose( X_glob, X_glob3, rtol=1e-8, atol=1e-8 )
+
 # right now, the maximum tested number for MPI_COMM_WORLD.size is 4; some test sizes failed with size 8 for now.
 
 # tests without MPI
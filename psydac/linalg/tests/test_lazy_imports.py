@@ -0,0 +1,32 @@
+# coding: utf-8
+
+import subprocess
+import sys
+
+import pytest
+
+#===============================================================================
+def imported_modules(statement):
+    """Top-level packages imported by a statement, in a fresh interpreter."""
+    code = f'import sys; {statement}; print(" ".join(sorted({{m.split(".")[0] for m in sys.modules}})))'
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return set(output.split())
+
+#===============================================================================
+@pytest.mark.parametrize('statement', ['import psydac',
+                                       'import psydac.linalg',
+                                       'from psydac.linalg.stencil import StencilVectorSpace',
+                                       'from psydac.linalg.iterative_solvers import pcg',
+                                       'from psydac.ddm.cart import CartDecomposition'])
+def test_no_heavy_imports(statement):
+    modules = imported_modules(statement)
+    for heavy in ['sympy', 'sympde', 'pyccel', 'h5py', 'yaml', 'matplotlib']:
+        assert heavy not in modules
+
+#===============================================================================
+def test_lazy_subpackages():
+    import psydac
+    assert 'linalg' in dir(psydac)
+    assert psydac.linalg.stencil.StencilVectorSpace.__name__ == 'StencilVectorSpace'
+    with pytest.raises(AttributeError):
+        psydac.not_a_subpackage
@@ -0,0 +1,183 @@
+# -*- coding: UTF-8 -*-
+
+import pytest
+import numpy as np
+
+from psydac.linalg.basic         import (SumLinearOperator, ComposedLinearOperator,
+                                         ScaledLinearOperator, InverseLinearOperator)
+from psydac.linalg.stencil       import StencilVectorSpace, StencilMatrix
+from psydac.linalg.kron          import KroneckerLinearSolver
+from psydac.linalg.direct_solvers import SparseSolver
+from psydac.feec.derivatives     import DirectionalDerivativeOperator
+
+from scipy.sparse import csr_matrix
+
+#===============================================================================
+def random_stencil_matrix( V, W ):
+    M = StencilMatrix( V, W )
+    M._data[:] = np.random.random( M._data.shape )
+    M.remove_spurious_entries()
+    return M
+
+def random_stencil_vector( V ):
+    v = V.zeros()
+    idx = tuple( slice(p, -p) for p in V.pads )
+    v._data[idx] = np.random.random( v._data[idx].shape )
+    return v
+
+#===============================================================================
+# SERIAL TESTS
+#===============================================================================
+@pytest.mark.parametrize( 'n1', [8, 11] )
+@pytest.mark.parametrize( 'n2', [6, 9] )
+@pytest.mark.parametrize( 'p1', [1, 2] )
+@pytest.mark.parametrize( 'p2', [1, 3] )
+
+def test_lazy_operator_algebra_2d( n1, n2, p1, p2 ):
+
+    np.random.seed(0)
+
+    V = StencilVectorSpace( [n1, n2], [p1, p2], [False, False] )
+    W = StencilVectorSpace( [n1+1, n2], [p1, p2], [False, False] )
+
+    M = random_stencil_matrix( V, V )
+    N = random_stencil_matrix( V, V )
+    D = random_stencil_matrix( V, W )
+    K = random_stencil_matrix( W, W )
+
+    Ma = M.toarray()
+    Na = N.toarray()
+    Da = D.toarray()
+    Ka = K.toarray()
+
+    v = random_stencil_vector( V )
+    va = v.toarray()
+
+    # Sum of matrices which are not added explicitly
+    S = SumLinearOperator( M, 2.0 * N, -N )
+    assert isinstance( S, SumLinearOperator )
+    assert len( S.addends ) == 3
+    assert np.allclose( S.dot( v ).toarray(), (Ma + Na).dot( va ) )
+
+    # Composition D^T K D, applied with and without output vector
+    C = D.T @ K @ D
+    assert isinstance( C, ComposedLinearOperator )
+    assert len( C.factors ) == 3
+    assert C.domain is V and C.codomain is V
+
+    Ca  = Da.T.dot( Ka ).dot( Da )
+    out = V.zeros()
+    assert C.dot( v, out=out ) is out
+    assert np.allclose( out.toarray(), Ca.dot( va ) )
+    assert np.allclose( C.dot( v ).toarray(), Ca.dot( va ) )
+
+    # In-place application
+    w = v.copy()
+    C.dot( w, out=w )
+    assert np.allclose( w.toarray(), Ca.dot( va ) )
+
+    w = v.copy()
+    S.dot( w, out=w )
+    assert np.allclose( w.toarray(), (Ma + Na).dot( va ) )
+
+    # Nested expressions and transposition
+    E = -(M @ N) + 0.5 * C - M
+    Ea = -Ma.dot( Na ) + 0.5 * Ca - Ma
+    assert isinstance( E, SumLinearOperator )
+    assert len( E.addends ) == 3
+    assert np.allclose( E.dot( v ).toarray(), Ea.dot( va ) )
+    assert np.allclose( E.T.dot( v ).toarray(), Ea.T.dot( va ) )
+
+    # Scalars are merged
+    A = 3.0 * (2.0 * C)
+    assert isinstance( A, ScaledLinearOperator )
+    assert A.scalar == 6.0
+    assert A.operator is C
+
+#===============================================================================
+@pytest.mark.parametrize( 'n1', [8, 11] )
+@pytest.mark.parametrize( 'n2', [6, 9] )
+
+def test_inverse_linear_operator_2d( n1, n2 ):
+
+    np.random.seed(1)
+
+    V = StencilVectorSpace( [n1, n2], [1, 1], [False, False] )
+
+    # 1D diagonally dominant matrices
+    As = []
+    for n in (n1, n2):
+        A = np.random.random( (n, n) ) + n * np.eye( n )
+        As.append( A )
+
+    solver = KroneckerLinearSolver( V, [SparseSolver( csr_matrix( A ) ) for A in As] )
+    Ainv   = InverseLinearOperator( solver )
+    Aa     = np.kron( As[0], As[1] )
+
+    v  = random_stencil_vector( V )
+    va = v.toarray()
+
+    assert np.allclose( Ainv.dot( v ).toarray(), np.linalg.solve( Aa, va ) )
+    assert np.allclose( Ainv.T.dot( v ).toarray(), np.linalg.solve( Aa.T, va ) )
+
+    # Composition with its own inverse
+    M = StencilMatrix( V, V )
+    M._data[:] = np.random.random( M._data.shape )
+    M.remove_spurious_entries()
+    Ma = M.toarray()
+
+    C = Ainv @ M
+    assert np.allclose( C.dot( v ).toarray(), np.linalg.solve( Aa, Ma.dot( va ) ) )
+
+#===============================================================================
+@pytest.mark.parametrize( 'diffdir', [0, 1] )
+
+def test_derivative_mass_composition_2d( diffdir ):
+
+    np.random.seed(2)
+
+    npts = [9, 7]
+    wpts = [n-1 if d == diffdir else n for d, n in enumerate( npts )]
+
+    V = StencilVectorSpace( npts, [2, 2], [False, False] )
+    W = StencilVectorSpace( wpts, [2, 2], [False, False] )
+
+    # Matrix-free derivative V -> W, and "mass matrix" of W
+    D  = DirectionalDerivativeOperator( V, W, diffdir )
+    M1 = random_stencil_matrix( W, W )
+
+    Da = D.toarray()
+    Ma = M1.toarray()
+
+    # Stiffness-like operator D^T M1 D, never assembled
+    K = D.T @ M1 @ D
+    assert isinstance( K, ComposedLinearOperator )
+    assert K.domain is V and K.codomain is V
+
+    v   = random_stencil_vector( V )
+    Ka  = Da.T.dot( Ma ).dot( Da )
+    out = V.zeros()
+    assert K.dot( v, out=out ) is out
+    assert np.allclose( out.toarray(), Ka.dot( v.toarray() ) )
+
+    # Linear combination with its transpose
+    A = 2.0 * K + 0.5 * K.T
+    assert np.allclose( A.dot( v ).toarray(), (2.0 * Ka + 0.5 * Ka.T).dot( v.toarray() ) )
+
+    # Multiplication by anything else than a scalar is not defined
+    with pytest.raises( TypeError ):
+        K * 'a'
+    with pytest.raises( TypeError ):
+        'a' * K
+
+    # Composition with anything else than a linear operator is not defined
+    with pytest.raises( TypeError ):
+        K @ v
+    assert K.__matmul__( Ka ) is NotImplemented
+
+#===============================================================================
+# SCRIPT FUNCTIONALITY
+#===============================================================================
+if __name__ == "__main__":
+    import sys
+    pytest.main( sys.argv )
@@ -111,3 +111,57 @@ def test_pcg(n, p):
     assert err_norm0 < tol and err_norm1 < tol and err_norm2 < tol
     assert info1 == info1b and info1 == info1c
 
+
+#===============================================================================
+@pytest.mark.parametrize( 'n', [16, 64] )
+@pytest.mark.parametrize( 'p', [2, 3] )
+def test_iterative_refinement(n, p):
+    """
+    Test mixed-precision iterative refinement on a banded linear system, with
+    inner solves on the same matrix stored in single precision.
+
+    """
+    from psydac.linalg.iterative_solvers import pcg, iterative_refinement
+    from psydac.linalg.stencil import StencilVectorSpace, StencilMatrix, StencilVector
+
+    V = StencilVectorSpace([n], [p], [False])
+    e = V.ends[0]
+    s = V.starts[0]
+
+    # Symmetric positive definite matrix, with entries not exact in single precision
+    A = StencilMatrix(V, V)
+    A[:,-p:0  ] = -1 / 3
+    A[:, 0:1  ] = 2*p / 3 + 0.1
+    A[:, 1:p+1] = -1 / 3
+    A.remove_spurious_entries()
+
+    A_low = A.astype(np.float32)
+
+    xe = StencilVector(V)
+    xe[s:e+1] = np.random.random(e+1-s)
+    b = A.dot(xe)
+
+    tol = 1e-12
+
+    # pcg on the single-precision matrix stagnates at its accuracy
+    x0, info0 = pcg(A_low, b, pc="jacobi", tol=tol, maxiter=200)
+    r0 = b - A.dot(x0)
+
+    # iterative refinement reaches the accuracy of the double-precision matrix
+    x1, info1 = iterative_refinement(A, b, A_low, pc="jacobi", tol=tol)
+    r1 = b - A.dot(x1)
+
+    assert info1['success']
+    assert info1['niter'] > 1
+    assert np.sqrt(r1.dot(r1)) < tol
+    assert abs(info1['res_norm'] - np.sqrt(r1.dot(r1))) < tol
+    assert np.sqrt(r1.dot(r1)) < np.sqrt(r0.dot(r0))
+    assert np.linalg.norm((x1 - xe).toarray()) < 1e-9
+
+    # No refinement step: first guess and its residual
+    x2, info2 = iterative_refinement(A, b, A_low, pc="jacobi", tol=tol, maxiter=0)
+
+    assert info2['niter'] == 0 and info2['inner_niter'] == 0
+    assert not info2['success']
+    assert np.array_equal(x2.toarray(), np.zeros(n))
+    assert abs(info2['res_norm'] - np.sqrt(b.dot(b))) < tol
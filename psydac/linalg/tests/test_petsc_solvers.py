@@ -0,0 +1,133 @@
+# coding: utf-8
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from psydac.ddm.cart                 import CartDecomposition
+from psydac.linalg.stencil           import StencilVectorSpace, StencilMatrix
+from psydac.linalg.block             import BlockVectorSpace, BlockVector, BlockMatrix
+from psydac.linalg.iterative_solvers import pcg
+
+petsc4py = pytest.importorskip('petsc4py')
+
+from psydac.linalg.petsc_solvers import PetscSolver
+
+#===============================================================================
+def random_spd_matrix(V, seed):
+    """Symmetric and diagonally dominant StencilMatrix with random entries."""
+    rng  = np.random.default_rng(seed)
+    rows = tuple(slice(p, p + n) for p, n in zip(V.pads, V.npts))
+    B    = StencilMatrix(V, V)
+    B._data[rows] = rng.random(B._data[rows].shape)
+    B.remove_spurious_entries()
+
+    A = B + B.T
+    A.remove_spurious_entries()
+
+    d = np.abs(A.toarray()).sum(axis=1)
+    for i in np.ndindex(*V.npts):
+        A[i + (0,) * V.ndim] = d[np.ravel_multi_index(i, V.npts)] + 1.
+    return A
+
+#===============================================================================
+@pytest.mark.parametrize('npts, pads, periods', [([12], [3], [True]),
+                                                 ([7, 8], [2, 1], [False, True]),
+                                                 ([4, 5, 3], [1, 2, 1], [False, False, True])])
+@pytest.mark.parametrize('transposed', [False, True])
+def test_petsc_solver(npts, pads, periods, transposed):
+
+    V = StencilVectorSpace(npts, pads, periods)
+    A = random_spd_matrix(V, seed=0)
+    M = A.toarray()
+
+    b = V.zeros()
+    b._data[...] = np.random.random(b._data.shape)
+
+    # Exact preallocation from the stencil, and conversion of the values
+    solver = PetscSolver(A, ksp_type='preonly', pc_type='lu')
+    assert solver.mat.getInfo()['nz_unneeded'] == 0
+    assert np.allclose(solver.mat.convert('dense').getDenseArray(), M, rtol=1e-14, atol=0)
+
+    x = solver.solve(b, transposed=transposed)
+    assert np.allclose(x.toarray(), np.linalg.solve(M.T if transposed else M, b.toarray()), rtol=1e-10, atol=1e-12)
+
+    # Update of the values in place
+    A *= 2.
+    solver.update()
+    x = solver.solve(b, transposed=transposed)
+    assert np.allclose(x.toarray(), np.linalg.solve(2 * (M.T if transposed else M), b.toarray()), rtol=1e-10, atol=1e-12)
+
+    # Solve in place
+    solver.solve(b, out=b, transposed=transposed)
+    assert np.allclose(b.toarray(), x.toarray(), rtol=1e-14, atol=0)
+
+#===============================================================================
+def test_petsc_solver_block():
+
+    V = StencilVectorSpace([9, 8], [2, 2], [False, True])
+    W = BlockVectorSpace(V, V)
+
+    A = BlockMatrix(W, W)
+    A[0, 0] = random_spd_matrix(V, seed=1)
+    A[1, 1] = random_spd_matrix(V, seed=2)
+    A[0, 1] = 0.1 * random_spd_matrix(V, seed=3)
+    A[1, 0] = A[0, 1].T
+
+    b = BlockVector(W, blocks=[V.zeros(), V.zeros()])
+    for bi in b.blocks:
+        bi._data[...] = np.random.random(bi._data.shape)
+
+    solver = PetscSolver(A, ksp_type='cg', pc_type='jacobi', tol=1e-12)
+    x = solver.solve(b)
+
+    assert solver.info['success']
+    assert np.allclose(x.toarray(), np.linalg.solve(A.toarray(), b.toarray()), rtol=1e-8, atol=1e-10)
+
+#===============================================================================
+def test_petsc_solver_options():
+
+    V = StencilVectorSpace([20, 20], [2, 2], [False, False])
+    A = random_spd_matrix(V, seed=4)
+
+    b = V.zeros()
+    b._data[...] = np.random.random(b._data.shape)
+
+    x0, info0 = pcg(A, b, pc=None, tol=1e-10)
+
+    solver = PetscSolver(A, ksp_type='gmres', pc_type='gamg', options={'ksp_gmres_restart': 50})
+    x1 = solver.solve(b)
+
+    assert solver.ksp.getType() == 'gmres'
+    assert solver.info['success']
+    assert np.allclose(x1.toarray(), x0.toarray(), rtol=0, atol=1e-8)
+
+#===============================================================================
+@pytest.mark.parametrize('npts, pads, periods', [([20, 16], [2, 3], [False, True]),
+                                                 ([8, 7, 9], [1, 2, 1], [True, False, False])])
+@pytest.mark.parallel
+def test_petsc_solver_parallel(npts, pads, periods):
+
+    comm = MPI.COMM_WORLD
+    cart = CartDecomposition(npts=npts, pads=pads, periods=periods, reorder=False, comm=comm)
+    V    = StencilVectorSpace(cart)
+
+    # Diagonally dominant matrix, with same values on every process
+    A = StencilMatrix(V, V)
+    A._data[...] = -1.
+    A[(slice(None),) * V.ndim + (0,) * V.ndim] = np.prod([2*p + 1 for p in pads])
+    A.remove_spurious_entries()
+
+    b = V.zeros()
+    b[tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))] = 1.
+    b.update_ghost_regions()
+
+    solver = PetscSolver(A, ksp_type='cg', pc_type='jacobi', tol=1e-12)
+    assert solver.mat.getInfo()['nz_unneeded'] == 0
+
+    x = solver.solve(b)
+    x.update_ghost_regions()
+    r = A.dot(x) - b
+
+    assert solver.info['success']
+    assert r.dot(r) ** 0.5 < 1e-10 * b.dot(b) ** 0.5
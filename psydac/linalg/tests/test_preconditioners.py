@@ -0,0 +1,435 @@
+# coding: utf-8
+
+import numpy as np
+import pytest
+
+from psydac.linalg.stencil           import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.block             import BlockVectorSpace, BlockVector, BlockMatrix
+from psydac.linalg.iterative_solvers import pcg
+from psydac.linalg.preconditioners   import JacobiPreconditioner, BlockJacobiPreconditioner, SSORPreconditioner
+from psydac.linalg.preconditioners   import AdditiveSchwarzPreconditioner, ChebyshevPreconditioner
+from psydac.api.settings             import PSYDAC_BACKEND_GPYCCEL
+
+#===============================================================================
+def random_spd_matrix(V, seed):
+    """Symmetric and diagonally dominant StencilMatrix with random entries."""
+    rng  = np.random.default_rng(seed)
+    rows = tuple(slice(p, p + n) for p, n in zip(V.pads, V.npts))
+    B    = StencilMatrix(V, V)
+    B._data[rows] = rng.random(B._data[rows].shape)
+    B.remove_spurious_entries()
+
+    A = B + B.T
+    A.remove_spurious_entries()
+
+    d = np.abs(A.toarray()).sum(axis=1)
+    for i in np.ndindex(*V.npts):
+        A[i + (0,) * V.ndim] = d[np.ravel_multi_index(i, V.npts)] + 1.
+    return A
+
+# ...
+def laplacian_matrix(V):
+    """Finite difference Laplacian (with Dirichlet boundary conditions) on a StencilVectorSpace with pads 1."""
+    A = StencilMatrix(V, V)
+    rows = tuple(slice(1, 1 + n) for n in V.npts)
+    for d in range(V.ndim):
+        lower = tuple(1 - (k == d) for k in range(V.ndim))
+        upper = tuple(1 + (k == d) for k in range(V.ndim))
+        A._data[rows + (1,) * V.ndim] += 2.
+        A._data[rows + lower] = -1.
+        A._data[rows + upper] = -1.
+    A.remove_spurious_entries()
+    return A
+
+# ...
+def chebyshev_error_matrix(M, degree, lmin, lmax):
+    """Error propagation matrix T_k((theta - M) / delta) / T_k(theta / delta) of the Chebyshev iteration."""
+    theta = (lmax + lmin) / 2
+    delta = (lmax - lmin) / 2
+    Y  = (theta * np.eye(len(M)) - M) / delta
+    T0, T1 = np.eye(len(M)), Y
+    t0, t1 = 1., theta / delta
+    for k in range(1, degree):
+        T0, T1 = T1, 2 * Y @ T1 - T0
+        t0, t1 = t1, 2 * theta / delta * t1 - t0
+    return T1 / t1
+
+#===============================================================================
+@pytest.mark.parametrize('npts, pads', [([10], [2]), ([7, 8], [2, 1]), ([4, 5, 3], [1, 2, 1])])
+def test_stencil_matrix_diagonal(npts, pads):
+
+    V = StencilVectorSpace(npts, pads, [False] * len(npts))
+    A = random_spd_matrix(V, seed=0)
+
+    d    = A.diagonal()
+    dinv = A.diagonal(inverse=True)
+
+    assert isinstance(d, StencilVector) and d.space is V
+    assert np.allclose(d.toarray(), np.diag(A.toarray()), rtol=1e-14, atol=0)
+    assert np.allclose(dinv.toarray(), 1 / np.diag(A.toarray()), rtol=1e-14, atol=0)
+
+    # Jacobi preconditioner, weighted
+    P = JacobiPreconditioner(A, omega=0.5)
+    b = V.zeros()
+    b._data[...] = np.random.random(b._data.shape)
+    x = P.solve(b)
+    assert np.allclose(x.toarray(), 0.5 * b.toarray() / np.diag(A.toarray()), rtol=1e-14, atol=0)
+
+    # Application in place
+    P.solve(b, out=b)
+    assert np.allclose(b.toarray(), x.toarray(), rtol=1e-14, atol=0)
+
+#===============================================================================
+@pytest.mark.parametrize('transposed', [False, True])
+def test_block_jacobi(transposed):
+
+    V = StencilVectorSpace([9, 8], [2, 2], [False, False])
+    W = BlockVectorSpace(V, V)
+
+    A = BlockMatrix(W, W)
+    A[0, 0] = random_spd_matrix(V, seed=1)
+    A[1, 1] = random_spd_matrix(V, seed=2)
+    A[0, 1] = random_spd_matrix(V, seed=3)
+
+    b = BlockVector(W, blocks=[StencilVector(V), StencilVector(V)])
+    for bi in b.blocks:
+        bi._data[...] = np.random.random(bi._data.shape)
+
+    P = BlockJacobiPreconditioner(A)
+    x = P.solve(b, transposed=transposed)
+
+    # Point blocks of the diagonal, in the global numbering of the BlockMatrix
+    n = V.dimension
+    M = A.toarray()
+    D = np.zeros_like(M)
+    for i in range(2):
+        for j in range(2):
+            D[i*n:(i+1)*n, j*n:(j+1)*n] = np.diag(np.diag(M[i*n:(i+1)*n, j*n:(j+1)*n]))
+    if transposed:
+        D = D.T
+
+    assert np.allclose(x.toarray(), np.linalg.solve(D, b.toarray()), rtol=1e-12, atol=1e-14)
+
+    # Jacobi preconditioner of a BlockMatrix
+    assert np.allclose(A.diagonal().toarray(), np.diag(M), rtol=1e-14, atol=0)
+    x = JacobiPreconditioner(A).solve(b)
+    assert np.allclose(x.toarray(), b.toarray() / np.diag(M), rtol=1e-14, atol=0)
+
+    # Mismatching distribution of the blocks
+    W2 = BlockVectorSpace(V, StencilVectorSpace([9, 8], [1, 1], [False, False]))
+    with pytest.raises(ValueError):
+        BlockJacobiPreconditioner(BlockMatrix(W2, W2))
+
+#===============================================================================
+@pytest.mark.parametrize('npts, pads', [([12], [3]), ([7, 8], [2, 1]), ([4, 5, 3], [1, 2, 1])])
+@pytest.mark.parametrize('omega', [1., 1.5])
+def test_ssor(npts, pads, omega):
+
+    V = StencilVectorSpace(npts, pads, [False] * len(npts))
+    A = random_spd_matrix(V, seed=4)
+
+    b = V.zeros()
+    b._data[...] = np.random.random(b._data.shape)
+
+    P = SSORPreconditioner(A, omega=omega)
+    x = P.solve(b)
+
+    M = A.toarray()
+    D = np.diag(np.diag(M))
+    L = np.tril(M, -1)
+    U = np.triu(M, 1)
+    y = omega * (2 - omega) * np.linalg.solve(D + omega * U, D @ np.linalg.solve(D + omega * L, b.toarray()))
+
+    assert np.allclose(x.toarray(), y, rtol=1e-12, atol=1e-14)
+
+    # Application in place
+    P.solve(b, out=b)
+    assert np.allclose(b.toarray(), x.toarray(), rtol=1e-14, atol=0)
+
+    with pytest.raises(ValueError):
+        SSORPreconditioner(A, omega=2.)
+
+#===============================================================================
+@pytest.mark.parametrize('backend', [None, PSYDAC_BACKEND_GPYCCEL])
+def test_ssor_single_precision(backend):
+
+    V = StencilVectorSpace([7, 8], [2, 1], [False, False])
+    A = random_spd_matrix(V, seed=6)
+    A.set_backend(backend)
+
+    # Entries stored in single precision, sweeps in the datatype of the space
+    A32 = A.astype(np.float32)
+
+    b = V.zeros()
+    b._data[...] = np.random.random(b._data.shape)
+
+    x = SSORPreconditioner(A32).solve(b)
+
+    M = A32.toarray().astype(float)
+    D = np.diag(np.diag(M))
+    y = np.linalg.solve(D + np.triu(M, 1), D @ np.linalg.solve(D + np.tril(M, -1), b.toarray()))
+
+    assert x.dtype == V.dtype
+    assert np.allclose(x.toarray(), y, rtol=1e-12, atol=1e-14)
+
+#===============================================================================
+def test_pcg_preconditioners():
+
+    V = StencilVectorSpace([20, 20], [2, 2], [False, False])
+    A = random_spd_matrix(V, seed=5)
+
+    xe = V.zeros()
+    xe._data[...] = np.random.random(xe._data.shape)
+    b  = A.dot(xe)
+
+    x0, info0 = pcg(A, b, pc=None, tol=1e-10)
+    x1, info1 = pcg(A, b, pc=JacobiPreconditioner(A), tol=1e-10)
+    x2, info2 = pcg(A, b, pc=SSORPreconditioner(A), tol=1e-10)
+
+    assert info1['success'] and info2['success']
+    assert info2['niter'] < info0['niter']
+    assert np.allclose(x1.toarray(), x0.toarray(), rtol=0, atol=1e-8)
+    assert np.allclose(x2.toarray(), x0.toarray(), rtol=0, atol=1e-8)
+
+#===============================================================================
+@pytest.mark.parametrize('npts, pads', [([12], [3]), ([7, 8], [2, 1]), ([4, 5, 3], [1, 2, 1])])
+@pytest.mark.parametrize('transposed', [False, True])
+def test_additive_schwarz(npts, pads, transposed):
+
+    V = StencilVectorSpace(npts, pads, [False] * len(npts))
+    A = random_spd_matrix(V, seed=6)
+    M = A.toarray()
+
+    b = V.zeros()
+    b._data[...] = np.random.random(b._data.shape)
+
+    # In serial the only subdomain is the whole domain: direct solver
+    P = AdditiveSchwarzPreconditioner(A)
+    x = P.solve(b, transposed=transposed)
+    assert np.allclose(x.toarray(), np.linalg.solve(M.T if transposed else M, b.toarray()), rtol=1e-10, atol=1e-12)
+
+    # Nicolaides coarse space: constant function
+    P = AdditiveSchwarzPreconditioner(A, coarse_space=True)
+    x = P.solve(b, transposed=transposed)
+    Mt = M.T if transposed else M
+    y  = np.linalg.solve(Mt, b.toarray()) + b.toarray().sum() / M.sum()
+    assert P.coarse_space
+    assert np.allclose(x.toarray(), y, rtol=1e-10, atol=1e-12)
+
+    # Application in place
+    P.solve(b, out=b, transposed=transposed)
+    assert np.allclose(b.toarray(), x.toarray(), rtol=1e-14, atol=0)
+
+    with pytest.raises(ValueError):
+        AdditiveSchwarzPreconditioner(A, overlap=max(pads) + 1)
+
+#===============================================================================
+@pytest.mark.parametrize('periodic', [False, True])
+def test_pcg_additive_schwarz(periodic):
+
+    V = StencilVectorSpace([20, 20], [2, 2], [periodic] * 2)
+    A = random_spd_matrix(V, seed=7)
+
+    xe = V.zeros()
+    xe._data[...] = np.random.random(xe._data.shape)
+    b  = A.dot(xe)
+
+    x0, info0 = pcg(A, b, pc=None, tol=1e-10)
+    x1, info1 = pcg(A, b, pc=AdditiveSchwarzPreconditioner(A, overlap=1, coarse_space=True), tol=1e-10)
+
+    assert info1['success']
+    assert info1['niter'] < info0['niter']
+    assert np.allclose(x1.toarray(), x0.toarray(), rtol=0, atol=1e-8)
+
+#===============================================================================
+@pytest.mark.parametrize('periodic', [False, True])
+@pytest.mark.parallel
+def test_additive_schwarz_parallel(periodic):
+
+    from mpi4py import MPI
+    from psydac.ddm.cart import CartDecomposition
+
+    comm = MPI.COMM_WORLD
+
+    # Local blocks of 3 points (with 3 processes or more), shorter than twice
+    # the pads: the regions of the overlap sent to the two neighbours overlap.
+    # The subdomains must not cover the whole periodic domain.
+    p, overlap = 2, 2
+    n = max(3 * comm.size, 2 * (p + overlap))
+    cart = CartDecomposition(npts=[n], pads=[p], periods=[periodic], reorder=False, comm=comm)
+    V    = StencilVectorSpace(cart)
+    s, e = V.starts[0], V.ends[0]
+
+    # Symmetric positive definite matrix with half-bandwidth p, same on all processes
+    rng = np.random.default_rng(8)
+    Ag  = np.zeros((n, n))
+    for i in range(n):
+        for k in range(1, p+1):
+            if periodic or i+k < n:
+                Ag[i, (i+k) % n] = Ag[(i+k) % n, i] = rng.random()
+    Ag += np.diag(np.abs(Ag).sum(axis=1) + 1.)
+
+    A = StencilMatrix(V, V)
+    for i in range(s, e+1):
+        for k in range(-p, p+1):
+            if periodic or 0 <= i+k < n:
+                A[i, k] = Ag[i, (i+k) % n]
+
+    P = AdditiveSchwarzPreconditioner(A, overlap=overlap)
+
+    # Matrix of the preconditioner, column by column
+    Pinv = np.zeros((n, n))
+    for j in range(n):
+        ej = V.zeros()
+        if s <= j <= e:
+            ej[j] = 1.
+        Pinv[:, j] = comm.allreduce(P.solve(ej).toarray(), op=MPI.SUM)
+
+    # Exact sum over the subdomains of R_i^T A_i^{-1} R_i, where A_i only
+    # has the couplings within the box of the local data array (not across
+    # the periodic boundary)
+    Pinv_exact = np.zeros((n, n))
+    for si, ei in comm.allgather((s, e)):
+        lo  = si - overlap if comm.size > 1 and (si > 0 or periodic) else si
+        hi  = ei + overlap if comm.size > 1 and (ei < n-1 or periodic) else ei
+        box = np.arange(lo, hi+1)
+        Ai  = Ag[np.ix_(box % n, box % n)] * (abs(box[:, None] - box[None, :]) <= p)
+        Pinv_exact[np.ix_(box % n, box % n)] += np.linalg.inv(Ai)
+
+    assert np.allclose(Pinv, Pinv.T, rtol=0, atol=1e-12)
+    assert np.allclose(Pinv, Pinv_exact, rtol=0, atol=1e-12)
+
+#===============================================================================
+@pytest.mark.parametrize('jacobi', [False, True])
+@pytest.mark.parametrize('npts, pads', [([30], [2]), ([9, 8], [2, 1])])
+def test_chebyshev_eigenvalue_estimate(npts, pads, jacobi):
+
+    V = StencilVectorSpace(npts, pads, [False] * len(npts))
+    A = random_spd_matrix(V, seed=4)
+
+    M = A.toarray()
+    if jacobi:
+        M = M / np.diag(M)[:, None]
+    lam = np.linalg.eigvals(M).real
+
+    P = ChebyshevPreconditioner(A, jacobi=jacobi, nsteps=10, safety=1.1)
+    lmin, lmax = P.eig_bounds
+
+    # Ritz values are within the spectrum, and close to its extremities
+    assert lam.min() <= lmin < lmax <= 1.1 * lam.max()
+    assert lmax >= lam.max()
+    assert lmin < 1.5 * lam.min()
+
+    # Bounds given, or lower bound given by the ratio
+    P = ChebyshevPreconditioner(A, eig_bounds=(0.5, 2.), eig_ratio=10.)
+    assert P.eig_bounds == (0.2, 2.)
+
+    with pytest.raises(ValueError):
+        ChebyshevPreconditioner(A, eig_bounds=(2., 1.))
+
+    with pytest.raises(ValueError):
+        ChebyshevPreconditioner(A, degree=0)
+
+#===============================================================================
+@pytest.mark.parametrize('jacobi', [False, True])
+@pytest.mark.parametrize('degree', [1, 2, 5])
+@pytest.mark.parametrize('npts, pads', [([12], [3]), ([7, 8], [2, 1]), ([4, 5, 3], [1, 2, 1])])
+def test_chebyshev(npts, pads, degree, jacobi):
+
+    V = StencilVectorSpace(npts, pads, [False] * len(npts))
+    A = random_spd_matrix(V, seed=6)
+
+    Ad = A.toarray()
+    D  = np.diag(np.diag(Ad)) if jacobi else np.eye(len(Ad))
+    M  = np.linalg.solve(D, Ad)
+
+    lam  = np.linalg.eigvals(M).real
+    lmin = lam.min()
+    lmax = lam.max()
+
+    P = ChebyshevPreconditioner(A, degree, jacobi=jacobi, eig_bounds=(lmin, lmax))
+
+    b = V.zeros()
+    b._data[...] = np.random.random(b._data.shape)
+
+    # Error propagation matrix I - P^{-1} A of the Chebyshev iteration
+    E    = chebyshev_error_matrix(M, degree, lmin, lmax)
+    Pinv = (np.eye(len(Ad)) - E) @ np.linalg.inv(Ad)
+
+    x = P.solve(b)
+    assert np.allclose(x.toarray(), Pinv @ b.toarray(), rtol=1e-10, atol=1e-12)
+
+    # The preconditioner is symmetric positive definite
+    assert np.allclose(Pinv, Pinv.T, rtol=0, atol=1e-12)
+    assert np.linalg.eigvalsh((Pinv + Pinv.T) / 2).min() > 0
+
+    # Application in place, and transposed
+    y = P.solve(b, transposed=True)
+    P.solve(b, out=b)
+    assert np.allclose(b.toarray(), x.toarray(), rtol=1e-14, atol=0)
+    assert np.allclose(y.toarray(), x.toarray(), rtol=1e-14, atol=0)
+
+#===============================================================================
+def test_chebyshev_smoother():
+
+    n = 31
+    V = StencilVectorSpace([n], [1], [False])
+    A = laplacian_matrix(V)
+
+    lam, U = np.linalg.eigh(A.toarray())
+    xe = V.zeros()
+    xe._data[...] = np.random.random(xe._data.shape)
+    xe.ghost_regions_in_sync = False
+    b = A.dot(xe)
+
+    ratio  = 4.
+    degree = 3
+    S = ChebyshevPreconditioner(A, degree, eig_ratio=ratio)
+    lmin, lmax = S.eig_bounds
+    assert lmax >= lam.max() / 2
+
+    # One smoothing step x <- x + P^{-1} (b - A x)
+    x = V.zeros()
+    x._data[...] = np.random.random(x._data.shape)
+    x0 = x.toarray()
+    y  = S.smooth(b, x)
+    assert y is x
+
+    E = chebyshev_error_matrix(A.toarray() / 2, degree, lmin, lmax)
+    e = x0 - xe.toarray()
+    assert np.allclose(x.toarray() - xe.toarray(), E @ e, rtol=1e-10, atol=1e-12)
+
+    # The components of the error in the upper part of the spectrum are damped
+    high = (lam / 2 >= lmin) & (lam / 2 <= lmax)
+    damping = np.abs(U.T @ E @ U)[high, high]
+    assert damping.max() <= 1.0 / np.cosh(degree * np.arccosh((lmax + lmin) / (lmax - lmin))) + 1e-12
+
+#===============================================================================
+@pytest.mark.parametrize('jacobi', [False, True])
+def test_pcg_chebyshev(jacobi):
+
+    V = StencilVectorSpace([20, 20], [1, 1], [False, False])
+    W = BlockVectorSpace(V, V)
+    A = BlockMatrix(W, W)
+    A[0, 0] = laplacian_matrix(V)
+    A[1, 1] = laplacian_matrix(V)
+    A[1, 1] *= 3.
+
+    xe = BlockVector(W, blocks=[StencilVector(V), StencilVector(V)])
+    for xi in xe.blocks:
+        xi._data[...] = np.random.random(xi._data.shape)
+        xi.ghost_regions_in_sync = False
+    b = A.dot(xe)
+
+    x0, info0 = pcg(A, b, pc=JacobiPreconditioner(A), tol=1e-10)
+    x1, info1 = pcg(A, b, pc=ChebyshevPreconditioner(A, 4, jacobi=jacobi), tol=1e-10)
+
+    assert info0['success'] and info1['success']
+    assert info1['niter'] < info0['niter'] / (2 if jacobi else 1)
+    assert np.allclose(x1.toarray(), x0.toarray(), rtol=0, atol=1e-8)
+
+    # Standalone: the Chebyshev iteration converges with exact bounds
+    lam = np.linalg.eigvalsh(A.toarray())
+    P   = ChebyshevPreconditioner(A, 200, jacobi=False, eig_bounds=(lam.min(), lam.max()))
+    x2  = P.solve(b)
+    assert np.allclose(x2.toarray(), x0.toarray(), rtol=0, atol=1e-6)
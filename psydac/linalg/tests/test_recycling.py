@@ -0,0 +1,139 @@
+# coding: utf-8
+
+import numpy as np
+import pytest
+
+from psydac.linalg.stencil           import StencilVectorSpace, StencilMatrix, StencilVector
+from psydac.linalg.iterative_solvers import pcg, deflated_pcg
+from psydac.linalg.recycling         import SolverSequence
+
+#===============================================================================
+def laplacian_2d(n, shift):
+    """Five-point finite difference Laplacian (plus shift) on a n x n grid."""
+    V = StencilVectorSpace([n, n], [1, 1], [False, False])
+    A = StencilMatrix(V, V)
+    A[:, :, 0, 0] = 4 + shift
+    A[:, :,-1, 0] = -1
+    A[:, :, 1, 0] = -1
+    A[:, :, 0,-1] = -1
+    A[:, :, 0, 1] = -1
+    A.remove_spurious_entries()
+    return A
+
+# ...
+def smooth_rhs(V, t):
+    """Right-hand side which depends smoothly on time t."""
+    x1, x2 = np.meshgrid(*[np.linspace(0, 1, n) for n in V.npts], indexing='ij')
+    b = StencilVector(V)
+    b[0:V.npts[0], 0:V.npts[1]] = np.sin(np.pi * x1 * (1 + 0.3 * t)) * np.sin(np.pi * x2) + 0.2 * np.cos(3 * x1 + t)
+    return b
+
+#===============================================================================
+@pytest.mark.parametrize('pc', [None, 'jacobi'])
+def test_deflated_pcg(pc):
+
+    n = 12
+    A = laplacian_2d(n, shift=0.01)
+    V = A.domain
+    b = smooth_rhs(V, 0.)
+
+    x0, info0 = pcg(A, b, pc=pc, tol=1e-10)
+
+    # Without deflation vectors: same iterations as pcg
+    x1, info1 = deflated_pcg(A, b, pc=pc, tol=1e-10, nstore=4)
+    assert info1['niter'] == info0['niter']
+    assert len(info1['directions']) == 4
+    assert np.allclose(x1.toarray(), x0.toarray(), rtol=0, atol=1e-12)
+
+    # With the eigenvectors of the 6 smallest eigenvalues: fewer iterations
+    lam, U = np.linalg.eigh(A.toarray())
+    W = []
+    for u in U[:, :6].T:
+        w = StencilVector(V)
+        w[0:n, 0:n] = u.reshape(n, n)
+        W.append(w)
+
+    x2, info2 = deflated_pcg(A, b, pc=pc, W=W, tol=1e-10)
+    r2 = b - A.dot(x2)
+
+    assert info2['success']
+    assert info2['niter'] < info0['niter']
+    assert np.sqrt(r2.dot(r2)) < 1e-10
+
+    # The stored search directions are A-orthogonal to the deflation vectors
+    x3, info3 = deflated_pcg(A, b, pc=pc, W=W, tol=1e-10, nstore=3)
+    for p, Ap in info3['directions']:
+        assert max(abs(w.dot(Ap)) for w in W) < 1e-10 * np.sqrt(p.dot(p))
+
+#===============================================================================
+@pytest.mark.parametrize('guess, nguess, ndefl', [('extrapolation', 3, 0),
+                                                  ('projection', 4, 0),
+                                                  ('projection', 0, 8),
+                                                  ('projection', 4, 8)])
+@pytest.mark.parametrize('recompute', [True, False])
+def test_solver_sequence(guess, nguess, ndefl, recompute):
+
+    A = laplacian_2d(20, shift=0.01)
+    V = A.domain
+
+    tol = 1e-10
+    S   = SolverSequence(A, 'jacobi', tol=tol, maxiter=1000, guess=guess, nguess=nguess,
+                         ndefl=ndefl, recompute=recompute)
+
+    assert S.space is V
+    assert S.operator is A
+
+    niter = []
+    for t in np.linspace(0, 1, 8):
+        b = smooth_rhs(V, t)
+        x = S.solve(b)
+        r = b - A.dot(x)
+
+        assert S.info['success']
+        assert np.sqrt(r.dot(r)) < tol
+        niter.append(S.info['niter'])
+
+    # The recycled information reduces the number of iterations
+    assert max(niter[2:]) < niter[0]
+    assert len(S.deflation_vectors) == ndefl
+
+    # After a reset, the first solve starts from scratch (here in place)
+    S.reset()
+    assert S.deflation_vectors == ()
+
+    b = smooth_rhs(V, 0.)
+    x = S.solve(b, out=b)
+    assert x is b
+    assert S.info['niter'] == niter[0]
+
+#===============================================================================
+def test_solver_sequence_first_guess():
+
+    A = laplacian_2d(10, shift=1.)
+    V = A.domain
+
+    # Right-hand side (and solution) linear in time: exact extrapolation
+    b0 = smooth_rhs(V, 0.)
+    b1 = smooth_rhs(V, 1.)
+    rhs = lambda t: (1 - t) * b0 + t * b1
+
+    S = SolverSequence(A, tol=1e-12, guess='extrapolation', nguess=2, ndefl=0)
+    for t in [0., 0.1, 0.2]:
+        S.solve(rhs(t))
+    x = S.solve(rhs(0.3))
+    r = rhs(0.3) - A.dot(x)
+    assert S.info['niter'] <= 2
+    assert np.sqrt(r.dot(r)) < 1e-12
+
+    # Solution in the span of the previous ones: exact projection
+    S = SolverSequence(A, tol=1e-12, guess='projection', nguess=2, ndefl=0)
+    S.solve(b0)
+    S.solve(b1)
+    S.solve(0.3 * b0 - 2 * b1)
+    assert S.info['niter'] <= 2
+
+    # Correction to a given first guess (lifting of boundary conditions)
+    x0 = smooth_rhs(V, 0.5)
+    x  = S.solve(b1, x0=x0)
+    r  = b1 - A.dot(x)
+    assert np.sqrt(r.dot(r)) < 1e-12
@@ -803,6 +803,64 @@ def test_stencil_matrix_3d_serial_transpose_1( n1, n2, n3, p1, p2, p3, P1, P2, P
     assert abs(Ts - Ts_exact).max() < 1e-14
 
 
+#===============================================================================
+@pytest.mark.parametrize( 'n1', [7, 12] )
+@pytest.mark.parametrize( 'n2', [7, 10] )
+@pytest.mark.parametrize( 'p1', [2, 3] )
+@pytest.mark.parametrize( 'p2', [2, 3] )
+@pytest.mark.parametrize( 'P1', [True, False] )
+@pytest.mark.parametrize( 'P2', [True, False] )
+
+def test_stencil_matrix_2d_serial_matmul( n1, n2, p1, p2, P1, P2 ):
+
+    # Create vector space and stencil matrices with half-bandwidth 1
+    V = StencilVectorSpace( [n1, n2], [p1, p2], [P1, P2] )
+    A = StencilMatrix( V, V, pads=(1, 1) )
+    B = StencilMatrix( V, V, pads=(1, p2-1) )
+
+    # Fill in matrix values with random numbers between 0 and 1
+    A[0:n1, 0:n2, :, :] = np.random.random((n1, n2, 3, 3))
+    B[0:n1, 0:n2, :, :] = np.random.random((n1, n2, 3, 2*p2-1))
+
+    # If domain is not periodic, set corresponding periodic corners to zero
+    A.remove_spurious_entries()
+    B.remove_spurious_entries()
+
+    # TEST: compute product, then convert to Scipy sparse format
+    C  = A.matmul( B )
+    Cs = C.tosparse()
+
+    # Exact result: convert to Scipy sparse format, then multiply
+    Cs_exact = A.tosparse() @ B.tosparse()
+
+    # Check pads and data
+    assert C.pads == (2, p2)
+    assert abs(Cs - Cs_exact).max() < 1e-13
+
+#===============================================================================
+@pytest.mark.parametrize( 'n1', [7, 12] )
+@pytest.mark.parametrize( 'p1', [2, 3] )
+
+def test_stencil_matrix_1d_serial_matmul_bandwidth( n1, p1 ):
+
+    # Create vector space and tridiagonal stencil matrices with pads p1
+    V = StencilVectorSpace( [n1], [p1], [False] )
+    A = StencilMatrix( V, V )
+    A[0:n1, -1:2] = np.random.random((n1, 3))
+    A.remove_spurious_entries()
+
+    # TEST: pads of product are computed from the non-zero entries
+    C = A.matmul( A )
+    assert C.pads == (2,)
+    assert abs(C.tosparse() - A.tosparse() @ A.tosparse()).max() < 1e-13
+
+    # TEST: product whose bandwidth exceeds the pads of the space
+    B = StencilMatrix( V, V )
+    B[0:n1, -p1:p1+1] = 1.0
+    B.remove_spurious_entries()
+    with pytest.raises( ValueError ):
+        A.matmul( B )
+
 #===============================================================================
 # BACKENDS TESTS
 #===============================================================================
@@ -1012,6 +1070,113 @@ def test_stencil_matrix_2d_serial_backend_switch( n1, n2, p1, p2, P1, P2 , backe
     assert M.backend is backend2
     M.dot(x)
 
+#===============================================================================
+@pytest.mark.parametrize( 'n1', [5,15] )
+@pytest.mark.parametrize( 'n2', [5,12] )
+@pytest.mark.parametrize( 'p1', [2,3] )
+@pytest.mark.parametrize( 'p2', [2,3] )
+@pytest.mark.parametrize( 'P1', [True, False] )
+@pytest.mark.parametrize( 'P2', [True, False] )
+@pytest.mark.parametrize( 'backend', [PSYDAC_BACKEND_NUMBA, PSYDAC_BACKEND_GPYCCEL] )
+
+def test_stencil_matrix_2d_serial_backend_matmul( n1, n2, p1, p2, P1, P2, backend ):
+
+    # Create vector space and stencil matrices with half-bandwidth 1
+    V = StencilVectorSpace( [n1, n2], [p1, p2], [P1, P2] )
+    A = StencilMatrix( V, V, pads=(1, 1), backend=backend )
+    B = StencilMatrix( V, V, pads=(1, 1), backend=backend )
+
+    # Fill in matrix values with random numbers between 0 and 1
+    A[0:n1, 0:n2, :, :] = np.random.random((n1, n2, 3, 3))
+    B[0:n1, 0:n2, :, :] = np.random.random((n1, n2, 3, 3))
+
+    # If domain is not periodic, set corresponding periodic corners to zero
+    A.remove_spurious_entries()
+    B.remove_spurious_entries()
+
+    # TEST: compute product with the accelerated kernel
+    C = A.matmul( B )
+
+    # Exact result: convert to Scipy sparse format, then multiply
+    Cs_exact = A.tosparse() @ B.tosparse()
+
+    # Check data and backend propagation
+    assert abs(C.tosparse() - Cs_exact).max() < 1e-13
+    assert C.backend is backend
+
+#===============================================================================
+@pytest.mark.parametrize( 'n1', [8,21] )
+@pytest.mark.parametrize( 'n2', [13,32] )
+@pytest.mark.parametrize( 'p1', [1,3] )
+@pytest.mark.parametrize( 'p2', [1,2] )
+@pytest.mark.parametrize( 'P1', [True, False] )
+@pytest.mark.parametrize( 'P2', [True, False] )
+@pytest.mark.parametrize( 'backend', [None, PSYDAC_BACKEND_PYTHON, PSYDAC_BACKEND_GPYCCEL] )
+
+def test_stencil_matrix_2d_serial_astype( n1, n2, p1, p2, P1, P2, backend ):
+
+    # Create vector space, stencil matrix, and stencil vector
+    V = StencilVectorSpace( [n1,n2], [p1,p2], [P1,P2] )
+    M = StencilMatrix( V, V, backend=backend )
+    x = StencilVector( V )
+
+    # Fill in matrix and vector with random values
+    M[0:n1, 0:n2, :, :] = np.random.random((n1, n2, 2*p1+1, 2*p2+1))
+    M.remove_spurious_entries()
+    x[0:n1, 0:n2] = np.random.random((n1, n2))
+    x.update_ghost_regions()
+
+    # TEST: copy with entries in single precision
+    M32 = M.astype( np.float32 )
+
+    assert M32.data_dtype == np.float32
+    assert M32.dtype      == M.dtype
+    assert M32.backend    is backend
+    assert M32._data.nbytes * 2 == M._data.nbytes
+    assert (2*M32).data_dtype == np.float32
+    assert M32.T.data_dtype   == np.float32
+
+    # Products have the accuracy of single precision, and a vector in double precision
+    y   = M.dot( x )
+    y32 = M32.dot( x )
+    assert y32.dtype == y.dtype
+    assert np.allclose( y32.toarray(), y.toarray(), rtol=1e-6, atol=1e-6 )
+    assert np.allclose( M32.T.toarray(), M.T.toarray(), rtol=1e-6, atol=1e-6 )
+
+    # Conversion in place after a modification of the matrix
+    M *= 2
+    M.astype( np.float32, out=M32 )
+    assert np.array_equal( M32._data, M._data.astype( np.float32 ) )
+
+#===============================================================================
+@pytest.mark.parametrize( 'P1', [True, False] )
+@pytest.mark.parametrize( 'P2', [True, False] )
+@pytest.mark.parametrize( 'backend', [None, PSYDAC_BACKEND_GPYCCEL] )
+
+def test_stencil_matrix_2d_serial_astype_matmul( P1, P2, backend ):
+
+    # Create vector space and stencil matrices with half-bandwidth 1
+    V = StencilVectorSpace( [9, 10], [2, 2], [P1, P2] )
+    A = StencilMatrix( V, V, pads=(1, 1), backend=backend )
+    B = StencilMatrix( V, V, pads=(1, 1), backend=backend )
+
+    A[0:9, 0:10, :, :] = np.random.random((9, 10, 3, 3))
+    B[0:9, 0:10, :, :] = np.random.random((9, 10, 3, 3))
+    A.remove_spurious_entries()
+    B.remove_spurious_entries()
+
+    # TEST: product of matrices stored in single precision
+    A32 = A.astype( np.float32 )
+    B32 = B.astype( np.float32 )
+    C   = A32.matmul( B32 )
+
+    # Exact result of the single-precision entries
+    Cs_exact = A32.tosparse().astype( float ) @ B32.tosparse().astype( float )
+
+    assert C.data_dtype == V.dtype
+    assert abs(C.tosparse() - Cs_exact).max() < 1e-13
+    assert C.backend is backend
+
 #===============================================================================
 # PARALLEL TESTS
 #===============================================================================
@@ -1443,6 +1608,69 @@ def test_stencil_matrix_2d_parallel_transpose( n1, n2, p1, p2, P1, P2, reorder )
     # Check data
     assert abs(Ts - Ts_exact).max() < 1e-14
 
+#===============================================================================
+@pytest.mark.parametrize( 'n1', [ 8, 21] )
+@pytest.mark.parametrize( 'n2', [13, 32] )
+@pytest.mark.parametrize( 'p1', [2, 3] )
+@pytest.mark.parametrize( 'p2', [2] )
+@pytest.mark.parametrize( 'P1', [True, False] )
+@pytest.mark.parametrize( 'P2', [True, False] )
+@pytest.mark.parametrize( 'reorder', [True, False] )
+@pytest.mark.parallel
+
+def test_stencil_matrix_2d_parallel_matmul( n1, n2, p1, p2, P1, P2, reorder ):
+
+    from mpi4py       import MPI
+    from psydac.ddm.cart import CartDecomposition
+
+    comm = MPI.COMM_WORLD
+    cart = CartDecomposition(
+        npts    = [n1, n2],
+        pads    = [p1, p2],
+        periods = [P1, P2],
+        reorder = reorder,
+        comm    = comm
+    )
+
+    # Create vector spaces and stencil matrices with half-bandwidth 1
+    V  = StencilVectorSpace( cart )
+    Vs = StencilVectorSpace( [n1, n2], [p1, p2], [P1, P2] )
+    A, As = [StencilMatrix( W, W, pads=(1, 1) ) for W in (V, Vs)]
+    B, Bs = [StencilMatrix( W, W, pads=(1, 1) ) for W in (V, Vs)]
+
+    s1, s2 = V.starts
+    e1, e2 = V.ends
+
+    # Fill in matrix values with the same random numbers on all processes
+    np.random.seed(2)
+    a = np.random.random((n1, n2, 3, 3))
+    b = np.random.random((n1, n2, 3, 3))
+
+    As[0:n1, 0:n2, :, :] = a
+    Bs[0:n1, 0:n2, :, :] = b
+    A[s1:e1+1, s2:e2+1, :, :] = a[s1:e1+1, s2:e2+1]
+    B[s1:e1+1, s2:e2+1, :, :] = b[s1:e1+1, s2:e2+1]
+
+    # If domain is not periodic, set corresponding periodic corners to zero
+    for M in (A, As, B, Bs):
+        M.remove_spurious_entries()
+
+    # TEST: compute distributed product, then convert to Numpy array
+    C  = A.matmul( B )
+    Ca = C.toarray()
+
+    # Exact result: serial product, hence remove rows that do not belong to
+    # current process.
+    Ca_exact = As.matmul( Bs ).toarray()
+    for i in range( n1*n2 ):
+        i1, i2 = np.unravel_index( i, shape=[n1, n2], order='C' )
+        if not (s1 <= i1 <= e1 and s2 <= i2 <= e2):
+            Ca_exact[i, :] = 0.0
+
+    # Check data
+    assert C.pads == (2, 2)
+    assert np.allclose( Ca, Ca_exact, rtol=1e-14, atol=1e-14 )
+
 #===============================================================================
 # PARALLEL BACKENDS TESTS
 #===============================================================================
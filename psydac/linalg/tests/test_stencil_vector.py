@@ -173,6 +173,42 @@ def test_stencil_vector_2d_serial_dot( n1, n2, p1, p2, P1=True, P2=False ):
     assert z1 == z_exact
     assert z2 == z_exact
 
+#===============================================================================
+@pytest.mark.parametrize( 'n1', [1,7] )
+@pytest.mark.parametrize( 'n2', [1,5] )
+@pytest.mark.parametrize( 'p1', [1,2] )
+@pytest.mark.parametrize( 'p2', [1,2] )
+
+def test_stencil_vector_2d_serial_version( n1, n2, p1, p2, P1=True, P2=False ):
+
+    V = StencilVectorSpace( [n1,n2], [p1,p2], [P1,P2] )
+    x = StencilVector( V )
+    y = StencilVector( V )
+
+    versions = [x.version]
+
+    # Every in-place modification changes the version
+    x[:,:] = 1.0
+    versions.append( x.version )
+    x += y
+    versions.append( x.version )
+    x -= y
+    versions.append( x.version )
+    x *= 2.0
+    versions.append( x.version )
+    x.mark_modified()
+    versions.append( x.version )
+
+    assert len( set( versions ) ) == len( versions )
+
+    # Read access and out-of-place operations do not change the version
+    v = x.version
+    _ = x[0,0]
+    _ = x + y
+    _ = x.dot( y )
+    x.update_ghost_regions()
+    assert x.version == v
+
 #===============================================================================
 @pytest.mark.parametrize( 'n1', [1,7] )
 @pytest.mark.parametrize( 'n2', [1,5] )
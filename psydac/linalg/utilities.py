@@ -5,7 +5,7 @@ from math                  import sqrt
 from psydac.linalg.stencil import StencilVectorSpace, StencilVector
 from psydac.linalg.block   import BlockVector, BlockVectorSpace
 
-__all__ = ['array_to_stencil', '_sym_ortho']
+__all__ = ['array_to_stencil', 'lumped_diagonal', '_sym_ortho']
 
 def array_to_stencil(x, Xh):
     """ converts a numpy array to StencilVector or BlockVector format"""
@@ -53,6 +53,44 @@ def petsc_to_stencil(x, Xh):
     u = array_to_stencil(x, Xh)
     return u
 
+def lumped_diagonal(M, out=None):
+    """
+    Compute the row sums of a StencilMatrix or BlockMatrix, i.e. the diagonal
+    of the lumped matrix obtained by adding all entries of each row to the
+    diagonal. For a mass matrix, this gives a diagonal approximation which can
+    be inverted at no cost (see DiagonalSolver), at the price of a lower
+    accuracy.
+
+    Parameters
+    ----------
+    M : StencilMatrix | BlockMatrix
+        Square matrix to be lumped.
+
+    out : StencilVector | BlockVector, optional
+        Vector of M.codomain where the result is stored.
+
+    Returns
+    -------
+    out : StencilVector | BlockVector
+        Row sums of M.
+    """
+    ones = M.domain.zeros()
+    for v in _stencil_blocks(ones):
+        v._data[_owned_region(v.space)] = 1.0
+        v.ghost_regions_in_sync = False
+
+    return M.dot(ones, out=out)
+
+def _stencil_blocks(v):
+    """ List of the StencilVector objects which make up a (nested) BlockVector."""
+    if isinstance(v, BlockVector):
+        return [w for b in v.blocks for w in _stencil_blocks(b)]
+    return [v]
+
+def _owned_region(V):
+    """ Index of the entries owned by the process in the data array of a StencilVector."""
+    return tuple(slice(m*p, m*p+e-s+1) for p,m,s,e in zip(V.pads, V.shifts, V.starts, V.ends))
+
 def _sym_ortho(a, b):
     """
     Stable implementation of Givens rotation.
@@ -0,0 +1,351 @@
+# coding: utf-8
+"""
+Layout and encoding of the HDF5 datasets in which the coefficients of
+distributed spline fields are written.
+
+"""
+import numpy as np
+
+__all__ = ('DatasetStorage', 'decomposition_chunks', 'is_encoded', 'read_dataset')
+
+#==============================================================================
+def decomposition_chunks(V):
+    """
+    Chunk shape aligned with the Cartesian decomposition of a vector space:
+    along each axis, the largest number of points owned by a process. In this
+    way every process writes to as few chunks as possible, which are shared
+    with the fewest neighbours.
+
+    Parameters
+    ----------
+    V : psydac.linalg.stencil.StencilVectorSpace
+        Distributed vector space.
+
+    Returns
+    -------
+    tuple of int
+        Chunk shape.
+    """
+    if V.parallel:
+        return tuple(int(max(e - s + 1)) for s, e in zip(V.cart.global_starts, V.cart.global_ends))
+    return tuple(int(n) for n in V.npts)
+
+#==============================================================================
+class DatasetStorage:
+    """
+    Storage options of the HDF5 datasets which hold the coefficients of the
+    fields. The default values reproduce the contiguous, uncompressed layout
+    in the data type of the space, written with independent MPI-IO.
+
+    Parameters
+    ----------
+    chunks : None | bool | str | tuple of int
+        Chunk shape of the datasets: None for a contiguous layout (unless
+        compression is used), True for the automatic chunking of h5py,
+        'decomposition' for chunks aligned with the Cartesian decomposition
+        (see decomposition_chunks), or an explicit shape.
+
+    compression : None | str
+        Lossless compression filter: 'gzip' or 'lzf'. Compressed datasets are
+        chunked along the decomposition if no chunks are given. With parallel
+        HDF5 the filters require collective writes, which are then enabled.
+
+    compression_opts : int, optional
+        Compression level of 'gzip', between 0 and 9 (default: 4).
+
+    shuffle : bool
+        If True, apply the byte shuffle filter before compression, which
+        usually improves the compression ratio of floating point data.
+
+    dtype : numpy.dtype, optional
+        Data type of the datasets, e.g. numpy.float32 to halve the size of
+        the files. The coefficients are converted on write. By default the
+        data type of the vector space is used.
+
+    collective : bool
+        If True, write the datasets with collective MPI-IO instead of
+        independent MPI-IO. Only used if the file is opened with the 'mpio'
+        driver.
+
+    keyframe_interval : int, optional
+        If given, the snapshots are written as keyframes every keyframe_interval
+        snapshots, and as differences with the previous snapshot in between
+        (bitwise XOR of the floating point values, which is exact). Slowly
+        evolving fields then compress much better.
+
+    tolerance : float, optional
+        If given, the values are quantized to integers with a step of
+        2*tolerance, hence an absolute error smaller than tolerance, which
+        compress much better than floating point values. Combined with
+        keyframe_interval, the differences of the integers are written.
+
+    Notes
+    -----
+    The encoded datasets are decoded by read_dataset. Since the encodings
+    only pay off with compression, gzip with the shuffle filter is used if
+    keyframe_interval or tolerance is given without compression.
+    """
+    def __init__(self, *, chunks=None, compression=None, compression_opts=None,
+                 shuffle=False, dtype=None, collective=False,
+                 keyframe_interval=None, tolerance=None):
+
+        if keyframe_interval is not None and keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be a positive integer, got {}".format(keyframe_interval))
+
+        if tolerance is not None and not tolerance > 0:
+            raise ValueError("Tolerance must be positive, got {}".format(tolerance))
+
+        if (keyframe_interval is not None or tolerance is not None) and compression is None:
+            compression = 'gzip'
+            shuffle     = True
+
+        if compression not in (None, 'gzip', 'lzf'):
+            raise ValueError("Compression filter must be 'gzip' or 'lzf', got {}".format(compression))
+
+        if compression_opts is not None and compression != 'gzip':
+            raise ValueError("Compression options are only available for 'gzip'")
+
+        if isinstance(chunks, str) and chunks != 'decomposition':
+            raise ValueError("Chunks must be None, True, 'decomposition' or a tuple, got '{}'".format(chunks))
+
+        if compression is not None and chunks is None:
+            chunks = 'decomposition'
+
+        self._chunks           = chunks
+        self._compression      = compression
+        self._compression_opts = compression_opts
+        self._shuffle          = shuffle
+        self._dtype            = None if dtype is None else np.dtype(dtype)
+        self._collective       = collective
+        self._keyframe_interval = keyframe_interval
+        self._tolerance         = tolerance
+
+    # ...
+    @property
+    def chunks(self):
+        return self._chunks
+
+    @property
+    def compression(self):
+        return self._compression
+
+    @property
+    def compression_opts(self):
+        return self._compression_opts
+
+    @property
+    def shuffle(self):
+        return self._shuffle
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def collective(self):
+        return self._collective
+
+    @property
+    def keyframe_interval(self):
+        return self._keyframe_interval
+
+    @property
+    def tolerance(self):
+        return self._tolerance
+
+    @property
+    def has_filters(self):
+        """ True if the datasets are compressed or shuffled."""
+        return self._compression is not None or self._shuffle
+
+    # ...
+    def create_dataset(self, group, name, V, reference=None):
+        """
+        Create a dataset with the global shape of a distributed vector space.
+        This operation is collective if the file is opened in parallel.
+
+        Parameters
+        ----------
+        group : h5py.Group
+            Group in which the dataset is created.
+
+        name : str
+            Name (or path relative to the group) of the dataset.
+
+        V : psydac.linalg.stencil.StencilVectorSpace
+            Distributed vector space of the coefficients.
+
+        reference : h5py.Dataset, optional
+            Dataset of the previous snapshot, if the new dataset stores the
+            difference with it (see keyframe_interval).
+
+        Returns
+        -------
+        h5py.Dataset
+            New empty dataset.
+        """
+        kwargs = {}
+
+        chunks = self._chunks
+        if chunks == 'decomposition':
+            chunks = decomposition_chunks(V)
+        if chunks is not None:
+            kwargs['chunks'] = chunks
+
+        if self._compression is not None:
+            kwargs['compression'] = self._compression
+            if self._compression_opts is not None:
+                kwargs['compression_opts'] = self._compression_opts
+
+        if self._shuffle:
+            kwargs['shuffle'] = True
+
+        dtype = np.dtype(V.dtype if self._dtype is None else self._dtype)
+        if self._tolerance is not None:
+            stored_dtype = np.dtype(np.int64)
+        elif reference is not None:
+            stored_dtype = _bits_dtype(dtype)
+        else:
+            stored_dtype = dtype
+
+        dset = group.create_dataset(name, shape=V.npts, dtype=stored_dtype, **kwargs)
+
+        if self._tolerance is not None:
+            dset.attrs.create('quantization_step', data=2 * self._tolerance)
+        if stored_dtype != dtype:
+            dset.attrs.create('dtype', data=dtype.str)
+        if reference is not None:
+            dset.attrs.create('delta_reference', data=reference.name)
+
+        return dset
+
+    # ...
+    def write(self, dset, coeffs):
+        """
+        Write the coefficients owned by the process to a dataset created with
+        'create_dataset'. This operation is collective if collective writes
+        are enabled (or required by the filters) in parallel.
+
+        Parameters
+        ----------
+        dset : h5py.Dataset
+            Dataset with the global shape of coeffs.space.
+
+        coeffs : psydac.linalg.stencil.StencilVector
+            Distributed coefficients.
+        """
+        V     = coeffs.space
+        index = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+        self.write_local(dset, V, coeffs[index])
+
+    # ...
+    def write_local(self, dset, V, values, previous=None):
+        """
+        Write an array with the coefficients owned by the process, e.g. a copy
+        of coeffs[starts:ends+1], to a dataset created with 'create_dataset'.
+
+        Parameters
+        ----------
+        dset : h5py.Dataset
+            Dataset with the global shape of V.
+
+        V : psydac.linalg.stencil.StencilVectorSpace
+            Distributed vector space of the coefficients.
+
+        values : numpy.ndarray
+            Coefficients owned by the process.
+
+        previous : numpy.ndarray, optional
+            Encoded coefficients of the reference dataset, as returned by the
+            previous call, if dset was created with a reference.
+
+        Returns
+        -------
+        numpy.ndarray
+            Encoded coefficients (a new array), to be used as the reference
+            of the next snapshot.
+        """
+        index   = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+        dtype   = np.dtype(dset.attrs.get('dtype', dset.dtype))
+        encoded = np.array(values, dtype=dtype, order='C')
+
+        if 'quantization_step' in dset.attrs:
+            encoded = np.rint(encoded / dset.attrs['quantization_step']).astype(np.int64)
+
+        if previous is None:
+            values = encoded
+        else:
+            values = _difference(encoded, previous)
+
+        if dset.file.driver == 'mpio' and (self._collective or self.has_filters):
+            with dset.collective:
+                dset[index] = values
+        else:
+            dset[index] = values
+
+        return encoded
+
+#==============================================================================
+def is_encoded(dset):
+    """
+    True if a dataset is written as a difference with a reference dataset,
+    or with quantized values (see DatasetStorage).
+    """
+    return 'delta_reference' in dset.attrs or 'quantization_step' in dset.attrs
+
+#==============================================================================
+def read_dataset(dset, index=()):
+    """
+    Read (a hyperslab of) a dataset written with a DatasetStorage, and decode
+    it if needed: the chain of differences is followed back to the keyframe,
+    and the quantized values are converted back to floating point numbers.
+
+    Parameters
+    ----------
+    dset : h5py.Dataset
+        Dataset to read.
+
+    index : tuple of slice, optional
+        Hyperslab to read (by default the whole dataset).
+
+    Returns
+    -------
+    numpy.ndarray
+        Decoded values.
+    """
+    if not is_encoded(dset):
+        return dset[index]
+
+    chain = [dset]
+    while 'delta_reference' in chain[-1].attrs:
+        chain.append(dset.file[chain[-1].attrs['delta_reference']])
+
+    encoded = chain.pop()[index]
+    while chain:
+        encoded = _undo_difference(encoded, chain.pop()[index])
+
+    dtype = np.dtype(dset.attrs.get('dtype', dset.dtype))
+    if 'quantization_step' in dset.attrs:
+        return (encoded * dset.attrs['quantization_step']).astype(dtype)
+    return encoded.view(dtype)
+
+#==============================================================================
+def _bits_dtype(dtype):
+    """Unsigned integer type with the size of a floating point type."""
+    if dtype.kind != 'f':
+        raise ValueError('Differences of snapshots are only available for real floating point data')
+    return np.dtype('u{}'.format(dtype.itemsize))
+
+def _difference(encoded, previous):
+    """Difference of integers, or bitwise XOR of floating point numbers."""
+    if encoded.dtype.kind == 'i':
+        return encoded - previous
+    bits = _bits_dtype(encoded.dtype)
+    return np.bitwise_xor(encoded.view(bits), previous.view(bits))
+
+def _undo_difference(previous, delta):
+    """Inverse of _difference: encoded values from the previous ones and the difference."""
+    if previous.dtype.kind == 'i':
+        return previous + delta
+    bits = _bits_dtype(previous.dtype)
+    return np.bitwise_xor(previous.view(bits), delta).view(previous.dtype)
@@ -48,7 +48,7 @@ def gauss_legendre(ordergl,tol=10e-14):
 def gauss_lobatto(k):
     """
     Returns nodal abscissas {x} and weights {A} of
-    Gauss-Legendre m-point quadrature.
+    Gauss-Lobatto (k+1)-point quadrature, sorted in increasing order.
     """
     beta = .5 / np.sqrt(1-(2 * np.arange(1., k + 1)) ** (-2)) #3-term recurrence coeffs
     beta[-1] = np.sqrt((k / (2 * k-1.)))